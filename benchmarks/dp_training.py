@@ -0,0 +1,125 @@
+#!/usr/bin/env python
+# This file is originally part of Fed-BioMed
+# SPDX-License-Identifier: Apache-2.0
+
+"""Benchmark of differentially private training: plain training vs Opacus vs vectorized (`vmap`) engine.
+
+Trains a multi-layer perceptron on synthetic data with each engine, and reports the training
+time per epoch. Example:
+
+    python benchmarks/dp_training.py --samples 20000 --batch-size 64 --hidden 512 --output dp.json
+"""
+
+import argparse
+import json
+import platform
+import time
+from typing import Dict
+
+import torch
+from torch.utils.data import DataLoader, TensorDataset
+
+from fedbiomed.common.models import TorchModel
+from fedbiomed.common.optimizers.generic_optimizers import NativeTorchOptimizer
+from fedbiomed.common.privacy import DPController
+
+
+ENGINES = ("plain", "opacus", "vmap")
+
+
+def _build(args: argparse.Namespace, engine: str):
+    """Builds the model, optimizer, data loader and DP controller of an engine."""
+    torch.manual_seed(args.seed)
+    layers = [torch.nn.Linear(args.features, args.hidden), torch.nn.ReLU()]
+    for _ in range(args.layers - 1):
+        layers += [torch.nn.Linear(args.hidden, args.hidden), torch.nn.ReLU()]
+    model = torch.nn.Sequential(*layers, torch.nn.Linear(args.hidden, args.classes))
+
+    data = torch.randn(args.samples, args.features)
+    target = torch.randint(0, args.classes, (args.samples,))
+    loader = DataLoader(TensorDataset(data, target), batch_size=args.batch_size, shuffle=True)
+
+    dp_controller = DPController(
+        None if engine == "plain" else
+        {"type": "local", "sigma": args.sigma, "clip": args.clip, "engine": engine}
+    )
+    model = dp_controller.validate_and_fix_model(model)
+    wrapper = TorchModel(model)
+    optimizer = NativeTorchOptimizer(wrapper, torch.optim.SGD(model.parameters(), lr=0.01))
+    optimizer, loader = dp_controller.before_training(optimizer, loader)
+    return wrapper, optimizer, loader, dp_controller
+
+
+def run(args: argparse.Namespace, engine: str) -> Dict[str, float]:
+    """Trains with an engine, and returns its timings."""
+    wrapper, optimizer, loader, dp_controller = _build(args, engine)
+
+    def training_step(data, target):
+        return torch.nn.functional.cross_entropy(wrapper.model(data), target)
+
+    epoch_times = []
+    for _ in range(args.epochs):
+        start = time.perf_counter()
+        for data, target in loader:
+            optimizer.zero_grad()
+            if dp_controller.vectorized:
+                dp_controller.private_backward(training_step, data, target)
+            else:
+                training_step(data, target).backward()
+            optimizer.step()
+        epoch_times.append(time.perf_counter() - start)
+
+    # the first epoch includes warm-up
+    steady = epoch_times[1:] or epoch_times
+    return {
+        "first_epoch_s": epoch_times[0],
+        "epoch_s": sum(steady) / len(steady),
+        "samples_per_s": args.samples * len(steady) / sum(steady),
+    }
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--engines", nargs="+", choices=ENGINES, default=list(ENGINES))
+    parser.add_argument("--samples", type=int, default=10000)
+    parser.add_argument("--features", type=int, default=64)
+    parser.add_argument("--classes", type=int, default=10)
+    parser.add_argument("--hidden", type=int, default=256)
+    parser.add_argument("--layers", type=int, default=2)
+    parser.add_argument("--batch-size", type=int, default=64)
+    parser.add_argument("--epochs", type=int, default=3)
+    parser.add_argument("--sigma", type=float, default=1.0)
+    parser.add_argument("--clip", type=float, default=1.0)
+    parser.add_argument("--threads", type=int, default=None, help="number of torch intra-op threads")
+    parser.add_argument("--seed", type=int, default=0)
+    parser.add_argument("--output", default=None, help="JSON file where results are written")
+    args = parser.parse_args()
+
+    if args.threads:
+        torch.set_num_threads(args.threads)
+
+    results = {engine: run(args, engine) for engine in args.engines}
+    if "plain" in results:
+        for result in results.values():
+            result["slowdown"] = result["epoch_s"] / results["plain"]["epoch_s"]
+
+    report = {
+        "benchmark": "dp_training",
+        "config": vars(args),
+        "environment": {
+            "python": platform.python_version(),
+            "torch": torch.__version__,
+            "threads": torch.get_num_threads(),
+        },
+        "results": results,
+    }
+    for engine, result in results.items():
+        print(f"{engine:>8}: {result['epoch_s']:.3f} s/epoch, {result['samples_per_s']:.0f} samples/s"
+              + (f", x{result['slowdown']:.2f}" if "slowdown" in result else ""))
+    if args.output:
+        with open(args.output, "w") as f:
+            json.dump(report, f, indent=2)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,308 @@
+#!/usr/bin/env python
+# This file is originally part of Fed-BioMed
+# SPDX-License-Identifier: Apache-2.0
+
+"""End-to-end benchmark of federated rounds, with the time spent in each phase.
+
+Runs the rounds of an `Experiment` with the virtual nodes of a `Simulation`: the researcher and the nodes are the
+real `Experiment`, `Job` and `Round`, with the broker and the file repository of the simulation as stand-ins for MQTT
+and the HTTP repository.
+
+The phases of the nodes are the spans recorded by their `Round` and sent in their training replies (download, import,
+deserialization, data_loading, validation, training, encryption, serialization, upload). Nodes train in parallel, so
+the duration of a phase in a round is the one of the slowest node. The phases of the researcher are recorded with a
+`SpanRecorder` around the methods of the experiment that run them:
+
+    dispatch              `Job` uploads the global parameters and sends the training requests
+    training_round        `Job` waits for the replies of the nodes, including the dispatch and researcher download
+    researcher_download   `Job` downloads and deserializes the parameters of the nodes
+    aggregate             `FedAverage` or secure aggregation
+    update_parameters     `Job` saves and uploads the aggregated parameters
+    breakpoint            `Experiment` saves the breakpoint of the round
+
+Scenarios are the combinations of frameworks, model sizes and secure aggregation settings. The JSON report can be
+compared across commits. Example:
+
+    python benchmarks/round.py --frameworks torch sklearn --sizes 1M 10M --output round.json
+
+Training data is generated by the training plans from their model arguments, the datasets of the virtual nodes are
+only used to find the nodes. Secure aggregation needs MP-SPDZ to be set up for the researcher, and takes more than a
+minute per million parameters and node: scenarios above `--secagg-max-params` are reported as skipped. Models of 100M
+parameters need several GB of memory per node.
+"""
+
+import argparse
+import functools
+import json
+import os
+import platform
+import shutil
+import subprocess
+import tempfile
+import time
+from typing import Any, Dict, List
+
+import numpy as np
+import sklearn
+import torch
+
+from fedbiomed.common.data import DataManager
+from fedbiomed.common.instrumentation import SpanRecorder
+from fedbiomed.common.logger import logger
+from fedbiomed.common.training_plans import FedSGDRegressor, TorchTrainingPlan
+from fedbiomed.researcher.aggregators import FedAverage
+from fedbiomed.researcher.experiment import Experiment
+from fedbiomed.researcher.simulation import Simulation
+
+
+FRAMEWORKS = ("torch", "sklearn")
+RESEARCHER_PHASES = ("dispatch", "training_round", "researcher_download", "aggregate", "update_parameters",
+                     "breakpoint")
+NODE_PHASES = ("download", "import", "deserialization", "data_loading", "validation", "training", "encryption",
+               "serialization", "upload")
+TAGS = ["#benchmark-round"]
+
+
+class BenchmarkTorchPlan(TorchTrainingPlan):
+    """Multi-layer perceptron on synthetic data, with a hidden layer sized to the number of parameters."""
+
+    def init_model(self, model_args):
+        return torch.nn.Sequential(torch.nn.Linear(model_args["features"], model_args["hidden"]), torch.nn.ReLU(),
+                                   torch.nn.Linear(model_args["hidden"], model_args["classes"]))
+
+    def init_optimizer(self, optimizer_args):
+        return torch.optim.SGD(self.model().parameters(), lr=optimizer_args["lr"])
+
+    def init_dependencies(self):
+        return ["import numpy as np"]
+
+    def training_data(self, batch_size=32):
+        args = self.model_args()
+        rng = np.random.default_rng(args["seed"])
+        data = rng.standard_normal((args["samples"], args["features"]), dtype=np.float32)
+        target = rng.integers(0, args["classes"], args["samples"])
+        return DataManager(dataset=data, target=target, batch_size=batch_size, shuffle=True)
+
+    def training_step(self, data, target):
+        return torch.nn.functional.cross_entropy(self.model()(data), target.long())
+
+
+class BenchmarkSGDRegressorPlan(FedSGDRegressor):
+    """Linear regression on synthetic data, with one parameter per feature."""
+
+    def init_dependencies(self):
+        return ["import numpy as np", "from fedbiomed.common.data import DataManager"]
+
+    def training_data(self):
+        args = self.model_args()
+        rng = np.random.default_rng(args["seed"])
+        # scaled so that the weights stay in the clipping range of secure aggregation
+        data = rng.standard_normal((args["samples"], args["n_features"])) / np.sqrt(args["n_features"])
+        target = rng.standard_normal(args["samples"])
+        return DataManager(dataset=data, target=target)
+
+
+def parse_size(size: str) -> int:
+    """Parses a number of parameters such as `100k`, `1M` or `1.5G`."""
+    units = {"k": 10 ** 3, "m": 10 ** 6, "g": 10 ** 9}
+    unit = units.get(size[-1].lower())
+    try:
+        return int(float(size[:-1]) * unit) if unit else int(size)
+    except ValueError:
+        raise argparse.ArgumentTypeError(f"invalid model size {size}")
+
+
+def git_commit() -> str:
+    """Returns the commit of the benchmarked tree, if known."""
+    try:
+        return subprocess.run(["git", "rev-parse", "HEAD"], cwd=os.path.dirname(os.path.abspath(__file__)),
+                              capture_output=True, text=True, check=True).stdout.strip()
+    except (OSError, subprocess.CalledProcessError):
+        return "unknown"
+
+
+def record_spans(benchmark: "RoundBenchmark", obj: Any, method: str, span: str):
+    """Records the calls of a method of an object in a span of the current round of the benchmark."""
+    function = getattr(obj, method)
+
+    @functools.wraps(function)
+    def recorded(*args, **kwargs):
+        with benchmark.spans.span(span):
+            return function(*args, **kwargs)
+
+    setattr(obj, method, recorded)
+
+
+class RoundBenchmark:
+    """Experiment of a scenario, run on the virtual nodes of a simulation."""
+
+    def __init__(self, args: argparse.Namespace, framework: str, num_params: int, secagg: bool):
+        self.args = args
+        if framework == "torch":
+            hidden = max(1, (num_params - args.classes) // (args.features + args.classes + 1))
+            self.plan_class = BenchmarkTorchPlan
+            self.model_args = {"features": args.features, "hidden": hidden, "classes": args.classes,
+                               "samples": args.samples, "seed": args.seed}
+            self.training_args = {"optimizer_args": {"lr": 0.01}, "batch_size": args.batch_size}
+        else:
+            self.plan_class = BenchmarkSGDRegressorPlan
+            self.model_args = {"n_features": max(1, num_params - 1), "samples": args.sklearn_samples,
+                               "seed": args.seed}
+            self.training_args = {"optimizer_args": {"lr": 0.01},
+                                  "batch_size": args.sklearn_samples}
+        self.training_args.update({"num_updates": args.updates, "test_ratio": args.test_ratio,
+                                   "test_on_global_updates": True, "test_on_local_updates": True})
+        self.secagg = secagg
+        self.spans = SpanRecorder()
+
+        self.data_dir = tempfile.mkdtemp(prefix="fedbiomed_benchmark_")
+        self.nodes = []
+        for i in range(args.nodes):
+            path = os.path.join(self.data_dir, f"node_{i}.csv")
+            with open(path, "w") as file:
+                file.write("feature,target\n0,0\n")
+            self.nodes.append({"name": f"benchmark node {i}", "data_type": "csv", "path": path, "tags": TAGS,
+                               "description": "placeholder dataset of the round benchmark"})
+
+    def close(self):
+        shutil.rmtree(self.data_dir, ignore_errors=True)
+
+    def run(self) -> List[Dict[str, Any]]:
+        """Runs the rounds of the experiment, and returns the time spent in each phase of each round."""
+        with Simulation(self.nodes, processes=self.args.processes, cpu_threads=self.args.threads,
+                        log_level=self.args.log_level, start_method=self.args.start_method,
+                        response_timeout=self.args.response_timeout):
+            torch.manual_seed(self.args.seed)
+            experiment = Experiment(tags=TAGS, model_args=self.model_args, training_plan_class=self.plan_class,
+                                    training_args=self.training_args, round_limit=self.args.rounds,
+                                    aggregator=FedAverage(), node_selection_strategy=None, secagg=self.secagg,
+                                    save_breakpoints=True)
+            try:
+                return self._run_rounds(experiment)
+            finally:
+                shutil.rmtree(experiment.experimentation_path(), ignore_errors=True)
+
+    def _run_rounds(self, experiment: Experiment) -> List[Dict[str, Any]]:
+        job = experiment.job()
+        self.num_params = sum(int(np.prod(np.shape(value)))
+                              for value in job.training_plan.get_model_params().values())
+        record_spans(self, job, "_send_training_requests", "dispatch")
+        record_spans(self, job, "start_nodes_training_round", "training_round")
+        record_spans(self, job, "_process_training_reply", "researcher_download")
+        record_spans(self, experiment.aggregator(), "aggregate", "aggregate")
+        record_spans(self, experiment.secagg, "aggregate", "aggregate")
+        record_spans(self, job, "update_parameters", "update_parameters")
+        record_spans(self, experiment, "breakpoint", "breakpoint")
+        record_spans(self, experiment._breakpoint_writer, "wait", "breakpoint")
+
+        rounds = []
+        for round_ in range(self.args.rounds):
+            self.spans = SpanRecorder()
+            start = time.perf_counter()
+            experiment.run_once()
+            total = time.perf_counter() - start
+
+            researcher = self.spans.spans()
+            nodes = [reply["spans"] for reply in experiment.training_replies()[round_]]
+            rounds.append({
+                "total": total,
+                "researcher": {phase: researcher[phase]["wall_time"] if phase in researcher else 0.
+                               for phase in RESEARCHER_PHASES},
+                # nodes train in parallel: the round waits for the slowest one
+                "nodes": {phase: max((spans[phase]["wall_time"] for spans in nodes if phase in spans), default=0.)
+                          for phase in NODE_PHASES},
+                "nodes_peak_rss": max((span["peak_rss"] or 0 for spans in nodes for span in spans.values()),
+                                      default=0),
+                "nodes_bytes": {phase: max((spans[phase]["bytes"] for spans in nodes if phase in spans), default=0)
+                                for phase in ("download", "upload")},
+            })
+        return rounds
+
+
+def run(args: argparse.Namespace, framework: str, num_params: int, secagg: bool) -> Dict[str, Any]:
+    """Runs the rounds of a scenario, and returns its timings."""
+    if secagg and num_params > args.secagg_max_params:
+        return {"skipped": f"secure aggregation above {args.secagg_max_params} parameters"}
+
+    benchmark = RoundBenchmark(args, framework, num_params, secagg)
+    try:
+        rounds = benchmark.run()
+    finally:
+        benchmark.close()
+
+    # the first round includes warm-up
+    steady = rounds[1:] or rounds
+    return {
+        "num_params": benchmark.num_params,
+        "first_round_s": rounds[0]["total"],
+        "round_s": sum(timing["total"] for timing in steady) / len(steady),
+        "researcher_s": {phase: sum(timing["researcher"][phase] for timing in steady) / len(steady)
+                         for phase in RESEARCHER_PHASES},
+        "nodes_s": {phase: sum(timing["nodes"][phase] for timing in steady) / len(steady) for phase in NODE_PHASES},
+        "nodes_peak_rss": max(timing["nodes_peak_rss"] for timing in rounds),
+        "nodes_bytes": steady[-1]["nodes_bytes"],
+    }
+
+
+def parse_args(argv: List[str] = None) -> argparse.Namespace:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--frameworks", nargs="+", choices=FRAMEWORKS, default=list(FRAMEWORKS))
+    parser.add_argument("--sizes", nargs="+", type=parse_size, default=[10 ** 6, 10 ** 7],
+                        help="numbers of model parameters, e.g. 1M 10M 100M")
+    parser.add_argument("--secagg", nargs="+", choices=("off", "on"), default=["off"])
+    parser.add_argument("--secagg-max-params", type=parse_size, default=10 ** 6)
+    parser.add_argument("--nodes", type=int, default=2)
+    parser.add_argument("--processes", type=int, default=None, help="number of worker processes of the nodes")
+    parser.add_argument("--rounds", type=int, default=3)
+    parser.add_argument("--updates", type=int, default=10, help="number of local updates of each round")
+    parser.add_argument("--samples", type=int, default=2000, help="number of samples of each node (torch)")
+    parser.add_argument("--sklearn-samples", type=int, default=16, help="number of samples of each node (sklearn)")
+    parser.add_argument("--features", type=int, default=256, help="number of input features (torch)")
+    parser.add_argument("--classes", type=int, default=10)
+    parser.add_argument("--batch-size", type=int, default=32)
+    parser.add_argument("--test-ratio", type=float, default=0.1)
+    parser.add_argument("--threads", type=int, default=None, help="number of torch threads of each node process")
+    parser.add_argument("--response-timeout", type=float, default=0.5,
+                        help="time in seconds the researcher waits for replies before checking them")
+    parser.add_argument("--start-method", default="spawn", help="multiprocessing start method of the nodes")
+    parser.add_argument("--log-level", default="WARNING", help="logging level of Fed-BioMed")
+    parser.add_argument("--seed", type=int, default=0)
+    parser.add_argument("--output", default=None, help="JSON file where results are written")
+    return parser.parse_args(argv)
+
+
+def main():
+    args = parse_args()
+    logger.setLevel(args.log_level)
+
+    results = {}
+    for framework in args.frameworks:
+        for num_params in args.sizes:
+            for secagg in args.secagg:
+                name = f"{framework}-{num_params}-secagg_{secagg}"
+                results[name] = result = run(args, framework, num_params, secagg == "on")
+                if "skipped" in result:
+                    print(f"{name:>30}: skipped, {result['skipped']}")
+                else:
+                    phases = ", ".join(f"{phase} {duration:.3f}"
+                                       for phase, duration in {**result["researcher_s"], **result["nodes_s"]}.items())
+                    print(f"{name:>30}: {result['round_s']:.3f} s/round ({phases})")
+
+    report = {
+        "benchmark": "round",
+        "config": vars(args),
+        "environment": {
+            "python": platform.python_version(),
+            "torch": torch.__version__,
+            "sklearn": sklearn.__version__,
+            "commit": git_commit(),
+        },
+        "results": results,
+    }
+    if args.output:
+        with open(args.output, "w") as f:
+            json.dump(report, f, indent=2)
+
+
+if __name__ == "__main__":
+    main()
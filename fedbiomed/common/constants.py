@@ -37,7 +37,7 @@ __version__ = FBM_Component_Version('4.3.1')  # Fed-BioMed software version
 __researcher_config_version__ = FBM_Component_Version('1')  # researcher config file version
 __node_config_version__ = FBM_Component_Version('1')  # node config file version
 __breakpoints_version__ = FBM_Component_Version('1')  # breakpoints format version
-__messaging_protocol_version__ = FBM_Component_Version('1')  # format of MQTT messages.
+__messaging_protocol_version__ = FBM_Component_Version('3')  # format of MQTT messages.
 # Nota: for messaging protocol version, all changes should be a major version upgrade
 
 
@@ -65,6 +65,17 @@ class ComponentType(_BaseEnum):
 
 
 
+class DatabaseBackend(_BaseEnum):
+    """Storage backends available for the component databases
+
+    Attributes:
+        TINYDB: single JSON file handled by TinyDB
+        SQLITE: SQLite file with indexed fields
+    """
+    TINYDB = 'tinydb'
+    SQLITE = 'sqlite'
+
+
 class BiprimeType(_BaseEnum):
     """Constant values for secure aggregation biprime type that will be saved into db
 
@@ -298,6 +309,8 @@ class ErrorNumbers(_BaseEnum):
     FB624 = "FB624: Secure aggregation crypter error"
     FB625 = "FB625: Component version error"
     FB626 = "FB626: Fed-BioMed optimizer error"
+    FB627 = "FB627: Database error"
+    FB628 = "FB628: Simulation error"
 
     # oops
     FB999 = "FB999: unknown error code sent by the node"
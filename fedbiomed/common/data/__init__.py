@@ -6,14 +6,9 @@ Classes that simplify imports from fedbiomed.common.data
 """
 
 
-from ._data_manager import DataManager
-from ._torch_data_manager import TorchDataManager
-from ._sklearn_data_manager import SkLearnDataManager, NPDataLoader
-from ._tabular_dataset import TabularDataset
-from ._medical_datasets import NIFTIFolderDataset, MedicalFolderDataset, MedicalFolderBase, MedicalFolderController, \
-    MedicalFolderLoadingBlockTypes
-from ._flamby_dataset import FlambyDatasetMetadataBlock, FlambyLoadingBlockTypes, \
-    FlambyDataset, discover_flamby_datasets
+from typing import TYPE_CHECKING
+
+from fedbiomed.common.utils import lazy_import_attributes
 from ._data_loading_plan import (DataLoadingBlock,
                                  MapperBlock,
                                  DataLoadingPlan,
@@ -21,6 +16,35 @@ from ._data_loading_plan import (DataLoadingBlock,
                                  SerializationValidation  # keep it for documentation
                                  )
 
+if TYPE_CHECKING:
+    from ._data_manager import DataManager
+    from ._torch_data_manager import TorchDataManager
+    from ._sklearn_data_manager import SkLearnDataManager, NPDataLoader
+    from ._tabular_dataset import TabularDataset, ColumnarTabularDataset
+    from ._medical_datasets import NIFTIFolderDataset, MedicalFolderDataset, MedicalFolderBase, \
+        MedicalFolderController, MedicalFolderLoadingBlockTypes
+    from ._flamby_dataset import FlambyDatasetMetadataBlock, FlambyLoadingBlockTypes, \
+        FlambyDataset, discover_flamby_datasets
+
+# data managers and datasets import torch, scikit-learn, MONAI or FLamby, only when they are used
+__getattr__, __dir__ = lazy_import_attributes(__name__, {
+    "DataManager": "._data_manager",
+    "TorchDataManager": "._torch_data_manager",
+    "SkLearnDataManager": "._sklearn_data_manager",
+    "NPDataLoader": "._sklearn_data_manager",
+    "TabularDataset": "._tabular_dataset",
+    "ColumnarTabularDataset": "._tabular_dataset",
+    "NIFTIFolderDataset": "._medical_datasets",
+    "MedicalFolderDataset": "._medical_datasets",
+    "MedicalFolderBase": "._medical_datasets",
+    "MedicalFolderController": "._medical_datasets",
+    "MedicalFolderLoadingBlockTypes": "._medical_datasets",
+    "FlambyDatasetMetadataBlock": "._flamby_dataset",
+    "FlambyLoadingBlockTypes": "._flamby_dataset",
+    "FlambyDataset": "._flamby_dataset",
+    "discover_flamby_datasets": "._flamby_dataset",
+})
+
 __all__ = [
     "MedicalFolderBase",
     "MedicalFolderController",
@@ -30,6 +54,7 @@ __all__ = [
     "TorchDataManager",
     "SkLearnDataManager",
     "TabularDataset",
+    "ColumnarTabularDataset",
     "NIFTIFolderDataset",
     "NPDataLoader",
     "DataLoadingBlock",
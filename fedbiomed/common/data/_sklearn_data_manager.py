@@ -9,7 +9,8 @@ Fed-BioMed users relying on the scikit-learn framework that is similar to the in
 """
 
 
-from typing import Union, Tuple, Optional
+import math
+from typing import Iterator, Union, Tuple, Optional
 
 import numpy as np
 import pandas as pd
@@ -21,12 +22,44 @@ from fedbiomed.common.logger import logger
 from fedbiomed.common.utils import get_method_spec
 
 
+NP_LOADER_MODES = ('gather', 'in_place', 'blocks')
+"""Ways NPDataLoader iterates over its arrays, see [`NPDataLoader`][fedbiomed.common.data.NPDataLoader]"""
+
+DEFAULT_BLOCK_BATCHES = 64
+"""Default number of batches in a block read at once by NPDataLoader in `blocks` mode"""
+
+
+def _shuffle_together(rng: np.random.Generator, *arrays: Optional[np.ndarray]) -> None:
+    """Shuffles arrays of the same length in place along their first axis, with the same permutation.
+
+    The state of the generator is replayed for each array, as shuffling only depends on the length.
+    Arrays that overlap an array already shuffled (eg: target columns of the dataset) are skipped.
+    """
+    state = rng.bit_generator.state
+    shuffled = []
+    for array in arrays:
+        if array is not None and not any(np.shares_memory(array, other) for other in shuffled):
+            rng.bit_generator.state = state
+            rng.shuffle(array)
+            shuffled.append(array)
+
+
 class NPDataLoader:
     """DataLoader for a Numpy dataset.
 
     This data loader encapsulates a dataset composed of numpy arrays and presents an Iterable interface.
     One design principle was to try to make the interface as similar as possible to a torch.DataLoader.
 
+    The loader iterates over the data in one of the following modes:
+
+    - `gather` (default): batches are gathered from the arrays through a (shuffled) index, as copies.
+    - `in_place`: the arrays are shuffled in place once per epoch, and batches are contiguous views of
+        the arrays, without any copy. The arrays of the loader are modified.
+    - `blocks`: out-of-core mode for arrays larger than memory (eg: `np.memmap`). Blocks of contiguous rows
+        are read in a reusable buffer, in random order, and shuffled in the buffer. Batches are views of the
+        buffer, valid until the next block is read, so they should be consumed before requesting the next one.
+        Without shuffling, batches are views of the arrays, read on access.
+
     Attributes:
         _dataset: (np.ndarray) a 2d array of features
         _target: (np.ndarray) an optional array of target values
@@ -34,6 +67,9 @@ class NPDataLoader:
         _shuffle: (bool) if True, shuffle the data at the beginning of every epoch
         _drop_last: (bool) if True, drop the last batch if it does not contain batch_size elements
         _rng: (np.random.Generator) the random number generator for shuffling
+        _mode: (str) how batches are produced, one of `NP_LOADER_MODES`
+        _block_size: (int) number of rows of a block in `blocks` mode, a multiple of batch_size
+        _buffers: (tuple) reusable buffers for the dataset and target blocks in `blocks` mode
     """
 
     def __init__(self,
@@ -42,7 +78,9 @@ class NPDataLoader:
                  batch_size: int = 1,
                  shuffle: bool = False,
                  random_seed: Optional[int] = None,
-                 drop_last: bool = False):
+                 drop_last: bool = False,
+                 mode: str = 'gather',
+                 block_size: Optional[int] = None):
         """Construct numpy data loader
 
         Args:
@@ -53,6 +91,9 @@ class NPDataLoader:
             random_seed: an optional integer to set the numpy random seed for shuffling. If it equals
                 None, then no attempt will be made to set the random seed.
             drop_last: whether to drop the last batch in case it does not fill the whole batch size
+            mode: how batches are produced, one of `gather`, `in_place` or `blocks` (see class documentation)
+            block_size: number of rows read at once in `blocks` mode, rounded down to a multiple of
+                `batch_size`. Defaults to `DEFAULT_BLOCK_BATCHES` batches.
         """
 
         if not isinstance(dataset, np.ndarray) or not isinstance(target, np.ndarray):
@@ -115,12 +156,35 @@ class NPDataLoader:
             logger.error(msg)
             raise FedbiomedTypeError(msg)
 
+        if mode not in NP_LOADER_MODES:
+            msg = f"{ErrorNumbers.FB609.value}. Wrong value for `mode` parameter of NPDataLoader. " \
+                  f"Expected one of {NP_LOADER_MODES}, instead got {mode}."
+            logger.error(msg)
+            raise FedbiomedValueError(msg)
+
+        if block_size is not None and (not isinstance(block_size, int) or isinstance(block_size, bool)):
+            msg = f"{ErrorNumbers.FB609.value}. Wrong type for `block_size` parameter of NPDataLoader. " \
+                  f"Expected int or None, instead got {type(block_size)}."
+            logger.error(msg)
+            raise FedbiomedTypeError(msg)
+
+        if block_size is not None and block_size < batch_size:
+            msg = f"{ErrorNumbers.FB609.value}. Wrong value for `block_size` parameter of NPDataLoader. " \
+                  f"Expected at least the batch size {batch_size}, instead got {block_size}."
+            logger.error(msg)
+            raise FedbiomedValueError(msg)
+
         self._dataset = dataset
         self._target = target
         self._batch_size = batch_size
         self._shuffle = shuffle
         self._drop_last = drop_last
         self._rng = np.random.default_rng(random_seed)
+        self._mode = mode
+        # blocks hold whole batches, so that batches never span two blocks
+        block_size = block_size or DEFAULT_BLOCK_BATCHES * batch_size
+        self._block_size = block_size - block_size % batch_size
+        self._buffers: Optional[Tuple[np.ndarray, Optional[np.ndarray]]] = None
 
     def __len__(self) -> int:
         """Returns the length of the encapsulated dataset"""
@@ -170,13 +234,33 @@ class NPDataLoader:
         """Returns the remainder of the division between dataset length and batch size."""
         return len(self._dataset) % self._batch_size
 
+    def mode(self) -> str:
+        """Returns the iteration mode"""
+        return self._mode
+
+    def block_size(self) -> int:
+        """Returns the number of rows of a block in `blocks` mode"""
+        return self._block_size
+
+    def block_buffers(self) -> Tuple[np.ndarray, Optional[np.ndarray]]:
+        """Returns the buffers used to shuffle blocks in `blocks` mode, allocated on first call."""
+        if self._buffers is None:
+            rows = min(self._block_size, len(self._dataset))
+            self._buffers = (
+                np.empty((rows, *self._dataset.shape[1:]), dtype=self._dataset.dtype),
+                None if self._target is None else
+                np.empty((rows, *self._target.shape[1:]), dtype=self._target.dtype)
+            )
+        return self._buffers
+
 
 class _BatchIterator:
     """ Iterator over batches for NPDataLoader.
 
     Attributes:
         _loader: (NPDataLoader) the data loader that created this iterator
-        _index: (np.array) an array  of indices into the data loader's data
+        _index: (np.array) an array  of indices into the data loader's data, in `gather` mode
+        _views: (Iterator) batches of the current epoch as contiguous views, in other modes
         _num_yielded: (int) the number of batches yielded in the current epoch
     """
     def __init__(self, loader: NPDataLoader):
@@ -187,17 +271,27 @@ class _BatchIterator:
         """
         self._loader = loader
         self._index = None
+        self._views = None
         self._num_yielded = 0
         self._reset()
 
     def _reset(self):
         """Reset the iterator between epochs.
 
-        restore num_yielded to 0, reshuffles the indices if shuffle is True, and applies drop_last
+        restore num_yielded to 0, reshuffles the indices (or the data, depending on the mode) if shuffle
+        is True, and applies drop_last
         """
         self._num_yielded = 0
         dlen = len(self._loader.dataset)
 
+        # batches of other modes are produced lazily, when the epoch starts
+        if self._loader.mode() == 'in_place':
+            self._views = self._in_place()
+            return
+        if self._loader.mode() == 'blocks':
+            self._views = self._blocks()
+            return
+
         self._index = np.arange(dlen)
 
         # Perform the optional shuffling.
@@ -219,6 +313,10 @@ class _BatchIterator:
         Raises:
             StopIteration: when an epoch of data has been exhausted.
         """
+        if self._num_yielded < len(self._loader) and self._views is not None:
+            self._num_yielded += 1
+            return next(self._views)
+
         if self._num_yielded < len(self._loader):
             start = self._num_yielded*self._loader.batch_size()
             stop = (self._num_yielded+1)*self._loader.batch_size()
@@ -233,6 +331,68 @@ class _BatchIterator:
         self._reset()
         raise StopIteration
 
+    def _num_rows(self, start: int, stop: int) -> int:
+        """Number of rows of the dataset range [start - stop) that are used, applying drop_last.
+
+        Args:
+            start: first row of the range (the tail of the dataset in `blocks` mode)
+            stop: row after the range
+        """
+        if stop == len(self._loader.dataset) and self._loader.drop_last():
+            return stop - start - self._loader.n_remainder_samples()
+        return stop - start
+
+    def _slices(self,
+                dataset: np.ndarray,
+                target: Optional[np.ndarray],
+                num_rows: int) -> Iterator[Tuple[np.ndarray, Optional[np.ndarray]]]:
+        """Yields batches of the first rows of the arrays as views.
+
+        Args:
+            dataset: array of features
+            target: array of target values, or None
+            num_rows: number of rows to iterate over
+        """
+        batch_size = self._loader.batch_size()
+        for start in range(0, num_rows, batch_size):
+            stop = min(start + batch_size, num_rows)
+            yield dataset[start:stop], None if target is None else target[start:stop]
+
+    def _in_place(self) -> Iterator[Tuple[np.ndarray, Optional[np.ndarray]]]:
+        """Yields batches of an epoch, after shuffling the arrays in place."""
+        dataset, target = self._loader.dataset, self._loader.target
+        if self._loader.shuffle():
+            _shuffle_together(self._loader.rng(), dataset, target)
+
+        yield from self._slices(dataset, target, self._num_rows(0, len(dataset)))
+
+    def _blocks(self) -> Iterator[Tuple[np.ndarray, Optional[np.ndarray]]]:
+        """Yields batches of an epoch, reading blocks of contiguous rows one at a time."""
+        dataset, target = self._loader.dataset, self._loader.target
+        dlen, block_size = len(dataset), self._loader.block_size()
+
+        if not self._loader.shuffle():
+            yield from self._slices(dataset, target, self._num_rows(0, dlen))
+            return
+
+        # the last block of the dataset may be smaller: it is always read last, so that
+        # all batches of the epoch but the last one are full
+        starts = np.arange(0, dlen, block_size)
+        self._loader.rng().shuffle(starts[:-1] if dlen % block_size else starts)
+
+        buffer_dataset, buffer_target = self._loader.block_buffers()
+        for start in starts:
+            stop = min(start + block_size, dlen)
+            block_dataset = buffer_dataset[:stop - start]
+            block_dataset[...] = dataset[start:stop]
+            block_target = None
+            if target is not None:
+                block_target = buffer_target[:stop - start]
+                block_target[...] = target[start:stop]
+            _shuffle_together(self._loader.rng(), block_dataset, block_target)
+
+            yield from self._slices(block_dataset, block_target, self._num_rows(start, stop))
+
 
 class SkLearnDataManager(object):
     """Wrapper for `pd.DataFrame`, `pd.Series` and `np.ndarray` datasets.
@@ -317,6 +477,10 @@ class SkLearnDataManager(object):
     def split(self, test_ratio: float) -> Tuple[NPDataLoader, NPDataLoader]:
         """Splits `np.ndarray` dataset into train and validation.
 
+        With the `in_place` and `blocks` loader modes, the subsets are views of the arrays rather than
+        copies. In `in_place` mode the arrays are shuffled in place before the split, in `blocks` mode they
+        are not shuffled, and the last samples are used for validation.
+
         Args:
              test_ratio: Ratio for validation set partition. Rest of the samples will be used for training
 
@@ -339,6 +503,7 @@ class SkLearnDataManager(object):
             raise FedbiomedTypeError(msg)
 
         empty_subset = (np.array([]), np.array([]))
+        mode = self._loader_arguments.get('mode', 'gather')
 
         if test_ratio <= 0.:
             self._subset_train = (self._inputs, self._target)
@@ -346,14 +511,31 @@ class SkLearnDataManager(object):
         elif test_ratio >= 1.:
             self._subset_train = empty_subset
             self._subset_test = (self._inputs, self._target)
-        else:
+        elif mode == 'gather':
             x_train, x_test, y_train, y_test = train_test_split(self._inputs, self._target, test_size=test_ratio)
             self._subset_test = (x_test, y_test)
             self._subset_train = (x_train, y_train)
-
-        test_batch_size = max(1, len(self._subset_test[0]))
+        else:
+            # subsets are views of the arrays, so that the data is never copied
+            if mode == 'in_place':
+                _shuffle_together(np.random.default_rng(), self._inputs, self._target)
+            else:
+                logger.info("Out-of-core data is not shuffled before the train/validation split: "
+                            "the last samples are used for validation")
+            n_train = len(self._inputs) - math.ceil(test_ratio * len(self._inputs))
+            self._subset_train = (self._inputs[:n_train], self._target[:n_train])
+            self._subset_test = (self._inputs[n_train:], self._target[n_train:])
+
+        test_loader_arguments = {'batch_size': max(1, len(self._subset_test[0]))}
+        if mode == 'in_place':
+            # a single batch is a view of the validation subset
+            test_loader_arguments['mode'] = mode
+        elif mode == 'blocks':
+            # out-of-core validation subset is not loaded as a single batch
+            test_loader_arguments = {k: v for k, v in self._loader_arguments.items()
+                                     if k in ('batch_size', 'block_size', 'mode')}
         return self._subset_loader(self._subset_train, **self._loader_arguments), \
-            self._subset_loader(self._subset_test, batch_size=test_batch_size)
+            self._subset_loader(self._subset_test, **test_loader_arguments)
 
     @staticmethod
     def _subset_loader(subset: Tuple[np.ndarray, np.ndarray], **loader_arguments) -> Optional[NPDataLoader]:
@@ -5,11 +5,12 @@
 Torch tabulated data manager
 """
 
-from typing import Union, Tuple
+from typing import Dict, List, Optional, Union, Tuple
 
 import numpy as np
 import pandas as pd
 
+import torch
 from torch import from_numpy, Tensor
 from torch.utils.data import Dataset
 
@@ -94,3 +95,234 @@ class TabularDataset(Dataset):
     @staticmethod
     def get_dataset_type() -> DatasetTypes:
         return DatasetTypes.TABULAR
+
+
+class _ChunkedArray:
+    """Rows of several arrays (eg: memory-mapped chunk files) seen as a single array."""
+
+    def __init__(self, chunks: List[np.ndarray]):
+        """Constructor of the class.
+
+        Args:
+            chunks: arrays with the same dtype and shape except for the first dimension
+
+        Raises:
+            FedbiomedDatasetError: chunks with different dtypes or shapes
+        """
+        if not chunks or any(c.dtype != chunks[0].dtype or c.shape[1:] != chunks[0].shape[1:] for c in chunks):
+            raise FedbiomedDatasetError(f"{ErrorNumbers.FB610.value}: Chunks of a dataset should have the same "
+                                        f"dtype and the same shape except for the number of rows")
+        self._chunks = chunks
+        self._offsets = np.cumsum([0] + [len(c) for c in chunks])
+        self.dtype = chunks[0].dtype
+        self.shape = (int(self._offsets[-1]), *chunks[0].shape[1:])
+        self.ndim = len(self.shape)
+
+    def __len__(self) -> int:
+        return self.shape[0]
+
+    def take(self, indices: np.ndarray) -> np.ndarray:
+        """Gathers rows from the chunks.
+
+        Args:
+            indices: indices of the rows in the concatenation of the chunks
+
+        Returns:
+            The rows, as a new array
+        """
+        rows = np.empty((len(indices), *self.shape[1:]), dtype=self.dtype)
+        chunk_ids = np.searchsorted(self._offsets, indices, side='right') - 1
+        for chunk_id in np.unique(chunk_ids):
+            mask = chunk_ids == chunk_id
+            rows[mask] = self._chunks[chunk_id][indices[mask] - self._offsets[chunk_id]]
+        return rows
+
+
+class ColumnarTabularDataset(Dataset):
+    """Torch Dataset for tabular data that converts rows to tensors per batch.
+
+    Contrary to [`TabularDataset`][fedbiomed.common.data.TabularDataset], the data is not
+    converted upfront. Columns keep their dtype and share memory with the source data frame or arrays
+    where possible (including memory-mapped arrays and chunk files, see
+    [`from_files`][fedbiomed.common.data.ColumnarTabularDataset.from_files]). Categorical columns are
+    stored as their integer codes.
+
+    Batches of rows are gathered by `__getitems__`, in a single pass over the columns, and converted by
+    [`collate_batch`][fedbiomed.common.data.ColumnarTabularDataset.collate_batch] which is used as the
+    collate function of the data loaders created by
+    [`TorchDataManager`][fedbiomed.common.data.TorchDataManager].
+    """
+
+    def __init__(self,
+                 inputs: Union[np.ndarray, pd.DataFrame, pd.Series, _ChunkedArray],
+                 target: Union[np.ndarray, pd.DataFrame, pd.Series, _ChunkedArray],
+                 dtype: Optional[torch.dtype] = torch.float32,
+                 target_dtype: Optional[torch.dtype] = torch.float32):
+        """Constructs the dataset.
+
+        Args:
+            inputs: Input variables that will be passed to network
+            target: Target variable for output layer
+            dtype: dtype of the inputs tensor of a batch. If None, inputs keep the dtype of their columns:
+                batches of data frame inputs are dictionaries of tensors indexed by column name.
+            target_dtype: dtype of the target tensor of a batch, dtype of the target columns if None.
+
+        Raises:
+            FedbiomedDatasetError: bad type of `inputs` or `target`, non-numeric columns, or inputs
+                and target of different lengths
+        """
+        self._inputs = self._columns(inputs, 'inputs')
+        self._target = self._columns(target, 'target')
+        self._dtype = dtype
+        self._target_dtype = target_dtype
+
+        if len(self._inputs[0][1]) != len(self._target[0][1]):
+            raise FedbiomedDatasetError(f"{ErrorNumbers.FB610.value}: Length of input variables and target "
+                                        f"variable does not match. Please make sure that they have "
+                                        f"equal size while creating the method `training_data` of "
+                                        f"TrainingPlan")
+
+    @classmethod
+    def from_files(cls,
+                   inputs: Union[str, List[str]],
+                   target: Union[str, List[str]],
+                   **kwargs) -> 'ColumnarTabularDataset':
+        """Creates a dataset from `.npy` files, that are memory-mapped rather than loaded.
+
+        Args:
+            inputs: Path of the inputs file, or paths of files holding consecutive chunks of rows
+            target: Path of the target file, or paths of files holding consecutive chunks of rows
+            **kwargs: other arguments of the constructor
+
+        Raises:
+            FedbiomedDatasetError: a file can not be read
+        """
+        def load(paths: Union[str, List[str]]) -> Union[np.ndarray, _ChunkedArray]:
+            try:
+                if isinstance(paths, str):
+                    return np.load(paths, mmap_mode='r')
+                return _ChunkedArray([np.load(path, mmap_mode='r') for path in paths])
+            except (OSError, ValueError) as e:
+                raise FedbiomedDatasetError(f"{ErrorNumbers.FB610.value}: Can not read dataset file: {e}")
+
+        return cls(load(inputs), load(target), **kwargs)
+
+    @staticmethod
+    def _columns(data: Union[np.ndarray, pd.DataFrame, pd.Series, _ChunkedArray],
+                 name: str) -> List[Tuple[Optional[str], Union[np.ndarray, _ChunkedArray]]]:
+        """Gets the columns of the data, without copying them when possible.
+
+        Returns:
+            `(column name, array)` tuples. Arrays are used as a single column (possibly 2D), without name.
+        """
+        if isinstance(data, pd.DataFrame):
+            columns = [(column, ColumnarTabularDataset._series_values(data[column])) for column in data.columns]
+        elif isinstance(data, pd.Series):
+            columns = [(None, ColumnarTabularDataset._series_values(data))]
+        elif isinstance(data, (np.ndarray, _ChunkedArray)):
+            columns = [(None, data)]
+        else:
+            raise FedbiomedDatasetError(f"{ErrorNumbers.FB610.value}: The argument `{name}` should be "
+                                        f"an instance one of np.ndarray, pd.DataFrame or pd.Series")
+
+        for column, values in columns:
+            if not (np.issubdtype(values.dtype, np.number) or np.issubdtype(values.dtype, np.bool_)):
+                raise FedbiomedDatasetError(f"{ErrorNumbers.FB610.value}: The argument `{name}` should only "
+                                            f"contain numeric or categorical columns, column {column} "
+                                            f"is {values.dtype}")
+        return columns
+
+    @staticmethod
+    def _series_values(series: pd.Series) -> np.ndarray:
+        """Values of a series, as a view of the data frame when possible, or categorical codes."""
+        if isinstance(series.dtype, pd.CategoricalDtype):
+            return series.cat.codes.to_numpy()
+        return series.to_numpy()
+
+    def __len__(self) -> int:
+        """Gets sample size of dataset.
+
+        Returns:
+            Total number of samples
+        """
+        return len(self._inputs[0][1])
+
+    def __getitem__(self, item: int) -> Tuple[Union[Tensor, Dict[str, Tensor]], Tensor]:
+        """Gets the input and target of a single sample.
+
+        Args:
+            item: Index to select single sample from dataset
+
+        Returns:
+            inputs: Input sample
+            target: Target sample
+        """
+        inputs, target = self.__getitems__([item])
+        if isinstance(inputs, dict):
+            return {column: values[0] for column, values in inputs.items()}, target[0]
+        return inputs[0], target[0]
+
+    def __getitems__(self, items: List[int]) -> Tuple[Union[Tensor, Dict[str, Tensor]], Tensor]:
+        """Gets a batch of samples, converted to tensors.
+
+        Used by torch data loaders to fetch batches, instead of fetching samples one by one.
+
+        Args:
+            items: Indices of the samples of the batch
+
+        Returns:
+            inputs: Inputs of the batch, a tensor, or a dictionary of tensors indexed by column name
+                for data frame inputs when `dtype` is None
+            target: Targets of the batch
+        """
+        indices = np.asarray(items, dtype=np.int64)
+        return self._batch(self._inputs, indices, self._dtype), self._batch(self._target, indices, self._target_dtype)
+
+    @staticmethod
+    def collate_batch(batch: Tuple[Union[Tensor, Dict[str, Tensor]], Tensor]) \
+            -> Tuple[Union[Tensor, Dict[str, Tensor]], Tensor]:
+        """Collate function of the data loaders: batches are already collated by `__getitems__`."""
+        return batch
+
+    @staticmethod
+    def _take(values: Union[np.ndarray, _ChunkedArray], indices: np.ndarray) -> Tuple[np.ndarray, bool]:
+        """Gathers rows of a column.
+
+        Returns:
+            The rows, and whether they are a view of the column (consecutive indices) rather than a copy
+        """
+        if isinstance(values, _ChunkedArray):
+            return values.take(indices), False
+        if len(indices) and indices[-1] - indices[0] == len(indices) - 1 and np.all(np.diff(indices) == 1):
+            return values[indices[0]:indices[-1] + 1], True
+        return np.asarray(values[indices]), False
+
+    def _batch(self,
+               columns: List[Tuple[Optional[str], Union[np.ndarray, _ChunkedArray]]],
+               indices: np.ndarray,
+               dtype: Optional[torch.dtype]) -> Union[Tensor, Dict[str, Tensor]]:
+        """Gathers the rows of a batch and converts them to tensors, with a single copy per column."""
+        if dtype is None:
+            tensors = {}
+            for column, values in columns:
+                rows, is_view = self._take(values, indices)
+                tensors[column] = torch.from_numpy(np.array(rows, copy=is_view))
+            return tensors[None] if None in tensors else tensors
+
+        if len(columns) == 1 and columns[0][0] is None:
+            # array source: keep its shape
+            rows, _ = self._take(columns[0][1], indices)
+            batch = torch.empty(rows.shape, dtype=dtype)
+            batch.numpy()[...] = rows
+            return batch
+
+        batch = torch.empty((len(indices), len(columns)), dtype=dtype)
+        batch_values = batch.numpy()
+        for j, (_, values) in enumerate(columns):
+            rows, _ = self._take(values, indices)
+            batch_values[:, j] = rows
+        return batch
+
+    @staticmethod
+    def get_dataset_type() -> DatasetTypes:
+        return DatasetTypes.TABULAR
@@ -174,6 +174,11 @@ class TorchDataManager(object):
             Data loader for given dataset
         """
 
+        # Datasets that build whole batches (eg: `ColumnarTabularDataset`) provide their collate function
+        source = dataset.dataset if isinstance(dataset, Subset) else dataset
+        if 'collate_fn' not in kwargs and callable(getattr(source, 'collate_batch', None)):
+            kwargs = {**kwargs, 'collate_fn': source.collate_batch}
+
         try:
             # Create a loader from self._dataset to extract inputs and target values
             # by iterating over samples
@@ -0,0 +1,605 @@
+# This file is originally part of Fed-BioMed
+# SPDX-License-Identifier: Apache-2.0
+
+"""Pluggable storage backend for the component databases.
+
+Component databases (datasets, data loading plans, training plans, secagg elements, ...)
+are accessed through a TinyDB-like interface: `db.table(name)` returns a table object
+supporting `search`, `get`, `insert`, `update`, `upsert`, `remove`, `all`, ... with
+conditions expressed as `tinydb.Query` instances.
+
+Two backends provide this interface:
+
+- `tinydb`: the historical single JSON file backend (`tinydb.TinyDB`)
+- `sqlite`: an SQLite file backend ([`SQLiteDatabase`][fedbiomed.common.db.SQLiteDatabase]),
+    where each document is stored as one row and frequently queried fields are indexed.
+
+**Typical use:**
+
+```python
+from fedbiomed.common.db import open_database
+
+db = open_database(environ['DB_PATH'])
+table = db.table(name='Datasets', cache_size=0)
+table.search(Query().tags.all(['#MNIST']))
+```
+"""
+
+import json
+import os
+import sqlite3
+import threading
+from typing import Any, Callable, Dict, Iterable, Iterator, List, Mapping, Optional, Set, Union
+
+from tinydb import TinyDB
+from tinydb.queries import QueryLike
+from tinydb.table import Document
+
+from fedbiomed.common.constants import DatabaseBackend, ErrorNumbers
+from fedbiomed.common.exceptions import FedbiomedDatabaseError
+from fedbiomed.common.logger import logger
+
+
+SQLITE_EXTENSIONS = ('.sqlite', '.sqlite3', '.db')
+"""File extensions handled by the SQLite backend"""
+
+INDEXED_FIELDS = ('tags', 'dataset_id', 'hash', 'training_plan_id', 'secagg_id')
+"""Document fields indexed by the SQLite backend"""
+
+_SQLITE_TIMEOUT = 30
+"""Seconds to wait for a lock held by another connection (eg: GUI and node process) before failing"""
+
+_MAX_SQL_VARIABLES = 500
+"""Maximum number of bound variables used in a single `IN (...)` clause"""
+
+
+def db_path_extension(backend: str) -> str:
+    """Returns the database file extension used for a storage backend.
+
+    Args:
+        backend: name of the backend, one of the values of `DatabaseBackend`
+
+    Returns:
+        The file extension (including the leading dot)
+
+    Raises:
+        FedbiomedDatabaseError: unknown backend
+    """
+    if backend == DatabaseBackend.TINYDB.value:
+        return '.json'
+    elif backend == DatabaseBackend.SQLITE.value:
+        return '.sqlite'
+
+    _msg = f"{ErrorNumbers.FB627.value}: unknown database backend '{backend}', " \
+        f"expected one of {DatabaseBackend.list()}"
+    logger.critical(_msg)
+    raise FedbiomedDatabaseError(_msg)
+
+
+def open_database(db_path: str) -> Union[TinyDB, 'SQLiteDatabase']:
+    """Opens a component database, choosing the backend from the file extension.
+
+    Args:
+        db_path: path to the database file. Files ending with one of `SQLITE_EXTENSIONS`
+            use the SQLite backend, other files use the TinyDB JSON backend.
+
+    Returns:
+        A database object exposing the `table()` method.
+    """
+    if os.path.splitext(db_path)[1].lower() in SQLITE_EXTENSIONS:
+        return SQLiteDatabase(db_path)
+    return TinyDB(db_path)
+
+
+def _encode(value: Any) -> str:
+    """Encodes a scalar value for storage in the index, keeping type information."""
+    return json.dumps(value, sort_keys=True)
+
+
+def _index_entries(document: Mapping) -> List[tuple]:
+    """Computes the (field, encoded value) index entries of a document.
+
+    Scalar fields produce one entry, list fields produce one entry per scalar element.
+    """
+    entries = []
+    for field in INDEXED_FIELDS:
+        if field not in document:
+            continue
+        value = document[field]
+        values = value if isinstance(value, (list, tuple)) else [value]
+        for v in values:
+            if v is None or isinstance(v, (str, int, float, bool)):
+                entries.append((field, _encode(v)))
+    return entries
+
+
+def _is_scalar(value: Any) -> bool:
+    return value is None or isinstance(value, (str, int, float, bool))
+
+
+class SQLiteDatabase:
+    """TinyDB-like database stored in an SQLite file.
+
+    One connection is opened per object and shared between threads (guarded by a lock).
+    Concurrent processes (eg: node and GUI) are synchronized by SQLite file locking:
+    each write operation runs in its own immediate transaction, so a read-modify-write
+    such as `update` or `upsert` cannot interleave with a write from another process.
+    """
+
+    def __init__(self, db_path: str):
+        """Constructor of the class.
+
+        Args:
+            db_path: path to the SQLite database file, created if it does not exist.
+
+        Raises:
+            FedbiomedDatabaseError: cannot open or initialize the database
+        """
+        self._path = db_path
+        self._lock = threading.RLock()
+        self._tables = {}
+
+        try:
+            self._conn = sqlite3.connect(db_path,
+                                         timeout=_SQLITE_TIMEOUT,
+                                         isolation_level=None,
+                                         check_same_thread=False)
+            self._conn.execute('PRAGMA journal_mode=WAL')
+            self._conn.execute(f'PRAGMA busy_timeout={_SQLITE_TIMEOUT * 1000}')
+            self._conn.executescript(
+                'CREATE TABLE IF NOT EXISTS documents ('
+                '  table_name TEXT NOT NULL,'
+                '  doc_id INTEGER NOT NULL,'
+                '  data TEXT NOT NULL,'
+                '  PRIMARY KEY (table_name, doc_id));'
+                'CREATE TABLE IF NOT EXISTS doc_index ('
+                '  table_name TEXT NOT NULL,'
+                '  doc_id INTEGER NOT NULL,'
+                '  field TEXT NOT NULL,'
+                '  value TEXT NOT NULL);'
+                'CREATE INDEX IF NOT EXISTS doc_index_lookup ON doc_index (table_name, field, value);'
+                'CREATE INDEX IF NOT EXISTS doc_index_doc ON doc_index (table_name, doc_id);'
+            )
+        except sqlite3.Error as e:
+            _msg = f"{ErrorNumbers.FB627.value}: cannot open SQLite database {db_path}: {e}"
+            logger.critical(_msg)
+            raise FedbiomedDatabaseError(_msg)
+
+    def table(self, name: str, **kwargs) -> 'SQLiteTable':
+        """Gets a table of the database.
+
+        Args:
+            name: name of the table
+            **kwargs: accepted for compatibility with `TinyDB.table` (eg: `cache_size`) and ignored,
+                as the SQLite backend never caches documents.
+
+        Returns:
+            The table object
+        """
+        if name not in self._tables:
+            self._tables[name] = SQLiteTable(self, name)
+        return self._tables[name]
+
+    def tables(self) -> Set[str]:
+        """Gets the names of all non-empty tables in the database."""
+        rows = self._read('SELECT DISTINCT table_name FROM documents')
+        return {row[0] for row in rows}
+
+    def drop_table(self, name: str) -> None:
+        """Removes a table and all its documents from the database."""
+        self.table(name).truncate()
+        self._tables.pop(name, None)
+
+    def drop_tables(self) -> None:
+        """Removes all tables from the database."""
+        for name in self.tables():
+            self.drop_table(name)
+
+    def close(self):
+        """Closes the connection to the database."""
+        with self._lock:
+            self._conn.close()
+
+    def _read(self, sql: str, params: Iterable = ()) -> List[tuple]:
+        """Executes a read-only SQL statement and returns all rows."""
+        with self._lock:
+            try:
+                return self._conn.execute(sql, tuple(params)).fetchall()
+            except sqlite3.Error as e:
+                _msg = f"{ErrorNumbers.FB627.value}: failed reading database {self._path}: {e}"
+                logger.error(_msg)
+                raise FedbiomedDatabaseError(_msg)
+
+    def _write(self, func: Callable[[sqlite3.Connection], Any]) -> Any:
+        """Runs `func(connection)` inside an immediate (write locked) transaction."""
+        with self._lock:
+            try:
+                self._conn.execute('BEGIN IMMEDIATE')
+                try:
+                    result = func(self._conn)
+                except BaseException:
+                    self._conn.execute('ROLLBACK')
+                    raise
+                self._conn.execute('COMMIT')
+            except sqlite3.Error as e:
+                _msg = f"{ErrorNumbers.FB627.value}: failed writing database {self._path}: {e}"
+                logger.error(_msg)
+                raise FedbiomedDatabaseError(_msg)
+        return result
+
+
+class SQLiteTable:
+    """Table of an [`SQLiteDatabase`][fedbiomed.common.db.SQLiteDatabase] with a `tinydb.table.Table` interface.
+
+    Conditions are `tinydb.Query` instances. When a condition tests an indexed field (equality,
+    `one_of`, `all`, `any`, possibly combined with `&` and `|`), candidate documents are first
+    selected through the index. The condition is then always evaluated on the candidates, so
+    results are identical to the ones of the TinyDB backend.
+    """
+
+    def __init__(self, database: SQLiteDatabase, name: str):
+        """Constructor of the class.
+
+        Args:
+            database: database containing this table
+            name: name of the table
+        """
+        self._database = database
+        self._name = name
+
+    @property
+    def name(self) -> str:
+        """Name of the table (property kept for compatibility with TinyDB tables)"""
+        return self._name
+
+    def __repr__(self) -> str:
+        return f"<SQLiteTable name='{self._name}', db='{self._database._path}'>"
+
+    def __len__(self) -> int:
+        return self.count()
+
+    def __iter__(self) -> Iterator[Document]:
+        return iter(self.all())
+
+    # --- read operations
+
+    def all(self) -> List[Document]:
+        """Gets all documents of the table."""
+        return self._fetch(None)
+
+    def search(self, cond: QueryLike) -> List[Document]:
+        """Searches documents matching a condition.
+
+        Args:
+            cond: the condition to check
+
+        Returns:
+            List of matching documents
+        """
+        return [doc for doc in self._fetch(self._candidates(cond)) if cond(doc)]
+
+    def get(self, cond: Optional[QueryLike] = None, doc_id: Optional[int] = None) -> Optional[Document]:
+        """Gets exactly one document, by condition or by document ID.
+
+        Args:
+            cond: the condition to check
+            doc_id: the document's ID
+
+        Returns:
+            The first matching document, or None if no document matches
+        """
+        if doc_id is not None:
+            docs = self._fetch({doc_id})
+            return docs[0] if docs else None
+        if cond is None:
+            raise RuntimeError('You have to pass either cond or doc_id')
+
+        for doc in self._fetch(self._candidates(cond)):
+            if cond(doc):
+                return doc
+        return None
+
+    def contains(self, cond: Optional[QueryLike] = None, doc_id: Optional[int] = None) -> bool:
+        """Checks whether the table contains a document matching a condition or a document ID."""
+        return self.get(cond=cond, doc_id=doc_id) is not None
+
+    def count(self, cond: Optional[QueryLike] = None) -> int:
+        """Counts the documents matching a condition, or all documents if no condition is given."""
+        if cond is None:
+            rows = self._database._read('SELECT COUNT(*) FROM documents WHERE table_name = ?', (self._name,))
+            return rows[0][0]
+        return len(self.search(cond))
+
+    # --- write operations
+
+    def insert(self, document: Mapping) -> int:
+        """Inserts a new document.
+
+        Args:
+            document: the document to insert
+
+        Returns:
+            The ID of the inserted document
+        """
+        return self.insert_multiple([document])[0]
+
+    def insert_multiple(self, documents: Iterable[Mapping]) -> List[int]:
+        """Inserts several documents in a single transaction.
+
+        Args:
+            documents: the documents to insert
+
+        Returns:
+            The IDs of the inserted documents
+
+        Raises:
+            ValueError: a document is not a mapping, or its `doc_id` already exists
+        """
+        documents = list(documents)
+        for document in documents:
+            if not isinstance(document, Mapping):
+                raise ValueError('Document is not a Mapping')
+
+        def _insert(conn: sqlite3.Connection) -> List[int]:
+            next_id = self._next_id(conn)
+            doc_ids = []
+            for document in documents:
+                if isinstance(document, Document):
+                    doc_id = document.doc_id
+                    if conn.execute('SELECT 1 FROM documents WHERE table_name = ? AND doc_id = ?',
+                                    (self._name, doc_id)).fetchone():
+                        raise ValueError(f'Document with ID {doc_id} already exists')
+                else:
+                    doc_id = next_id
+                next_id = max(next_id, doc_id + 1)
+                self._store(conn, doc_id, dict(document))
+                doc_ids.append(doc_id)
+            return doc_ids
+
+        return self._database._write(_insert)
+
+    def update(self,
+               fields: Union[Mapping, Callable[[Dict], None]],
+               cond: Optional[QueryLike] = None,
+               doc_ids: Optional[Iterable[int]] = None) -> List[int]:
+        """Updates documents matching a condition, or given by their IDs, or all documents.
+
+        Args:
+            fields: the fields to update, or a function modifying the document in place
+            cond: which documents to update
+            doc_ids: IDs of the documents to update
+
+        Returns:
+            The IDs of the updated documents
+        """
+        def _update(conn: sqlite3.Connection) -> List[int]:
+            if doc_ids is not None:
+                docs = self._fetch(set(doc_ids), conn)
+            elif cond is not None:
+                docs = [d for d in self._fetch(self._candidates(cond, conn), conn) if cond(d)]
+            else:
+                docs = self._fetch(None, conn)
+
+            updated = []
+            for doc in docs:
+                if callable(fields):
+                    fields(doc)
+                else:
+                    doc.update(fields)
+                self._store(conn, doc.doc_id, dict(doc), replace=True)
+                updated.append(doc.doc_id)
+            return updated
+
+        return self._database._write(_update)
+
+    def upsert(self, document: Mapping, cond: Optional[QueryLike] = None) -> List[int]:
+        """Updates documents matching the condition if any, otherwise inserts the document.
+
+        Args:
+            document: the document to insert, or the fields to update
+            cond: which documents to update
+
+        Returns:
+            The IDs of the updated documents, or a list with the ID of the inserted document
+        """
+        if isinstance(document, Document) and hasattr(document, 'doc_id'):
+            doc_ids = [document.doc_id]
+        else:
+            doc_ids = None
+        if doc_ids is None and cond is None:
+            raise ValueError("If you don't specify a search query, you must specify a doc_id. "
+                             "Hint: use a table.Document object.")
+
+        def _upsert(conn: sqlite3.Connection) -> List[int]:
+            if doc_ids is not None:
+                docs = self._fetch(set(doc_ids), conn)
+            else:
+                docs = [d for d in self._fetch(self._candidates(cond, conn), conn) if cond(d)]
+
+            if not docs:
+                doc_id = doc_ids[0] if doc_ids is not None else self._next_id(conn)
+                self._store(conn, doc_id, dict(document))
+                return [doc_id]
+
+            updated = []
+            for doc in docs:
+                doc.update(document)
+                self._store(conn, doc.doc_id, dict(doc), replace=True)
+                updated.append(doc.doc_id)
+            return updated
+
+        return self._database._write(_upsert)
+
+    def remove(self, cond: Optional[QueryLike] = None, doc_ids: Optional[Iterable[int]] = None) -> List[int]:
+        """Removes documents matching a condition or given by their IDs.
+
+        Args:
+            cond: the condition to check
+            doc_ids: IDs of the documents to remove
+
+        Returns:
+            The IDs of the removed documents
+        """
+        if cond is None and doc_ids is None:
+            raise RuntimeError('Use truncate() to remove all documents')
+
+        def _remove(conn: sqlite3.Connection) -> List[int]:
+            if doc_ids is not None:
+                removed = [d.doc_id for d in self._fetch(set(doc_ids), conn)]
+            else:
+                removed = [d.doc_id for d in self._fetch(self._candidates(cond, conn), conn) if cond(d)]
+            for chunk in self._chunks(removed):
+                marks = ','.join('?' * len(chunk))
+                conn.execute(f'DELETE FROM documents WHERE table_name = ? AND doc_id IN ({marks})',
+                             (self._name, *chunk))
+                conn.execute(f'DELETE FROM doc_index WHERE table_name = ? AND doc_id IN ({marks})',
+                             (self._name, *chunk))
+            return removed
+
+        return self._database._write(_remove)
+
+    def truncate(self) -> None:
+        """Removes all documents from the table."""
+        def _truncate(conn: sqlite3.Connection):
+            conn.execute('DELETE FROM documents WHERE table_name = ?', (self._name,))
+            conn.execute('DELETE FROM doc_index WHERE table_name = ?', (self._name,))
+
+        self._database._write(_truncate)
+
+    def clear_cache(self) -> None:
+        """No-op, kept for compatibility with TinyDB tables (the SQLite backend has no cache)."""
+
+    # --- internals
+
+    @staticmethod
+    def _chunks(values: List) -> Iterator[List]:
+        for i in range(0, len(values), _MAX_SQL_VARIABLES):
+            yield values[i:i + _MAX_SQL_VARIABLES]
+
+    def _next_id(self, conn: sqlite3.Connection) -> int:
+        row = conn.execute('SELECT MAX(doc_id) FROM documents WHERE table_name = ?', (self._name,)).fetchone()
+        return (row[0] or 0) + 1
+
+    def _store(self, conn: sqlite3.Connection, doc_id: int, document: dict, replace: bool = False):
+        """Writes a document and its index entries (to be called within a write transaction)."""
+        if replace:
+            conn.execute('DELETE FROM doc_index WHERE table_name = ? AND doc_id = ?', (self._name, doc_id))
+        conn.execute('INSERT OR REPLACE INTO documents (table_name, doc_id, data) VALUES (?, ?, ?)',
+                     (self._name, doc_id, json.dumps(document)))
+        conn.executemany('INSERT INTO doc_index (table_name, doc_id, field, value) VALUES (?, ?, ?, ?)',
+                         [(self._name, doc_id, field, value) for field, value in _index_entries(document)])
+
+    def _query(self, sql: str, params: tuple, conn: Optional[sqlite3.Connection]) -> List[tuple]:
+        if conn is None:
+            return self._database._read(sql, params)
+        return conn.execute(sql, params).fetchall()
+
+    def _fetch(self,
+               doc_ids: Optional[Set[int]],
+               conn: Optional[sqlite3.Connection] = None) -> List[Document]:
+        """Loads documents by ID (all documents if `doc_ids` is None), in ID order."""
+        if doc_ids is None:
+            rows = self._query('SELECT doc_id, data FROM documents WHERE table_name = ? ORDER BY doc_id',
+                               (self._name,), conn)
+        else:
+            rows = []
+            for chunk in self._chunks(sorted(doc_ids)):
+                marks = ','.join('?' * len(chunk))
+                rows.extend(self._query(
+                    f'SELECT doc_id, data FROM documents WHERE table_name = ? AND doc_id IN ({marks})',
+                    (self._name, *chunk), conn))
+            rows.sort(key=lambda r: r[0])
+        return [Document(json.loads(data), doc_id=doc_id) for doc_id, data in rows]
+
+    def _lookup(self, field: str, values: Iterable[Any], conn: Optional[sqlite3.Connection]) -> Set[int]:
+        """Gets IDs of documents having an index entry of `field` equal to one of `values`."""
+        encoded = [_encode(v) for v in values]
+        found = set()
+        for chunk in self._chunks(encoded):
+            marks = ','.join('?' * len(chunk))
+            rows = self._query(
+                f'SELECT doc_id FROM doc_index WHERE table_name = ? AND field = ? AND value IN ({marks})',
+                (self._name, field, *chunk), conn)
+            found.update(r[0] for r in rows)
+        return found
+
+    def _candidates(self, cond: QueryLike, conn: Optional[sqlite3.Connection] = None) -> Optional[Set[int]]:
+        """Uses the index to compute a superset of the IDs of the documents matching `cond`.
+
+        Returns:
+            A set of document IDs, or None if the index cannot be used for this condition
+                (all documents are then candidates).
+        """
+        return self._plan(getattr(cond, '_hash', None), conn)
+
+    def _plan(self, hashval: Any, conn: Optional[sqlite3.Connection]) -> Optional[Set[int]]:
+        """Recursively plans an index lookup from the hash value of a `tinydb.Query`."""
+        if not isinstance(hashval, tuple) or not hashval:
+            return None
+        op = hashval[0]
+
+        if op in ('and', 'or') and len(hashval) == 2:
+            plans = [self._plan(h, conn) for h in hashval[1]]
+            if op == 'and':
+                plans = [p for p in plans if p is not None]
+                return set.intersection(*plans) if plans else None
+            if any(p is None for p in plans):
+                return None
+            return set.union(*plans) if plans else set()
+
+        if len(hashval) != 3 or not isinstance(hashval[1], tuple) or len(hashval[1]) != 1:
+            return None
+        field, rhs = hashval[1][0], hashval[2]
+        if field not in INDEXED_FIELDS:
+            return None
+
+        if op == '==' and _is_scalar(rhs):
+            return self._lookup(field, [rhs], conn)
+        if op in ('one_of', 'any') and isinstance(rhs, tuple) and all(_is_scalar(v) for v in rhs):
+            return self._lookup(field, rhs, conn)
+        if op == 'all' and isinstance(rhs, tuple) and rhs and all(_is_scalar(v) for v in rhs):
+            return set.intersection(*[self._lookup(field, [v], conn) for v in rhs])
+        return None
+
+
+def migrate_tinydb_to_sqlite(json_path: str, sqlite_path: str) -> Dict[str, int]:
+    """Copies all tables of a TinyDB JSON database to a new SQLite database.
+
+    Document IDs are preserved. The JSON database is left untouched.
+
+    Args:
+        json_path: path to the existing TinyDB JSON database
+        sqlite_path: path of the SQLite database to create
+
+    Returns:
+        Number of migrated documents for each table
+
+    Raises:
+        FedbiomedDatabaseError: JSON database cannot be read, or SQLite database already exists
+    """
+    if os.path.exists(sqlite_path):
+        _msg = f"{ErrorNumbers.FB627.value}: cannot migrate database, destination {sqlite_path} already exists"
+        logger.error(_msg)
+        raise FedbiomedDatabaseError(_msg)
+
+    try:
+        with open(json_path, 'r') as f:
+            content = f.read()
+        tables = json.loads(content) if content.strip() else {}
+    except (OSError, ValueError) as e:
+        _msg = f"{ErrorNumbers.FB627.value}: cannot read TinyDB database {json_path}: {e}"
+        logger.error(_msg)
+        raise FedbiomedDatabaseError(_msg)
+
+    database = SQLiteDatabase(sqlite_path)
+    migrated = {}
+    try:
+        for name, documents in tables.items():
+            docs = [Document(doc, doc_id=int(doc_id)) for doc_id, doc in documents.items()]
+            database.table(name).insert_multiple(docs)
+            migrated[name] = len(docs)
+    finally:
+        database.close()
+
+    logger.info(f"Migrated database {json_path} to {sqlite_path}: {migrated}")
+    return migrated
@@ -22,7 +22,8 @@ Nodes Global Variables:
 - NODE_ID                           : id of the node
 - ID                                : equals to node id
 - MESSAGES_QUEUE_DIR                : Path for queues
-- DB_PATH                           : TinyDB database path where datasets/training_plans/loading plans are saved
+- DB_BACKEND                        : storage backend of the node database (`tinydb` or `sqlite`)
+- DB_PATH                           : database path where datasets/training_plans/loading plans are saved
 - DEFAULT_TRAINING_PLANS_DIR        : Path of directory for storing default training plans
 - TRAINING_PLANS_DIR                 : Path of directory for storing registered training plans
 - TRAINING_PLAN_APPROVAL            : True if the node enables training plan approval
@@ -50,7 +51,7 @@ import configparser
 import os
 
 from abc import abstractmethod
-from typing import Any, Tuple, Union
+from typing import Any, Dict, Tuple, Union
 
 from fedbiomed.common.constants import ErrorNumbers, VAR_FOLDER_NAME, MPSPDZ_certificate_prefix, \
     CACHE_FOLDER_NAME, CONFIG_FOLDER_NAME, TMP_FOLDER_NAME
@@ -120,6 +121,24 @@ class Environ(metaclass=SingletonABCMeta):
         self._values[key] = value
         return value
 
+    def snapshot(self) -> Dict[str, Any]:
+        """Copies the environment variables, to restore them later with `restore`
+
+        Returns:
+            A copy of the environment variables
+        """
+        return dict(self._values)
+
+    def restore(self, values: Dict[str, Any]):
+        """Restores environment variables copied with `snapshot`
+
+        Used to switch between the components hosted by a process, e.g. the virtual nodes of a simulation.
+
+        Args:
+            values: environment variables returned by `snapshot`
+        """
+        self._values = dict(values)
+
     @abstractmethod
     def _check_config_version(self):
         """Abstract method for checking if config version is compatible and setting config version"""
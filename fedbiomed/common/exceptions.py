@@ -38,6 +38,13 @@ class FedbiomedDataLoadingPlanValueError(FedbiomedError):
     pass
 
 
+class FedbiomedDatabaseError(FedbiomedError):
+    """
+    Exceptions specific to the component database backends.
+    """
+    pass
+
+
 class FedbiomedDatasetError(FedbiomedError):
     """
     Generic exception for a Dataset class.
@@ -195,6 +202,13 @@ class FedbiomedSilentTerminationError(FedbiomedError):
         return []
 
 
+class FedbiomedSimulationError(FedbiomedError):
+    """
+    Error in the in-process simulation of nodes
+    """
+    pass
+
+
 class FedbiomedSkLearnDataManagerError(FedbiomedError):
     """
     Exceptions specific for the class SkLearnDataset.
@@ -0,0 +1,124 @@
+# This file is originally part of Fed-BioMed
+# SPDX-License-Identifier: Apache-2.0
+
+"""Recording of the time and resources spent in the phases of a task, as named spans."""
+
+import os
+import threading
+import time
+from contextlib import contextmanager
+from typing import Dict, Iterator, List, Optional, Union
+
+
+__all__ = [
+    "RSS_SAMPLING_INTERVAL",
+    "SpanRecorder",
+    "current_rss",
+]
+
+
+RSS_SAMPLING_INTERVAL = 0.01
+"""Seconds between two measures of the resident set size while a span is open"""
+
+_STATM = '/proc/self/statm'
+
+
+def current_rss() -> Optional[int]:
+    """Returns the current resident set size of the process.
+
+    Returns:
+        Resident set size in bytes, or None if it cannot be measured on this platform (only Linux is supported)
+    """
+    try:
+        with open(_STATM, 'rb') as file:
+            return int(file.read().split()[1]) * os.sysconf('SC_PAGE_SIZE')
+    except (OSError, ValueError, IndexError, AttributeError):
+        return None
+
+
+def _sample_rss(stop: threading.Event, peak: List[int]):
+    """Keeps the maximum resident set size in `peak[0]`, until `stop` is set."""
+    while not stop.wait(RSS_SAMPLING_INTERVAL):
+        rss = current_rss()
+        if rss is not None and rss > peak[0]:
+            peak[0] = rss
+
+
+class SpanRecorder:
+    """Records the wall time, CPU time, peak memory and bytes transferred of named spans.
+
+    Spans of the same name are accumulated: times and bytes are added, and the peak memory is the maximum.
+    The peak resident set size of a span is the maximum resident set size of the process measured while the
+    span is open, sampled every `RSS_SAMPLING_INTERVAL` seconds and at the start and end of the span: memory
+    allocated and freed between two samples is not seen.
+
+    **Typical use:**
+
+    ```python
+    spans = SpanRecorder()
+    with spans.span('download'):
+        path = download(url)
+        spans.add_bytes('download', os.path.getsize(path))
+    with spans.span('training'):
+        train()
+
+    spans.spans()  # {'download': {'wall_time': ..., 'cpu_time': ..., 'peak_rss': ..., 'bytes': ...}, ...}
+    ```
+    """
+
+    def __init__(self):
+        """Constructor of the class."""
+        self._spans: Dict[str, Dict[str, Union[int, float, None]]] = {}
+
+    def _get(self, name: str) -> Dict[str, Union[int, float, None]]:
+        if name not in self._spans:
+            self._spans[name] = {'wall_time': 0., 'cpu_time': 0., 'peak_rss': None, 'bytes': 0}
+        return self._spans[name]
+
+    @contextmanager
+    def span(self, name: str) -> Iterator[None]:
+        """Context recording the time and resources spent in a span.
+
+        The span is recorded even if the block raises an exception.
+
+        Args:
+            name: name of the span
+        """
+        rss = current_rss()
+        sampler = None
+        if rss is not None:
+            peak = [rss]
+            stop = threading.Event()
+            sampler = threading.Thread(target=_sample_rss, args=(stop, peak), name='span-rss-sampler', daemon=True)
+            sampler.start()
+
+        wall_start = time.perf_counter()
+        cpu_start = time.process_time()
+        try:
+            yield
+        finally:
+            span = self._get(name)
+            span['wall_time'] += time.perf_counter() - wall_start
+            span['cpu_time'] += time.process_time() - cpu_start
+            if sampler is not None:
+                stop.set()
+                sampler.join()
+                span['peak_rss'] = max(span['peak_rss'] or 0, peak[0], current_rss() or 0)
+
+    def add_bytes(self, name: str, num_bytes: int):
+        """Adds bytes transferred in a span.
+
+        Args:
+            name: name of the span
+            num_bytes: number of bytes sent or received
+        """
+        self._get(name)['bytes'] += num_bytes
+
+    def spans(self) -> Dict[str, Dict[str, Union[int, float, None]]]:
+        """Gets the recorded spans.
+
+        Returns:
+            Measures of each span, indexed by span name in the order the spans were first recorded: `wall_time`
+                and `cpu_time` in seconds, `peak_rss` and `bytes` in bytes
+        """
+        return {name: dict(span) for name, span in self._spans.items()}
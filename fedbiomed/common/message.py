@@ -613,6 +613,9 @@ class TrainReply(Message, RequiresProtocolVersion):
         timing: Timing statistics
         msg: Custom message
         command: Reply command string
+        round: Round of the training request, None if unknown
+        spans: Time and resources spent in each phase of the round, as recorded by a
+            [`SpanRecorder`][fedbiomed.common.instrumentation.SpanRecorder], None if unknown
 
     Raises:
         FedbiomedMessageError: triggered if message's fields validation failed
@@ -627,6 +630,8 @@ class TrainReply(Message, RequiresProtocolVersion):
     sample_size: (int, type(None))
     msg: str
     command: str
+    round: (int, type(None)) = None
+    spans: (dict, type(None)) = None
 
 
 class MessageFactory:
@@ -6,13 +6,12 @@ Provide test metrics, both MetricTypes to use in TrainingArgs but also calculati
 """
 
 
+from abc import ABC, abstractmethod
 from copy import copy
 import numpy as np
-from typing import Any, Dict, List, Tuple, Union
-
-from sklearn import metrics
-from sklearn.preprocessing import OneHotEncoder
+from typing import Any, Dict, List, Set, Tuple, Union
 
+# sklearn is imported by the metric functions, so that the metric types can be used without loading it
 from fedbiomed.common.constants import _BaseEnum, ErrorNumbers
 from fedbiomed.common.logger import logger
 from fedbiomed.common.exceptions import FedbiomedMetricError
@@ -133,6 +132,7 @@ class Metrics(object):
 
         try:
             y_true, y_pred, _, _ = Metrics._configure_multiclass_parameters(y_true, y_pred, kwargs, 'ACCURACY')
+            from sklearn import metrics
             return metrics.accuracy_score(y_true, y_pred, **kwargs)
         except Exception as e:
             msg = ErrorNumbers.FB611.value + " Exception raised from SKLEARN metrics: " + str(e)
@@ -166,6 +166,7 @@ class Metrics(object):
         kwargs.pop("pos_label", None)
 
         try:
+            from sklearn import metrics
             return metrics.precision_score(y_true, y_pred, average=average, pos_label=pos_label, **kwargs)
         except Exception as e:
             raise FedbiomedMetricError(f"{ErrorNumbers.FB611.value}: Error during calculation of `PRECISION` "
@@ -197,6 +198,7 @@ class Metrics(object):
         kwargs.pop("pos_label", None)
 
         try:
+            from sklearn import metrics
             return metrics.recall_score(y_true, y_pred, average=average, pos_label=pos_label, **kwargs)
         except Exception as e:
             raise FedbiomedMetricError(f"{ErrorNumbers.FB611.value}: Error during calculation of `RECALL` "
@@ -232,6 +234,7 @@ class Metrics(object):
         kwargs.pop("pos_label", None)
 
         try:
+            from sklearn import metrics
             return metrics.f1_score(y_true, y_pred, average=average, pos_label=pos_label, **kwargs)
         except Exception as e:
             raise FedbiomedMetricError(f"{ErrorNumbers.FB611.value}: Error during calculation of `F1_SCORE` {str(e)}")
@@ -265,6 +268,7 @@ class Metrics(object):
         kwargs.pop('multioutput', None)
 
         try:
+            from sklearn import metrics
             return metrics.mean_squared_error(y_true, y_pred, multioutput=multi_output, **kwargs)
         except Exception as e:
             raise FedbiomedMetricError(f"{ErrorNumbers.FB611.value}: Error during calculation of `MEAN_SQUARED_ERROR`"
@@ -298,6 +302,7 @@ class Metrics(object):
         kwargs.pop('multioutput', None)
 
         try:
+            from sklearn import metrics
             return metrics.mean_absolute_error(y_true, y_pred, multioutput=multi_output, **kwargs)
         except Exception as e:
             raise FedbiomedMetricError(f"{ErrorNumbers.FB611.value}: Error during calculation of `MEAN_ABSOLUTE_ERROR`"
@@ -333,6 +338,7 @@ class Metrics(object):
         kwargs.pop('multioutput', None)
 
         try:
+            from sklearn import metrics
             return metrics.explained_variance_score(y_true, y_pred, multioutput=multi_output, **kwargs)
         except Exception as e:
             raise FedbiomedMetricError(f"{ErrorNumbers.FB611.value}: Error during calculation of `EXPLAINED_VARIANCE`"
@@ -486,6 +492,7 @@ class Metrics(object):
             logger.info(f'Actual/True values (y_true) has more than two levels, using multiclass `{average}` '
                         f'calculation for the metric {metric}')
 
+            from sklearn.preprocessing import OneHotEncoder
             encoder = OneHotEncoder()
             y_true = np.expand_dims(y_true, axis=1)
             y_pred = np.expand_dims(y_pred, axis=1)
@@ -507,3 +514,434 @@ class Metrics(object):
                 pos_label = y_true_copy[0]
 
         return y_true, y_pred, average, pos_label
+
+
+class MetricAccumulator(ABC):
+    """Streaming accumulator of a validation metric.
+
+    Accumulators are updated batch by batch with vectorized operations on
+    sufficient statistics (confusion matrix, moments), and finalized once.
+    The result is the same as evaluating the metric on the whole dataset,
+    unlike an average of per-batch metric values.
+
+    Use [`MetricAccumulator.create`][fedbiomed.common.metrics.MetricAccumulator.create]
+    to get the accumulator of a metric.
+    """
+
+    def __init__(self, metric: MetricTypes, **kwargs: dict):
+        """Constructor of the accumulator.
+
+        Args:
+            metric: The metric to compute
+            **kwargs: The arguments specifics to each type of metrics.
+        """
+        self._metric = metric
+        self._kwargs = kwargs
+        self._num_samples = 0
+
+    @property
+    def metric(self) -> MetricTypes:
+        """Metric computed by the accumulator."""
+        return self._metric
+
+    @property
+    def num_samples(self) -> int:
+        """Number of samples accumulated so far."""
+        return self._num_samples
+
+    @staticmethod
+    def create(metric: MetricTypes, **kwargs: dict) -> 'MetricAccumulator':
+        """Gets an accumulator for a metric and its arguments.
+
+        Arguments that cannot be computed from sufficient statistics (eg: `sample_weight`)
+        fall back to an accumulator that concatenates the labels, and evaluates the metric
+        once with [`Metrics.evaluate`][fedbiomed.common.metrics.Metrics.evaluate].
+
+        Args:
+            metric: An instance of MetricTypes to chose metric that will be used for evaluation
+            **kwargs: The arguments specifics to each type of metrics.
+
+        Returns:
+            An accumulator for the metric
+
+        Raises:
+            FedbiomedMetricError: invalid metric
+        """
+        if not isinstance(metric, MetricTypes):
+            raise FedbiomedMetricError(f"{ErrorNumbers.FB611.value}: Metric should instance of `MetricTypes`")
+
+        if metric.metric_category() is _MetricCategory.CLASSIFICATION_LABELS:
+            accumulator = ConfusionMatrixAccumulator
+        else:
+            accumulator = MomentsAccumulator
+
+        if set(kwargs) - accumulator.supported_arguments(metric):
+            accumulator = ConcatenatingAccumulator
+
+        return accumulator(metric, **kwargs)
+
+    @staticmethod
+    def supported_arguments(metric: MetricTypes) -> Set[str]:
+        """Gets the metric arguments supported by the accumulator.
+
+        Args:
+            metric: The metric to compute
+        """
+        return set()
+
+    def update(self, y_true: Union[np.ndarray, list], y_pred: Union[np.ndarray, list]):
+        """Accumulates a batch of true and predicted values.
+
+        Args:
+            y_true: True values of the batch
+            y_pred: Predicted values of the batch
+
+        Raises:
+            FedbiomedMetricError: invalid or inconsistent values
+        """
+        y_true, y_pred = self._prepare(y_true, y_pred)
+        self._num_samples += len(y_true)
+        self._update(y_true, y_pred)
+
+    @abstractmethod
+    def _update(self, y_true: np.ndarray, y_pred: np.ndarray):
+        """Accumulates a batch of checked true and predicted values."""
+
+    @abstractmethod
+    def result(self) -> Union[float, np.ndarray]:
+        """Computes the metric on the values accumulated so far.
+
+        Returns:
+            Result of the metric
+
+        Raises:
+            FedbiomedMetricError: no value accumulated, or the metric cannot be computed
+        """
+
+    def _check_not_empty(self):
+        if not self._num_samples:
+            raise FedbiomedMetricError(f"{ErrorNumbers.FB611.value}: Can not compute metric `{self._metric.name}` "
+                                       f"without any sample")
+
+    def _prepare(self, y_true: Union[np.ndarray, list], y_pred: Union[np.ndarray, list]) \
+            -> Tuple[np.ndarray, np.ndarray]:
+        """Checks shapes of a batch, keeping the sample axis.
+
+        Arrays of shape `(samples, 1)` are flattened to `(samples, )`.
+        """
+        if not isinstance(y_true, (np.ndarray, list)):
+            raise FedbiomedMetricError(f"{ErrorNumbers.FB611.value}: The argument `y_true` should an instance "
+                                       f"of `np.ndarray`, but got {type(y_true)} ")
+        if not isinstance(y_pred, (np.ndarray, list)):
+            raise FedbiomedMetricError(f"{ErrorNumbers.FB611.value}: The argument `y_pred` should an instance "
+                                       f"of `np.ndarray`, but got {type(y_pred)} ")
+
+        y_true = np.asarray(y_true)
+        y_pred = np.asarray(y_pred)
+        if y_true.ndim == 0:
+            y_true = y_true.reshape((1,))
+        if y_pred.ndim == 0:
+            y_pred = y_pred.reshape((1,))
+
+        if len(y_pred) != len(y_true):
+            raise FedbiomedMetricError(f"{ErrorNumbers.FB611.value}: Predictions and true values should have"
+                                       f"equal number of samples, {len(y_true)}, {len(y_pred)}")
+
+        # Remove output axes of size 1, but never the sample axis
+        y_true = y_true.reshape((len(y_true), *[d for d in y_true.shape[1:] if d != 1]))
+        y_pred = y_pred.reshape((len(y_pred), *[d for d in y_pred.shape[1:] if d != 1]))
+
+        if y_pred.ndim > 2 or y_true.ndim > 2:
+            raise FedbiomedMetricError(f"{ErrorNumbers.FB611.value}: Predictions or true values are not in "
+                                       f"supported shape {y_pred.shape}, `{y_true.shape}`, should be 1D or 2D "
+                                       f"list/array. If it isa special case,  please consider creating a custom "
+                                       f"`testing_step` method in training plan")
+
+        return y_true, y_pred
+
+
+class ConfusionMatrixAccumulator(MetricAccumulator):
+    """Accumulates the confusion matrix of classification labels.
+
+    Accuracy, precision, recall and F1 score are computed from the matrix with
+    the same defaults as [`Metrics`][fedbiomed.common.metrics.Metrics]: `weighted`
+    average if there are more than two classes in true values, otherwise binary
+    metric for the `pos_label` class (first class in sorted order by default).
+    """
+
+    def __init__(self, metric: MetricTypes, **kwargs: dict):
+        super().__init__(metric, **kwargs)
+        # Rows are true labels, columns predicted labels
+        self._matrix = np.zeros((0, 0), dtype=np.int64)
+        # Labels are their own indexes as long as only non-negative integers are seen
+        self._identity = True
+        self._labels: List[Any] = []
+        self._index: Dict[Any, int] = {}
+        self._warned_regression = False
+
+    @staticmethod
+    def supported_arguments(metric: MetricTypes) -> Set[str]:
+        if metric is MetricTypes.ACCURACY:
+            return {'normalize'}
+        return {'average', 'pos_label', 'zero_division'}
+
+    def _prepare(self, y_true, y_pred) -> Tuple[np.ndarray, np.ndarray]:
+        """Converts predictions and true values to labels, see `Metrics._configure_y_true_pred_`"""
+        y_true, y_pred = super()._prepare(y_true, y_pred)
+        if not len(y_true):
+            return y_true.reshape(0), y_pred.reshape(0)
+
+        if Metrics._is_array_of_str(y_pred) != Metrics._is_array_of_str(y_true):
+            raise FedbiomedMetricError(f"{ErrorNumbers.FB611.value}: Predicted values and true values have "
+                                       f"different types `int` and `str`")
+        if Metrics._is_array_of_str(y_pred):
+            return y_true, y_pred
+
+        if y_pred.ndim == 1 and y_true.ndim == 1:
+            # If y_pred contains labels as integer, do not use threshold cut
+            if not np.array_equal(y_pred, np.round(y_pred)):
+                y_pred = (y_pred > 0.5).astype(np.int64)
+            if not np.array_equal(y_true, np.round(y_true)):
+                y_true = (y_true > 0.5).astype(np.int64)
+                if not self._warned_regression:
+                    self._warned_regression = True
+                    logger.warning(f"Target data seems to be a regression, metric {self._metric.name} might "
+                                   "not be appropriate")
+        elif y_pred.ndim == 1:
+            y_pred = (y_pred > 0.5).astype(np.int64)
+            y_true = np.argmax(y_true, axis=1)
+        elif y_true.ndim == 1:
+            y_pred = np.argmax(y_pred, axis=1)
+        else:
+            if y_pred.shape[1] != y_true.shape[1]:
+                raise FedbiomedMetricError(f"{ErrorNumbers.FB611.value}: Can not convert values to class labels, "
+                                           f"shape of predicted and true values do not match.")
+            y_pred = np.argmax(y_pred, axis=1)
+            y_true = np.argmax(y_true, axis=1)
+
+        return y_true, y_pred
+
+    def _encode(self, y: np.ndarray) -> np.ndarray:
+        """Gets indexes of labels in the confusion matrix, registering new labels"""
+        if y.dtype.kind == 'f' and np.array_equal(y, np.round(y)):
+            y = y.astype(np.int64)
+
+        if self._identity:
+            if y.dtype.kind in 'iub' and (not y.size or y.min() >= 0):
+                return y.astype(np.int64, copy=False)
+            # Switch to explicit label indexes
+            self._identity = False
+            self._labels = list(range(self._matrix.shape[0]))
+            self._index = {label: i for i, label in enumerate(self._labels)}
+
+        values, inverse = np.unique(y, return_inverse=True)
+        lookup = np.empty(len(values), dtype=np.int64)
+        for i, value in enumerate(values.tolist()):
+            if value not in self._index:
+                self._index[value] = len(self._labels)
+                self._labels.append(value)
+            lookup[i] = self._index[value]
+
+        return lookup[inverse]
+
+    def _update(self, y_true: np.ndarray, y_pred: np.ndarray):
+        if not len(y_true):
+            return
+
+        true_idx = self._encode(y_true)
+        pred_idx = self._encode(y_pred)
+        n_labels = max(self._matrix.shape[0], int(true_idx.max()) + 1, int(pred_idx.max()) + 1)
+        if not self._identity:
+            n_labels = max(n_labels, len(self._labels))
+
+        if n_labels > self._matrix.shape[0]:
+            grow = n_labels - self._matrix.shape[0]
+            self._matrix = np.pad(self._matrix, ((0, grow), (0, grow)))
+
+        self._matrix += np.bincount(true_idx * n_labels + pred_idx,
+                                    minlength=n_labels * n_labels).reshape(n_labels, n_labels)
+
+    @property
+    def confusion_matrix(self) -> Tuple[List[Any], np.ndarray]:
+        """Labels in sorted order, and the confusion matrix of the labels seen so far.
+
+        Rows of the matrix are true labels, columns are predicted labels.
+        """
+        if self._identity:
+            present = np.flatnonzero(self._matrix.sum(axis=0) + self._matrix.sum(axis=1))
+            return present.tolist(), self._matrix[np.ix_(present, present)]
+
+        order = sorted(range(len(self._labels)), key=lambda i: self._labels[i])
+        return [self._labels[i] for i in order], self._matrix[np.ix_(order, order)]
+
+    def result(self) -> Union[float, np.ndarray]:
+        self._check_not_empty()
+        labels, matrix = self.confusion_matrix
+        tp = np.diag(matrix).astype(float)
+
+        if self._metric is MetricTypes.ACCURACY:
+            correct = tp.sum()
+            return float(correct / matrix.sum()) if self._kwargs.get('normalize', True) else float(correct)
+
+        support = matrix.sum(axis=1).astype(float)
+        predicted = matrix.sum(axis=0).astype(float)
+        zero_division = self._kwargs.get('zero_division', 0)
+        zero_division = 0. if zero_division == 'warn' else float(zero_division)
+
+        if self._metric is MetricTypes.PRECISION:
+            numerator, denominator = tp, predicted
+        elif self._metric is MetricTypes.RECALL:
+            numerator, denominator = tp, support
+        else:
+            numerator, denominator = 2 * tp, support + predicted
+
+        # Same default averaging as `Metrics._configure_multiclass_parameters`
+        pos_label = self._kwargs.get('pos_label', None)
+        if np.count_nonzero(support) > 2:
+            average = self._kwargs.get('average', 'weighted')
+            logger.info(f'Actual/True values (y_true) has more than two levels, using multiclass `{average}` '
+                        f'calculation for the metric {self._metric.name}')
+        else:
+            average = self._kwargs.get('average', 'binary')
+            if pos_label is None:
+                pos_label = labels[int(np.flatnonzero(support)[0])]
+
+        if average == 'micro':
+            num, den = numerator.sum(), denominator.sum()
+            return float(num / den) if den else zero_division
+
+        with np.errstate(divide='ignore', invalid='ignore'):
+            scores = np.where(denominator > 0, numerator / np.where(denominator > 0, denominator, 1), zero_division)
+
+        if average == 'binary':
+            if pos_label not in labels:
+                if len(labels) > 1:
+                    raise FedbiomedMetricError(f"{ErrorNumbers.FB611.value}: pos_label={pos_label} is not a valid "
+                                               f"label. It should be one of {labels}")
+                return zero_division
+            return float(scores[labels.index(pos_label)])
+        elif average == 'macro':
+            return float(scores.mean())
+        elif average == 'weighted':
+            return float(np.average(scores, weights=support)) if support.sum() else zero_division
+        elif average is None:
+            return scores
+
+        raise FedbiomedMetricError(f"{ErrorNumbers.FB611.value}: Unsupported average `{average}` for metric "
+                                   f"`{self._metric.name}`")
+
+
+class MomentsAccumulator(MetricAccumulator):
+    """Accumulates moments of true values and of prediction errors, for regression metrics.
+
+    Moments are merged batch by batch with the parallel algorithm of Chan et al.,
+    which is numerically stable unlike plain sums of squares.
+    """
+
+    def __init__(self, metric: MetricTypes, **kwargs: dict):
+        super().__init__(metric, **kwargs)
+        self._multi_output = None
+        self._mean_true = self._m2_true = None
+        self._mean_error = self._m2_error = None
+        self._abs_error = None
+
+    @staticmethod
+    def supported_arguments(metric: MetricTypes) -> Set[str]:
+        return {'multioutput'}
+
+    def _prepare(self, y_true, y_pred) -> Tuple[np.ndarray, np.ndarray]:
+        y_true, y_pred = super()._prepare(y_true, y_pred)
+
+        if len(y_true) and (Metrics._is_array_of_str(y_pred) or Metrics._is_array_of_str(y_true)):
+            raise FedbiomedMetricError(f"{ErrorNumbers.FB611.value}: Can not apply metric `{self._metric.name}` "
+                                       f"to non-numeric prediction results")
+        if y_pred.shape[1:] != y_true.shape[1:]:
+            raise FedbiomedMetricError(f"{ErrorNumbers.FB611.value}: For the metric `{self._metric.name}` multiple "
+                                       f"output regression is not supported")
+        if self._multi_output is not None and self._multi_output != (y_true.ndim == 2):
+            raise FedbiomedMetricError(f"{ErrorNumbers.FB611.value}: Number of outputs changed between batches "
+                                       f"for the metric `{self._metric.name}`")
+
+        return y_true.astype(float, copy=False), y_pred.astype(float, copy=False)
+
+    @staticmethod
+    def _merge(n_a: int, mean_a: np.ndarray, m2_a: np.ndarray, values: np.ndarray) \
+            -> Tuple[np.ndarray, np.ndarray]:
+        """Merges mean and sum of squared deviations of `values` with the accumulated ones"""
+        n_b = len(values)
+        mean_b = values.mean(axis=0)
+        m2_b = np.square(values - mean_b).sum(axis=0)
+        if mean_a is None:
+            return mean_b, m2_b
+
+        n = n_a + n_b
+        delta = mean_b - mean_a
+        return mean_a + delta * (n_b / n), m2_a + m2_b + np.square(delta) * (n_a * n_b / n)
+
+    def _update(self, y_true: np.ndarray, y_pred: np.ndarray):
+        n_b = len(y_true)
+        if not n_b:
+            return
+
+        n_a = self._num_samples - n_b
+        self._multi_output = y_true.ndim == 2
+        error = y_true - y_pred
+        self._mean_true, self._m2_true = self._merge(n_a, self._mean_true, self._m2_true, y_true)
+        self._mean_error, self._m2_error = self._merge(n_a, self._mean_error, self._m2_error, error)
+        abs_error = np.abs(error).sum(axis=0)
+        self._abs_error = abs_error if self._abs_error is None else self._abs_error + abs_error
+
+    def result(self) -> Union[float, np.ndarray]:
+        self._check_not_empty()
+        n = self._num_samples
+
+        if self._metric is MetricTypes.MEAN_SQUARE_ERROR:
+            scores = self._m2_error / n + np.square(self._mean_error)
+        elif self._metric is MetricTypes.MEAN_ABSOLUTE_ERROR:
+            scores = self._abs_error / n
+        else:
+            numerator, denominator = self._m2_error, self._m2_true
+            with np.errstate(divide='ignore', invalid='ignore'):
+                scores = np.where(denominator != 0, 1 - numerator / np.where(denominator != 0, denominator, 1),
+                                  np.where(numerator == 0, 1., 0.))
+
+        if not self._multi_output:
+            return float(scores)
+
+        # Same default as `Metrics` for multiple outputs
+        multi_output = self._kwargs.get('multioutput', 'raw_values')
+        if isinstance(multi_output, str):
+            if multi_output == 'raw_values':
+                return scores
+            elif multi_output == 'uniform_average':
+                return float(scores.mean())
+            elif multi_output == 'variance_weighted' and self._metric is MetricTypes.EXPLAINED_VARIANCE:
+                return float(np.average(scores, weights=self._m2_true)) if self._m2_true.sum() else float(scores.mean())
+            raise FedbiomedMetricError(f"{ErrorNumbers.FB611.value}: Unsupported multioutput `{multi_output}` for "
+                                       f"metric `{self._metric.name}`")
+
+        return float(np.average(scores, weights=multi_output))
+
+
+class ConcatenatingAccumulator(MetricAccumulator):
+    """Accumulator that keeps all values, and evaluates the metric once with
+    [`Metrics.evaluate`][fedbiomed.common.metrics.Metrics.evaluate].
+
+    Used for metric arguments that cannot be computed from sufficient statistics.
+    """
+
+    def __init__(self, metric: MetricTypes, **kwargs: dict):
+        super().__init__(metric, **kwargs)
+        self._y_true: List[np.ndarray] = []
+        self._y_pred: List[np.ndarray] = []
+
+    def _update(self, y_true: np.ndarray, y_pred: np.ndarray):
+        self._y_true.append(y_true)
+        self._y_pred.append(y_pred)
+
+    def result(self) -> Union[float, np.ndarray]:
+        self._check_not_empty()
+        return Metrics().evaluate(np.concatenate(self._y_true),
+                                  np.concatenate(self._y_pred),
+                                  metric=self._metric,
+                                  **copy(self._kwargs))
@@ -34,15 +34,20 @@ class TorchModel(Model):
 
     def get_gradients(
         self,
+        copy: bool = True,
     ) -> Dict[str, torch.Tensor]:
         """Return the gradients attached to the model.
 
+        Args:
+            copy: Whether to return copies of the gradients (the default), or detached
+                views that share memory with the gradients attached to the model.
+
         Returns:
             Gradients, as a dict mapping parameters' names to their gradient's
                 torch tensor.
         """
         gradients = {
-            name: param.grad.detach().clone()
+            name: param.grad.detach().clone() if copy else param.grad.detach()
             for name, param in self.model.named_parameters()
             if (param.requires_grad and param.grad is not None)
         }
@@ -58,6 +63,7 @@ class TorchModel(Model):
     def get_weights(
         self,
         only_trainable: bool = False,
+        copy: bool = True,
     ) -> Dict[str, torch.Tensor]:
         """Return the model's parameters.
 
@@ -65,13 +71,16 @@ class TorchModel(Model):
             only_trainable: Whether to ignore non-trainable model parameters
                 from outputs (e.g. frozen neural network layers' parameters),
                 or include all model parameters (the default).
+            copy: Whether to return copies of the parameters (the default), or detached
+                views that share memory with the model parameters, and are modified
+                when the model is updated.
 
         Returns:
             Model weights, as a dictionary mapping parameters' names to their
                 torch tensor.
         """
         parameters = {
-            name: param.detach().clone()
+            name: param.detach().clone() if copy else param.detach()
             for name, param in self.model.named_parameters()
             if param.requires_grad or not only_trainable
         }
@@ -198,6 +207,9 @@ class TorchModel(Model):
         self.model.eval()  # pytorch switch for model inference-mode
         with torch.no_grad():
             pred = self.model(inputs)
+        if pred.dtype == torch.bfloat16:
+            # numpy has no bfloat16 type (eg: predictions computed under bfloat16 autocast)
+            pred = pred.float()
         return pred.cpu().numpy()
 
     def send_to_device(
@@ -128,6 +128,10 @@ class DeclearnOptimizer(BaseOptimizer):
 
     def step(self):
         """Performs one optimization step"""
+        if isinstance(self._model, TorchModel):
+            self._step_torch()
+            return
+
         # NOTA: for sklearn, gradients retrieved are unscaled because we are using learning rate equal to 1.
         # Therefore, it is necessary to disable the sklearn internal optimizer beforehand
         # otherwise, computation will be incorrect
@@ -136,6 +140,32 @@ class DeclearnOptimizer(BaseOptimizer):
         updates = self.optimizer.step(grad, weights)
         self._model.apply_updates(updates.coefs)
 
+    def _step_torch(self):
+        """Performs one optimization step on a TorchModel, without copying its parameters.
+
+        Gradients and weights are passed to declearn as views of the model tensors, and updates are
+        added in place. Weights are only copied when the optimizer has regularizers, that may keep
+        them across steps (eg: FedProx keeps the weights of the first step of the round). When the
+        optimizer is a plain SGD, the step is applied in place without any intermediate tensor.
+        """
+        grads = self._model.get_gradients(copy=False)
+        sgd = self.optimizer.get_sgd_parameters()
+
+        if sgd is not None:
+            lr, decay = sgd
+            with torch.no_grad():
+                for name, grad in grads.items():
+                    param = self._model.model.get_parameter(name)
+                    if decay:
+                        param.mul_(1. - decay)
+                    param.add_(grad.to(param.device), alpha=-lr)
+            return
+
+        weights = self._model.get_weights(copy=self.optimizer.has_regularizers())
+        updates = self.optimizer.step(declearn.model.api.Vector.build(grads),
+                                      declearn.model.api.Vector.build(weights))
+        self._model.apply_updates(updates.coefs)
+
     def set_aux(self, aux: Dict[str, Any]):
         # FIXME: for imported tensors in PyTorch sent as auxiliary variables,
         # we should push it on the appropriate device (ie cpu/gpu)
@@ -155,6 +155,21 @@ class Optimizer:
                 f"{ErrorNumbers.FB621.value}: error in 'step': {exc}"
             ) from exc
 
+    def has_regularizers(self) -> bool:
+        """Return whether the optimizer has regularizers, that may keep references to the input weights."""
+        return bool(self._optimizer.regularizers)
+
+    def get_sgd_parameters(self) -> Optional[Tuple[float, float]]:
+        """Return the parameters of the optimizer if it performs a plain SGD step.
+
+        Returns:
+            `(lr, decay)` if the optimizer has neither regularizers nor modules, so that
+                its updates are `- lr * grads - decay * weights`, or None otherwise.
+        """
+        if self._optimizer.regularizers or self._optimizer.modules:
+            return None
+        return self._optimizer.lrate, self._optimizer.w_decay
+
     def get_aux(self) -> Dict[str, Union[Dict[str, Any], Any]]:
         """Return auxiliary variables that need to be shared across network.
 
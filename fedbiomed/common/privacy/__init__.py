@@ -2,7 +2,9 @@
 # SPDX-License-Identifier: Apache-2.0
 
 from ._dp_controller import DPController
+from ._per_sample_gradients import PerSampleGradients
 
 __all__ = [
-    "DPController"
+    "DPController",
+    "PerSampleGradients",
 ]
\ No newline at end of file
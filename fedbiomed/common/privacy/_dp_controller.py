@@ -3,7 +3,7 @@
 
 """Diffenrential Privacy controller."""
 
-from typing import Dict, Tuple, Union
+from typing import Any, Callable, Dict, Optional, Tuple, Union
 from fedbiomed.common.optimizers.generic_optimizers import NativeTorchOptimizer
 
 import torch
@@ -17,6 +17,7 @@ from fedbiomed.common.validator import ValidateError
 from fedbiomed.common.training_args import DPArgsValidator
 from fedbiomed.common.exceptions import FedbiomedDPControllerError
 from fedbiomed.common.constants import ErrorNumbers
+from fedbiomed.common.privacy._per_sample_gradients import PerSampleGradients
 
 
 class DPController:
@@ -31,10 +32,25 @@ class DPController:
         self._privacy_engine = PrivacyEngine()
         self._dp_args = dp_args or {}
         self._is_active = dp_args is not None
+        # per-sample gradients computation of the `vmap` engine, set before training
+        self._per_sample_gradients: Optional[PerSampleGradients] = None
+        self._sample_rate: float = 0.
         # Configure/validate dp arguments
         if self._is_active:
             self._configure_dp_args()
 
+    @property
+    def is_active(self) -> bool:
+        """Whether differential privacy is applied during training."""
+        return self._is_active
+
+    @property
+    def vectorized(self) -> bool:
+        """Whether private gradients are computed by
+        [`private_backward`][fedbiomed.common.privacy.DPController.private_backward]
+        (`vmap` engine) rather than by an Opacus wrapped model and optimizer."""
+        return self._is_active and self._dp_args['engine'] == 'vmap'
+
     def before_training(self,
                         optimizer: NativeTorchOptimizer,
                         loader: DataLoader) -> Tuple[NativeTorchOptimizer, DPDataLoader]:
@@ -61,6 +77,8 @@ class DPController:
                     f"{ErrorNumbers.FB616.value}: "
                     "Data loader must be an instance of torch.utils.data.DataLoader"
                 )
+            if self.vectorized:
+                return optimizer, self._prepare_vectorized(optimizer, loader)
             try:
                 optimizer._model.model, optimizer.optimizer, loader = self._privacy_engine.make_private(
                     module=optimizer._model.model,
@@ -76,6 +94,64 @@ class DPController:
                 )
         return optimizer, loader
 
+    def _prepare_vectorized(self, optimizer: NativeTorchOptimizer, loader: DataLoader) -> DPDataLoader:
+        """Prepares training with per-sample gradients vectorized by `torch.func`.
+
+        The model and optimizer are used as is, batches are Poisson sampled like with Opacus.
+
+        Args:
+            optimizer: NativeTorchOptimizer for training
+            loader: Data loader for training
+
+        Returns:
+            Poisson sampling data loader
+        """
+        try:
+            dp_loader = DPDataLoader.from_data_loader(loader)
+        except Exception as e:
+            raise FedbiomedDPControllerError(
+                f"{ErrorNumbers.FB616.value}: "
+                f"Error while creating the private data loader: {e}"
+            )
+        self._sample_rate = dp_loader.sample_rate
+        self._per_sample_gradients = PerSampleGradients(
+            model=optimizer._model.model,
+            sigma=float(self._dp_args['sigma']),
+            clip=float(self._dp_args['clip']),
+            expected_batch_size=loader.batch_size or 1
+        )
+        return dp_loader
+
+    def private_backward(self,
+                         training_step: Callable[[Any, Any], torch.Tensor],
+                         data: Any,
+                         target: Any) -> torch.Tensor:
+        """Computes the private gradients of a batch, in place of the backward pass (`vmap` engine).
+
+        Per-sample gradients are clipped, summed, noised and averaged, then accumulated in the
+        parameters' gradients, ready for the optimizer step.
+
+        Args:
+            training_step: function computing the loss of a batch with the model
+            data: inputs of the batch
+            target: targets of the batch
+
+        Returns:
+            Average loss of the samples of the batch
+
+        Raises:
+            FedbiomedDPControllerError: called before `before_training`, or with another engine
+        """
+        if self._per_sample_gradients is None:
+            raise FedbiomedDPControllerError(
+                f"{ErrorNumbers.FB616.value}: "
+                "Private gradients are only computed by the `vmap` engine, after `before_training`"
+            )
+        loss = self._per_sample_gradients.backward(training_step, data, target)
+        self._privacy_engine.accountant.step(noise_multiplier=float(self._dp_args['sigma']),
+                                             sample_rate=self._sample_rate)
+        return loss
+
     def after_training(self, params: Dict) -> Dict:
         """DP actions after the training.
 
@@ -161,9 +237,13 @@ class DPController:
             for key, param in params.items()
         }
         # When using central DP, postprocess the parameters.
-        if self._dp_args['type'] == 'central':
+        if self._dp_args['type'] == 'central' and params:
+            # draw the noise of all the parameters at once
             sigma = self._dp_args['sigma_CDP']
-            for key, param in params.items():
-                noise = sigma * self._dp_args['clip'] * torch.randn_like(param)
-                params[key] = param + noise
+            keys, tensors = zip(*params.items())
+            numels = [param.numel() for param in tensors]
+            noise = torch.randn(sum(numels), dtype=tensors[0].dtype, device=tensors[0].device)
+            noise = [n.view_as(param).to(param.dtype) for n, param in zip(noise.split(numels), tensors)]
+            params = dict(zip(keys, torch._foreach_add(list(tensors), noise,
+                                                       alpha=sigma * self._dp_args['clip'])))
         return params
@@ -0,0 +1,121 @@
+# This file is originally part of Fed-BioMed
+# SPDX-License-Identifier: Apache-2.0
+
+"""DP-SGD gradients from per-sample gradients vectorized with `torch.func`."""
+
+from typing import Any, Callable, Dict, List
+
+import torch
+from torch.func import functional_call, grad_and_value, vmap
+from torch.nn import Module
+from torch.utils._pytree import tree_leaves, tree_map
+
+
+class _TrainingStepModule(Module):
+    """Module whose forward pass is a training step, so that it can be called functionally.
+
+    The training step uses the wrapped model: replacing the parameters of this module replaces
+    the parameters used by the training step.
+    """
+
+    def __init__(self, model: Module, training_step: Callable[[Any, Any], torch.Tensor]):
+        super().__init__()
+        self.model = model
+        self._training_step = training_step
+
+    def forward(self, data: Any, target: Any) -> torch.Tensor:
+        return self._training_step(data, target)
+
+
+class PerSampleGradients:
+    """Computes DP-SGD gradients of a model, from per-sample gradients vectorized with `torch.func`.
+
+    Per-sample gradients are computed in a single vectorized pass (`vmap` of `grad`), instead of the
+    hooks used by Opacus. Each sample is clipped by the norm of its gradient over all the parameters
+    at once, then clipped gradients are summed over the batch, noised and averaged like Opacus does.
+    """
+
+    def __init__(self, model: Module, sigma: float, clip: float, expected_batch_size: int):
+        """Constructor of the class.
+
+        Args:
+            model: model to train
+            sigma: noise multiplier
+            clip: maximum norm of the gradient of a sample
+            expected_batch_size: expected number of samples of a batch, used to average gradients
+        """
+        self._model = model
+        self._sigma = sigma
+        self._clip = clip
+        self._expected_batch_size = max(1, expected_batch_size)
+
+    def backward(self,
+                 training_step: Callable[[Any, Any], torch.Tensor],
+                 data: Any,
+                 target: Any) -> torch.Tensor:
+        """Computes the private gradients of a batch, and accumulates them in the parameters' `grad`.
+
+        Args:
+            training_step: function computing the loss of a batch, using the model
+            data: inputs of the batch
+            target: targets of the batch
+
+        Returns:
+            Average loss of the samples of the batch
+        """
+        names: List[str] = [name for name, param in self._model.named_parameters() if param.requires_grad]
+        named_params = dict(self._model.named_parameters())
+        params = {f'model.{name}': named_params[name].detach() for name in names}
+        buffers = {f'model.{name}': buffer.detach() for name, buffer in self._model.named_buffers()}
+        module = _TrainingStepModule(self._model, training_step)
+
+        def sample_loss(params: Dict[str, torch.Tensor], sample_data: Any, sample_target: Any) -> torch.Tensor:
+            # each sample is seen as a batch of one sample by the training step
+            sample_data, sample_target = tree_map(lambda t: t.unsqueeze(0), (sample_data, sample_target))
+            return functional_call(module, (params, buffers), (sample_data, sample_target))
+
+        if tree_leaves(data)[0].shape[0] > 0:
+            sample_grads, losses = vmap(grad_and_value(sample_loss), in_dims=(None, 0, 0),
+                                        randomness='different')(params, data, target)
+            grads = self._clip_and_sum([sample_grads[f'model.{name}'] for name in names])
+            loss = losses.detach().mean()
+        else:
+            # empty batches (Poisson sampling) only contribute noise
+            grads = [torch.zeros_like(named_params[name]) for name in names]
+            loss = torch.zeros((), device=grads[0].device if grads else None)
+
+        if self._sigma > 0 and grads:
+            self._add_noise(grads)
+        torch._foreach_div_(grads, self._expected_batch_size)
+
+        for name, grad in zip(names, grads):
+            param = named_params[name]
+            if param.grad is None:
+                param.grad = grad
+            else:
+                param.grad.add_(grad)
+
+        return loss
+
+    def _clip_and_sum(self, sample_grads: List[torch.Tensor]) -> List[torch.Tensor]:
+        """Clips per-sample gradients by their norm over all the parameters, and sums them over the batch.
+
+        Args:
+            sample_grads: per-sample gradients of each parameter, with the samples as first dimension
+
+        Returns:
+            The sum of the clipped gradients of the samples, for each parameter
+        """
+        if not sample_grads:
+            return []
+        batch_size = sample_grads[0].shape[0]
+        norms = torch.stack([g.reshape(batch_size, -1).norm(2, dim=1) for g in sample_grads], dim=1).norm(2, dim=1)
+        factors = (self._clip / (norms + 1e-6)).clamp(max=1.)
+        return [torch.tensordot(factors.to(g.dtype), g, dims=1) for g in sample_grads]
+
+    def _add_noise(self, grads: List[torch.Tensor]) -> None:
+        """Adds gaussian noise to the summed gradients, drawn at once for all the parameters."""
+        numels = [g.numel() for g in grads]
+        noise = torch.randn(sum(numels), device=grads[0].device, dtype=grads[0].dtype)
+        noise.mul_(self._sigma * self._clip)
+        torch._foreach_add_(grads, [n.view_as(g).to(g.dtype) for n, g in zip(noise.split(numels), grads)])
@@ -9,9 +9,10 @@ from typing import Union, List, Dict
 import copy
 
 import json
-from tinydb import TinyDB, Query
+from tinydb import Query
 
 from fedbiomed.common.constants import ErrorNumbers, BiprimeType
+from fedbiomed.common.db import open_database
 from fedbiomed.common.exceptions import FedbiomedSecaggError
 from fedbiomed.common.logger import logger
 from fedbiomed.common.validator import Validator, ValidatorError, SchemeValidator
@@ -37,7 +38,7 @@ class BaseSecaggManager(ABC):
             FedbiomedSecaggError: failed to access the database
         """
         try:
-            self._db = TinyDB(db_path)
+            self._db = open_database(db_path)
         except Exception as e:
             errmess = f'{ErrorNumbers.FB623.value}: failed to access the database with error: {e}'
             logger.error(errmess)
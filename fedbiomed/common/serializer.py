@@ -3,13 +3,12 @@
 
 """MsgPack serialization utils, wrapped into a namespace class."""
 
+import sys
 from math import ceil
 from typing import Any
 
 import msgpack
 import numpy as np
-import torch
-from declearn.model.api import Vector
 
 from fedbiomed.common.exceptions import FedbiomedTypeError
 from fedbiomed.common.logger import logger
@@ -32,6 +31,9 @@ class Serializer:
         - numpy arrays and scalars
         - torch tensors (that are always loaded on CPU)
         - tuples (which would otherwise be converted to lists)
+
+    torch and declearn are only imported to load tensors and vectors, so that
+    components exchanging other data do not load them.
     """
 
     @classmethod
@@ -106,11 +108,14 @@ class Serializer:
         if isinstance(obj, np.generic):
             spec = [obj.tobytes(), obj.dtype.name]
             return {"__type__": "np.generic", "value": spec}
-        if isinstance(obj, torch.Tensor):
+        # tensors and vectors can only be given if torch and declearn are imported
+        torch = sys.modules.get("torch")
+        if torch is not None and isinstance(obj, torch.Tensor):
             obj = obj.cpu().numpy()
             spec = [obj.tobytes(), obj.dtype.name, list(obj.shape)]
             return {"__type__": "torch.Tensor", "value": spec}
-        if isinstance(obj, Vector):
+        declearn_api = sys.modules.get("declearn.model.api")
+        if declearn_api is not None and isinstance(obj, declearn_api.Vector):
             return {"__type__": "Vector", "value": obj.coefs}
         # Raise on unsupported types.
         raise FedbiomedTypeError(
@@ -134,10 +139,12 @@ class Serializer:
             data, dtype = obj["value"]
             return np.frombuffer(data, dtype=dtype)[0]
         if objtype == "torch.Tensor":
+            import torch
             data, dtype, shape = obj["value"]
             array = np.frombuffer(data, dtype=dtype).reshape(shape).copy()
             return torch.from_numpy(array)
         if objtype == "Vector":
+            from declearn.model.api import Vector
             return Vector.build(obj["value"])
         logger.warning(
             "Encountered an object that cannot be properly deserialized."
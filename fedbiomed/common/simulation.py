@@ -0,0 +1,393 @@
+# This file is originally part of Fed-BioMed
+# SPDX-License-Identifier: Apache-2.0
+
+"""
+In-process simulation backend, replacing the message broker and the HTTP file repository.
+
+When a simulation is active in a process, [`create_messaging`][fedbiomed.common.simulation.create_messaging] and
+[`create_repository`][fedbiomed.common.simulation.create_repository] return a `SimulatedMessaging` and a
+`SimulatedRepository` instead of a MQTT `Messaging` and an HTTP `Repository`. Components of the simulation
+exchange Python objects through multiprocessing queues, and files through a shared directory held in memory
+(`/dev/shm`) when available, without JSON serialization, broker or HTTP server.
+
+Simulations are run with [`Simulation`][fedbiomed.researcher.simulation.Simulation].
+"""
+
+import multiprocessing
+import os
+import queue
+import shutil
+import tempfile
+import threading
+import uuid
+from typing import Any, Callable, Dict, List, Optional, Text, Tuple, Union
+
+from fedbiomed.common.constants import ComponentType, ErrorNumbers, __messaging_protocol_version__
+from fedbiomed.common.exceptions import FedbiomedMessagingError, FedbiomedRepositoryError
+import fedbiomed.common.message as message
+from fedbiomed.common.logger import logger
+from fedbiomed.common.messaging import Messaging
+from fedbiomed.common.repository import Repository
+from fedbiomed.common.utils import raise_for_version_compatibility, __default_version__
+
+
+SIMULATION_UPLOADS_URL = 'http://localhost/simulation/'
+
+
+class SimulationBroker:
+    """Routes messages between the components of a simulation, through one multiprocessing queue per inbox.
+
+    Components use the topics of the MQTT broker. Several components may share an inbox, e.g. the virtual
+    nodes hosted by a worker process: a message published to several components of an inbox is queued once.
+    Components are added before the broker is passed to other processes.
+    """
+
+    def __init__(self, context: Any = None):
+        """Constructor of the class.
+
+        Args:
+            context: multiprocessing context used to create the queues. Defaults to the `spawn` context.
+        """
+        self._context = context or multiprocessing.get_context('spawn')
+        self._queues: Dict[str, Any] = {}
+        # components subscribed to each topic, indexed by inbox
+        self._subscribers: Dict[str, Dict[str, List[str]]] = {}
+
+    def add_component(self, component_type: ComponentType, component_id: str, inbox: Optional[str] = None):
+        """Adds a component, subscribed to the topics of its type.
+
+        Args:
+            component_type: type of the component
+            component_id: id of the component
+            inbox: name of the inbox receiving the messages of the component. Defaults to the component id.
+        """
+        inbox = inbox or component_id
+        if inbox not in self._queues:
+            self._queues[inbox] = self._context.Queue()
+
+        if component_type is ComponentType.RESEARCHER:
+            topics = ('general/researcher', 'general/monitoring', 'general/logger')
+        else:
+            topics = ('general/nodes', f'general/{component_id}')
+        for topic in topics:
+            self._subscribers.setdefault(topic, {}).setdefault(inbox, []).append(component_id)
+
+    def publish(self, topic: str, msg: Dict[str, Any]):
+        """Publishes a message to the components subscribed to a topic.
+
+        Args:
+            topic: topic of the message
+            msg: message
+        """
+        for inbox, component_ids in self._subscribers.get(topic, {}).items():
+            self._queues[inbox].put((component_ids, topic, msg))
+
+    def receive(self, inbox: str, timeout: Optional[float] = None) \
+            -> Optional[Tuple[List[str], str, Dict[str, Any]]]:
+        """Receives the next message of an inbox.
+
+        Args:
+            inbox: name of the inbox
+            timeout: maximum time to wait in seconds, None to wait until a message is received
+
+        Returns:
+            The ids of the destination components, the topic and the message. None if the inbox was closed or
+                on timeout.
+        """
+        try:
+            return self._queues[inbox].get(timeout=timeout)
+        except queue.Empty:
+            return None
+
+    def close(self, inbox: str):
+        """Closes an inbox: its receiver gets None.
+
+        Args:
+            inbox: name of the inbox
+        """
+        self._queues[inbox].put(None)
+
+
+class SimulatedMessaging(Messaging):
+    """Messaging of a component of a simulation, through a [`SimulationBroker`][fedbiomed.common.simulation]."""
+
+    def __init__(self,
+                 on_message: Callable[[dict], None],
+                 messaging_type: ComponentType,
+                 messaging_id: Union[int, str],
+                 broker: SimulationBroker,
+                 dispatch: bool = True):
+        """Constructor of the class.
+
+        Args:
+            on_message: Function that should be executed when a message is received
+            messaging_type: Describes incoming message sender. 1 for researcher, 2 for node
+            messaging_id: messaging id
+            broker: broker of the simulation
+            dispatch: whether `start` runs a thread receiving the messages of the component. False when the
+                messages are received by the caller, and passed to `deliver`.
+        """
+        self._messaging_type = messaging_type
+        self._messaging_id = str(messaging_id)
+        self._is_connected = False
+        self._is_failed = False
+        self._broker = broker
+        self._dispatch = dispatch
+        self._thread = None
+
+        self._on_message_handler = on_message
+        if on_message is None:
+            logger.warning("no message handler defined")
+
+        if self._messaging_type is ComponentType.RESEARCHER:
+            self._default_send_topic = 'general/nodes'
+        elif self._messaging_type is ComponentType.NODE:
+            self._default_send_topic = 'general/researcher'
+        else:
+            self._default_send_topic = None
+
+    def deliver(self, msg: Dict[str, Any], topic: str):
+        """Passes a message received from the broker to the message handler.
+
+        Args:
+            msg: message
+            topic: topic of the message
+        """
+        if self._on_message_handler is None:
+            logger.warning("no message handler defined")
+            return
+        msg_version = msg.get('protocol_version', __default_version__)
+        raise_for_version_compatibility(msg_version, __messaging_protocol_version__,
+                                        f"{ErrorNumbers.FB104.value}: Received message with protocol version %s "
+                                        f"which is incompatible with the current protocol version %s")
+        self._on_message_handler(msg=msg, topic=topic)
+
+    def _receive_messages(self):
+        """Receives the messages of the component until the messaging is stopped."""
+        while True:
+            received = self._broker.receive(self._messaging_id)
+            if received is None:
+                break
+            _, topic, msg = received
+            try:
+                self.deliver(msg, topic)
+            except Exception as e:
+                logger.error(f"Messaging {self._messaging_id} failed handling a message: {e}")
+
+    def start(self, block: bool = False):
+        """Connects to the broker of the simulation, and starts receiving messages if `dispatch` is True.
+
+        Args:
+            block: if True, receives the messages in the calling thread until the messaging is stopped, else in
+                a background thread.
+        """
+        self._is_connected = True
+        if not self._dispatch:
+            return
+        if block:
+            self._receive_messages()
+        elif self._thread is None:
+            self._thread = threading.Thread(target=self._receive_messages,
+                                            name=f'messaging-{self._messaging_id}',
+                                            daemon=True)
+            self._thread.start()
+
+    def stop(self):
+        """Stops receiving messages."""
+        if self._thread is not None:
+            self._broker.close(self._messaging_id)
+            self._thread.join()
+            self._thread = None
+        self._is_connected = False
+
+    def send_message(self, msg: dict, client: str = None):
+        """This method sends a message to a given client
+
+        Args:
+            msg: the content of a message
+            client: defines the channel to which the message will be sent. Defaults to None (all clients)
+        """
+        if self._is_failed:
+            logger.error('Messaging has failed, will not try to send message')
+            return
+        elif not self._is_connected:
+            logger.error('Messaging is not connected, will not try to send message')
+            return
+
+        channel = self._default_send_topic if client is None else "general/" + str(client)
+        if channel is None:
+            logger.warning("send_message: channel must be specific (None at the moment)")
+            return
+        self._broker.publish(channel, msg)
+
+    def send_error(self, errnum: ErrorNumbers, extra_msg: str = "", researcher_id: str = "<unknown>"):
+        """Sends an error message to the researcher
+
+        Args:
+            errnum: Error number
+            extra_msg: Extra error message
+            researcher_id: ID of the researcher that the message will be sent to
+
+        Raises:
+            FedbiomedMessagingError: If client is not connected
+        """
+        if self._messaging_type != ComponentType.NODE:
+            logger.warning(f"this component ({self._messaging_type}) cannot send error message ({errnum.value})")
+            return
+
+        if not self._is_connected:
+            msg = f"{ErrorNumbers.FB103.value}: messaging not started yet (error to transmit={errnum.value})"
+            logger.critical(msg)
+            raise FedbiomedMessagingError(msg)
+
+        msg = dict(
+            command='error',
+            errnum=errnum,
+            node_id=self._messaging_id,
+            extra_msg=extra_msg,
+            researcher_id=researcher_id
+        )
+        self._broker.publish("general/researcher", message.NodeMessages.format_outgoing_message(msg).get_dict())
+
+
+class SimulatedRepository(Repository):
+    """File repository of a simulation, in a directory shared by the processes of the simulation."""
+
+    def __init__(self, store_dir: str, tmp_dir: str, cache_dir: str):
+        """Constructor of the class.
+
+        Args:
+            store_dir: directory holding the uploaded files
+            tmp_dir: A directory for temporary files
+            cache_dir: Currently unused
+        """
+        super().__init__(SIMULATION_UPLOADS_URL, tmp_dir, cache_dir)
+        self._store_dir = store_dir
+
+    def upload_file(self, filename: str) -> Dict[str, Any]:
+        """Copies a file to the shared directory.
+
+        Args:
+            filename: A name/path of the file to upload.
+
+        Returns:
+            The URL of the file, under key `file`.
+
+        Raises:
+            FedbiomedRepositoryError: unable to read the file 'filename'
+        """
+        name = f"{uuid.uuid4()}_{os.path.basename(filename)}"
+        try:
+            shutil.copyfile(filename, os.path.join(self._store_dir, name))
+        except OSError as e:
+            _msg = ErrorNumbers.FB604.value + f': Cannot upload file {filename}: {e}'
+            logger.error(_msg)
+            raise FedbiomedRepositoryError(_msg)
+        return {'file': SIMULATION_UPLOADS_URL + name}
+
+    def download_file(self, url: str, filename: str) -> Tuple[int, str]:
+        """Copies a file of the shared directory to the temporary directory.
+
+        Args:
+            url: URL of the file, returned by `upload_file`
+            filename: The name of the temporary file
+
+        Returns:
+            status: The HTTP status code equivalent, 200
+            filepath: The complete pathfile under which the temporary file is saved
+
+        Raises:
+            FedbiomedRepositoryError: URL is not a file of the simulation, or the file cannot be copied
+        """
+        if not url.startswith(SIMULATION_UPLOADS_URL):
+            _msg = ErrorNumbers.FB604.value + f': {url} is not a file of the simulation repository'
+            logger.error(_msg)
+            raise FedbiomedRepositoryError(_msg)
+
+        filepath = os.path.join(self.tmp_dir, filename)
+        try:
+            shutil.copyfile(os.path.join(self._store_dir, url[len(SIMULATION_UPLOADS_URL):]), filepath)
+        except OSError as e:
+            _msg = ErrorNumbers.FB604.value + f': Cannot download file {url}: {e}'
+            logger.error(_msg)
+            raise FedbiomedRepositoryError(_msg)
+        return 200, filepath
+
+
+def make_store_dir() -> str:
+    """Creates a directory for the files of a simulation, in memory (`/dev/shm`) when available.
+
+    Returns:
+        Path of the directory
+    """
+    shm_dir = '/dev/shm'
+    return tempfile.mkdtemp(prefix='fedbiomed_simulation_',
+                            dir=shm_dir if os.path.isdir(shm_dir) and os.access(shm_dir, os.W_OK) else None)
+
+
+# simulation active in this process
+_simulation: Dict[str, Any] = {}
+
+
+def activate(broker: SimulationBroker, store_dir: str, dispatch: bool = True):
+    """Activates a simulation in this process: new messagings and repositories are simulated.
+
+    Args:
+        broker: broker of the simulation
+        store_dir: directory holding the files of the simulation repository
+        dispatch: whether the messagings receive their messages in a background thread
+    """
+    _simulation.update(broker=broker, store_dir=store_dir, dispatch=dispatch)
+
+
+def deactivate():
+    """Deactivates the simulation of this process."""
+    _simulation.clear()
+
+
+def is_active() -> bool:
+    """Whether a simulation is active in this process.
+
+    Returns:
+        True if a simulation is active
+    """
+    return bool(_simulation)
+
+
+def create_messaging(on_message: Callable[[dict], None],
+                     messaging_type: ComponentType,
+                     messaging_id: Union[int, str],
+                     mqtt_broker: str = 'localhost',
+                     mqtt_broker_port: int = 1883) -> Messaging:
+    """Creates the messaging of a component.
+
+    Args:
+        on_message: Function that should be executed when a message is received
+        messaging_type: Describes incoming message sender. 1 for researcher, 2 for node
+        messaging_id: messaging id
+        mqtt_broker: IP address / URL of the MQTT broker, unused by a simulation
+        mqtt_broker_port: port of the MQTT broker, unused by a simulation
+
+    Returns:
+        A `SimulatedMessaging` if a simulation is active, else a MQTT `Messaging`
+    """
+    if _simulation:
+        return SimulatedMessaging(on_message, messaging_type, messaging_id,
+                                  _simulation['broker'], dispatch=_simulation['dispatch'])
+    return Messaging(on_message, messaging_type, messaging_id, mqtt_broker, mqtt_broker_port)
+
+
+def create_repository(uploads_url: Union[Text, bytes], tmp_dir: str, cache_dir: str) -> Repository:
+    """Creates a file repository.
+
+    Args:
+        uploads_url: The URL where we upload files, unused by a simulation
+        tmp_dir: A directory for temporary files
+        cache_dir: Currently unused
+
+    Returns:
+        A `SimulatedRepository` if a simulation is active, else an HTTP `Repository`
+    """
+    if _simulation:
+        return SimulatedRepository(_simulation['store_dir'], tmp_dir, cache_dir)
+    return Repository(uploads_url, tmp_dir, cache_dir)
@@ -25,6 +25,15 @@ def _validate_dp_type(value: Any):
         return True
 
 
+@validator_decorator
+def _validate_dp_engine(value: Any):
+    """ Validates whether DP engine is valid"""
+    if value not in ["opacus", "vmap"]:
+        return False, f"DP engine should one of `opacus` or `vmap` not {value}"
+    else:
+        return True
+
+
 DPArgsValidator = SchemeValidator({
     'type': {
         "rules": [str, _validate_dp_type], "required": True, "default": "central"
@@ -35,6 +44,9 @@ DPArgsValidator = SchemeValidator({
     'clip': {
         "rules": [float], "required": True
     },
+    'engine': {
+        "rules": [str, _validate_dp_engine], "required": True, "default": "opacus"
+    },
 })
 
 
@@ -256,6 +268,28 @@ class TrainingArgs:
 
         return True
 
+    @staticmethod
+    @validator_decorator
+    def _validate_profiling(v: Any) -> Union[Tuple[bool, str], bool]:
+        """
+        Test if profiling is None, a bool, or a dictionary of profiler options.
+        """
+        if v is None or isinstance(v, bool):
+            return True
+        elif not isinstance(v, dict):
+            return False, f"`profiling` should be None, a bool or a dictionary, not {type(v)}"
+
+        unknown = set(v) - {'top_n', 'sort'}
+        if unknown:
+            return False, f"Unknown `profiling` options {sorted(unknown)}, expected `top_n` and `sort`"
+        top_n = v.get('top_n', 1)
+        if not isinstance(top_n, int) or isinstance(top_n, bool) or top_n < 1:
+            return False, f"`profiling` option `top_n` should be a positive integer, not {top_n}"
+        if v.get('sort', 'cumulative') not in ('cumulative', 'tottime', 'calls'):
+            return False, f"`profiling` option `sort` should be `cumulative`, `tottime` or `calls`, not {v['sort']}"
+
+        return True
+
     @classmethod
     def default_scheme(cls) -> Dict:
         """
@@ -282,6 +316,7 @@ class TrainingArgs:
         | fedprox_mu | set the value of mu and enable FedProx correction |
         | dp_args | arguments for Differential Privacy |
         | share_persistent_buffers | toggle whether nodes share the full state_dict (when True) or only trainable parameters (False) in a TorchTrainingPlan |
+        | profiling | request profiling of the training and validation routines on the nodes that allow it, with profiler options `top_n` and `sort` when a dict |
 
         """
         return {
@@ -334,6 +369,9 @@ class TrainingArgs:
             },
             "share_persistent_buffers": {
                 "rules": [bool], "required": False, "default": True
+            },
+            "profiling": {
+                "rules": [cls._validate_profiling], "required": False, "default": None
             }
         }
 
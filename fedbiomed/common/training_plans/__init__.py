@@ -7,10 +7,25 @@ that are used for federated training
 """
 
 
-from ._torchnn import TorchTrainingPlan
-from ._sklearn_training_plan import SKLearnTrainingPlan
-from ._sklearn_models import FedPerceptron, FedSGDClassifier, FedSGDRegressor
-from ._base_training_plan import BaseTrainingPlan
+from typing import TYPE_CHECKING
+
+from fedbiomed.common.utils import lazy_import_attributes
+
+if TYPE_CHECKING:
+    from ._torchnn import TorchTrainingPlan
+    from ._sklearn_training_plan import SKLearnTrainingPlan
+    from ._sklearn_models import FedPerceptron, FedSGDClassifier, FedSGDRegressor
+    from ._base_training_plan import BaseTrainingPlan
+
+# training plans import their framework (torch, scikit-learn) only when they are used
+__getattr__, __dir__ = lazy_import_attributes(__name__, {
+    "TorchTrainingPlan": "._torchnn",
+    "SKLearnTrainingPlan": "._sklearn_training_plan",
+    "FedPerceptron": "._sklearn_models",
+    "FedSGDClassifier": "._sklearn_models",
+    "FedSGDRegressor": "._sklearn_models",
+    "BaseTrainingPlan": "._base_training_plan",
+})
 
 __all__ = [
     "TorchTrainingPlan",
@@ -19,7 +19,7 @@ from fedbiomed.common.exceptions import (
     FedbiomedError, FedbiomedModelError, FedbiomedTrainingPlanError
 )
 from fedbiomed.common.logger import logger
-from fedbiomed.common.metrics import Metrics, MetricTypes
+from fedbiomed.common.metrics import MetricAccumulator, MetricTypes
 from fedbiomed.common.models import Model
 from fedbiomed.common.utils import get_class_source
 from fedbiomed.common.utils import get_method_spec
@@ -225,6 +225,44 @@ class BaseTrainingPlan(metaclass=ABCMeta):
     def set_aggregator_args(self, aggregator_args: Dict[str, Any]):
         raise FedbiomedTrainingPlanError("method not implemented and needed")
 
+    def reusable(self) -> bool:
+        """Whether the node can keep the training plan to run the next rounds of the same job.
+
+        Not reusable by default (to be overridden by children classes that implement `reset_round`).
+
+        Returns:
+            True if `reset_round` can prepare the training plan for a new round
+        """
+        return False
+
+    def reset_round(
+            self,
+            training_args: Dict[str, Any],
+            aggregator_args: Optional[Dict[str, Any]] = None,
+    ) -> None:
+        """Prepares a training plan kept by the node for a new round of the same job.
+
+        The model, the dependencies and the data loaders are kept, while the state of the previous round
+        (optimizer, aggregator arguments...) is reset as if `post_init` was called again with the same model
+        arguments and the training arguments of the new round. The new model parameters are then loaded with
+        `set_model_params`.
+
+        The node only reuses a training plan if the training arguments used to set up the model and the data
+        loaders (batch size, test ratio, differential privacy, GPU) did not change since `post_init`.
+
+        Args:
+            training_args: Arguments of the new round that are used in training routines
+                such as epoch, num_updates etc.
+                Please see [`TrainingArgs`][fedbiomed.common.training_args.TrainingArgs]
+            aggregator_args: Arguments managed by and shared with the
+                researcher-side aggregator, for the new round.
+
+        Raises:
+            FedbiomedTrainingPlanError: the training plan is not reusable
+        """
+        raise FedbiomedTrainingPlanError(f"{ErrorNumbers.FB605.value}: {self.__class__.__name__} cannot be reused "
+                                         f"for a new round")
+
     @abstractmethod
     def init_optimizer(self) -> Any:
         """Method for declaring optimizer by default
@@ -234,6 +272,20 @@ class BaseTrainingPlan(metaclass=ABCMeta):
             FedBiomed [`Optimizers`][`fedbiomed.common.optimizers.Optimizer`]
         """
 
+    def set_performance_profile(self, node_args: Optional[Dict[str, Any]] = None) -> Dict[str, Any]:
+        """Applies the node performance settings to the training and validation routines.
+
+        Nothing is configurable by default (to be overridden by children classes).
+
+        Args:
+            node_args: command line arguments for node, see
+                [`Round`][fedbiomed.node.round.Round] for the performance settings.
+
+        Returns:
+            Effective performance settings, reported in the training reply timing.
+        """
+        return {}
+
     def optimizer_args(self) -> Dict:
         """Retrieves optimizer arguments (to be overridden
         by children classes)
@@ -434,10 +486,14 @@ class BaseTrainingPlan(metaclass=ABCMeta):
             If the training plan implements a `testing_step` method
             (the signature of which is func(data, target) -> metrics)
             then it will be used rather than the input metric.
+            Its values are reported for each batch, whereas the input metric
+            is accumulated over batches and reported once, computed on the
+            whole validation dataset.
 
         Args:
             metric: The metric used for validation.
                 If None, use MetricTypes.ACCURACY.
+            metric_args: Arguments of the metric (eg: `average`).
             history_monitor: HistoryMonitor instance,
                 used to record computed metrics and communicate them to
                 the researcher (server).
@@ -454,26 +510,33 @@ class BaseTrainingPlan(metaclass=ABCMeta):
         n_batches = len(self.testing_data_loader)
         n_samples = len(self.testing_data_loader.dataset)
         # Set up a batch-wise metrics-computation function.
-        # Either use an optionally-implemented custom training routine.
+        # Either use an optionally-implemented custom training routine,
+        # whose values are reported for each batch.
+        accumulator = None
         if hasattr(self, "testing_step"):
             evaluate = getattr(self, "testing_step")
             metric_name = "Custom"
-        # Or use the provided `metric` (or its default value).
+        # Or use the provided `metric` (or its default value), accumulated
+        # over batches and computed once on the whole validation dataset.
         else:
             if metric is None:
                 metric = MetricTypes.ACCURACY
-            metric_controller = Metrics()
+            try:
+                accumulator = MetricAccumulator.create(metric, **metric_args)
+            except FedbiomedError as exc:
+                msg = f"{ErrorNumbers.FB605.value}: Invalid validation metric: {exc}"
+                logger.critical(msg)
+                raise FedbiomedTrainingPlanError(msg) from exc
+
             def evaluate(data, target):
-                nonlocal metric, metric_args, metric_controller
                 output = self._model.predict(data)
                 if isinstance(target, torch.Tensor):
                     target = target.numpy()
-                return metric_controller.evaluate(
-                    target, output, metric=metric, **metric_args
-                )
+                accumulator.update(target, output)
             metric_name = metric.name
         # Iterate over the validation dataset and run the defined routine.
         num_samples_observed_till_now: int = 0
+        idx = 0
         for idx, (data, target) in enumerate(self.testing_data_loader, 1):
             num_samples_observed_till_now += self._infer_batch_size(data)
             # Run the evaluation step; catch and raise exceptions.
@@ -486,26 +549,66 @@ class BaseTrainingPlan(metaclass=ABCMeta):
                 )
                 logger.critical(msg)
                 raise FedbiomedTrainingPlanError(msg) from exc
-            # Log the computed value.
-            logger.debug(
-                f"Validation: Batch {idx}/{n_batches} "
-                f"| Samples {num_samples_observed_till_now}/{n_samples} "
-                f"| Metric[{metric_name}]: {m_value}"
-            )
-            # Further parse, and report it (provided a monitor is set).
-            if history_monitor is not None:
-                m_dict = self._create_metric_result_dict(m_value, metric_name)
-                history_monitor.add_scalar(
-                    metric=m_dict,
-                    iteration=idx,
-                    epoch=None,
-                    test=True,
-                    test_on_local_updates=(not before_train),
-                    test_on_global_updates=before_train,
-                    total_samples=n_samples,
-                    batch_samples=num_samples_observed_till_now,
-                    num_batches=n_batches
+            if accumulator is None:
+                self._report_testing_metric(m_value, metric_name, history_monitor, before_train,
+                                            idx, n_batches, num_samples_observed_till_now, n_samples)
+        # Finalize the accumulated metric, if any batch was evaluated.
+        if accumulator is not None and idx:
+            try:
+                m_value = accumulator.result()
+            except Exception as exc:
+                msg = (
+                    f"{ErrorNumbers.FB605.value}: An error occurred "
+                    f"while computing the {metric_name} metric: {exc}"
                 )
+                logger.critical(msg)
+                raise FedbiomedTrainingPlanError(msg) from exc
+            self._report_testing_metric(m_value, metric_name, history_monitor, before_train,
+                                        idx, n_batches, num_samples_observed_till_now, n_samples)
+
+    def _report_testing_metric(
+            self,
+            m_value: Any,
+            metric_name: str,
+            history_monitor: Optional['HistoryMonitor'],
+            before_train: bool,
+            iteration: int,
+            n_batches: int,
+            num_samples_observed: int,
+            n_samples: int
+        ) -> None:
+        """Log a validation metric value, and report it to the history monitor (if any).
+
+        Args:
+            m_value: Metric value(s), see `_create_metric_result_dict`.
+            metric_name: Name of the metric.
+            history_monitor: HistoryMonitor instance, or None.
+            before_train: Whether the evaluation is performed before local training.
+            iteration: Index of the last evaluated batch.
+            n_batches: Total number of validation batches.
+            num_samples_observed: Number of samples evaluated so far.
+            n_samples: Total number of validation samples.
+        """
+        # Log the computed value.
+        logger.debug(
+            f"Validation: Batch {iteration}/{n_batches} "
+            f"| Samples {num_samples_observed}/{n_samples} "
+            f"| Metric[{metric_name}]: {m_value}"
+        )
+        # Further parse, and report it (provided a monitor is set).
+        if history_monitor is not None:
+            m_dict = self._create_metric_result_dict(m_value, metric_name)
+            history_monitor.add_scalar(
+                metric=m_dict,
+                iteration=iteration,
+                epoch=None,
+                test=True,
+                test_on_local_updates=(not before_train),
+                test_on_global_updates=before_train,
+                total_samples=n_samples,
+                batch_samples=num_samples_observed,
+                num_batches=n_batches
+            )
 
     @staticmethod
     def _infer_batch_size(data: Union[dict, list, tuple, 'torch.Tensor', 'np.ndarray']) -> int:
@@ -262,12 +262,15 @@ class FedPerceptron(FedSGDClassifier):
             training_args: Dict[str, Any],
             aggregator_args: Optional[Dict[str, Any]] = None,
         ) -> None:
-        # get default values of Perceptron model (different from SGDClassifier model default values)
-        perceptron_default_values = Perceptron().get_params()
-        sgd_classifier_default_values = SGDClassifier().get_params()
         # make sure loss used is perceptron loss - can not be changed by user
         model_args["loss"] = "perceptron"
         super().post_init(model_args, training_args)
+
+    def _configure_model_and_optimizer(self):
+        super()._configure_model_and_optimizer()
+        # get default values of Perceptron model (different from SGDClassifier model default values)
+        perceptron_default_values = Perceptron().get_params()
+        sgd_classifier_default_values = SGDClassifier().get_params()
         self._model.set_params(loss="perceptron")
 
         # collect default values of Perceptron and set it to the model FedPerceptron
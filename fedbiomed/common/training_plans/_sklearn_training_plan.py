@@ -90,31 +90,80 @@ class SKLearnTrainingPlan(BaseTrainingPlan, metaclass=ABCMeta):
             aggregator_args: Arguments managed by and shared with the
                 researcher-side aggregator.
         """
-        self._model = SkLearnModel(self._model_cls)
         model_args.setdefault("verbose", 1)
         self._model_args = model_args
         self._aggregator_args = aggregator_args or {}
 
+        self._set_training_attributes(training_args)
+
+        # Add dependencies
+        self._configure_dependencies()
+
+        self._configure_model_and_optimizer()
+
+    def _set_training_attributes(self, training_args: TrainingArgs) -> None:
+        """Assigns the optimizer and training arguments of a round.
+
+        Args:
+            training_args: Arguments that are used in training routines
+                such as epoch, dry_run etc.
+                Please see [`TrainingArgs`][fedbiomed.common.training_args.TrainingArgs]
+        """
         self._optimizer_args = training_args.optimizer_arguments() or {}
         self._training_args = training_args.pure_training_arguments()
         self._batch_maxnum = self._training_args.get('batch_maxnum', self._batch_maxnum)
 
-        # Add dependencies
-        self._configure_dependencies()
+    def _configure_model_and_optimizer(self):
+        """Creates the scikit-learn model and configures its optimizer from the model and optimizer arguments."""
+        self._model = SkLearnModel(self._model_cls)
 
         # configure optimizer (if provided in the TrainingPlan)
         self._configure_optimizer()
-        
+
         # FIXME: should we do that in `_configure_optimizer`
         # from now on, `self._optimizer`` is not None
         # Override default model parameters based on `self._model_args`.
         params = {
-            key: model_args.get(key, val)
+            key: self._model_args.get(key, val)
             for key, val in self._model.get_params().items()
         }
         self._model.set_params(**params)
         # Set up additional parameters (normally created by `self._model.fit`).
-        self._model.set_init_params(model_args)
+        self._model.set_init_params(self._model_args)
+
+    def reusable(self) -> bool:
+        """Whether the node can keep the training plan to run the next rounds of the same job.
+
+        Returns:
+            True once the training plan has been initialized with `post_init`
+        """
+        return self._model is not None
+
+    def reset_round(
+            self,
+            training_args: TrainingArgs,
+            aggregator_args: Optional[Dict[str, Any]] = None,
+    ) -> None:
+        """Prepares a training plan kept by the node for a new round of the same job.
+
+        The dependencies are kept, while the training arguments are assigned again, and the scikit-learn model,
+        whose fitting state is not part of its parameters, and the optimizer are created again.
+
+        Args:
+            training_args: Arguments of the new round that are used in training routines
+                such as epoch, num_updates etc.
+                Please see [`TrainingArgs`][fedbiomed.common.training_args.TrainingArgs]
+            aggregator_args: Arguments managed by and shared with the
+                researcher-side aggregator, for the new round.
+
+        Raises:
+            FedbiomedTrainingPlanError: the training plan is not reusable, or the optimizer configuration goes wrong
+        """
+        if not self.reusable():
+            super().reset_round(training_args, aggregator_args)
+        self._aggregator_args = aggregator_args or {}
+        self._set_training_attributes(training_args)
+        self._configure_model_and_optimizer()
 
     def set_data_loaders(
             self,
@@ -3,6 +3,7 @@
 
 """TrainingPlan definition for the pytorch deep learning framework."""
 
+import contextlib
 from abc import ABCMeta, abstractmethod
 
 from typing import Any, Dict, List, Tuple, OrderedDict, Optional, Union, Iterator
@@ -21,7 +22,6 @@ from fedbiomed.common.exceptions import FedbiomedTrainingPlanError
 from fedbiomed.common.logger import logger
 from fedbiomed.common.metrics import MetricTypes
 from fedbiomed.common.privacy import DPController
-from fedbiomed.common.training_args import TrainingArgs
 from fedbiomed.common.training_plans._training_iterations import MiniBatchTrainingIterationsAccountant
 from fedbiomed.common.training_plans._base_training_plan import BaseTrainingPlan
 from fedbiomed.common.utils import get_method_spec
@@ -30,6 +30,13 @@ from fedbiomed.common.utils import get_method_spec
 
 ModelInputType = Union[torch.Tensor, Dict, List, Tuple]
 
+# Message to format for unexpected argument definitions in special methods
+_METHOD_ERROR = \
+    ErrorNumbers.FB605.value + ": Special method `{method}` has more than one argument: {keys}. This method " \
+                               "can not have more than one argument/parameter (for {prefix} arguments) or " \
+                               "method can be defined without argument and `{alternative}` can be used for " \
+                               "accessing {prefix} arguments defined in the experiment."
+
 
 class TorchTrainingPlan(BaseTrainingPlan, metaclass=ABCMeta):
     """Implements  TrainingPlan for torch NN framework
@@ -91,6 +98,11 @@ class TorchTrainingPlan(BaseTrainingPlan, metaclass=ABCMeta):
 
         self.correction_state: OrderedDict = OrderedDict()
         self.aggregator_name: str = None
+        # correction state materialized on the training device during the training routine,
+        # as parameters and correction tensors in the same order
+        self._corrections: Optional[Tuple[List[nn.Parameter], List[torch.Tensor]]] = None
+        # initial buffers of the model, restored when the training plan is reused for a new round
+        self._initial_buffers: Dict[str, torch.Tensor] = {}
 
         # TODO : add random seed init
         # self.random_seed_params = None
@@ -102,6 +114,9 @@ class TorchTrainingPlan(BaseTrainingPlan, metaclass=ABCMeta):
         self._device_init: str = "cpu"
         self._device = self._device_init
 
+        # bfloat16 mixed precision on CPU, see `set_performance_profile`
+        self._bfloat16: bool = False
+
         # list dependencies of the model
         self.add_dependency(["import torch",
                              "import torch.nn as nn",
@@ -140,6 +155,24 @@ class TorchTrainingPlan(BaseTrainingPlan, metaclass=ABCMeta):
         # Assign model arguments.
         self._model_args = model_args
         # Assign scalar attributes.
+        self._set_training_attributes(training_args)
+        # Optionally set up differential privacy.
+        self._dp_controller = DPController(training_args.dp_arguments() or None)
+        # Add dependencies
+        self._configure_dependencies()
+        # Configure aggregator-related arguments
+        self.set_aggregator_args(aggregator_args or {})
+        # Configure the model and optimizer.
+        self._configure_model_and_optimizer()
+
+    def _set_training_attributes(self, training_args: TrainingArgs) -> None:
+        """Assigns the optimizer and training arguments of a round.
+
+        Args:
+            training_args: Arguments that are used in training routines
+                such as epoch, dry_run etc.
+                Please see [`TrainingArgs`][fedbiomed.common.training_args.TrainingArgs]
+        """
         self._optimizer_args = training_args.optimizer_arguments() or {}
         self._training_args = training_args.pure_training_arguments()
         self._use_gpu = self._training_args.get('use_gpu')
@@ -149,16 +182,49 @@ class TorchTrainingPlan(BaseTrainingPlan, metaclass=ABCMeta):
         self._num_updates = self._training_args.get('num_updates', 1)
         self._dry_run = self._training_args.get('dry_run')
         self._share_persistent_buffers = training_args.get('share_persistent_buffers', True)
-        # Optionally set up differential privacy.
-        self._dp_controller = DPController(training_args.dp_arguments() or None)
-        # Add dependencies
-        self._configure_dependencies()
-        # Configure aggregator-related arguments
         # TODO: put fedprox mu inside strategy_args
         self._fedprox_mu = self._training_args.get('fedprox_mu')
+
+    def reusable(self) -> bool:
+        """Whether the node can keep the training plan to run the next rounds of the same job.
+
+        Training plans using differential privacy are not reusable, because the model is modified for private
+        training during the training routine.
+
+        Returns:
+            True if `reset_round` can prepare the training plan for a new round
+        """
+        return self._model is not None and not (self._dp_controller is not None and self._dp_controller.is_active)
+
+    def reset_round(
+            self,
+            training_args: TrainingArgs,
+            aggregator_args: Optional[Dict[str, Any]] = None,
+    ) -> None:
+        """Prepares a training plan kept by the node for a new round of the same job.
+
+        The model and its dependencies are kept, its initial buffers are restored, and the training arguments,
+        the optimizer and the aggregator arguments are configured again.
+
+        Args:
+            training_args: Arguments of the new round that are used in training routines
+                such as epoch, num_updates etc.
+                Please see [`TrainingArgs`][fedbiomed.common.training_args.TrainingArgs]
+            aggregator_args: Arguments managed by and shared with the
+                researcher-side aggregator, for the new round.
+
+        Raises:
+            FedbiomedTrainingPlanError: the training plan is not reusable, or the optimizer configuration goes wrong
+        """
+        if not self.reusable():
+            super().reset_round(training_args, aggregator_args)
+        self._model.model.load_state_dict(self._initial_buffers, strict=False)
+        self._set_training_attributes(training_args)
+        self.correction_state = OrderedDict()
+        self._corrections = None
+        self.aggregator_name = None
         self.set_aggregator_args(aggregator_args or {})
-        # Configure the model and optimizer.
-        self._configure_model_and_optimizer()
+        self._configure_optimizer()
 
     @abstractmethod
     def init_model(self):
@@ -249,13 +315,7 @@ class TorchTrainingPlan(BaseTrainingPlan, metaclass=ABCMeta):
 
     def _configure_model_and_optimizer(self):
         """Configures model and optimizer before training """
-
-        # Message to format for unexpected argument definitions in special methods
-        method_error = \
-            ErrorNumbers.FB605.value + ": Special method `{method}` has more than one argument: {keys}. This method " \
-                                       "can not have more than one argument/parameter (for {prefix} arguments) or " \
-                                       "method can be defined without argument and `{alternative}` can be used for " \
-                                       "accessing {prefix} arguments defined in the experiment."
+        method_error = _METHOD_ERROR
 
         # Get model defined by user -----------------------------------------------------------------------------
         init_model_spec = get_method_spec(self.init_model)
@@ -272,6 +332,14 @@ class TorchTrainingPlan(BaseTrainingPlan, metaclass=ABCMeta):
         # Validate and fix model
         model = self._dp_controller.validate_and_fix_model(model)
         self._model = TorchModel(model)
+        # buffers (eg: batch norm statistics) are not always part of the parameters of a round
+        self._initial_buffers = {name: buffer.detach().clone() for name, buffer in model.named_buffers()}
+
+        self._configure_optimizer()
+
+    def _configure_optimizer(self):
+        """Configures the optimizer of the model"""
+        method_error = _METHOD_ERROR
 
         # Get optimizer defined by researcher ---------------------------------------------------------------------
         init_optim_spec = get_method_spec(self.init_optimizer)
@@ -338,6 +406,57 @@ class TorchTrainingPlan(BaseTrainingPlan, metaclass=ABCMeta):
                      f"gpu_only={node_args['gpu_only']}, "
                      f"use_gpu={use_gpu}, gpu_num={node_args['gpu_num']})")
 
+    def set_performance_profile(self, node_args: Optional[Dict[str, Any]] = None) -> Dict[str, Any]:
+        """Applies the node CPU performance profile to the training and validation routines.
+
+        Torch intra-op and inter-op thread pools are process-wide: the number of intra-op threads
+        is set for each call, whereas the number of inter-op threads can only be changed before
+        torch starts any inter-op parallel work in the process.
+
+        Args:
+            node_args: command line arguments for node. Can include:
+                - `cpu_threads (Union[int, None])`: number of torch intra-op threads, torch default if None.
+                - `cpu_interop_threads (Union[int, None])`: number of torch inter-op threads, torch default
+                    if None.
+                - `cpu_bfloat16 (bool)`: use bfloat16 autocast for the forward passes on CPU. Default False.
+
+        Returns:
+            Effective settings, reported in the training reply timing.
+        """
+        node_args = {} if not isinstance(node_args, dict) else node_args
+
+        threads = node_args.get('cpu_threads')
+        if threads:
+            torch.set_num_threads(int(threads))
+
+        interop_threads = node_args.get('cpu_interop_threads')
+        if interop_threads and interop_threads != torch.get_num_interop_threads():
+            try:
+                torch.set_num_interop_threads(int(interop_threads))
+            except RuntimeError as e:
+                logger.warning(f"Cannot set the number of torch inter-op threads to {interop_threads}, keeping "
+                               f"{torch.get_num_interop_threads()}: {e}")
+
+        self._bfloat16 = bool(node_args.get('cpu_bfloat16', False))
+        if self._bfloat16 and self._dp_controller is not None and self._dp_controller.is_active:
+            # per-sample gradients of bfloat16 activations cannot be accumulated in fp32 parameters
+            logger.warning("bfloat16 autocast is not compatible with differential privacy, training in fp32")
+            self._bfloat16 = False
+
+        return {'cpu_threads': torch.get_num_threads(),
+                'cpu_interop_threads': torch.get_num_interop_threads(),
+                'cpu_bfloat16': self._bfloat16}
+
+    def _autocast(self, device: str) -> contextlib.AbstractContextManager:
+        """Context for the forward passes: bfloat16 autocast on CPU if enabled by the performance profile.
+
+        Args:
+            device: device the forward passes run on
+        """
+        if self._bfloat16 and torch.device(device).type == 'cpu':
+            return torch.autocast(device_type='cpu', dtype=torch.bfloat16)
+        return contextlib.nullcontext()
+
     def send_to_device(self,
                        to_send: Union[torch.Tensor, list, tuple, dict],
                        device: torch.device
@@ -399,84 +518,88 @@ class TorchTrainingPlan(BaseTrainingPlan, metaclass=ABCMeta):
         # set correct type for node args
         node_args = {} if not isinstance(node_args, dict) else node_args
 
-        # send all model to device, ensures having all the requested tensors
         self._set_device(self._use_gpu, node_args)
-        self._model.send_to_device(self._device)
-
-        # Run preprocess when everything is ready before the training
-        self._preprocess()
-
-        # # initial aggregated model parameters
-        # self._init_params = deepcopy(list(self.model().parameters()))
-
-        # DP actions
-        self._optimizer, self.training_data_loader = \
-            self._dp_controller.before_training(optimizer= self._optimizer, loader=self.training_data_loader)
-
-        # set number of training loop iterations
-        iterations_accountant = MiniBatchTrainingIterationsAccountant(self)
-
-        # Training loop iterations
-        for epoch in iterations_accountant.iterate_epochs():
-            training_data_iter: Iterator = iter(self.training_data_loader)
-
-            for batch_idx in iterations_accountant.iterate_batches():
-                # retrieve data and target
-                data, target = next(training_data_iter)
-
-                # update accounting for number of observed samples
-                batch_size = self._infer_batch_size(data)
-                iterations_accountant.increment_sample_counters(batch_size)
-
-                # handle training on accelerator devices
-                data, target = self.send_to_device(data, self._device), self.send_to_device(target, self._device)
-
-                # train this batch
-                corrected_loss, loss = self._train_over_batch(data, target)
-
-                # Reporting
-                if iterations_accountant.should_log_this_batch():
-                    # Retrieve reporting information: semantics differ whether num_updates or epochs were specified
-                    num_samples, num_samples_max = iterations_accountant.reporting_on_num_samples()
-                    num_iter, num_iter_max = iterations_accountant.reporting_on_num_iter()
-                    epoch_to_report = iterations_accountant.reporting_on_epoch()
-
-                    logger.debug('Train {}| '
-                                 'Iteration {}/{} | '
-                                 'Samples {}/{} ({:.0f}%)\tLoss: {:.6f}'.format(
-                                     f'Epoch: {epoch_to_report} ' if epoch_to_report is not None else '',
-                                     num_iter,
-                                     num_iter_max,
-                                     num_samples,
-                                     num_samples_max,
-                                     100. * num_iter / num_iter_max,
-                                     loss.item())
-                                 )
-
-                    # Send scalar values via general/feedback topic
-                    if history_monitor is not None:
-                        # the researcher only sees the average value of samples observed until now
-                        history_monitor.add_scalar(metric={'Loss': loss.item()},
-                                                   iteration=num_iter,
-                                                   epoch=epoch_to_report,
-                                                   train=True,
-                                                   num_samples_trained=num_samples,
-                                                   num_batches=num_iter_max,
-                                                   total_samples=num_samples_max,
-                                                   batch_samples=batch_size)
-
-                # Handle dry run mode
-                if self._dry_run:
-                    self._model.send_to_device(self._device_init)
-                    torch.cuda.empty_cache()
-                    return iterations_accountant.num_samples_observed_in_total
-
-        # release gpu usage as much as possible though:
-        # - it should be done by deleting the object
-        # - and some gpu memory remains used until process (cuda kernel ?) finishes
-
-        self._model.send_to_device(self._device_init)
-        torch.cuda.empty_cache()
+        # the device is released even if the training fails
+        try:
+            # send all model to device, ensures having all the requested tensors
+            self._model.send_to_device(self._device)
+
+            # Run preprocess when everything is ready before the training
+            self._preprocess()
+
+            # # initial aggregated model parameters
+            # self._init_params = deepcopy(list(self.model().parameters()))
+
+            # DP actions
+            self._optimizer, self.training_data_loader = \
+                self._dp_controller.before_training(optimizer= self._optimizer, loader=self.training_data_loader)
+
+            # If Scaffold is used: place corrections on the training device once for the whole round
+            if self.aggregator_name is not None and self.aggregator_name.lower() == "scaffold":
+                self._corrections = self._align_parameters_state(self.correction_state)
+
+            # set number of training loop iterations
+            iterations_accountant = MiniBatchTrainingIterationsAccountant(self)
+
+            # data loaders yield CPU tensors: no need to transfer batches when training on CPU
+            transfer_batches = torch.device(self._device).type != 'cpu'
+
+            # Training loop iterations
+            for epoch in iterations_accountant.iterate_epochs():
+                training_data_iter: Iterator = iter(self.training_data_loader)
+
+                for batch_idx in iterations_accountant.iterate_batches():
+                    # retrieve data and target
+                    data, target = next(training_data_iter)
+
+                    # update accounting for number of observed samples
+                    batch_size = self._infer_batch_size(data)
+                    iterations_accountant.increment_sample_counters(batch_size)
+
+                    # handle training on accelerator devices
+                    if transfer_batches:
+                        data = self.send_to_device(data, self._device)
+                        target = self.send_to_device(target, self._device)
+
+                    # train this batch
+                    corrected_loss, loss = self._train_over_batch(data, target)
+
+                    # Reporting
+                    if iterations_accountant.should_log_this_batch():
+                        # Retrieve reporting information: semantics differ whether num_updates or epochs were specified
+                        num_samples, num_samples_max = iterations_accountant.reporting_on_num_samples()
+                        num_iter, num_iter_max = iterations_accountant.reporting_on_num_iter()
+                        epoch_to_report = iterations_accountant.reporting_on_epoch()
+
+                        logger.debug('Train {}| '
+                                     'Iteration {}/{} | '
+                                     'Samples {}/{} ({:.0f}%)\tLoss: {:.6f}'.format(
+                                         f'Epoch: {epoch_to_report} ' if epoch_to_report is not None else '',
+                                         num_iter,
+                                         num_iter_max,
+                                         num_samples,
+                                         num_samples_max,
+                                         100. * num_iter / num_iter_max,
+                                         loss.item())
+                                     )
+
+                        # Send scalar values via general/feedback topic
+                        if history_monitor is not None:
+                            # the researcher only sees the average value of samples observed until now
+                            history_monitor.add_scalar(metric={'Loss': loss.item()},
+                                                       iteration=num_iter,
+                                                       epoch=epoch_to_report,
+                                                       train=True,
+                                                       num_samples_trained=num_samples,
+                                                       num_batches=num_iter_max,
+                                                       total_samples=num_samples_max,
+                                                       batch_samples=batch_size)
+
+                    # Handle dry run mode
+                    if self._dry_run:
+                        return iterations_accountant.num_samples_observed_in_total
+        finally:
+            self._release_device()
         
         # # test (to be removed)
         # assert id(self._optimizer.model.model) == id(self._model.model)
@@ -497,6 +620,17 @@ class TorchTrainingPlan(BaseTrainingPlan, metaclass=ABCMeta):
         #     assert values == getattr(self._optimizer.model.model, attributes) 
         return iterations_accountant.num_samples_observed_in_total
 
+    def _release_device(self) -> None:
+        """Sends the model back to its initial device after training, and releases the training device."""
+        self._corrections = None
+        self._model.send_to_device(self._device_init)
+
+        # release gpu usage as much as possible though:
+        # - it should be done by deleting the object
+        # - and some gpu memory remains used until process (cuda kernel ?) finishes
+        if torch.device(self._device).type == 'cuda':
+            torch.cuda.empty_cache()
+
     def _train_over_batch(self, data: ModelInputType, target: ModelInputType) -> Tuple[torch.Tensor, torch.Tensor]:
         """Train the model over a single batch of data.
 
@@ -516,29 +650,69 @@ class TorchTrainingPlan(BaseTrainingPlan, metaclass=ABCMeta):
         # FIXME: `self._optimizer.train()` is never called but should be. 
         # FIXME 2: Should we move training process to `Optimizer` or `Model` class?
 
-        # compute loss
-        loss = self.training_step(data, target)  # raises an exception if not provided
-        corrected_loss = torch.clone(loss)
+        if self._dp_controller is not None and self._dp_controller.vectorized:
+            # compute the private gradients of the loss from vectorized per-sample gradients
+            loss = self._dp_controller.private_backward(self.training_step, data, target)
+            corrected_loss = torch.clone(loss)
+
+            # If FedProx is enabled: the regularization term does not depend on samples
+            if self._fedprox_mu is not None:
+                regularization = float(self._fedprox_mu) / 2 * self.__norm_l2()
+                regularization.backward()
+                corrected_loss += regularization.detach()
+        else:
+            # compute loss
+            with self._autocast(self._device):
+                loss = self.training_step(data, target)  # raises an exception if not provided
+            corrected_loss = torch.clone(loss)
 
-        # If FedProx is enabled: use regularized loss function
-        if self._fedprox_mu is not None:
-            corrected_loss += float(self._fedprox_mu) / 2 * self.__norm_l2()
+            # If FedProx is enabled: use regularized loss function
+            if self._fedprox_mu is not None:
+                corrected_loss += float(self._fedprox_mu) / 2 * self.__norm_l2()
 
-        # Run the backward pass to compute parameters' gradients
-        corrected_loss.backward()
+            # Run the backward pass to compute parameters' gradients
+            corrected_loss.backward()
 
         # If Scaffold is used: apply corrections to the gradients
-        if self.aggregator_name is not None and self.aggregator_name.lower() == "scaffold":
-            for name, param in self.model().named_parameters():
-                correction = self.correction_state.get(name)
-                if correction is not None:
-                    param.grad.sub_(correction.to(param.grad.device))
+        if self._corrections is not None:
+            # gradients are fetched at each step, as they may be re-allocated by `zero_grad`
+            pairs = [(param.grad, correction) for param, correction in zip(*self._corrections)
+                     if param.grad is not None]
+            if pairs:
+                grads, corrections = zip(*pairs)
+                torch._foreach_sub_(list(grads), list(corrections))
 
         # Have the optimizer collect, refine and apply gradients
         self._optimizer.step()
 
         return corrected_loss, loss
 
+    def _align_parameters_state(
+            self,
+            state: Dict[str, torch.Tensor]
+    ) -> Tuple[List[nn.Parameter], List[torch.Tensor]]:
+        """Aligns a per-parameter state supplied by the aggregator with the model parameters.
+
+        State tensors are sent once to the device and dtype of their parameter, and ordered as
+        `named_parameters()`, so that they can be applied with fused `torch._foreach_*` operations
+        at each training step.
+
+        Args:
+            state: tensors indexed by name of the parameter they apply to. Names that are not
+                parameters of the model are ignored.
+
+        Returns:
+            The parameters that have a state, and their state tensors in the same order.
+        """
+        params, tensors = [], []
+        for name, param in self.model().named_parameters():
+            tensor = state.get(name)
+            if tensor is not None:
+                params.append(param)
+                tensors.append(torch.as_tensor(tensor).to(device=param.device, dtype=param.dtype))
+
+        return params, tensors
+
     def testing_routine(
             self,
             metric: Optional[MetricTypes],
@@ -572,7 +746,7 @@ class TorchTrainingPlan(BaseTrainingPlan, metaclass=ABCMeta):
             raise FedbiomedTrainingPlanError(msg)
         try:
 
-            with torch.no_grad():
+            with torch.inference_mode(), self._autocast(self._device_init):
                 super().testing_routine(
                     metric, metric_args, history_monitor, before_train
                 )
@@ -23,6 +23,7 @@ from ._config_utils import (
     get_all_existing_certificates,
     get_existing_component_db_names,
 )
+from ._lazy_imports import lazy_import_attributes
 from ._secagg_utils import (
     matching_parties_servkey,
     matching_parties_biprime
@@ -55,6 +56,8 @@ __all__ = [
     "get_all_existing_config_files",
     "get_all_existing_certificates",
     "get_existing_component_db_names",
+    # _lazy_imports
+    "lazy_import_attributes",
     "matching_parties_servkey",
     "matching_parties_biprime",
     # _versions
@@ -0,0 +1,46 @@
+# This file is originally part of Fed-BioMed
+# SPDX-License-Identifier: Apache-2.0
+
+import importlib
+import sys
+from typing import Any, Callable, Dict, List, Tuple
+
+
+def lazy_import_attributes(
+        module_name: str,
+        attributes: Dict[str, str]
+) -> Tuple[Callable[[str], Any], Callable[[], List[str]]]:
+    """Creates the `__getattr__` and `__dir__` functions of a module whose attributes are imported on first access.
+
+    Modules such as `fedbiomed.common.data` re-export classes that depend on heavy frameworks (torch, scikit-learn,
+    MONAI...). Importing these classes only when they are used keeps the command line interfaces and the components
+    that do not train fast to start (see [PEP 562](https://peps.python.org/pep-0562/)).
+
+    **Typical use**, in the `__init__.py` of a package:
+
+    ```python
+    __getattr__, __dir__ = lazy_import_attributes(__name__, {
+        "TorchTrainingPlan": "._torchnn",
+    })
+    ```
+
+    Args:
+        module_name: name of the module, `__name__`
+        attributes: submodule defining each lazy attribute, as an absolute name or relative to the module
+
+    Returns:
+        Module functions `__getattr__`, importing a lazy attribute on first access, and `__dir__`, listing the module
+            attributes including the lazy ones
+    """
+    def __getattr__(name: str) -> Any:
+        if name not in attributes:
+            raise AttributeError(f"module {module_name!r} has no attribute {name!r}")
+        value = getattr(importlib.import_module(attributes[name], module_name), name)
+        # next accesses don't go through `__getattr__`
+        setattr(sys.modules[module_name], name, value)
+        return value
+
+    def __dir__() -> List[str]:
+        return sorted(set(vars(sys.modules[module_name])) | set(attributes))
+
+    return __getattr__, __dir__
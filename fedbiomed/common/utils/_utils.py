@@ -4,13 +4,16 @@
 import sys
 import inspect
 from collections.abc import Iterable
-from typing import Callable, Iterator, List, Optional, Union
+from typing import TYPE_CHECKING, Callable, Iterator, List, Optional, Union
 from IPython.core.magics.code import extract_symbols
 
-import torch
 import numpy as np
 from fedbiomed.common.exceptions import FedbiomedError
 
+if TYPE_CHECKING:
+    # torch is imported by the functions using it, so that importing the utils does not load it
+    import torch
+
 
 def read_file(path):
     """Read given file
@@ -130,7 +133,7 @@ def get_method_spec(method: Callable) -> dict:
     return method_spec
 
 
-def convert_to_python_float(value: Union[torch.Tensor, np.integer, np.floating, float, int]) -> float:
+def convert_to_python_float(value: Union['torch.Tensor', np.integer, np.floating, float, int]) -> float:
     """ Convert numeric types to float
 
     Args:
@@ -140,11 +143,14 @@ def convert_to_python_float(value: Union[torch.Tensor, np.integer, np.floating,
         Python float
     """
 
-    if not isinstance(value, (torch.Tensor, np.integer, np.floating, float, int)):
+    # a tensor can only be given if torch is already imported
+    torch = sys.modules.get('torch')
+    tensor_types = (torch.Tensor,) if torch is not None else ()
+    if not isinstance(value, (*tensor_types, np.integer, np.floating, float, int)):
         raise FedbiomedError(f"Converting {type(value)} to python to float is not supported.")
 
     # if the result is a tensor, convert it back to numpy
-    if isinstance(value, torch.Tensor):
+    if isinstance(value, tensor_types):
         value = value.numpy()
 
     if isinstance(value, Iterable) and value.size > 1:
@@ -177,7 +183,7 @@ def convert_iterator_to_list_of_python_floats(iterator: Iterator) -> List[float]
     return list_of_floats
 
 
-def compute_dot_product(model: dict, params: dict, device: Optional[str] = None) -> torch.tensor:
+def compute_dot_product(model: dict, params: dict, device: Optional[str] = None) -> 'torch.Tensor':
     """Compute the dot product between model and input parameters.
 
     Args:
@@ -187,6 +193,8 @@ def compute_dot_product(model: dict, params: dict, device: Optional[str] = None)
     Returns:
         A tensor containing a single numerical value which is the dot product.
     """
+    import torch
+
     model_p = model.values()
     correction_state = params.values()
     if device is None:
@@ -18,11 +18,10 @@ import readline
 from fedbiomed.common.constants import ErrorNumbers
 from fedbiomed.common.exceptions import FedbiomedError
 from fedbiomed.node.environ import environ
-from fedbiomed.node.node import Node
 from fedbiomed.common.logger import logger
 from fedbiomed.common.cli import CommonCLI
 from fedbiomed.node.cli_utils import dataset_manager, add_database, delete_database, delete_all_database, \
-    tp_security_manager, register_training_plan, update_training_plan, approve_training_plan, reject_training_plan, \
+    migrate_database, tp_security_manager, register_training_plan, update_training_plan, approve_training_plan, reject_training_plan, \
     delete_training_plan, view_training_plan
 
 #
@@ -84,6 +83,9 @@ def manage_node(node_args: Union[dict, None] = None):
 
     global node
 
+    # imports the frameworks used for training, only when the node is started
+    from fedbiomed.node.node import Node
+
     try:
         signal.signal(signal.SIGTERM, node_signal_handler)
 
@@ -198,6 +200,12 @@ def launch_cli():
     cli.parser.add_argument('-dm', '--delete-mnist',
                             help='Delete existing MNIST local dataset (non-interactive)',
                             action='store_true')
+    cli.parser.add_argument('-mdb', '--migrate-database',
+                            help='Migrate node database from TinyDB (JSON) to the SQLite backend (non-interactive)',
+                            action='store_true')
+    cli.parser.add_argument('-rdp', '--refresh-dataset-profiles',
+                            help='Recompute shape and statistics of the datasets whose data changed (non-interactive)',
+                            action='store_true')
     cli.parser.add_argument('-l', '--list',
                             help='List my shared_data',
                             action='store_true')
@@ -305,6 +313,11 @@ def launch_cli():
         delete_all_database()
     elif cli.arguments.delete_mnist:
         delete_database(interactive=False)
+    elif cli.arguments.migrate_database:
+        migrate_database()
+    elif cli.arguments.refresh_dataset_profiles:
+        refreshed = dataset_manager.refresh_dataset_profiles()
+        print(f'Refreshed profile of {len(refreshed)} dataset(s): {refreshed}')
     elif cli.arguments.register_training_plan:
         register_training_plan()
     elif cli.arguments.approve_training_plan:
@@ -325,7 +338,10 @@ def launch_cli():
             'gpu': (cli.arguments.gpu_num is not None) or (cli.arguments.gpu is True) or
                    (cli.arguments.gpu_only is True),
             'gpu_num': cli.arguments.gpu_num,
-            'gpu_only': (cli.arguments.gpu_only is True)
+            'gpu_only': (cli.arguments.gpu_only is True),
+            'cpu_threads': environ['CPU_THREADS'],
+            'cpu_interop_threads': environ['CPU_INTEROP_THREADS'],
+            'cpu_bfloat16': environ['CPU_BFLOAT16']
         }
         launch_node(node_args)
 
@@ -5,7 +5,7 @@
 to simplify imports from fedbiomed.node.cli_utils
 """
 
-from ._database import dataset_manager, add_database, delete_database, delete_all_database
+from ._database import dataset_manager, add_database, delete_database, delete_all_database, migrate_database
 from ._training_plan_management import tp_security_manager, register_training_plan, update_training_plan, approve_training_plan, reject_training_plan, \
     delete_training_plan, view_training_plan
 
@@ -14,6 +14,7 @@ __all__ = [
     'add_database',
     'delete_database',
     'delete_all_database',
+    'migrate_database',
     'tp_security_manager',
     'register_training_plan',
     'update_training_plan',
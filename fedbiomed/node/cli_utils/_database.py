@@ -7,14 +7,15 @@ import warnings
 from importlib import import_module
 from fedbiomed.common import data
 
-from fedbiomed.common.exceptions import FedbiomedDatasetError, FedbiomedDatasetManagerError
+from fedbiomed.common.constants import DatabaseBackend
+from fedbiomed.common.db import migrate_tinydb_to_sqlite
+from fedbiomed.common.exceptions import FedbiomedDatasetError, FedbiomedDatasetManagerError, FedbiomedDatabaseError
 from fedbiomed.common.logger import logger
-from fedbiomed.common.data import MedicalFolderController, DataLoadingPlan, FlambyDatasetMetadataBlock, \
-    FlambyLoadingBlockTypes
+from fedbiomed.common.data import DataLoadingPlan
 from fedbiomed.node.cli_utils._medical_folder_dataset import add_medical_folder_dataset_from_cli
 from fedbiomed.node.dataset_manager import DatasetManager
+from fedbiomed.node.environ import environ
 from fedbiomed.node.cli_utils._io import validated_data_type_input, validated_path_input
-from fedbiomed.common.data import discover_flamby_datasets
 
 
 dataset_manager = DatasetManager()
@@ -96,7 +97,7 @@ def add_database(interactive: bool = True,
                 path = None  # flamby datasets are not identified by their path
 
                 # Select the type of dataset (fed_ixi, fed_heart, etc...)
-                available_flamby_datasets = discover_flamby_datasets()
+                available_flamby_datasets = data.discover_flamby_datasets()
                 msg = "Please select the FLamby dataset that you're configuring:\n"
                 msg += "\n".join([f"\t{i}) {val}" for i, val in available_flamby_datasets.items()])
                 msg += "\nselect: "
@@ -127,12 +128,12 @@ def add_database(interactive: bool = True,
 
                 # Build the DataLoadingPlan with the selected dataset type and center id
                 data_loading_plan = DataLoadingPlan()
-                metadata_dlb = FlambyDatasetMetadataBlock()
+                metadata_dlb = data.FlambyDatasetMetadataBlock()
                 metadata_dlb.metadata = {
                     'flamby_dataset_name': available_flamby_datasets[flamby_dataset_index],
                     'flamby_center_id': center_id
                 }
-                data_loading_plan[FlambyLoadingBlockTypes.FLAMBY_DATASET_METADATA] = metadata_dlb
+                data_loading_plan[data.FlambyLoadingBlockTypes.FLAMBY_DATASET_METADATA] = metadata_dlb
             else:
                 path = validated_path_input(data_type)
 
@@ -255,3 +256,27 @@ def delete_all_database():
         logger.info('Dataset removed for tags:' + str(tags))
 
     return
+
+
+def migrate_database():
+    """Migrates the node's TinyDB JSON database to the SQLite backend.
+
+    The JSON database is kept unchanged. The node uses the migrated database once `db_backend = sqlite`
+    is set in the `default` section of the node configuration file (or `DB_BACKEND=sqlite` in the environment).
+    """
+    if environ['DB_BACKEND'] != DatabaseBackend.TINYDB.value:
+        logger.warning(f"Node database backend is already {environ['DB_BACKEND']}, nothing to migrate")
+        return
+
+    json_path = environ['DB_PATH']
+    sqlite_path = os.path.splitext(json_path)[0] + '.sqlite'
+    try:
+        migrated = migrate_tinydb_to_sqlite(json_path, sqlite_path)
+    except FedbiomedDatabaseError as e:
+        logger.error(f"Database migration failed: {e}")
+        return
+
+    for table, count in migrated.items():
+        logger.info(f"Migrated {count} entries of table {table}")
+    logger.info(f"Node database migrated to {sqlite_path}. Set `db_backend = sqlite` in the [default] section "
+                f"of the node configuration file to use it.")
@@ -5,7 +5,8 @@ from typing import Optional, List, Tuple
 import warnings
 from copy import copy
 from collections import defaultdict
-from fedbiomed.common.data import DataLoadingPlan, MedicalFolderController, MedicalFolderBase, MapperBlock
+from fedbiomed.common import data
+from fedbiomed.common.data import DataLoadingPlan, MapperBlock
 from fedbiomed.node.cli_utils._io import validated_path_input
 
 
@@ -14,7 +15,7 @@ def add_medical_folder_dataset_from_cli(interactive: bool,
                                         dlp: Optional[DataLoadingPlan]) -> Tuple[str, dict, DataLoadingPlan]:
     print('Please select the root folder of the Medical Folder dataset')
     path = validated_path_input(type='dir')
-    controller = MedicalFolderController(path)
+    controller = data.MedicalFolderController(path)
     dataset_parameters = {} if dataset_parameters is None else dataset_parameters
 
     choice = input('\nWould you like to select a demographics csv file? [y/N]\n')
@@ -55,7 +56,7 @@ def add_medical_folder_dataset_from_cli(interactive: bool,
 
 
 def get_map_modalities2folders_from_cli(modality_folder_names: List[str]) -> MapperBlock:
-    modality_names = ['Manually insert new modality name', *copy(MedicalFolderBase.default_modality_names)]
+    modality_names = ['Manually insert new modality name', *copy(data.MedicalFolderBase.default_modality_names)]
     map_modalities_to_folders = defaultdict(list)
     for modality_folder in modality_folder_names:
         keep_asking_for_this_modality = True
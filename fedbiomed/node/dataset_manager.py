@@ -7,8 +7,11 @@ Interfaces with the node component database.
 
 
 import csv
+from datetime import datetime
+import itertools
+import math
 import os.path
-from typing import Iterable, Union, List, Any, Optional, Tuple
+from typing import TYPE_CHECKING, Iterable, Iterator, Union, List, Any, Optional, Tuple
 import uuid
 
 from urllib.request import urlretrieve
@@ -16,32 +19,39 @@ from urllib.error import ContentTooShortError, HTTPError, URLError
 import tarfile
 from fedbiomed.common import data
 
-from tinydb import TinyDB, Query
-import pandas as pd
+from tinydb import Query
 from tabulate import tabulate  # only used for printing
 
-import torch
-from torchvision import datasets
-from torchvision import transforms
-
 from fedbiomed.node.environ import environ
+from fedbiomed.common.db import open_database
 from fedbiomed.common.exceptions import FedbiomedError, FedbiomedDatasetManagerError
 from fedbiomed.common.constants import ErrorNumbers, DatasetTypes
-from fedbiomed.common.data import MedicalFolderController, DataLoadingPlan, DataLoadingBlock, FlambyLoadingBlockTypes, \
-    FlambyDataset
+from fedbiomed.common.data import DataLoadingPlan, DataLoadingBlock
 from fedbiomed.common.logger import logger
 
+if TYPE_CHECKING:
+    # pandas, torch and torchvision are imported when loading datasets, so that managing the database does not
+    # load them
+    import pandas as pd
+    import torch
+
+_PROFILE_SCAN_DEPTH = 2
+"""Depth of sub-folders whose modification time is checked to detect changes of a folder dataset"""
+
+_CSV_SNIFF_LINES = 100
+"""Number of lines of a CSV file read to identify its delimiter and header"""
 
 class DatasetManager:
     """Interfaces with the node component database.
 
     Facility for storing data, retrieving data and getting data info
-    for the node. Currently uses TinyDB.
+    for the node. Uses the storage backend selected by the node configuration
+    (TinyDB JSON file or SQLite), see [`open_database`][fedbiomed.common.db.open_database].
     """
     def __init__(self):
         """Constructor of the class.
         """
-        self._db = TinyDB(environ['DB_PATH'])
+        self._db = open_database(environ['DB_PATH'])
         self._database = Query()
 
         # don't use DB read cache to ensure coherence
@@ -149,7 +159,7 @@ class DatasetManager:
 
         return self._dataset_table.search(self._database.tags.test(_conflicting_tags))
 
-    def read_csv(self, csv_file: str, index_col: Union[int, None] = None) -> pd.DataFrame:
+    def read_csv(self, csv_file: str, index_col: Union[int, None] = None) -> 'pd.DataFrame':
         """Gets content of a CSV file.
 
         Reads a *.csv file and outputs its data into a pandas DataFrame.
@@ -163,17 +173,130 @@ class DatasetManager:
         Returns:
             Pandas DataFrame with data contained in CSV file.
         """
+        delimiter, header = self._sniff_csv(csv_file)
+
+        import pandas as pd
+        return pd.read_csv(csv_file, index_col=index_col, sep=delimiter, header=header)
+
+    def read_csv_window(self,
+                        csv_file: str,
+                        offset: int = 0,
+                        limit: Optional[int] = None,
+                        columns: Optional[List[Union[str, int]]] = None) -> 'pd.DataFrame':
+        """Gets a window of rows of a CSV file, without loading the whole file.
+
+        Args:
+            csv_file: File name / path
+            offset: Index of the first data row to read (the header is not counted).
+            limit: Maximum number of rows to read. Reads until the end of the file if None.
+            columns: Names (or indexes if the file has no header) of the columns to read.
+                Reads all columns if None.
+
+        Returns:
+            Pandas DataFrame with the requested rows, empty if `offset` is beyond the end of the file.
+        """
+        delimiter, header = self._sniff_csv(csv_file)
+
+        import pandas as pd
+        return pd.read_csv(csv_file, sep=delimiter, header=header, nrows=limit, usecols=columns,
+                           skiprows=self._csv_skiprows(offset, header))
+
+    def iter_csv(self,
+                 csv_file: str,
+                 offset: int = 0,
+                 limit: Optional[int] = None,
+                 columns: Optional[List[Union[str, int]]] = None,
+                 chunk_size: int = 1000) -> Iterator['pd.DataFrame']:
+        """Iterates over a window of rows of a CSV file by chunks.
+
+        Memory usage is bounded by the chunk size, whatever the size of the window.
+
+        Args:
+            csv_file: File name / path
+            offset: Index of the first data row to read (the header is not counted).
+            limit: Maximum number of rows to read. Reads until the end of the file if None.
+            columns: Names (or indexes if the file has no header) of the columns to read.
+                Reads all columns if None.
+            chunk_size: Maximum number of rows of each chunk
+
+        Yields:
+            Pandas DataFrames of at most `chunk_size` rows
+        """
+        delimiter, header = self._sniff_csv(csv_file)
 
-        # Automatically identify separator and header
+        import pandas as pd
+        with pd.read_csv(csv_file, sep=delimiter, header=header, nrows=limit, usecols=columns,
+                         skiprows=self._csv_skiprows(offset, header), chunksize=chunk_size) as reader:
+            for chunk in reader:
+                yield chunk
+
+    def count_csv_rows(self, csv_file: str, max_bytes: Optional[int] = None) -> Tuple[int, bool]:
+        """Counts data rows of a CSV file by streaming it, without parsing it.
+
+        Rows are counted from line breaks, so quoted values that contain line breaks
+        are counted as several rows.
+
+        Args:
+            csv_file: File name / path
+            max_bytes: If the file is bigger, only reads this number of bytes and
+                extrapolates the number of rows. Reads the whole file if None.
+
+        Returns:
+            The number of rows, and whether this number is exact (False if it is an estimation).
+        """
+        _, header = self._sniff_csv(csv_file)
+        size = os.path.getsize(csv_file)
+        to_read = size if max_bytes is None else min(size, max_bytes)
+
+        lines, read, last = 0, 0, b'\n'
+        with open(csv_file, 'rb') as file:
+            while read < to_read:
+                block = file.read(min(1024 * 1024, to_read - read))
+                if not block:
+                    break
+                lines += block.count(b'\n')
+                read += len(block)
+                last = block[-1:]
+
+        exact = read >= size
+        if exact:
+            # last line without line break
+            lines += 0 if last == b'\n' else 1
+        elif read:
+            lines = round(lines * size / read)
+
+        rows = lines - (1 if header == 0 else 0)
+        return max(rows, 0), exact
+
+    @staticmethod
+    def _sniff_csv(csv_file: str) -> Tuple[str, Union[int, None]]:
+        """Identifies delimiter and header of a CSV file from its first lines.
+
+        Args:
+            csv_file: File name / path
+
+        Returns:
+            The delimiter, and the row of the header (`0`) or None if the file has no header.
+        """
         sniffer = csv.Sniffer()
         with open(csv_file, 'r') as file:
             delimiter = sniffer.sniff(file.readline()).delimiter
             file.seek(0)
-            header = 0 if sniffer.has_header(file.read()) else None
+            sample = ''.join(itertools.islice(file, _CSV_SNIFF_LINES))
+            header = 0 if sniffer.has_header(sample) else None
 
-        return pd.read_csv(csv_file, index_col=index_col, sep=delimiter, header=header)
+        return delimiter, header
+
+    @staticmethod
+    def _csv_skiprows(offset: int, header: Union[int, None]) -> Optional[range]:
+        """Gets lines to skip for reading CSV data rows from `offset`, keeping the header"""
+        if not offset:
+            return None
+
+        start = 1 if header == 0 else 0
+        return range(start, start + offset)
 
-    def get_torch_dataset_shape(self, dataset: torch.utils.data.Dataset) -> List[int]:
+    def get_torch_dataset_shape(self, dataset: 'torch.utils.data.Dataset') -> List[int]:
         """Gets info about dataset shape.
 
         Args:
@@ -187,7 +310,7 @@ class DatasetManager:
         """
         return [len(dataset)] + list(dataset[0][0].shape)
 
-    def get_csv_data_types(self, dataset: pd.DataFrame) -> List[str]:
+    def get_csv_data_types(self, dataset: 'pd.DataFrame') -> List[str]:
         """Gets data types of each variable in dataset.
 
         Args:
@@ -200,11 +323,124 @@ class DatasetManager:
 
         return types
 
+    def get_csv_statistics(self, dataset: 'pd.DataFrame') -> dict:
+        """Computes summary statistics of each variable in dataset.
+
+        Args:
+            dataset: A Pandas dataset.
+
+        Returns:
+            A dict indexed by column name. Each value contains the number of
+                non missing and missing values, plus the mean, standard deviation,
+                min and max for numeric columns or the number of unique values for
+                other columns.
+        """
+        numeric = dataset.select_dtypes(include='number')
+        summary = numeric.agg(['mean', 'std', 'min', 'max']) if not numeric.empty else None
+        counts = dataset.count()
+        missing = dataset.isna().sum()
+
+        statistics = {}
+        for column in dataset.columns:
+            stats = {'count': int(counts[column]), 'missing': int(missing[column])}
+            if column in numeric.columns:
+                stats.update({stat: self._to_json_float(summary.at[stat, column])
+                              for stat in ('mean', 'std', 'min', 'max')})
+            else:
+                stats['unique'] = int(dataset[column].nunique())
+            statistics[str(column)] = stats
+
+        return statistics
+
+    def profile_dataset(self,
+                        data_type: str,
+                        dataset: Any,
+                        path: Optional[str] = None,
+                        dataset_parameters: Optional[dict] = None) -> dict:
+        """Computes the profile of a loaded dataset, saved in the database at registration time.
+
+        Profiles are served in `search`/`list` replies and in the GUI, so that the data
+        does not need to be read again to describe the dataset.
+
+        Args:
+            data_type: File extension/format of the dataset (*.csv, images, ...)
+            dataset: the loaded dataset (`pd.DataFrame` for CSV datasets, dataset object otherwise)
+            path: Path to the dataset, used to detect later modifications of the data.
+            dataset_parameters: a dictionary of additional (customized) parameters, or None
+
+        Returns:
+            A dict containing the number of samples (`n_samples`), the summary statistics of
+                tabular variables (`statistics`), the number of samples per class for labelled
+                image datasets (`targets`), and the information used for refreshing the profile.
+        """
+        profile = {'n_samples': len(dataset)}
+
+        if data_type == 'csv':
+            profile['statistics'] = self.get_csv_statistics(dataset)
+        elif data_type == 'medical-folder':
+            if dataset.demographics is not None:
+                profile['statistics'] = self.get_csv_statistics(dataset.demographics)
+        else:
+            import torch
+            targets = getattr(dataset, 'targets', None)
+            if isinstance(targets, (list, torch.Tensor)) and len(targets) > 0:
+                counts = torch.bincount(torch.as_tensor(targets).flatten().long()).tolist()
+                classes = getattr(dataset, 'classes', None)
+                if classes is None or len(classes) != len(counts):
+                    classes = range(len(counts))
+                profile['targets'] = {str(c): n for c, n in zip(classes, counts)}
+
+        profile['source_mtime'] = self._source_mtime(path, dataset_parameters)
+        profile['profiled_at'] = datetime.now().strftime("%d-%m-%Y %H:%M:%S.%f")
+
+        return profile
+
+    @staticmethod
+    def _to_json_float(value: Any) -> Optional[float]:
+        """Converts a numeric statistic to a JSON compatible float (None for NaN/infinite values)."""
+        value = float(value)
+        return value if math.isfinite(value) else None
+
+    @staticmethod
+    def _source_mtime(path: Optional[str], dataset_parameters: Optional[dict] = None) -> Optional[float]:
+        """Gets the latest modification time of a dataset's files.
+
+        For folders, only the modification time of the folder and its sub-folders (up to
+        `_PROFILE_SCAN_DEPTH` levels, eg: classes, subjects, modalities) is checked: adding or
+        removing a sample changes the time of the folder containing it, so the data files
+        themselves are never opened or stat-ed one by one.
+
+        Args:
+            path: Path to the dataset
+            dataset_parameters: a dictionary of additional (customized) parameters, or None
+
+        Returns:
+            Latest modification time as a timestamp, or None if the dataset has no local path.
+        """
+        if path is None or not os.path.exists(path):
+            return None
+
+        mtime = os.path.getmtime(path)
+        folders = [path] if os.path.isdir(path) else []
+        for _ in range(_PROFILE_SCAN_DEPTH):
+            subfolders = []
+            for folder in folders:
+                with os.scandir(folder) as entries:
+                    subfolders.extend(e.path for e in entries if e.is_dir(follow_symlinks=False))
+            mtime = max([mtime] + [os.path.getmtime(f) for f in subfolders])
+            folders = subfolders
+
+        tabular_file = (dataset_parameters or {}).get('tabular_file')
+        if tabular_file is not None and os.path.isfile(tabular_file):
+            mtime = max(mtime, os.path.getmtime(tabular_file))
+
+        return mtime
+
     def load_default_database(self,
                               name: str,
                               path: str,
                               as_dataset: bool = False) -> Union[List[int],
-                                                                 torch.utils.data.Dataset]:
+                                                                 'torch.utils.data.Dataset']:
         """Loads a default dataset.
 
         Currently, only MNIST dataset is used as the default dataset.
@@ -227,6 +463,8 @@ class DatasetManager:
             If set to False, returns the size of the dataset stored inside
             a list (type: List[int]).
         """
+        from torchvision import datasets, transforms
+
         kwargs = dict(root=path, download=True, transform=transforms.ToTensor())
 
         if 'mnist' in name.lower():
@@ -242,7 +480,7 @@ class DatasetManager:
     def load_mednist_database(self,
                               path: str,
                               as_dataset: bool = False) -> Union[List[int],
-                                                                 torch.utils.data.Dataset]:
+                                                                 'torch.utils.data.Dataset']:
         """Loads the MedNist dataset.
 
         Args:
@@ -285,6 +523,7 @@ class DatasetManager:
                 logger.error(_msg)
                 raise FedbiomedDatasetManagerError(_msg)
 
+        from torchvision import datasets, transforms
         try:
             dataset = datasets.ImageFolder(download_path,
                                            transform=transforms.ToTensor())
@@ -309,7 +548,7 @@ class DatasetManager:
     def load_images_dataset(self,
                             folder_path: str,
                             as_dataset: bool = False) -> Union[List[int],
-                                                               torch.utils.data.Dataset]:
+                                                               'torch.utils.data.Dataset']:
         """Loads an image dataset.
 
         Args:
@@ -324,6 +563,7 @@ class DatasetManager:
             If set to False, returns the size of the dataset stored inside
             a list (type: List[int])
         """
+        from torchvision import datasets, transforms
         try:
             dataset = datasets.ImageFolder(folder_path,
                                            transform=transforms.ToTensor())
@@ -340,7 +580,7 @@ class DatasetManager:
         else:
             return self.get_torch_dataset_shape(dataset)
 
-    def load_csv_dataset(self, path: str) -> pd.DataFrame:
+    def load_csv_dataset(self, path: str) -> 'pd.DataFrame':
         """Loads a CSV dataset.
 
         Args:
@@ -391,6 +631,52 @@ class DatasetManager:
             logger.critical(msg)
             raise FedbiomedDatasetManagerError(msg)
 
+        path, shape, dtypes, profile = self._inspect_dataset(name, data_type, path,
+                                                             dataset_parameters, data_loading_plan)
+
+        if not dataset_id:
+            dataset_id = 'dataset_' + str(uuid.uuid4())
+
+        new_database = dict(name=name, data_type=data_type, tags=tags,
+                            description=description, shape=shape,
+                            path=path, dataset_id=dataset_id, dtypes=dtypes,
+                            dataset_parameters=dataset_parameters, profile=profile)
+        if save_dlp:
+            dlp_id = self.save_data_loading_plan(data_loading_plan)
+        elif isinstance(data_loading_plan, DataLoadingPlan):
+            dlp_id = data_loading_plan.dlp_id
+        else:
+            dlp_id = None
+        if dlp_id is not None:
+            new_database['dlp_id'] = dlp_id
+        self._dataset_table.insert(new_database)
+
+        return dataset_id
+
+    def _inspect_dataset(self,
+                         name: str,
+                         data_type: str,
+                         path: Optional[str],
+                         dataset_parameters: Optional[dict],
+                         data_loading_plan: Optional[DataLoadingPlan]) -> Tuple[Optional[str], Any, List[str], dict]:
+        """Loads a dataset once to check it and compute the metadata saved in the database.
+
+        Args:
+            name: Name of the dataset
+            data_type: File extension/format of the dataset (*.csv, images, ...)
+            path: Path to the dataset.
+            dataset_parameters: a dictionary of additional (customized) parameters, or None
+            data_loading_plan: a DataLoadingPlan to be linked to this dataset, or None
+
+        Raises:
+            NotImplementedError: `data_type` is not supported.
+            FedbiomedDatasetManagerError: path does not exist or dataset cannot be read.
+
+        Returns:
+            A tuple with the path to save in the database, the shape of the dataset, the data types
+                of the variables (CSV datasets only) and the profile of the dataset
+                (see [`profile_dataset`][fedbiomed.node.dataset_manager.DatasetManager.profile_dataset]).
+        """
         dtypes = []  # empty list for Image datasets
         data_types = ['csv', 'default', 'mednist', 'images', 'medical-folder', 'flamby']
 
@@ -402,16 +688,16 @@ class DatasetManager:
         elif data_type == 'flamby':
             # check that data loading plan is present and well formed
             if data_loading_plan is None or \
-                    FlambyLoadingBlockTypes.FLAMBY_DATASET_METADATA not in data_loading_plan:
+                    data.FlambyLoadingBlockTypes.FLAMBY_DATASET_METADATA not in data_loading_plan:
                 msg = f"{ErrorNumbers.FB316.value}. A DataLoadingPlan containing " \
-                      f"{FlambyLoadingBlockTypes.FLAMBY_DATASET_METADATA.value} is required for adding a FLamby dataset " \
+                      f"{data.FlambyLoadingBlockTypes.FLAMBY_DATASET_METADATA.value} is required for adding a FLamby dataset " \
                       f"to the database."
                 logger.critical(msg)
                 raise FedbiomedDatasetManagerError(msg)
 
             # initialize a dataset and link to the flamby data. If all goes well, compute shape.
             try:
-                dataset = FlambyDataset()
+                dataset = data.FlambyDataset()
                 dataset.set_dlp(data_loading_plan)  # initializes fed_class as a side effect
             except FedbiomedError as e:
                 raise FedbiomedDatasetManagerError(f"Can not create FLamby dataset. {e}")
@@ -420,11 +706,13 @@ class DatasetManager:
 
         if data_type == 'default':
             assert os.path.isdir(path), f'Folder {path} for Default Dataset does not exist.'
-            shape = self.load_default_database(name, path)
+            dataset = self.load_default_database(name, path, as_dataset=True)
+            shape = self.get_torch_dataset_shape(dataset)
 
         elif data_type == 'mednist':
             assert os.path.isdir(path), f'Folder {path} for MedNIST Dataset does not exist.'
-            shape = self.load_mednist_database(path)
+            dataset = self.load_mednist_database(path, as_dataset=True)
+            shape = self.get_torch_dataset_shape(dataset)
             path = os.path.join(path, 'MedNIST')
 
         elif data_type == 'csv':
@@ -435,7 +723,8 @@ class DatasetManager:
 
         elif data_type == 'images':
             assert os.path.isdir(path), f'Folder {path} for Images Dataset does not exist.'
-            shape = self.load_images_dataset(path)
+            dataset = self.load_images_dataset(path, as_dataset=True)
+            shape = self.get_torch_dataset_shape(dataset)
 
         elif data_type == 'medical-folder':
             if not os.path.isdir(path):
@@ -452,7 +741,7 @@ class DatasetManager:
 
             try:
                 # load using the MedicalFolderController to ensure all available modalities are inspected
-                controller = MedicalFolderController(root=path)
+                controller = data.MedicalFolderController(root=path)
                 if data_loading_plan is not None:
                     controller.set_dlp(data_loading_plan)
                 dataset = controller.load_MedicalFolder(tabular_file=dataset_parameters.get('tabular_file', None),
@@ -460,34 +749,17 @@ class DatasetManager:
 
             except FedbiomedError as e:
                 raise FedbiomedDatasetManagerError(f"Can not create Medical Folder dataset. {e}")
-            else:
-                shape = dataset.shape()
 
-            # try to read one sample and raise if it doesn't work
+            # computing the shape reads one sample: raise if it doesn't work
             try:
-                _ = dataset.get_nontransformed_item(0)
+                shape = dataset.shape()
             except Exception as e:
                 raise FedbiomedDatasetManagerError(f'Medical Folder Dataset was not saved properly and '
                                                    f'cannot be read. {e}')
 
-        if not dataset_id:
-            dataset_id = 'dataset_' + str(uuid.uuid4())
-
-        new_database = dict(name=name, data_type=data_type, tags=tags,
-                            description=description, shape=shape,
-                            path=path, dataset_id=dataset_id, dtypes=dtypes,
-                            dataset_parameters=dataset_parameters)
-        if save_dlp:
-            dlp_id = self.save_data_loading_plan(data_loading_plan)
-        elif isinstance(data_loading_plan, DataLoadingPlan):
-            dlp_id = data_loading_plan.dlp_id
-        else:
-            dlp_id = None
-        if dlp_id is not None:
-            new_database['dlp_id'] = dlp_id
-        self._dataset_table.insert(new_database)
+        profile = self.profile_dataset(data_type, dataset, path, dataset_parameters)
 
-        return dataset_id
+        return path, shape, dtypes, profile
 
     def remove_dlp_by_id(self, dlp_id: str):
         """Removes a data loading plan (DLP) from the database.
@@ -559,6 +831,57 @@ class DatasetManager:
 
         self._dataset_table.update(modified_dataset, self._database.dataset_id == dataset_id)
 
+    def refresh_dataset_profiles(self,
+                                 dataset_ids: Optional[List[str]] = None,
+                                 force: bool = False) -> List[str]:
+        """Recomputes the shape, data types and profile of registered datasets whose data changed.
+
+        Datasets registered without a profile are always refreshed. Other datasets are only
+        re-read when the modification time of their files changed since they were profiled,
+        unless `force` is True.
+
+        Args:
+            dataset_ids: IDs of the datasets to refresh. Defaults to None (all datasets).
+            force: if True, refresh datasets even if their data did not change.
+
+        Returns:
+            The IDs of the refreshed datasets.
+        """
+        if dataset_ids is None:
+            datasets = self._dataset_table.all()
+        else:
+            datasets = [d for d in (self.get_by_id(i) for i in dataset_ids) if d is not None]
+
+        refreshed = []
+        for dataset in datasets:
+            profile = dataset.get('profile')
+            if not force and profile and \
+                    profile.get('source_mtime') == self._source_mtime(dataset['path'],
+                                                                      dataset.get('dataset_parameters')):
+                continue
+
+            path = dataset['path']
+            if dataset['data_type'] == 'mednist':
+                # path saved in the database already points to the downloaded `MedNIST` folder
+                path = os.path.dirname(path)
+
+            try:
+                dlp = None
+                if dataset.get('dlp_id') is not None:
+                    dlp = DataLoadingPlan().deserialize(*self.get_dlp_by_id(dataset['dlp_id']))
+                _, shape, dtypes, profile = self._inspect_dataset(dataset['name'], dataset['data_type'], path,
+                                                                  dataset.get('dataset_parameters'), dlp)
+            except (FedbiomedError, AssertionError, NotImplementedError) as e:
+                logger.error(f"{ErrorNumbers.FB315.value}: cannot refresh profile of dataset "
+                             f"{dataset['dataset_id']}: {e}")
+                continue
+
+            self._dataset_table.update({'shape': shape, 'dtypes': dtypes, 'profile': profile},
+                                       self._database.dataset_id == dataset['dataset_id'])
+            refreshed.append(dataset['dataset_id'])
+
+        return refreshed
+
     def list_my_data(self, verbose: bool = True) -> List[dict]:
         """Lists all datasets on the node.
 
@@ -575,11 +898,12 @@ class DatasetManager:
             doc.pop('dtypes')
 
         if verbose:
-            print(tabulate(my_data, headers='keys'))
+            # profiles are too detailed for a table view
+            print(tabulate([{k: v for k, v in doc.items() if k != 'profile'} for doc in my_data], headers='keys'))
 
         return my_data
 
-    def load_as_dataloader(self, dataset: dict) -> torch.utils.data.Dataset:
+    def load_as_dataloader(self, dataset: dict) -> 'torch.utils.data.Dataset':
         """Loads content of an image dataset.
 
         Args:
@@ -635,6 +959,7 @@ class DatasetManager:
             elif mode == 'numpy':
                 return df._get_numeric_data().values
             elif mode == 'torch_tensor':
+                import torch
                 return torch.from_numpy(df._get_numeric_data().values)
 
         elif os.path.isdir(dataset_path):
@@ -694,15 +1019,21 @@ class DatasetManager:
         self._dlp_table.insert(dlb.serialize())
 
     @staticmethod
-    def obfuscate_private_information(database_metadata: Iterable[dict]) -> Iterable[dict]:
+    def obfuscate_private_information(database_metadata: Iterable[dict],
+                                      share_profile: bool = False) -> Iterable[dict]:
         """Remove privacy-sensitive information, to prepare for sharing with a researcher.
 
         Removes any information that could be considered privacy-sensitive by the node. The typical use-case is to
         prevent sharing this information with a researcher through a reply message.
 
+        Only the number of samples and the column names of the dataset profile are shared. The summary statistics
+        (without min/max) and the number of samples per class are only shared if the node opts in.
+
         Args:
             database_metadata: an iterable of metadata information objects, one per dataset. Each metadata object
                 should be in the format af key-value pairs, such as e.g. a dict.
+            share_profile: whether to share the summary statistics and the number of samples per class of the
+                dataset profiles.
         Returns:
              the updated iterable of metadata information objects without privacy-sensitive information
         """
@@ -710,6 +1041,8 @@ class DatasetManager:
             try:
                 # common obfuscations
                 d.pop('path', None)
+                if isinstance(d.get('profile'), dict):
+                    d['profile'] = DatasetManager._shared_profile(d['profile'], share_profile)
                 # obfuscations specific for each data type
                 if 'data_type' in d:
                     if d['data_type'] == 'medical-folder':
@@ -719,3 +1052,33 @@ class DatasetManager:
                 raise FedbiomedDatasetManagerError(f"Object of type {type(d)} does not support pop or getitem method "
                                                    f"in obfuscate_private_information.")
         return database_metadata
+
+    @staticmethod
+    def _shared_profile(profile: dict, share_profile: bool) -> dict:
+        """Builds the part of a dataset profile that can be shared with a researcher.
+
+        Args:
+            profile: profile of the dataset, as saved in the database
+            share_profile: whether to share the summary statistics and the number of samples per class
+
+        Returns:
+            A dict with the number of samples (`n_samples`) and the column names (`columns`) of tabular datasets,
+                plus the summary statistics (`statistics`) and the number of samples per class (`targets`) if
+                `share_profile` is True.
+        """
+        shared = {'n_samples': profile.get('n_samples')}
+        statistics = profile.get('statistics')
+        if isinstance(statistics, dict):
+            shared['columns'] = list(statistics.keys())
+
+        if share_profile:
+            # extreme values of a variable may identify a single patient
+            if isinstance(statistics, dict):
+                shared['statistics'] = {
+                    column: {key: value for key, value in stats.items() if key not in ('min', 'max')}
+                    for column, stats in statistics.items()
+                }
+            if 'targets' in profile:
+                shared['targets'] = dict(profile['targets'])
+
+        return shared
@@ -24,8 +24,10 @@ import uuid
 from fedbiomed.common.logger import logger
 from fedbiomed.common.constants import __node_config_version__ as __config_version__
 from fedbiomed.common.exceptions import FedbiomedEnvironError
-from fedbiomed.common.constants import ComponentType, ErrorNumbers, HashingAlgorithms, DB_PREFIX, NODE_PREFIX
+from fedbiomed.common.constants import ComponentType, ErrorNumbers, HashingAlgorithms, DB_PREFIX, NODE_PREFIX, \
+    DatabaseBackend
 from fedbiomed.common.environ import Environ
+from fedbiomed.common.db import db_path_extension
 
 
 class NodeEnviron(Environ):
@@ -57,8 +59,17 @@ class NodeEnviron(Environ):
 
         self._values['MESSAGES_QUEUE_DIR'] = os.path.join(self._values['VAR_DIR'],
                                                           f'queue_manager_{self._values["NODE_ID"]}')
+
+        # config files created before the storage backend was configurable use TinyDB
+        db_backend = os.getenv('DB_BACKEND',
+                               self._cfg.get('default', 'db_backend', fallback=DatabaseBackend.TINYDB.value))
+        if db_backend not in DatabaseBackend.list():
+            _msg = ErrorNumbers.FB600.value + ": unknown database backend: " + str(db_backend)
+            logger.critical(_msg)
+            raise FedbiomedEnvironError(_msg)
+        self._values['DB_BACKEND'] = db_backend
         self._values['DB_PATH'] = os.path.join(self._values['VAR_DIR'],
-                                               f'{DB_PREFIX}{self._values["NODE_ID"]}.json')
+                                               f'{DB_PREFIX}{self._values["NODE_ID"]}{db_path_extension(db_backend)}')
 
         self._values['DEFAULT_TRAINING_PLANS_DIR'] = os.path.join(self._values['ROOT_DIR'],
                                                                   'envs', 'common', 'default_training_plans')
@@ -99,8 +110,51 @@ class NodeEnviron(Environ):
             'FORCE_SECURE_AGGREGATION',
             force_secure_aggregation).lower() in ('true', '1', 't', True)
 
+        # config files created before profiling was available don't have the option
+        allow_profiling = self._cfg.get('security', 'allow_profiling', fallback='False')
+        self._values['ALLOW_PROFILING'] = str(os.getenv('ALLOW_PROFILING', allow_profiling)) \
+            .lower() in ('true', '1', 't', True)
+
+        # summary statistics and class counts of the dataset profiles are kept on the node unless it opts in
+        share_dataset_profile = self._cfg.get('security', 'share_dataset_profile', fallback='False')
+        self._values['SHARE_DATASET_PROFILE'] = str(os.getenv('SHARE_DATASET_PROFILE', share_dataset_profile)) \
+            .lower() in ('true', '1', 't', True)
+
         self._values['EDITOR'] = os.getenv('EDITOR')
 
+        # CPU performance profile for training and validation
+        # config files created before the profile was configurable don't have a `performance` section
+        for key in ('cpu_threads', 'cpu_interop_threads'):
+            threads = os.getenv(key.upper(), self._cfg.get('performance', key, fallback=''))
+            try:
+                threads = int(threads) if str(threads).strip() else None
+                if threads is not None and threads < 0:
+                    raise ValueError
+            except ValueError:
+                _msg = ErrorNumbers.FB600.value + f": {key} should be a non-negative integer, not {threads}"
+                logger.critical(_msg)
+                raise FedbiomedEnvironError(_msg)
+            # 0 or unset keeps the torch default
+            self._values[key.upper()] = threads or None
+
+        cpu_bfloat16 = self._cfg.get('performance', 'cpu_bfloat16', fallback='False')
+        self._values['CPU_BFLOAT16'] = str(os.getenv('CPU_BFLOAT16', cpu_bfloat16)) \
+            .lower() in ('true', '1', 't', True)
+
+        # warm cache of the training plans between the rounds of a job: memory budget in MiB (0 disables the cache)
+        # and idle time in seconds after which a training plan is evicted (0 never evicts idle training plans)
+        for key, default in (('warm_cache_memory', '1024'), ('warm_cache_idle_time', '600')):
+            value = os.getenv(key.upper(), self._cfg.get('performance', key, fallback=default))
+            try:
+                value = int(value)
+                if value < 0:
+                    raise ValueError
+            except ValueError:
+                _msg = ErrorNumbers.FB600.value + f": {key} should be a non-negative integer, not {value}"
+                logger.critical(_msg)
+                raise FedbiomedEnvironError(_msg)
+            self._values[key.upper()] = value
+
         # ========= PATCH MNIST Bug torchvision 0.9.0 ===================
         # https://github.com/pytorch/vision/issues/1938
 
@@ -128,6 +182,7 @@ class NodeEnviron(Environ):
             'id': node_id,
             'component': "NODE",
             'uploads_url': uploads_url,
+            'db_backend': os.getenv('DB_BACKEND', DatabaseBackend.TINYDB.value),
             'version': __config_version__
         }
 
@@ -137,15 +192,32 @@ class NodeEnviron(Environ):
             'allow_default_training_plans': os.getenv('ALLOW_DEFAULT_TRAINING_PLANS', True),
             'training_plan_approval': os.getenv('ENABLE_TRAINING_PLAN_APPROVAL', False),
             'secure_aggregation': os.getenv('SECURE_AGGREGATION', True),
-            'force_secure_aggregation': os.getenv('FORCE_SECURE_AGGREGATION', False)
+            'force_secure_aggregation': os.getenv('FORCE_SECURE_AGGREGATION', False),
+            'allow_profiling': os.getenv('ALLOW_PROFILING', False),
+            'share_dataset_profile': os.getenv('SHARE_DATASET_PROFILE', False)
+        }
+
+        # CPU performance profile, empty values keep the torch defaults
+        self._cfg['performance'] = {
+            'cpu_threads': os.getenv('CPU_THREADS', ''),
+            'cpu_interop_threads': os.getenv('CPU_INTEROP_THREADS', ''),
+            'cpu_bfloat16': os.getenv('CPU_BFLOAT16', False),
+            'warm_cache_memory': os.getenv('WARM_CACHE_MEMORY', 1024),
+            'warm_cache_idle_time': os.getenv('WARM_CACHE_IDLE_TIME', 600)
         }
 
     def info(self):
         """Print useful information at environment creation"""
 
         logger.info("type                           = " + str(self._values['COMPONENT_TYPE']))
+        logger.info("db_backend                     = " + str(self._values['DB_BACKEND']))
         logger.info("training_plan_approval         = " + str(self._values['TRAINING_PLAN_APPROVAL']))
         logger.info("allow_default_training_plans   = " + str(self._values['ALLOW_DEFAULT_TRAINING_PLANS']))
+        logger.info("cpu_profile                    = " +
+                    f"threads={self._values['CPU_THREADS']}, interop_threads={self._values['CPU_INTEROP_THREADS']}, "
+                    f"bfloat16={self._values['CPU_BFLOAT16']}")
+        logger.info("warm_cache                     = " +
+                    f"memory={self._values['WARM_CACHE_MEMORY']}MiB, idle_time={self._values['WARM_CACHE_IDLE_TIME']}s")
 
 
 sys.tracebacklimit = 3
@@ -12,7 +12,7 @@ from fedbiomed.common.constants import ComponentType, ErrorNumbers
 from fedbiomed.common.exceptions import FedbiomedMessageError
 from fedbiomed.common.logger import logger
 from fedbiomed.common.message import NodeMessages, SecaggDeleteRequest, SecaggRequest, TrainRequest
-from fedbiomed.common.messaging import Messaging
+from fedbiomed.common.simulation import create_messaging
 from fedbiomed.common.tasks_queue import TasksQueue
 
 from fedbiomed.node.environ import environ
@@ -22,6 +22,7 @@ from fedbiomed.node.training_plan_security_manager import TrainingPlanSecurityMa
 from fedbiomed.node.round import Round
 from fedbiomed.node.secagg import SecaggSetup
 from fedbiomed.node.secagg_manager import SecaggManager
+from fedbiomed.node.warm_cache import WarmCache
 
 import validators
 
@@ -48,12 +49,15 @@ class Node:
         """
 
         self.tasks_queue = TasksQueue(environ['MESSAGES_QUEUE_DIR'], environ['TMP_DIR'])
-        self.messaging = Messaging(self.on_message, ComponentType.NODE,
-                                   environ['NODE_ID'], environ['MQTT_BROKER'], environ['MQTT_BROKER_PORT'])
+        self.messaging = create_messaging(self.on_message, ComponentType.NODE,
+                                          environ['NODE_ID'], environ['MQTT_BROKER'], environ['MQTT_BROKER_PORT'])
         self.dataset_manager = dataset_manager
         self.tp_security_manager = tp_security_manager
 
         self.node_args = node_args
+        # training plans kept between the rounds of a job
+        self.warm_cache = WarmCache(max_memory=environ['WARM_CACHE_MEMORY'] * 2**20,
+                                    idle_time=environ['WARM_CACHE_IDLE_TIME'])
 
     def add_task(self, task: dict):
         """Adds a task to the pending tasks queue.
@@ -108,7 +112,8 @@ class Node:
                 # Look for databases matching the tags
                 databases = self.dataset_manager.search_by_tags(msg['tags'])
                 if len(databases) != 0:
-                    databases = self.dataset_manager.obfuscate_private_information(databases)
+                    databases = self.dataset_manager.obfuscate_private_information(
+                        databases, share_profile=environ['SHARE_DATASET_PROFILE'])
                     # FIXME: what happens if len(database) == 0
                     self.messaging.send_message(NodeMessages.format_outgoing_message(
                         {'success': True,
@@ -120,7 +125,8 @@ class Node:
             elif command == 'list':
                 # Get list of all datasets
                 databases = self.dataset_manager.list_my_data(verbose=False)
-                databases = self.dataset_manager.obfuscate_private_information(databases)
+                databases = self.dataset_manager.obfuscate_private_information(
+                    databases, share_profile=environ['SHARE_DATASET_PROFILE'])
                 self.messaging.send_message(NodeMessages.format_outgoing_message(
                     {'success': True,
                      'command': 'list',
@@ -297,7 +303,8 @@ class Node:
                 aggregator_args,
                 self.node_args,
                 round_number=round_number,
-                dlp_and_loading_block_metadata=dlp_and_loading_block_metadata
+                dlp_and_loading_block_metadata=dlp_and_loading_block_metadata,
+                warm_cache=self.warm_cache
             )
 
         return round
@@ -308,67 +315,74 @@ class Node:
 
         while True:
             item = self.tasks_queue.get()
-            item_print = {key: value for key, value in item.items() if key != 'aggregator_args'}
-            logger.debug('[TASKS QUEUE] Item:' + str(item_print))
-            try:
-
-                item = NodeMessages.format_incoming_message(item)
-                command = item.get_param('command')
-            except Exception as e:
-                # send an error message back to network if something wrong occured
-                self.messaging.send_message(
-                    NodeMessages.format_outgoing_message(
-                        {
-                            'command': 'error',
-                            'extra_msg': str(e),
-                            'node_id': environ['NODE_ID'],
-                            'researcher_id': 'NOT_SET',
-                            'errnum': ErrorNumbers.FB300
-                        }
-                    ).get_dict()
-                )
-            else:
-                if command == 'train':
-                    try:
-                        round = self.parser_task_train(item)
-                        # once task is out of queue, initiate training rounds
-                        if round is not None:
-                            # iterate over each dataset found
-                            # in the current round (here round refers
-                            # to a round to be done on a specific dataset).
-                            msg = round.run_model_training(
-                                secagg_arguments={
-                                    'secagg_servkey_id': item.get_param('secagg_servkey_id'),
-                                    'secagg_biprime_id': item.get_param('secagg_biprime_id'),
-                                    'secagg_random': item.get_param('secagg_random'),
-                                    'secagg_clipping_range': item.get_param('secagg_clipping_range')
-                                }
-                            )
-                            self.messaging.send_message(msg)
-                    except Exception as e:
-                        # send an error message back to network if something
-                        # wrong occured
-                        self.messaging.send_message(
-                            NodeMessages.format_outgoing_message(
-                                {
-                                    'command': 'error',
-                                    'extra_msg': str(e),
-                                    'node_id': environ['NODE_ID'],
-                                    'researcher_id': 'NOT_SET',
-                                    'errnum': ErrorNumbers.FB300
-                                }
-                            ).get_dict()
-                        )
-                        logger.debug(f"{ErrorNumbers.FB300}: {e}")
-                elif command == 'secagg':
-                    self._task_secagg(item)
-                else:
-                    errmess = f'{ErrorNumbers.FB319.value}: "{command}"'
-                    logger.error(errmess)
-                    self.send_error(errnum=ErrorNumbers.FB319, extra_msg=errmess)
-
+            self.process_task(item)
             self.tasks_queue.task_done()
 
+    def process_task(self, item: dict):
+        """Executes a task of the queue.
+
+        Args:
+            item: task taken from the queue, a training or secagg request
+        """
+        item_print = {key: value for key, value in item.items() if key != 'aggregator_args'}
+        logger.debug('[TASKS QUEUE] Item:' + str(item_print))
+        try:
+
+            item = NodeMessages.format_incoming_message(item)
+            command = item.get_param('command')
+        except Exception as e:
+            # send an error message back to network if something wrong occured
+            self.messaging.send_message(
+                NodeMessages.format_outgoing_message(
+                    {
+                        'command': 'error',
+                        'extra_msg': str(e),
+                        'node_id': environ['NODE_ID'],
+                        'researcher_id': 'NOT_SET',
+                        'errnum': ErrorNumbers.FB300
+                    }
+                ).get_dict()
+            )
+        else:
+            if command == 'train':
+                try:
+                    round = self.parser_task_train(item)
+                    # once task is out of queue, initiate training rounds
+                    if round is not None:
+                        # iterate over each dataset found
+                        # in the current round (here round refers
+                        # to a round to be done on a specific dataset).
+                        msg = round.run_model_training(
+                            secagg_arguments={
+                                'secagg_servkey_id': item.get_param('secagg_servkey_id'),
+                                'secagg_biprime_id': item.get_param('secagg_biprime_id'),
+                                'secagg_random': item.get_param('secagg_random'),
+                                'secagg_clipping_range': item.get_param('secagg_clipping_range')
+                            }
+                        )
+                        self.messaging.send_message(msg)
+                except Exception as e:
+                    # send an error message back to network if something
+                    # wrong occured
+                    self.messaging.send_message(
+                        NodeMessages.format_outgoing_message(
+                            {
+                                'command': 'error',
+                                'extra_msg': str(e),
+                                'node_id': environ['NODE_ID'],
+                                'researcher_id': 'NOT_SET',
+                                'errnum': ErrorNumbers.FB300
+                            }
+                        ).get_dict()
+                    )
+                    logger.debug(f"{ErrorNumbers.FB300}: {e}")
+            elif command == 'secagg':
+                self._task_secagg(item)
+            else:
+                errmess = f'{ErrorNumbers.FB319.value}: "{command}"'
+                logger.error(errmess)
+                self.send_error(errnum=ErrorNumbers.FB319, extra_msg=errmess)
+
     def start_messaging(self, block: Optional[bool] = False):
         """Calls the start method of messaging class.
 
@@ -0,0 +1,195 @@
+# This file is originally part of Fed-BioMed
+# SPDX-License-Identifier: Apache-2.0
+
+"""Opt-in profiling of the training and validation routines of a node round."""
+
+import cProfile
+import os
+import pstats
+import site
+import sysconfig
+from typing import Any, Callable, Dict, List, Optional, Tuple
+
+import fedbiomed
+from fedbiomed.common.constants import ErrorNumbers
+from fedbiomed.common.exceptions import FedbiomedValueError
+from fedbiomed.common.logger import logger
+
+
+__all__ = [
+    "RoundProfiler",
+]
+
+
+PRIVATE = '<private>'
+"""Replaces the file and function of the frames the node does not disclose."""
+
+TRAINING_PLAN = '<training_plan>'
+"""Replaces the temporary file of the training plan sent by the researcher."""
+
+MAX_TOP_N = 100
+"""Maximum number of frames in a profile summary."""
+
+# disabling the profiler is the last call it records
+_DISABLE = ('~', 0, "<method 'disable' of '_lsprof.Profiler' objects>")
+
+_SORT_KEYS = {
+    'cumulative': 'cumtime',
+    'tottime': 'tottime',
+    'calls': 'calls',
+}
+
+
+def _public_dirs() -> List[Tuple[str, str]]:
+    """Gets the directories whose files are reported, and the directory they are reported relative to.
+
+    Returns:
+        Directories of the Python standard library, of installed packages and of the Fed-BioMed package, longest
+            first, with their reporting directory
+    """
+    paths = sysconfig.get_paths()
+    dirs = [paths.get(key) for key in ('stdlib', 'platstdlib', 'purelib', 'platlib')]
+    try:
+        dirs += site.getsitepackages() + [site.getusersitepackages()]
+    except AttributeError:  # pragma: no cover
+        # not available in some virtual environments
+        pass
+    public = {os.path.abspath(d): os.path.abspath(d) for d in dirs if d}
+
+    # only the package, not the other files of a source checkout, e.g. `var` and `etc`
+    package_dir = os.path.dirname(os.path.abspath(fedbiomed.__file__))
+    public[package_dir] = os.path.dirname(package_dir)
+    return sorted(public.items(), key=lambda item: len(item[0]), reverse=True)
+
+
+class RoundProfiler:
+    """Profiles the training and validation routines of a round with `cProfile`, and summarizes the profile.
+
+    The summary keeps the top frames of the profile, aggregated by function. To avoid disclosing the files of the
+    node, only the frames of the Python standard library, of installed packages, of Fed-BioMed and of the training
+    plan are reported with their file, relative to the library or package directory. Other frames are aggregated as
+    a single `<private>` frame. Arguments and data are never recorded.
+
+    `cProfile` only profiles the thread calling the routines: time spent in data loader worker processes is not
+    included, but time spent waiting for them is.
+
+    **Typical use:**
+
+    ```python
+    profiler = RoundProfiler(top_n=20, training_plan_path=path)
+    profiler.runcall(training_plan.training_routine, history_monitor=history_monitor)
+
+    profiler.summary()  # {'sort': 'cumulative', 'total_calls': ..., 'total_time': ..., 'frames': [...]}
+    ```
+    """
+
+    def __init__(self,
+                 top_n: int = 20,
+                 sort: str = 'cumulative',
+                 training_plan_path: Optional[str] = None):
+        """Constructor of the class.
+
+        Args:
+            top_n: number of frames of the summary, at most `MAX_TOP_N`
+            sort: order of the frames of the summary, one of `cumulative` (time spent in the function and the
+                functions it calls), `tottime` (time spent in the function itself) or `calls` (number of calls)
+            training_plan_path: path of the file of the training plan, reported as `<training_plan>`
+
+        Raises:
+            FedbiomedValueError: bad number of frames or order
+        """
+        if not isinstance(top_n, int) or isinstance(top_n, bool) or top_n < 1:
+            msg = f"{ErrorNumbers.FB314.value}: number of profiled frames should be a positive int, not {top_n}"
+            logger.critical(msg)
+            raise FedbiomedValueError(msg)
+        if sort not in _SORT_KEYS:
+            msg = f"{ErrorNumbers.FB314.value}: profile should be sorted by one of {list(_SORT_KEYS)}, not {sort}"
+            logger.critical(msg)
+            raise FedbiomedValueError(msg)
+
+        self._top_n = min(top_n, MAX_TOP_N)
+        self._sort = sort
+        self._training_plan_path = os.path.abspath(training_plan_path) if training_plan_path else None
+        self._public_dirs = _public_dirs()
+        self._profile = cProfile.Profile()
+        self._profiled = False
+
+    def runcall(self, func: Callable, *args, **kwargs) -> Any:
+        """Calls a function and profiles the call. Profiles of successive calls are accumulated.
+
+        If the profiler cannot be enabled, e.g. because another profiler is active, the function is called without
+        profiling.
+
+        Args:
+            func: function to call
+            *args: positional arguments of the function
+            **kwargs: keyword arguments of the function
+
+        Returns:
+            Value returned by the function
+        """
+        try:
+            self._profile.enable()
+        except ValueError as e:
+            logger.warning(f"Cannot profile the round: {e}")
+            return func(*args, **kwargs)
+        self._profiled = True
+        try:
+            return func(*args, **kwargs)
+        finally:
+            self._profile.disable()
+
+    def _sanitize(self, filename: str, line: int, function: str) -> Tuple[str, int, str]:
+        """Sanitizes the location of a frame.
+
+        Args:
+            filename: file of the frame, `~` for built-in functions
+            line: line of the function in the file
+            function: name of the function
+
+        Returns:
+            File, line and function to report
+        """
+        if filename == '~' or (filename.startswith('<') and filename.endswith('>')):
+            # built-in functions and frozen modules
+            return filename, line, function
+
+        path = os.path.abspath(filename)
+        if self._training_plan_path is not None and path == self._training_plan_path:
+            return TRAINING_PLAN, line, function
+        for directory, root in self._public_dirs:
+            if path.startswith(directory + os.sep):
+                return os.path.relpath(path, root), line, function
+        return PRIVATE, 0, PRIVATE
+
+    def summary(self) -> Dict[str, Any]:
+        """Summarizes the profile of the profiled calls.
+
+        Returns:
+            Summary with the order of the frames `sort`, the number of function calls `total_calls`, the profiled
+                time in seconds `total_time`, and the top `frames`. Each frame has its `function`, `file`, `line`,
+                number of `calls`, time spent in the function itself `tottime` and time spent in the function and
+                the functions it calls `cumtime`.
+        """
+        if not self._profiled:
+            return {'sort': self._sort, 'total_calls': 0, 'total_time': 0., 'frames': []}
+
+        stats = pstats.Stats(self._profile)
+        frames: Dict[Tuple[str, int, str], Dict[str, Any]] = {}
+        for (filename, line, function), (_, calls, tottime, cumtime, _) in stats.stats.items():
+            if (filename, line, function) == _DISABLE:
+                continue
+            filename, line, function = self._sanitize(filename, line, function)
+            frame = frames.setdefault((filename, line, function),
+                                      {'function': function, 'file': filename, 'line': line,
+                                       'calls': 0, 'tottime': 0., 'cumtime': 0.})
+            frame['calls'] += calls
+            frame['tottime'] += tottime
+            frame['cumtime'] += cumtime
+
+        key = _SORT_KEYS[self._sort]
+        top = sorted(frames.values(), key=lambda frame: frame[key], reverse=True)[:self._top_n]
+        return {'sort': self._sort,
+                'total_calls': stats.total_calls,
+                'total_time': stats.total_tt,
+                'frames': top}
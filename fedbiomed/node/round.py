@@ -5,6 +5,7 @@
 implementation of Round class of the node component
 '''
 
+import copy
 import importlib
 import inspect
 import os
@@ -12,22 +13,25 @@ import sys
 import time
 import functools
 import uuid
-from typing import Dict, Union, Any, Optional, Tuple, List
+from typing import Callable, Dict, Union, Any, Optional, Tuple, List
 
 
 from fedbiomed.common.constants import ErrorNumbers, TrainingPlanApprovalStatus
 from fedbiomed.common.data import DataManager, DataLoadingPlan
 from fedbiomed.common.exceptions import FedbiomedError, FedbiomedRoundError, FedbiomedUserInputError
+from fedbiomed.common.instrumentation import SpanRecorder
 from fedbiomed.common.logger import logger
 from fedbiomed.common.message import NodeMessages
-from fedbiomed.common.repository import Repository
 from fedbiomed.common.serializer import Serializer
+from fedbiomed.common.simulation import create_repository
 from fedbiomed.common.training_args import TrainingArgs
 
 from fedbiomed.node.environ import environ
 from fedbiomed.node.history_monitor import HistoryMonitor
+from fedbiomed.node.profiler import RoundProfiler
 from fedbiomed.node.secagg_manager import SKManager, BPrimeManager
 from fedbiomed.node.training_plan_security_manager import TrainingPlanSecurityManager
+from fedbiomed.node.warm_cache import WarmCache, WarmCacheKey, WarmTrainingPlan, training_plan_hash
 from fedbiomed.common.secagg import SecaggCrypter
 
 
@@ -50,7 +54,8 @@ class Round:
                  aggregator_args: dict = None,
                  node_args: Union[dict, None] = None,
                  round_number: int = 0,
-                 dlp_and_loading_block_metadata: Optional[Tuple[dict, List[dict]]] = None):
+                 dlp_and_loading_block_metadata: Optional[Tuple[dict, List[dict]]] = None,
+                 warm_cache: Optional[WarmCache] = None):
 
         """Constructor of the class
 
@@ -72,6 +77,13 @@ class Round:
                     GPU device if this GPU device is available.
                 - `gpu_only (bool)`: force use of a GPU device if any available, even if researcher
                     doesn't request for using a GPU.
+                - `cpu_threads (Union[int, None])`: number of torch intra-op threads, default if None.
+                - `cpu_interop_threads (Union[int, None])`: number of torch inter-op threads, default if None.
+                - `cpu_bfloat16 (bool)`: use bfloat16 autocast for forward passes on CPU.
+            round_number: number of the round
+            dlp_and_loading_block_metadata: data loading plan of the dataset and metadata of its loading blocks
+            warm_cache: cache of the node keeping the training plans between the rounds of a job. If None, the
+                training plan is set up by each round.
         """
 
         self._use_secagg: bool = False
@@ -86,7 +98,7 @@ class Round:
 
         self.tp_security_manager = TrainingPlanSecurityManager()
         self.node_args = node_args
-        self.repository = Repository(environ['UPLOADS_URL'], environ['TMP_DIR'], environ['CACHE_DIR'])
+        self.repository = create_repository(environ['UPLOADS_URL'], environ['TMP_DIR'], environ['CACHE_DIR'])
         self.training_plan = None
         self.training = training
         self._dlp_and_loading_block_metadata = dlp_and_loading_block_metadata
@@ -101,6 +113,10 @@ class Round:
         self._round = round_number
         self._biprime = None
         self._servkey = None
+        self._spans = SpanRecorder()
+        self._profiler = None
+        self._warm_cache = warm_cache
+        self._data_loaders = (None, None)
 
     def initialize_validate_training_arguments(self) -> None:
         """Validates and separates training argument for experiment round"""
@@ -165,8 +181,52 @@ class Round:
             error_message = f"Cannot download param file: {url}"
             return False, '', error_message
         else:
+            self._add_file_bytes('download', params_path)
             return True, params_path, ''
 
+    def _add_file_bytes(self, span: str, path: str):
+        """Adds the size of a downloaded or uploaded file to the bytes transferred in a span.
+
+        Args:
+            span: name of the span
+            path: path of the file
+        """
+        try:
+            self._spans.add_bytes(span, os.path.getsize(path))
+        except (OSError, TypeError) as e:
+            logger.debug(f"Cannot get the size of transferred file {path}: {repr(e)}")
+
+    def _configure_profiler(self, training_plan_path: str):
+        """Creates the profiler of the round if profiling is requested by the researcher and allowed by the node.
+
+        Args:
+            training_plan_path: path of the file of the training plan
+        """
+        profiling = self.training_arguments['profiling']
+        if not profiling:
+            return
+        if not environ['ALLOW_PROFILING']:
+            logger.warning("Profiling of the round is requested by the researcher but not allowed by the node, "
+                           "the round is not profiled")
+            return
+
+        options = profiling if isinstance(profiling, dict) else {}
+        self._profiler = RoundProfiler(training_plan_path=training_plan_path, **options)
+
+    def _run_profiled(self, routine: Callable, **kwargs) -> Any:
+        """Runs a routine of the training plan, and profiles it when the round is profiled.
+
+        Args:
+            routine: training or testing routine of the training plan
+            **kwargs: arguments of the routine
+
+        Returns:
+            Value returned by the routine
+        """
+        if self._profiler is None:
+            return routine(**kwargs)
+        return self._profiler.runcall(routine, **kwargs)
+
     def _configure_secagg(
             self,
             secagg_servkey_id: Union[str, None] = None,
@@ -268,13 +328,15 @@ class Round:
         try:
             # module name cannot contain dashes
             import_module = 'training_plan_' + str(uuid.uuid4().hex)
-            status, _ = self.repository.download_file(self.training_plan_url,
-                                                      import_module + '.py')
+            with self._spans.span('download'):
+                status, training_plan_path = self.repository.download_file(self.training_plan_url,
+                                                                           import_module + '.py')
 
             if status != 200:
                 error_message = "Cannot download training plan file: " + self.training_plan_url
                 return self._send_round_reply(success=False, message=error_message)
             else:
+                self._add_file_bytes('download', training_plan_path)
                 if environ["TRAINING_PLAN_APPROVAL"]:
                     approved, training_plan_ = self.tp_security_manager.check_training_plan_status(
                         os.path.join(environ["TMP_DIR"], import_module + '.py'),
@@ -288,10 +350,12 @@ class Round:
 
             if not is_failed:
 
-                success, params_path, error_msg = self.download_file(self.params_url, f"my_model_{uuid.uuid4()}.mpk")
-                if success:
-                    # retrieving aggregator args
-                    success, error_msg = self.download_aggregator_args()
+                with self._spans.span('download'):
+                    success, params_path, error_msg = self.download_file(self.params_url,
+                                                                         f"my_model_{uuid.uuid4()}.mpk")
+                    if success:
+                        # retrieving aggregator args
+                        success, error_msg = self.download_aggregator_args()
 
                 if not success:
                     return self._send_round_reply(success=False, message=error_msg)
@@ -302,36 +366,71 @@ class Round:
             error_message = f"Cannot download training plan files: {repr(e)}"
             return self._send_round_reply(success=False, message=error_message)
 
-        # import module, declare the training plan, load parameters
+        # reuse the training plan kept by the node since the previous round of the job
+        cache_key, warm = self._get_warm_training_plan(training_plan_path, import_module)
+        reused = warm is not None and warm.training_plan is not None
+
+        if not reused:
+            # import module, declare the training plan, load parameters
+            try:
+                with self._spans.span('import'):
+                    sys.path.insert(0, environ['TMP_DIR'])
+                    module = importlib.import_module(import_module)
+                    train_class = getattr(module, self.training_plan_class)
+                    self.training_plan = train_class()
+                    sys.path.pop(0)
+            except Exception as e:
+                error_message = f"Cannot instantiate training plan object: {repr(e)}"
+                return self._send_round_reply(success=False, message=error_message)
+
+            try:
+                with self._spans.span('import'):
+                    self.training_plan.post_init(model_args=self.model_arguments,
+                                                 training_args=self.training_arguments,
+                                                 aggregator_args=self.aggregator_args)
+            except Exception as e:
+                error_message = f"Can't initialize training plan with the arguments: {repr(e)}"
+                return self._send_round_reply(success=False, message=error_message)
+        else:
+            logger.info("Reusing the training plan of the previous round of the job")
+            self.training_plan = warm.training_plan
+            try:
+                with self._spans.span('import'):
+                    self.training_plan.reset_round(training_args=self.training_arguments,
+                                                   aggregator_args=self.aggregator_args)
+            except Exception as e:
+                error_message = f"Can't initialize training plan with the arguments: {repr(e)}"
+                return self._send_round_reply(success=False, message=error_message)
+
         try:
-            sys.path.insert(0, environ['TMP_DIR'])
-            module = importlib.import_module(import_module)
-            train_class = getattr(module, self.training_plan_class)
-            self.training_plan = train_class()
-            sys.path.pop(0)
-        except Exception as e:
-            error_message = f"Cannot instantiate training plan object: {repr(e)}"
-            return self._send_round_reply(success=False, message=error_message)
+            self._configure_profiler(warm.training_plan_path if reused else
+                                     os.path.join(environ['TMP_DIR'], import_module + '.py'))
+        except FedbiomedError as e:
+            return self._send_round_reply(success=False, message=repr(e))
 
+        # apply the node performance profile to training and validation
         try:
-            self.training_plan.post_init(model_args=self.model_arguments,
-                                         training_args=self.training_arguments,
-                                         aggregator_args=self.aggregator_args)
+            performance_profile = self.training_plan.set_performance_profile(self.node_args)
         except Exception as e:
-            error_message = f"Can't initialize training plan with the arguments: {repr(e)}"
+            error_message = f"Can't apply the node performance profile: {repr(e)}"
             return self._send_round_reply(success=False, message=error_message)
 
         # import model params into the training plan instance
         try:
-            params = Serializer.load(params_path)["model_weights"]
-            self.training_plan.set_model_params(params)
+            with self._spans.span('deserialization'):
+                params = Serializer.load(params_path)["model_weights"]
+                self.training_plan.set_model_params(params)
         except Exception as e:
             error_message = f"Cannot initialize model parameters: {repr(e)}"
             return self._send_round_reply(success=False, message=error_message)
 
         # Split training and validation data
         try:
-            self._set_training_testing_data_loaders()
+            with self._spans.span('data_loading'):
+                if not reused:
+                    self._set_training_testing_data_loaders()
+                else:
+                    self.training_plan.set_data_loaders(*warm.data_loaders)
         except FedbiomedError as e:
             error_message = f"Can not create validation/train data: {repr(e)}"
             return self._send_round_reply(success=False, message=error_message)
@@ -340,16 +439,23 @@ class Round:
                             f"validation/train data: {repr(e)}"
             return self._send_round_reply(success=False, message=error_message)
 
+        if warm is not None and not reused:
+            warm.training_plan = self.training_plan
+            warm.data_loaders = self._data_loaders
+
         # Validation Before Training
         if self.testing_arguments.get('test_on_global_updates', False) is not False:
 
             # Last control to make sure validation data loader is set.
             if self.training_plan.testing_data_loader is not None:
                 try:
-                    self.training_plan.testing_routine(metric=self.testing_arguments.get('test_metric', None),
-                                                       metric_args=self.testing_arguments.get('test_metric_args', {}),
-                                                       history_monitor=self.history_monitor,
-                                                       before_train=True)
+                    with self._spans.span('validation'):
+                        self._run_profiled(
+                            self.training_plan.testing_routine,
+                            metric=self.testing_arguments.get('test_metric', None),
+                            metric_args=self.testing_arguments.get('test_metric_args', {}),
+                            history_monitor=self.history_monitor,
+                            before_train=True)
                 except FedbiomedError as e:
                     logger.error(f"{ErrorNumbers.FB314}: During the validation phase on global parameter updates; "
                                  f"{repr(e)}")
@@ -367,8 +473,10 @@ class Round:
                     results = {}
                     rtime_before = time.perf_counter()
                     ptime_before = time.process_time()
-                    self.training_plan.training_routine(history_monitor=self.history_monitor,
-                                                        node_args=self.node_args)
+                    with self._spans.span('training'):
+                        self._run_profiled(self.training_plan.training_routine,
+                                           history_monitor=self.history_monitor,
+                                           node_args=self.node_args)
                     rtime_after = time.perf_counter()
                     ptime_after = time.process_time()
                 except Exception as e:
@@ -380,11 +488,13 @@ class Round:
 
                 if self.training_plan.testing_data_loader is not None:
                     try:
-                        self.training_plan.testing_routine(metric=self.testing_arguments.get('test_metric', None),
-                                                           metric_args=self.testing_arguments.get('test_metric_args',
-                                                                                                  {}),
-                                                           history_monitor=self.history_monitor,
-                                                           before_train=False)
+                        with self._spans.span('validation'):
+                            self._run_profiled(
+                                self.training_plan.testing_routine,
+                                metric=self.testing_arguments.get('test_metric', None),
+                                metric_args=self.testing_arguments.get('test_metric_args', {}),
+                                history_monitor=self.history_monitor,
+                                before_train=False)
                     except FedbiomedError as e:
                         logger.error(
                             f"{ErrorNumbers.FB314.value}: During the validation phase on local parameter updates; "
@@ -413,9 +523,10 @@ class Round:
                     weight=sample_size,
                     clipping_range=secagg_arguments.get('secagg_clipping_range')
                 )
-                model_weights = encrypt(params=model_weights)
-                results["encrypted"] = True
-                results["encryption_factor"] = encrypt(params=[secagg_arguments["secagg_random"]])
+                with self._spans.span('encryption'):
+                    model_weights = encrypt(params=model_weights)
+                    results["encrypted"] = True
+                    results["encryption_factor"] = encrypt(params=[secagg_arguments["secagg_random"]])
                 logger.info("Encryption is completed!")
 
             results['researcher_id'] = self.researcher_id
@@ -423,18 +534,25 @@ class Round:
             results['model_weights'] = model_weights
             results['node_id'] = environ['NODE_ID']
             results['optimizer_args'] = self.training_plan.optimizer_args()
+            if self._profiler is not None:
+                results['profile'] = self._profiler.summary()
 
             try:
                 # TODO: add validation status to these results?
                 # Dump the results to a msgpack file.
                 filename = os.path.join(environ["TMP_DIR"], f"node_params_{uuid.uuid4()}.mpk")
-                Serializer.dump(results, filename)
+                with self._spans.span('serialization'):
+                    Serializer.dump(results, filename)
                 # Upload that file to the remote repository.
-                res = self.repository.upload_file(filename)
+                with self._spans.span('upload'):
+                    res = self.repository.upload_file(filename)
+                    self._add_file_bytes('upload', filename)
                 logger.info("results uploaded successfully ")
             except Exception as exc:
                 return self._send_round_reply(success=False, message=f"Cannot upload results: {exc}")
 
+            self._keep_warm_training_plan(cache_key, warm)
+
             # end : clean the namespace
             try:
                 del self.training_plan
@@ -444,13 +562,71 @@ class Round:
 
             return self._send_round_reply(success=True,
                                           timing={'rtime_training': rtime_after - rtime_before,
-                                                  'ptime_training': ptime_after - ptime_before},
+                                                  'ptime_training': ptime_after - ptime_before,
+                                                  **performance_profile},
                                           params_url=res['file'],
                                           sample_size=sample_size)
         else:
             # Only for validation
+            self._keep_warm_training_plan(cache_key, warm)
             return self._send_round_reply(success=True)
 
+    def _get_warm_training_plan(
+            self,
+            training_plan_path: str,
+            import_module: str
+    ) -> Tuple[Optional[WarmCacheKey], Optional[WarmTrainingPlan]]:
+        """Gets the training plan kept by the node since the previous round of the job, if any.
+
+        Args:
+            training_plan_path: path of the training plan file downloaded for this round
+            import_module: name of the module of the training plan downloaded for this round
+
+        Returns:
+            Key of the training plan in the warm cache and the training plan kept by the node, or a training plan
+                without `training_plan` to be set up by the round. None and None if the warm cache is not used.
+        """
+        if self._warm_cache is None or not self._warm_cache.enabled:
+            return None, None
+        try:
+            cache_key = (self.researcher_id, self.job_id, training_plan_hash(training_plan_path))
+        except OSError as e:
+            logger.debug(f"Cannot hash the training plan file, the training plan is not kept: {repr(e)}")
+            return None, None
+
+        # copied before `post_init`, that may modify the model arguments. Training arguments that only change the
+        # training routine (num_updates, epochs, optimizer...) are applied to a reused training plan by `reset_round`.
+        arguments = copy.deepcopy({'training_plan_class': self.training_plan_class,
+                                   'model_args': self.model_arguments,
+                                   'loader_args': self.loader_arguments,
+                                   'test_ratio': self.testing_arguments.get('test_ratio', 0),
+                                   'dp_args': self.training_arguments.dp_arguments(),
+                                   'use_gpu': self.training_arguments.get('use_gpu'),
+                                   'dataset': self.dataset,
+                                   'dlp_and_loading_block_metadata': self._dlp_and_loading_block_metadata})
+        warm = self._warm_cache.get(cache_key, arguments)
+        if warm is None:
+            warm = WarmTrainingPlan(training_plan=None,
+                                    module_name=import_module,
+                                    training_plan_path=os.path.join(environ['TMP_DIR'], import_module + '.py'),
+                                    arguments=arguments,
+                                    data_loaders=(None, None))
+        return cache_key, warm
+
+    def _keep_warm_training_plan(self, cache_key: Optional[WarmCacheKey], warm: Optional[WarmTrainingPlan]):
+        """Keeps the training plan of a successful round in the warm cache of the node, for the next rounds.
+
+        Args:
+            cache_key: key of the training plan in the warm cache, None if the cache is not used
+            warm: training plan of the round
+        """
+        if cache_key is None or warm is None:
+            return
+        if not self.training_plan.reusable():
+            logger.debug("Training plan cannot be reused, it is not kept for the next rounds")
+            return
+        self._warm_cache.put(cache_key, warm)
+
     def _send_round_reply(
             self,
             message: str = '',
@@ -486,7 +662,9 @@ class Round:
                                           'params_url': params_url,
                                           'msg': message,
                                           'sample_size': sample_size,
-                                          'timing': timing}).get_dict()
+                                          'timing': timing,
+                                          'round': self._round,
+                                          'spans': self._spans.spans()}).get_dict()
 
     def _set_training_testing_data_loaders(self):
         """
@@ -519,6 +697,8 @@ class Round:
         # Set models validating and training parts for training plan
         self.training_plan.set_data_loaders(train_data_loader=training_data_loader,
                                             test_data_loader=testing_data_loader)
+        # kept for the next rounds, before the training routine pre-processes them
+        self._data_loaders = (training_data_loader, testing_data_loader)
 
     def _split_train_and_test_data(self, test_ratio: float = 0):
         """
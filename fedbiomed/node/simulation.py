@@ -0,0 +1,123 @@
+# This file is originally part of Fed-BioMed
+# SPDX-License-Identifier: Apache-2.0
+
+"""
+Worker process hosting virtual nodes of a simulation.
+
+The node environment is created when `fedbiomed.node.environ` is first imported, from the environment variables
+of the process. Node modules are thus imported by the worker once the variables of its first node are set, and not
+at the top of this module.
+"""
+
+import os
+import shutil
+from typing import Any, Dict, List, Optional
+
+from fedbiomed.common.constants import ErrorNumbers
+from fedbiomed.common.logger import logger
+from fedbiomed.common.simulation import SIMULATION_UPLOADS_URL, SimulationBroker, activate
+
+
+def _set_node_variables(node_id: str, work_dir: str, node_environ: Dict[str, str]):
+    """Sets the environment variables from which the environment of a virtual node is created."""
+    os.environ.update(node_environ)
+    os.environ['NODE_ID'] = node_id
+    os.environ['CONFIG_FILE'] = os.path.join(work_dir, f'config_{node_id}.ini')
+    os.environ['UPLOADS_URL'] = SIMULATION_UPLOADS_URL
+
+
+def _remove_node_files(values: Dict[str, Any]):
+    """Removes the files created for a virtual node, from the values of its environment."""
+    for path in (values.get('DB_PATH'), values.get('CONFIG_FILE')):
+        if path and os.path.isfile(path):
+            os.remove(path)
+    for path in (values.get('TRAINING_PLANS_DIR'), values.get('MESSAGES_QUEUE_DIR')):
+        if path and os.path.isdir(path):
+            shutil.rmtree(path, ignore_errors=True)
+    # certificates generated with the configuration of the node
+    cert_dir = os.path.dirname(values.get('MPSPDZ_CERTIFICATE_KEY', ''))
+    if values.get('CERT_DIR') and os.path.dirname(cert_dir) == values['CERT_DIR'] and os.path.isdir(cert_dir):
+        shutil.rmtree(cert_dir, ignore_errors=True)
+
+
+def run_virtual_nodes(broker: SimulationBroker,
+                      inbox: str,
+                      nodes: Dict[str, List[Dict[str, Any]]],
+                      store_dir: str,
+                      work_dir: str,
+                      node_args: Optional[Dict[str, Any]],
+                      node_environ: Dict[str, str],
+                      log_level: str,
+                      ready: Any):
+    """Runs virtual nodes in this process, until the inbox of the process is closed.
+
+    Each virtual node has its own configuration, database and task queue, and the node environment is switched
+    to the node handling a message. Training tasks are run as soon as they are queued, one at a time.
+
+    Args:
+        broker: broker of the simulation
+        inbox: inbox of this process in the broker, receiving the messages of all its virtual nodes
+        nodes: datasets of each virtual node, as arguments of `DatasetManager.add_database`, indexed by node id
+        store_dir: directory of the simulation repository
+        work_dir: directory for the configuration files of the virtual nodes
+        node_args: node arguments, as given by the command line to a node
+        node_environ: environment variables of the virtual nodes, e.g. `ENABLE_TRAINING_PLAN_APPROVAL`
+        log_level: logging level of the nodes
+        ready: queue receiving the inbox name once the nodes are started, with an error message or None
+    """
+    activate(broker, store_dir, dispatch=False)
+    environs: Dict[str, Dict[str, Any]] = {}
+    node_ids = list(nodes)
+    environ = None
+
+    try:
+        _set_node_variables(node_ids[0], work_dir, node_environ)
+        from fedbiomed.node.environ import environ
+        from fedbiomed.node.dataset_manager import DatasetManager
+        from fedbiomed.node.node import Node
+        from fedbiomed.node.training_plan_security_manager import TrainingPlanSecurityManager
+
+        virtual_nodes = {}
+        for i, node_id in enumerate(node_ids):
+            if i > 0:
+                _set_node_variables(node_id, work_dir, node_environ)
+                environ.setup_environment()
+            environs[node_id] = environ.snapshot()
+
+            dataset_manager = DatasetManager()
+            for dataset in nodes[node_id]:
+                dataset_manager.add_database(**dataset)
+            tp_security_manager = TrainingPlanSecurityManager()
+            if environ['TRAINING_PLAN_APPROVAL'] and environ['ALLOW_DEFAULT_TRAINING_PLANS']:
+                tp_security_manager.register_update_default_training_plans()
+
+            virtual_nodes[node_id] = Node(dataset_manager, tp_security_manager, node_args)
+            virtual_nodes[node_id].start_messaging()
+        logger.setLevel(log_level)
+    except Exception as e:
+        ready.put((inbox, f"{ErrorNumbers.FB628.value}: cannot start virtual nodes {node_ids}: {e}"))
+        for values in environs.values():
+            _remove_node_files(values)
+        return
+
+    ready.put((inbox, None))
+    try:
+        while True:
+            received = broker.receive(inbox)
+            if received is None:
+                break
+            component_ids, topic, msg = received
+            for node_id in component_ids:
+                environ.restore(environs[node_id])
+                node = virtual_nodes[node_id]
+                try:
+                    node.messaging.deliver(msg, topic)
+                    # run the queued tasks, instead of the task manager loop of the node
+                    while node.tasks_queue.qsize() > 0:
+                        node.process_task(node.tasks_queue.get())
+                        node.tasks_queue.task_done()
+                except Exception as e:
+                    logger.error(f"{ErrorNumbers.FB628.value}: virtual node {node_id} failed handling a message: {e}")
+    finally:
+        for values in environs.values():
+            _remove_node_files(values)
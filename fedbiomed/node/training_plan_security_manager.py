@@ -11,16 +11,17 @@ import re
 from python_minifier import minify
 import shutil
 from tabulate import tabulate
-from tinydb import TinyDB, Query, where
+from tinydb import Query, where
 from typing import Any, Dict, List, Tuple, Union
 import uuid
 
 from fedbiomed.common.constants import HashingAlgorithms, TrainingPlanApprovalStatus, TrainingPlanStatus, ErrorNumbers
+from fedbiomed.common.db import open_database
 from fedbiomed.common.exceptions import FedbiomedTrainingPlanSecurityManagerError, FedbiomedRepositoryError
 from fedbiomed.common.logger import logger
 from fedbiomed.common.message import NodeMessages
 from fedbiomed.common.messaging import Messaging
-from fedbiomed.common.repository import Repository
+from fedbiomed.common.simulation import create_repository
 from fedbiomed.common.validator import SchemeValidator, ValidateError
 from fedbiomed.node.environ import environ
 
@@ -51,11 +52,11 @@ class TrainingPlanSecurityManager:
         the database.
         """
 
-        self._tinydb = TinyDB(environ["DB_PATH"])
+        self._tinydb = open_database(environ["DB_PATH"])
         # dont use DB read cache for coherence when updating from multiple sources (eg: GUI and CLI)
         self._db = self._tinydb.table(name="TrainingPlans", cache_size=0)
         self._database = Query()
-        self._repo = Repository(environ['UPLOADS_URL'], environ['TMP_DIR'], environ['CACHE_DIR'])
+        self._repo = create_repository(environ['UPLOADS_URL'], environ['TMP_DIR'], environ['CACHE_DIR'])
 
         self._tags_to_remove = ['training_plan_path',
                                 'hash',
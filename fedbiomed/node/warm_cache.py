@@ -0,0 +1,302 @@
+# This file is originally part of Fed-BioMed
+# SPDX-License-Identifier: Apache-2.0
+
+"""Warm cache keeping the training plans of a node between the rounds of a job."""
+
+import hashlib
+import sys
+import threading
+import time
+import types
+from collections import OrderedDict
+from dataclasses import dataclass
+from typing import Any, Dict, Optional, Set, Tuple
+
+from fedbiomed.common.constants import ErrorNumbers
+from fedbiomed.common.exceptions import FedbiomedValueError
+from fedbiomed.common.logger import logger
+
+
+__all__ = [
+    "WarmCache",
+    "WarmCacheKey",
+    "WarmTrainingPlan",
+    "estimate_size",
+    "training_plan_hash",
+]
+
+
+WarmCacheKey = Tuple[str, str, str]
+"""Key of a training plan in the cache: researcher id, job id and hash of the training plan file."""
+
+# attributes of objects are followed up to this depth when estimating their size
+_MAX_DEPTH = 8
+
+# objects whose attributes are not part of the size of an instance
+_SKIPPED_TYPES = (type, types.ModuleType, types.FunctionType, types.MethodType, types.BuiltinFunctionType)
+
+
+def training_plan_hash(path: str) -> str:
+    """Hashes the file of a training plan.
+
+    Args:
+        path: path of the training plan file
+
+    Returns:
+        SHA256 hex digest of the content of the file
+    """
+    with open(path, 'rb') as file:
+        return hashlib.sha256(file.read()).hexdigest()
+
+
+def _nbytes(obj: Any, seen: Set[int], depth: int) -> int:
+    """Estimates the size of the arrays, tensors and strings referenced by an object.
+
+    Args:
+        obj: object to measure
+        seen: ids of the objects already measured
+        depth: remaining depth of attributes to follow
+
+    Returns:
+        Estimated size in bytes
+    """
+    if depth < 0 or id(obj) in seen or obj is None or isinstance(obj, _SKIPPED_TYPES):
+        return 0
+    seen.add(id(obj))
+
+    if isinstance(obj, (str, bytes, bytearray)):
+        return len(obj)
+    # frameworks are only measured if they are already used by the training plan
+    numpy = sys.modules.get('numpy')
+    if numpy is not None and isinstance(obj, numpy.ndarray):
+        return int(obj.nbytes)
+    torch = sys.modules.get('torch')
+    if torch is not None:
+        if isinstance(obj, torch.Tensor):
+            return obj.element_size() * obj.nelement()
+        if isinstance(obj, torch.nn.Module):
+            return sum(_nbytes(tensor, seen, depth - 1) for tensor in obj.state_dict(keep_vars=True).values())
+    pandas = sys.modules.get('pandas')
+    if pandas is not None and isinstance(obj, (pandas.DataFrame, pandas.Series)):
+        return int(obj.memory_usage(index=True, deep=False).sum())
+
+    if isinstance(obj, dict):
+        return sum(_nbytes(key, seen, depth - 1) + _nbytes(value, seen, depth - 1) for key, value in obj.items())
+    if isinstance(obj, (list, tuple, set, frozenset)):
+        return sum(_nbytes(item, seen, depth - 1) for item in obj)
+    attributes = getattr(obj, '__dict__', None)
+    if isinstance(attributes, dict):
+        return sum(_nbytes(value, seen, depth - 1) for value in attributes.values())
+    return 0
+
+
+def estimate_size(*objects: Any) -> int:
+    """Estimates the memory used by objects, e.g. a training plan and its data loaders.
+
+    Numpy arrays, torch tensors and modules, pandas data frames and strings referenced by the objects, their
+    attributes and containers are measured. Objects referenced several times are measured once. Data that is not
+    loaded in memory (eg: images read by a dataset when iterating) is not measured.
+
+    Args:
+        *objects: objects to measure
+
+    Returns:
+        Estimated size in bytes
+    """
+    seen: Set[int] = set()
+    return sum(_nbytes(obj, seen, _MAX_DEPTH) for obj in objects)
+
+
+@dataclass
+class WarmTrainingPlan:
+    """Training plan kept by the node between the rounds of a job.
+
+    Attributes:
+        training_plan: training plan initialized with `post_init` by the first round of the job, None while the
+            round sets it up
+        module_name: name of the module of the training plan, imported from the temporary directory
+        training_plan_path: path of the file of the training plan module
+        arguments: arguments of the round that initialized the training plan (training plan class, model arguments,
+            training arguments used by the setup of the model and data loaders, dataset...). Next rounds reuse the
+            training plan if they have the same arguments.
+        data_loaders: training and testing data loaders, as created by the round before any pre-processing
+        size: estimated memory used by the training plan and its data loaders in bytes
+        last_used: time when the training plan was last put in the cache, from `time.monotonic`
+    """
+    training_plan: Any
+    module_name: str
+    training_plan_path: str
+    arguments: Dict[str, Any]
+    data_loaders: Tuple[Any, Any]
+    size: int = 0
+    last_used: float = 0.
+
+
+class WarmCache:
+    """Keeps the training plans of a node between the rounds of a job, to skip their setup.
+
+    A round of a job whose training plan is in the cache reuses the imported training plan, its model and its
+    data loaders, instead of importing the training plan, running `post_init` and loading the dataset. Only the new
+    model parameters, training arguments and aggregator arguments are loaded.
+
+    Training plans are taken out of the cache while a round uses them, and put back when the round succeeds, so
+    that a failed round never leaves a training plan in an undetermined state. Training plans are evicted when they
+    are idle for longer than the idle time, and the least recently used ones are evicted to keep their estimated
+    memory within the budget.
+
+    **Typical use:**
+
+    ```python
+    cache = WarmCache(max_memory=2**30, idle_time=600)
+    key = (researcher_id, job_id, training_plan_hash(path))
+
+    entry = cache.get(key, arguments)
+    if entry is None:
+        entry = WarmTrainingPlan(...)  # set up the training plan
+    ...  # run the round
+    cache.put(key, entry)
+    ```
+    """
+
+    def __init__(self, max_memory: int, idle_time: float = 0):
+        """Constructor of the class.
+
+        Args:
+            max_memory: memory budget of the cache in bytes, 0 disables the cache
+            idle_time: time in seconds after which an idle training plan is evicted, 0 never evicts idle training
+                plans
+
+        Raises:
+            FedbiomedValueError: bad memory budget or idle time
+        """
+        for name, value in (('memory budget', max_memory), ('idle time', idle_time)):
+            if not isinstance(value, (int, float)) or isinstance(value, bool) or value < 0:
+                msg = f"{ErrorNumbers.FB314.value}: {name} of the warm cache should be a non-negative number, " \
+                      f"not {value}"
+                logger.critical(msg)
+                raise FedbiomedValueError(msg)
+
+        self._max_memory = max_memory
+        self._idle_time = idle_time
+        # least recently used first
+        self._entries: 'OrderedDict[WarmCacheKey, WarmTrainingPlan]' = OrderedDict()
+        self._lock = threading.Lock()
+        self._timer: Optional[threading.Timer] = None
+
+    @property
+    def enabled(self) -> bool:
+        """Whether the cache keeps training plans."""
+        return self._max_memory > 0
+
+    @property
+    def memory(self) -> int:
+        """Estimated memory used by the training plans in the cache, in bytes."""
+        with self._lock:
+            return sum(entry.size for entry in self._entries.values())
+
+    def __len__(self) -> int:
+        with self._lock:
+            return len(self._entries)
+
+    def __contains__(self, key: WarmCacheKey) -> bool:
+        with self._lock:
+            return key in self._entries
+
+    def get(self, key: WarmCacheKey, arguments: Dict[str, Any]) -> Optional[WarmTrainingPlan]:
+        """Takes a training plan out of the cache, to run a round.
+
+        Args:
+            key: researcher id, job id and hash of the training plan file of the round
+            arguments: arguments of the round, compared with the ones that initialized the training plan
+
+        Returns:
+            The training plan, or None if it is not in the cache or was initialized with other arguments
+        """
+        with self._lock:
+            entry = self._entries.pop(key, None)
+        if entry is None:
+            return None
+        if entry.arguments != arguments:
+            logger.debug("Arguments of the round changed, the training plan of the previous round is not reused")
+            self._release(entry)
+            return None
+        return entry
+
+    def put(self, key: WarmCacheKey, entry: WarmTrainingPlan) -> bool:
+        """Puts a training plan in the cache after a successful round.
+
+        The training plans of other training plan files of the same job are evicted, then the least recently used
+        training plans until the cache fits in the memory budget.
+
+        Args:
+            key: researcher id, job id and hash of the training plan file of the round
+            entry: training plan of the round
+
+        Returns:
+            True if the training plan is kept, False if the cache is disabled or the training plan exceeds the
+                memory budget
+        """
+        if not self.enabled:
+            self._release(entry)
+            return False
+
+        entry.size = estimate_size(entry.training_plan, entry.data_loaders)
+        if entry.size > self._max_memory:
+            logger.info(f"Training plan of job {key[1]} ({entry.size} bytes) exceeds the memory budget of the warm "
+                        f"cache ({self._max_memory} bytes), it is not kept for the next rounds")
+            self._release(entry)
+            return False
+
+        with self._lock:
+            for other in [other for other in self._entries if other[:2] == key[:2] or other == key]:
+                self._release(self._entries.pop(other))
+            entry.last_used = time.monotonic()
+            self._entries[key] = entry
+            while sum(cached.size for cached in self._entries.values()) > self._max_memory:
+                _, evicted = self._entries.popitem(last=False)
+                self._release(evicted)
+            self._schedule_eviction()
+        return True
+
+    def evict_idle(self):
+        """Evicts the training plans that are idle for longer than the idle time."""
+        if not self._idle_time:
+            return
+        with self._lock:
+            now = time.monotonic()
+            for key in [key for key, entry in self._entries.items() if now - entry.last_used >= self._idle_time]:
+                logger.debug(f"Evicting idle training plan of job {key[1]} from the warm cache")
+                self._release(self._entries.pop(key))
+            self._schedule_eviction()
+
+    def clear(self):
+        """Evicts all the training plans."""
+        with self._lock:
+            for entry in self._entries.values():
+                self._release(entry)
+            self._entries.clear()
+            if self._timer is not None:
+                self._timer.cancel()
+                self._timer = None
+
+    def _schedule_eviction(self):
+        """Schedules the eviction of the next idle training plan. Must be called with the lock held."""
+        if self._timer is not None:
+            self._timer.cancel()
+            self._timer = None
+        if not self._idle_time or not self._entries:
+            return
+        oldest = min(entry.last_used for entry in self._entries.values())
+        delay = max(0., oldest + self._idle_time - time.monotonic())
+        self._timer = threading.Timer(delay, self.evict_idle)
+        self._timer.daemon = True
+        self._timer.start()
+
+    @staticmethod
+    def _release(entry: WarmTrainingPlan):
+        """Releases the module of an evicted training plan.
+
+        Args:
+            entry: evicted training plan
+        """
+        sys.modules.pop(entry.module_name, None)
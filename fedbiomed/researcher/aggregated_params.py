@@ -0,0 +1,166 @@
+# This file is originally part of Fed-BioMed
+# SPDX-License-Identifier: Apache-2.0
+
+"""
+History of the aggregated parameters of an experiment, bounded in memory.
+"""
+
+from collections.abc import Mapping
+from typing import Any, Dict, Iterator, Optional
+
+from fedbiomed.common.constants import ErrorNumbers
+from fedbiomed.common.exceptions import FedbiomedExperimentError
+from fedbiomed.common.logger import logger
+from fedbiomed.common.serializer import Serializer
+
+
+DEFAULT_ROUNDS_IN_MEMORY = 2
+"""Default number of latest rounds whose aggregated parameters are kept in memory"""
+
+
+class LazyAggregatedParams(Mapping):
+    """Aggregated parameters of a round, loaded from their file on access.
+
+    Only the file path (and other metadata) are held in memory. The entry is a read-only
+    mapping with the same keys as a regular aggregated parameters entry: accessing the
+    `params` entry (including through `values()`, `items()` or `dict(entry)`) loads the
+    parameters from `params_path` each time, without keeping them, so that older rounds
+    do not use memory.
+    """
+
+    def __init__(self, entry: Dict[str, Any]):
+        """Constructor of the class.
+
+        Args:
+            entry: Aggregated parameters entry, with at least a `params_path` key.
+                The `params` key is ignored.
+        """
+        self._entry = {k: v for k, v in entry.items() if k != 'params'}
+
+    def load(self) -> Dict[str, Any]:
+        """Loads the parameters from file.
+
+        Returns:
+            A regular aggregated parameters entry, including `params`.
+        """
+        return {**self._entry, 'params': self['params']}
+
+    def __getitem__(self, key):
+        if key == 'params':
+            return Serializer.load(self._entry['params_path'])
+        return self._entry[key]
+
+    def __iter__(self) -> Iterator[str]:
+        yield from self._entry
+        yield 'params'
+
+    def __len__(self) -> int:
+        return len(self._entry) + 1
+
+    def __contains__(self, key) -> bool:
+        # does not load the parameters
+        return key == 'params' or key in self._entry
+
+    def __repr__(self) -> str:
+        return f"{self.__class__.__name__}({self._entry!r})"
+
+
+class AggregatedParamsHistory(dict):
+    """Aggregated parameters of each round, indexed by round number.
+
+    Behaves as the `{round: {'params': ..., 'params_path': ...}}` dict used
+    by [`Experiment`][fedbiomed.researcher.experiment.Experiment], but only keeps
+    the parameters of the latest rounds in memory. Entries of older rounds are replaced
+    by [`LazyAggregatedParams`][fedbiomed.researcher.aggregated_params.LazyAggregatedParams]
+    that load parameters from their file when accessed.
+    """
+
+    def __init__(self, entries: Optional[Dict[int, Dict[str, Any]]] = None,
+                 rounds_in_memory: int = DEFAULT_ROUNDS_IN_MEMORY):
+        """Constructor of the class.
+
+        Args:
+            entries: Initial entries of the history
+            rounds_in_memory: Number of latest rounds whose parameters are kept in memory.
+                `None` to keep all of them.
+        """
+        super().__init__()
+        self._rounds_in_memory = None
+        self.set_rounds_in_memory(rounds_in_memory)
+        for round_, entry in (entries or {}).items():
+            super().__setitem__(round_, entry)
+        self._evict()
+
+    @property
+    def rounds_in_memory(self) -> Optional[int]:
+        """Number of latest rounds whose parameters are kept in memory (`None` for all)."""
+        return self._rounds_in_memory
+
+    def set_rounds_in_memory(self, rounds_in_memory: Optional[int]) -> Optional[int]:
+        """Sets the number of latest rounds whose parameters are kept in memory.
+
+        Args:
+            rounds_in_memory: Number of rounds, `None` to keep all of them.
+
+        Returns:
+            The number of rounds kept in memory
+
+        Raises:
+            FedbiomedExperimentError: bad argument type or value
+        """
+        if rounds_in_memory is not None and \
+                (not isinstance(rounds_in_memory, int) or isinstance(rounds_in_memory, bool) or rounds_in_memory < 0):
+            msg = ErrorNumbers.FB410.value + \
+                f' `rounds_in_memory` should be a non-negative int or None, not {rounds_in_memory}'
+            logger.critical(msg)
+            raise FedbiomedExperimentError(msg)
+
+        self._rounds_in_memory = rounds_in_memory
+        self._evict()
+        return self._rounds_in_memory
+
+    @classmethod
+    def from_files(cls, entries: Dict[int, Dict[str, Any]],
+                   rounds_in_memory: int = DEFAULT_ROUNDS_IN_MEMORY) -> 'AggregatedParamsHistory':
+        """Builds the history from entries that only reference parameter files (eg: from a breakpoint).
+
+        Only the parameters of the latest rounds are loaded.
+
+        Args:
+            entries: Entries indexed by round, with a `params_path` key.
+            rounds_in_memory: Number of latest rounds whose parameters are loaded in memory.
+        """
+        history = cls(rounds_in_memory=rounds_in_memory)
+        for round_, entry in entries.items():
+            dict.__setitem__(history, round_, LazyAggregatedParams(entry))
+        for round_ in history._latest_rounds():
+            dict.__setitem__(history, round_, dict.__getitem__(history, round_).load())
+
+        return history
+
+    def __setitem__(self, round_: int, entry: Dict[str, Any]):
+        super().__setitem__(round_, entry)
+        self._evict()
+
+    def update(self, *args, **kwargs):
+        super().update(*args, **kwargs)
+        self._evict()
+
+    def _latest_rounds(self) -> list:
+        """Rounds whose parameters should be in memory"""
+        rounds = sorted(self)
+        if self._rounds_in_memory is None:
+            return rounds
+        return rounds[max(0, len(rounds) - self._rounds_in_memory):] if self._rounds_in_memory else []
+
+    def _evict(self):
+        """Replaces entries of older rounds by lazy entries, if their parameters are saved in a file."""
+        if self._rounds_in_memory is None:
+            return
+
+        latest = set(self._latest_rounds())
+        for round_, entry in dict.items(self):
+            if round_ in latest or isinstance(entry, LazyAggregatedParams):
+                continue
+            if isinstance(entry, Mapping) and entry.get('params_path'):
+                dict.__setitem__(self, round_, LazyAggregatedParams(entry))
@@ -3,14 +3,17 @@
 
 from .aggregator import Aggregator
 from .fedavg import FedAverage
+from .fedbuff import FedBuff
 from .scaffold import Scaffold
-from .functional import initialize, federated_averaging, weighted_sum
+from .functional import initialize, federated_averaging, weighted_sum, accumulate_weighted_sum
 
 __all__ = [
     "Aggregator",
     "FedAverage",
+    "FedBuff",
     "initialize",
     "federated_averaging",
     "weighted_sum",
+    "accumulate_weighted_sum",
     "Scaffold"
 ]
@@ -6,7 +6,6 @@ top class for all aggregators
 """
 
 
-import os
 import functools
 import math
 from typing import Any, Dict, Optional, Tuple, List
@@ -14,8 +13,8 @@ from typing import Any, Dict, Optional, Tuple, List
 from fedbiomed.common.constants import ErrorNumbers, TrainingPlans
 from fedbiomed.common.exceptions import FedbiomedAggregatorError
 from fedbiomed.common.logger import logger
-from fedbiomed.common.serializer import Serializer
 from fedbiomed.researcher.datasets import FederatedDataSet
+from fedbiomed.researcher.filetools import save_blob
 from fedbiomed.common.secagg import SecaggCrypter
 
 
@@ -165,10 +164,14 @@ class Aggregator:
         return state
 
     def _save_arg_to_file(self, breakpoint_path: str, arg_name: str, node_id: str, arg: Any) -> str:
+        """Saves an aggregator argument in the breakpoint blob store.
 
-        filename = os.path.join(breakpoint_path, f"{arg_name}_{node_id}.mpk")
-        Serializer.dump(arg, filename)
-        return filename
+        Unchanged arguments are not written again, the breakpoint only links to the existing blob.
+
+        Returns:
+            Path of the link to the argument blob in the breakpoint folder
+        """
+        return save_blob(breakpoint_path, f"{arg_name}_{node_id}", arg)
 
     def load_state(self, state: Dict[str, Any], **kwargs) -> None:
         """
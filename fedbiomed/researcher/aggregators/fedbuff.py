@@ -0,0 +1,190 @@
+# This file is originally part of Fed-BioMed
+# SPDX-License-Identifier: Apache-2.0
+
+"""
+Buffered asynchronous aggregation (FedBuff)
+"""
+
+from typing import Any, Dict, List, Mapping, Optional, Tuple, Union
+
+import numpy as np
+import torch
+
+from fedbiomed.common.constants import ErrorNumbers
+from fedbiomed.common.exceptions import FedbiomedAggregatorError
+from fedbiomed.common.logger import logger
+from fedbiomed.researcher.aggregators.aggregator import Aggregator
+
+
+class FedBuff(Aggregator):
+    """
+    Defines the buffered asynchronous aggregation strategy [FedBuff](https://arxiv.org/abs/2106.06639).
+
+    Nodes train asynchronously, from the version of the global model that was current when they were
+    (re)dispatched. Their updates (local model minus the global model they trained from) are buffered,
+    and the global model is updated every `buffer_size` updates:
+
+    - `x <- x + server_lr * sum_i p_i * s(t_i) * update_i`
+
+    where `p_i` is the proportion of samples of update `i` in the buffer, and `s(t) = (1 + t) ** -a`
+    down-weights updates by their staleness `t` (number of global model updates since the node was
+    dispatched), with `a` the `staleness_exponent`.
+
+    This aggregator is used by [`Experiment.run_async`][fedbiomed.researcher.experiment.Experiment.run_async].
+    With synchronous rounds, all updates have a staleness of 0 and it behaves as a federated averaging
+    with a server learning rate.
+    """
+
+    def __init__(self, buffer_size: int = 3, server_lr: float = 1., staleness_exponent: float = 0.5):
+        """Construct `FedBuff` object as an instance of [`Aggregator`]
+        [fedbiomed.researcher.aggregators.Aggregator].
+
+        Args:
+            buffer_size: number of node updates after which the global model is updated. Defaults to 3.
+            server_lr: server's (or Researcher's) learning rate. Defaults to 1.
+            staleness_exponent: exponent `a` of the staleness weighting `(1 + staleness) ** -a`,
+                0 to disable it. Defaults to 0.5.
+
+        Raises:
+            FedbiomedAggregatorError: bad argument type or value
+        """
+        super().__init__()
+        self.aggregator_name: str = "FedBuff"
+        if not isinstance(buffer_size, int) or isinstance(buffer_size, bool) or buffer_size < 1:
+            raise FedbiomedAggregatorError(
+                f"{ErrorNumbers.FB401.value}: FedBuff buffer size should be a positive int, not {buffer_size}")
+        if server_lr == 0.:
+            raise FedbiomedAggregatorError(f"{ErrorNumbers.FB401.value}: FedBuff server learning rate cannot be 0")
+        if staleness_exponent < 0.:
+            raise FedbiomedAggregatorError(
+                f"{ErrorNumbers.FB401.value}: FedBuff staleness exponent should be non-negative, "
+                f"not {staleness_exponent}")
+        self.buffer_size: int = buffer_size
+        self.server_lr: float = server_lr
+        self.staleness_exponent: float = staleness_exponent
+        # updates of the nodes, with their sample size and staleness
+        self._buffer: List[Tuple[Dict[str, Union[torch.Tensor, np.ndarray]], int, int]] = []
+        self._aggregator_args = {}
+
+    @property
+    def buffered(self) -> int:
+        """Number of node updates in the buffer."""
+        return len(self._buffer)
+
+    def staleness_weight(self, staleness: int) -> float:
+        """Weight of an update, given its staleness.
+
+        Args:
+            staleness: number of global model updates since the node was dispatched
+
+        Returns:
+            Weight of the update, in ]0, 1]
+        """
+        return float((1 + max(0, staleness)) ** -self.staleness_exponent)
+
+    def add_update(self,
+                   params: Mapping[str, Union[torch.Tensor, np.ndarray]],
+                   base_params: Mapping[str, Union[torch.Tensor, np.ndarray]],
+                   sample_size: int,
+                   staleness: int = 0) -> bool:
+        """Adds the update of a node to the buffer.
+
+        Args:
+            params: model parameters trained by the node
+            base_params: global model parameters the node trained from
+            sample_size: number of samples the node trained on
+            staleness: number of global model updates since the node was dispatched
+
+        Returns:
+            True if the buffer is full, ie the global model should be updated
+        """
+        update = {key: params[key] - base_params[key] for key in params}
+        self._buffer.append((update, sample_size, staleness))
+        return len(self._buffer) >= self.buffer_size
+
+    def flush(self,
+              global_model: Mapping[str, Union[torch.Tensor, np.ndarray]]
+              ) -> Dict[str, Union[torch.Tensor, np.ndarray]]:
+        """Updates the global model with the buffered updates, and empties the buffer.
+
+        Args:
+            global_model: current global model parameters
+
+        Returns:
+            Updated global model parameters
+
+        Raises:
+            FedbiomedAggregatorError: empty buffer, or no samples in the buffered updates
+        """
+        if not self._buffer:
+            raise FedbiomedAggregatorError(f"{ErrorNumbers.FB401.value}: FedBuff buffer is empty")
+        buffer, self._buffer = self._buffer, []
+
+        total_samples = sum(sample_size for _, sample_size, _ in buffer)
+        if total_samples <= 0:
+            raise FedbiomedAggregatorError(
+                f"{ErrorNumbers.FB401.value}. Aggregation aborted due to sum of the sample sizes is equal to 0. "
+                f"Sample sizes received from nodes might be corrupted.")
+        coefficients = [self.server_lr * sample_size / total_samples * self.staleness_weight(staleness)
+                        for _, sample_size, staleness in buffer]
+        logger.debug(f"FedBuff update of the global model with {len(buffer)} updates, "
+                     f"staleness {[staleness for _, _, staleness in buffer]}")
+
+        aggregated = {}
+        for key, value in global_model.items():
+            step = sum(coefficient * update[key] for (update, _, _), coefficient in zip(buffer, coefficients))
+            if isinstance(value, torch.Tensor):
+                aggregated[key] = (value + step).to(value.dtype)
+            else:
+                aggregated[key] = np.asarray(value + step).astype(np.asarray(value).dtype, copy=False)
+        return aggregated
+
+    def aggregate(self,
+                  model_params: Dict[str, Dict[str, Union['torch.Tensor', 'numpy.ndarray']]],
+                  weights: Dict[str, float],
+                  global_model: Mapping[str, Union[torch.Tensor, np.ndarray]],
+                  *args,
+                  **kwargs) -> Dict[str, Union[torch.Tensor, np.ndarray]]:
+        """Aggregates the local models of a synchronous round, as updates with a staleness of 0.
+
+        Args:
+            model_params: local model parameters, indexed by node id
+            weights: weight of each node, indexed by node id
+            global_model: global model parameters the nodes trained from
+
+        Returns:
+            Aggregated parameters
+        """
+        for node_id, params in model_params.items():
+            if node_id not in weights:
+                raise FedbiomedAggregatorError(
+                    f"{ErrorNumbers.FB401.value}. Can not find corresponding calculated weight for the "
+                    f"node {node_id}. Aggregation is aborted."
+                )
+            self.add_update(params, global_model, weights[node_id])
+        return self.flush(global_model)
+
+    def create_aggregator_args(self, *args, **kwargs) -> Tuple[dict, dict]:
+        """FedBuff does not send arguments to the nodes.
+
+        Returns:
+            Empty aggregator arguments sent through messages and through files
+        """
+        return {}, {}
+
+    def save_state(
+        self,
+        breakpoint_path: Optional[str] = None,
+        **aggregator_args_create: Any,
+    ) -> Dict[str, Any]:
+        # buffered updates are not saved: breakpoints are saved right after the global model is updated
+        self._aggregator_args['buffer_size'] = self.buffer_size
+        self._aggregator_args['server_lr'] = self.server_lr
+        self._aggregator_args['staleness_exponent'] = self.staleness_exponent
+        return super().save_state(breakpoint_path, **aggregator_args_create)
+
+    def load_state(self, state: Dict[str, Any] = None, **kwargs) -> None:
+        super().load_state(state)
+        self.buffer_size = self._aggregator_args['buffer_size']
+        self.server_lr = self._aggregator_args['server_lr']
+        self.staleness_exponent = self._aggregator_args['staleness_exponent']
@@ -2,7 +2,7 @@
 # SPDX-License-Identifier: Apache-2.0
 
 import copy
-from typing import Dict, List, Mapping, Tuple, Union
+from typing import Dict, List, Mapping, Optional, Tuple, Union
 
 import torch
 import numpy as np
@@ -72,6 +72,30 @@ def weighted_sum(model_params: List[Dict[str, Union[torch.Tensor, np.ndarray]]],
     return avg_params
 
 
+def accumulate_weighted_sum(accumulator: Optional[Dict[str, Union[torch.Tensor, np.ndarray]]],
+                            model_params: Mapping[str, Union[torch.Tensor, np.ndarray]],
+                            weight: float) -> Dict[str, Union[torch.Tensor, np.ndarray]]:
+    """Adds a weighted model to a running weighted sum, so that models can be summed one at a time.
+
+    Args:
+        accumulator: running weighted sum, None to start a new one
+        model_params: model parameters to add, maps model layer name to the model weights
+        weight: weight of the model in the sum
+
+    Returns:
+        Updated weighted sum. Tensors are summed in place when possible.
+    """
+    if accumulator is None:
+        accumulator = {key: initialize(val)[1] for key, val in model_params.items()}
+
+    for key, val in model_params.items():
+        if isinstance(accumulator[key], torch.Tensor):
+            accumulator[key].add_(val, alpha=weight)
+        else:
+            accumulator[key] += weight * np.asarray(val)
+    return accumulator
+
+
 def init_correction_states(model_params: Dict, node_ids: Dict) -> Dict:
     init_params = {key: initialize(tensor)[1] for key, tensor in model_params.items()}
     client_correction = {node_id: copy.deepcopy(init_params) for node_id in node_ids}
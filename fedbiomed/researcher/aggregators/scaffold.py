@@ -4,8 +4,6 @@
 """Scaffold Aggregator."""
 
 import copy
-import os
-import uuid
 from typing import Any, Dict, Collection, List, Mapping, Optional, Tuple, Union
 
 import numpy as np
@@ -14,12 +12,12 @@ import torch
 from fedbiomed.common.logger import logger
 from fedbiomed.common.constants import TrainingPlans
 from fedbiomed.common.exceptions import FedbiomedAggregatorError
-from fedbiomed.common.serializer import Serializer
 from fedbiomed.common.training_plans import BaseTrainingPlan
 
 from fedbiomed.researcher.aggregators.aggregator import Aggregator
 from fedbiomed.researcher.aggregators.functional import initialize
 from fedbiomed.researcher.datasets import FederatedDataSet
+from fedbiomed.researcher.filetools import load_blob, save_blob
 from fedbiomed.researcher.responses import Responses
 
 
@@ -431,10 +429,8 @@ class Scaffold(Aggregator):
         # adding aggregator parameters to the breakpoint that wont be sent to nodes
         self._aggregator_args['server_lr'] = self.server_lr
 
-        # saving global state variable into a file
-        filename = os.path.join(breakpoint_path, f"global_state_{uuid.uuid4()}.mpk")
-        Serializer.dump(self.global_state, filename)
-        self._aggregator_args['global_state_filename'] = filename
+        # saving global state variable into the breakpoint blob store
+        self._aggregator_args['global_state_filename'] = save_blob(breakpoint_path, "global_state", self.global_state)
         # adding aggregator parameters that will be sent to nodes afterwards
         return super().save_state(
             breakpoint_path, global_model=global_model, node_ids=self._fds.node_ids()
@@ -447,8 +443,8 @@ class Scaffold(Aggregator):
 
         # loading global state
         global_state_filename = self._aggregator_args['global_state_filename']
-        self.global_state = Serializer.load(global_state_filename)
+        self.global_state = load_blob(global_state_filename)
 
         for node_id in self._aggregator_args['aggregator_correction']:
             arg_filename = self._aggregator_args['aggregator_correction'][node_id]
-            self.nodes_deltas[node_id] = Serializer.load(arg_filename)
+            self.nodes_deltas[node_id] = load_blob(arg_filename)
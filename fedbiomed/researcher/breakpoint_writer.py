@@ -0,0 +1,77 @@
+# This file is originally part of Fed-BioMed
+# SPDX-License-Identifier: Apache-2.0
+
+"""
+Background writer for experiment breakpoints.
+"""
+
+from concurrent.futures import Future, ThreadPoolExecutor
+from typing import Any, Callable, Optional
+
+from fedbiomed.common.constants import ErrorNumbers
+from fedbiomed.common.exceptions import FedbiomedExperimentError
+from fedbiomed.common.logger import logger
+
+
+class BreakpointWriter:
+    """Writes breakpoints on a background thread, so that the next round can start meanwhile.
+
+    At most one breakpoint is written at a time: submitting a new write first waits for
+    the previous one. Errors of a write are logged when they happen, and raised by
+    the next call to [`wait`][fedbiomed.researcher.breakpoint_writer.BreakpointWriter.wait]
+    or [`submit`][fedbiomed.researcher.breakpoint_writer.BreakpointWriter.submit].
+
+    The write function must only use a snapshot of the experiment state (eg: serialized
+    JSON, references to objects that are not modified in place).
+    """
+
+    def __init__(self):
+        """Constructor of the class."""
+        self._executor: Optional[ThreadPoolExecutor] = None
+        self._future: Optional[Future] = None
+
+    @property
+    def pending(self) -> bool:
+        """Whether a breakpoint write was submitted and not waited for yet."""
+        return self._future is not None
+
+    def submit(self, write: Callable[..., Any], *args: Any) -> None:
+        """Writes a breakpoint in the background, after the previous one is written.
+
+        Args:
+            write: function that writes the breakpoint
+            *args: arguments of `write`
+
+        Raises:
+            FedbiomedExperimentError: the previous breakpoint could not be written
+        """
+        self.wait()
+
+        if self._executor is None:
+            self._executor = ThreadPoolExecutor(max_workers=1, thread_name_prefix='breakpoint-writer')
+        self._future = self._executor.submit(write, *args)
+        self._future.add_done_callback(self._log_error)
+
+    def wait(self) -> None:
+        """Waits until the submitted breakpoint is written.
+
+        Raises:
+            FedbiomedExperimentError: the breakpoint could not be written
+        """
+        if self._future is None:
+            return
+
+        future, self._future = self._future, None
+        error = future.exception()
+        if isinstance(error, FedbiomedExperimentError):
+            raise error
+        elif error is not None:
+            raise FedbiomedExperimentError(
+                ErrorNumbers.FB413.value + f' - save failed with message {str(error)}') from error
+
+    @staticmethod
+    def _log_error(future: Future) -> None:
+        error = future.exception()
+        if error is not None and not isinstance(error, FedbiomedExperimentError):
+            # `FedbiomedExperimentError` are already logged where they are raised
+            logger.critical(ErrorNumbers.FB413.value + f' - save failed with message {str(error)}')
@@ -92,7 +92,9 @@ class FederatedDataSet:
         """
         sample_sizes = []
         for (key, val) in self._data.items():
-            sample_sizes.append(val["shape"][0])
+            # number of samples is computed by the node when registering the dataset
+            profile = val.get("profile") or {}
+            sample_sizes.append(profile.get("n_samples", val["shape"][0]))
 
         return sample_sizes
 
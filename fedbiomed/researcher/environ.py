@@ -64,6 +64,8 @@ class ResearcherEnviron(Environ):
         # more directories
         self._values['TENSORBOARD_RESULTS_DIR'] = os.path.join(self._values['ROOT_DIR'], TENSORBOARD_FOLDER_NAME)
         self._values['EXPERIMENTS_DIR'] = os.path.join(self._values['VAR_DIR'], "experiments")
+        # compression of breakpoint blobs (`zstd` or empty for none)
+        self._values['BREAKPOINT_COMPRESSION'] = os.getenv('BREAKPOINT_COMPRESSION', '')
         self._values['MESSAGES_QUEUE_DIR'] = os.path.join(self._values['VAR_DIR'], 'queue_messages')
         self._values['DB_PATH'] = os.path.join(self._values['VAR_DIR'],
                                                f'{DB_PREFIX}{self._values["RESEARCHER_ID"]}.json')
@@ -9,6 +9,7 @@ import sys
 import json
 import inspect
 import traceback
+from collections.abc import Mapping
 from copy import deepcopy
 from re import findall
 from typing import Any, Dict, List, Optional, Tuple, Type, TypeVar, Union
@@ -22,22 +23,26 @@ from fedbiomed.common.exceptions import (
 )
 from fedbiomed.common.logger import logger
 from fedbiomed.common.metrics import MetricTypes
-from fedbiomed.common.serializer import Serializer
 from fedbiomed.common.training_args import TrainingArgs
 from fedbiomed.common.training_plans import BaseTrainingPlan, TorchTrainingPlan, SKLearnTrainingPlan
 from fedbiomed.common.utils import is_ipython, raise_for_version_compatibility, __default_version__
 
-from fedbiomed.researcher.aggregators import Aggregator, FedAverage
+from fedbiomed.researcher.aggregated_params import AggregatedParamsHistory, DEFAULT_ROUNDS_IN_MEMORY
+from fedbiomed.researcher.aggregators import Aggregator, FedAverage, FedBuff
+from fedbiomed.researcher.breakpoint_writer import BreakpointWriter
 from fedbiomed.researcher.datasets import FederatedDataSet
 from fedbiomed.researcher.environ import environ
 from fedbiomed.researcher.filetools import (
-    create_exp_folder, choose_bkpt_file, create_unique_link, create_unique_file_link, find_breakpoint_path
+    create_exp_folder, choose_bkpt_file, create_unique_link, create_unique_file_link, find_breakpoint_path,
+    prune_breakpoints, deferred_blobs, write_blobs
 )
 from fedbiomed.researcher.job import Job
 from fedbiomed.researcher.monitor import Monitor
 from fedbiomed.researcher.requests import Requests
 from fedbiomed.researcher.responses import Responses
+from fedbiomed.researcher.round_deadline import RoundDeadline
 from fedbiomed.researcher.secagg import SecureAggregation
+from fedbiomed.researcher.strategies.async_strategy import AsyncStrategy
 from fedbiomed.researcher.strategies.strategy import Strategy
 from fedbiomed.researcher.strategies.default_strategy import DefaultStrategy
 
@@ -265,9 +270,16 @@ class Experiment:
         self.set_job()
 
         # TODO: rewrite after experiment results refactoring
-        self._aggregated_params = {}
+        # only parameters of the latest rounds are kept in memory, older ones are loaded from file on access
+        self._aggregated_params = AggregatedParamsHistory()
 
         self.set_save_breakpoints(save_breakpoints)
+        # all breakpoints are kept unless a retention policy is set
+        self._breakpoint_retention = {'keep_last': None, 'keep_every': None}
+        # breakpoints saved after a round are written while the next round runs
+        self._breakpoint_writer = BreakpointWriter()
+        # rounds wait for all the sampled nodes unless a deadline is set
+        self._round_deadline: Optional[RoundDeadline] = None
 
         # always create a monitoring process
         self._monitor = Monitor()
@@ -547,6 +559,16 @@ class Experiment:
 
         return self._save_breakpoints
 
+    @exp_exceptions
+    def round_deadline(self) -> Optional[RoundDeadline]:
+        """Retrieves the deadline policy of training rounds.
+
+        Returns:
+            Deadline of the rounds, `None` if rounds wait for all the sampled nodes.
+        """
+
+        return self._round_deadline
+
     @exp_exceptions
     def monitor(self) -> Monitor:
         """Retrieves the monitor object
@@ -1406,6 +1428,86 @@ class Experiment:
 
         return self._save_breakpoints
 
+    @exp_exceptions
+    def set_breakpoint_retention(self,
+                                 keep_last: Optional[int] = None,
+                                 keep_every: Optional[int] = None) -> Dict[str, Optional[int]]:
+        """ Setter for the retention policy of breakpoints.
+
+        After a breakpoint is saved, only the breakpoints of the `keep_last` latest rounds and of every
+        `keep_every`-th round are kept. Breakpoint data that is not used anymore by the remaining
+        breakpoints is removed from the experiment folder.
+
+        Args:
+            keep_last: number of latest breakpoints to keep, `None` to keep all breakpoints.
+            keep_every: also keep the breakpoint of every `keep_every`-th round, `None` to keep only
+                the latest breakpoints.
+
+        Returns:
+            Retention policy, as a dict with `keep_last` and `keep_every` keys
+
+        Raises:
+            FedbiomedExperimentError: bad argument type or value
+        """
+        for name, value in (('keep_last', keep_last), ('keep_every', keep_every)):
+            if value is not None and (not isinstance(value, int) or isinstance(value, bool) or value < 1):
+                msg = ErrorNumbers.FB410.value + f' `{name}` should be a positive int or None, not {value}'
+                logger.critical(msg)
+                raise FedbiomedExperimentError(msg)
+
+        self._breakpoint_retention = {'keep_last': keep_last, 'keep_every': keep_every}
+        return self._breakpoint_retention
+
+    @exp_exceptions
+    def set_round_deadline(self,
+                           timeout: Optional[float] = None,
+                           quorum: Optional[float] = None,
+                           penalty_rounds: int = 1) -> Optional[RoundDeadline]:
+        """ Setter for the deadline of training rounds, after which a round goes on without late nodes.
+
+        A round is closed when all sampled nodes replied, after `timeout` seconds, or when a `quorum`
+        fraction of the sampled nodes replied, whichever comes first. Parameters of the nodes that replied
+        are aggregated with weights renormalized over these nodes. Late nodes are not sampled in the next
+        `penalty_rounds` rounds, and their replies are discarded when they come.
+
+        Deadlines are not applied while secure aggregation is active, since it needs all the parties.
+
+        Args:
+            timeout: maximum duration of a round in seconds, `None` for no timeout.
+            quorum: fraction of the sampled nodes, in ]0, 1], after whose replies a round is closed.
+                `None` to wait for all nodes.
+            penalty_rounds: number of rounds for which late nodes are not sampled.
+
+        Returns:
+            Deadline of the rounds, `None` if rounds wait for all the sampled nodes.
+
+        Raises:
+            FedbiomedExperimentError: bad arguments type or value
+        """
+        deadline = RoundDeadline(timeout=timeout, quorum=quorum, penalty_rounds=penalty_rounds)
+        self._round_deadline = deadline if deadline.active else None
+
+        return self._round_deadline
+
+    @exp_exceptions
+    def set_aggregated_params_in_memory(self, rounds: Optional[int]) -> Optional[int]:
+        """ Setter for the number of latest rounds whose aggregated parameters are kept in memory.
+
+        Aggregated parameters of older rounds are still available in
+        [`aggregated_params`][fedbiomed.researcher.experiment.Experiment.aggregated_params],
+        but they are loaded from their file each time they are accessed.
+
+        Args:
+            rounds: number of rounds, or `None` to keep parameters of all rounds in memory.
+
+        Returns:
+            Number of rounds whose aggregated parameters are kept in memory
+
+        Raises:
+            FedbiomedExperimentError: bad rounds type or value
+        """
+        return self._aggregated_params.set_rounds_in_memory(rounds)
+
     @exp_exceptions
     def set_tensorboard(self, tensorboard: bool) -> bool:
         """
@@ -1462,6 +1564,31 @@ class Experiment:
         Returns:
             Number of rounds really run
 
+        Raises:
+            FedbiomedExperimentError: bad argument type or value, or the breakpoint of the round could not be saved
+        """
+        increment = self._run_once(increase=increase, test_after=test_after)
+
+        # the breakpoint is written in the background while the final validation runs
+        self._breakpoint_writer.wait()
+
+        return increment
+
+    def _run_once(self, increase: bool = False, test_after: bool = False) -> int:
+        """Runs at most one round of an experiment.
+
+        See [`run_once`][fedbiomed.researcher.experiment.Experiment.run_once].
+
+        The breakpoint of the round may still be written in the background when returning, so that
+        [`run`][fedbiomed.researcher.experiment.Experiment.run] starts the next round meanwhile.
+
+        Args:
+            increase: automatically increase the `round_limit` of the experiment if needed
+            test_after: if True, do a second request to the nodes after the round, only for validation
+
+        Returns:
+            Number of rounds really run
+
         Raises:
             FedbiomedExperimentError: bad argument type or value
         """
@@ -1517,16 +1644,33 @@ class Experiment:
         self._aggregator.check_values(n_updates=self._training_args.get('num_updates'),
                                       training_plan=self._job.training_plan)
         logger.info('Sampled nodes in round ' + str(self._round_current) + ' ' + str(self._job.nodes))
+        node_training_args = self._node_selection_strategy.node_training_args(self._round_current,
+                                                                              self._training_args.dict())
 
         aggr_args_thr_msg, aggr_args_thr_file = self._aggregator.create_aggregator_args(self._global_model,
                                                                                         self._job.nodes)
 
+        deadline = self._round_deadline
+        if deadline is not None and self._secagg.active:
+            logger.warning('Round deadline is not applied while secure aggregation is active, '
+                           'waiting for all the sampled nodes')
+            deadline = None
+
         # Trigger training round on sampled nodes
         _ = self._job.start_nodes_training_round(round_=self._round_current,
                                                  aggregator_args_thr_msg=aggr_args_thr_msg,
                                                  aggregator_args_thr_files=aggr_args_thr_file,
                                                  do_training=True,
-                                                 secagg_arguments=secagg_arguments)
+                                                 secagg_arguments=secagg_arguments,
+                                                 deadline=deadline,
+                                                 node_training_args=node_training_args)
+
+        if deadline is not None and self._job.late_nodes.get(self._round_current):
+            self._node_selection_strategy.report_late_nodes(self._round_current,
+                                                            self._job.late_nodes[self._round_current],
+                                                            deadline.penalty_rounds)
+
+        self._monitor.add_spans(self._job.training_replies[self._round_current])
 
         # refining/normalizing model weights received from nodes
         model_params, weights, total_sample_size, encryption_factors = self._node_selection_strategy.refine(
@@ -1574,7 +1718,7 @@ class Experiment:
         self._monitor.set_round(round_=self._round_current + 1)
 
         if self._save_breakpoints:
-            self.breakpoint()
+            self.breakpoint(background=True)
 
         # do final validation after saving breakpoint :
         # not saved in breakpoint for current round, but more simple
@@ -1585,7 +1729,8 @@ class Experiment:
             self._job.start_nodes_training_round(round_=self._round_current,
                                                  aggregator_args_thr_msg=aggr_args_thr_msg,
                                                  aggregator_args_thr_files=aggr_args_thr_file,
-                                                 do_training=False)
+                                                 do_training=False,
+                                                 deadline=deadline)
 
         return 1
 
@@ -1696,7 +1841,7 @@ class Experiment:
             else:
                 test_after = False
 
-            increment = self.run_once(increase=False, test_after=test_after)
+            increment = self._run_once(increase=False, test_after=test_after)
 
             if increment == 0:
                 # should not happen
@@ -1705,8 +1850,144 @@ class Experiment:
                 logger.critical(msg)
                 raise FedbiomedExperimentError(msg)
 
+        # make sure the breakpoint of the last round is written before returning
+        self._breakpoint_writer.wait()
+
         return rounds
 
+    @exp_exceptions
+    def run_async(self, updates: Optional[int] = None) -> int:
+        """Run the experiment asynchronously, until the global model was updated `updates` times.
+
+        There is no synchronization barrier between nodes: all the nodes are sent a training request, then
+        each node is sent a new training request, from the latest global model, as soon as it replies.
+        Replies are buffered by the [`FedBuff`][fedbiomed.researcher.aggregators.FedBuff] aggregator,
+        that updates the global model every `buffer_size` replies, weighting them by their staleness.
+
+        Each global model update counts as a round: `round_current` is incremented, aggregated parameters
+        are saved, and a breakpoint is saved if breakpoints are active. Training requests still in flight
+        when this method returns are forgotten, their replies are discarded.
+
+        Requires a [`FedBuff`][fedbiomed.researcher.aggregators.FedBuff] aggregator and an
+        [`AsyncStrategy`][fedbiomed.researcher.strategies.AsyncStrategy] node selection strategy. Secure
+        aggregation and validation on global updates are not supported.
+
+        Args:
+            updates: Number of global model updates to run. `None` means "run all the rounds remaining
+                in the experiment", until `round_limit`.
+
+        Returns:
+            Number of global model updates run
+
+        Raises:
+            FedbiomedExperimentError: bad argument type or value, experiment not fully defined for
+                asynchronous training, or all nodes failed
+        """
+        if updates is not None and (not isinstance(updates, int) or isinstance(updates, bool) or updates < 1):
+            msg = ErrorNumbers.FB410.value + f', in method `run_async` param `updates` : {updates}'
+            logger.critical(msg)
+            raise FedbiomedExperimentError(msg)
+
+        if isinstance(self._round_limit, int):
+            remaining = self._round_limit - self._round_current
+            if remaining <= 0:
+                logger.warning(f'Round limit of {self._round_limit} already reached '
+                               'for this experiment, do nothing.')
+                return 0
+            updates = remaining if updates is None else min(updates, remaining)
+        elif updates is None:
+            logger.warning('Cannot run, please specify a number of `updates` to run or '
+                           'set a `round_limit` to the experiment')
+            return 0
+
+        if self._job is None or self._node_selection_strategy is None:
+            msg = ErrorNumbers.FB411.value + ', missing `job` or `node_selection_strategy`'
+            logger.critical(msg)
+            raise FedbiomedExperimentError(msg)
+        if not isinstance(self._aggregator, FedBuff) or \
+                not isinstance(self._node_selection_strategy, AsyncStrategy):
+            msg = ErrorNumbers.FB411.value + ', asynchronous training requires a `FedBuff` aggregator ' + \
+                'and an `AsyncStrategy` node selection strategy'
+            logger.critical(msg)
+            raise FedbiomedExperimentError(msg)
+        if self._secagg.active:
+            msg = ErrorNumbers.FB411.value + ', secure aggregation is not supported by asynchronous training'
+            logger.critical(msg)
+            raise FedbiomedExperimentError(msg)
+
+        if self._global_model is None:
+            self._global_model = self._job.training_plan.get_model_params()
+        self._aggregator.set_training_plan_type(self._job.training_plan.type())
+        self._aggregator.set_fds(self._fds)
+        self._aggregator.check_values(n_updates=self._training_args.get('num_updates'),
+                                      training_plan=self._job.training_plan)
+
+        # global model parameters each node trains from, indexed by version
+        base_models = {self._round_current: self._global_model}
+        failed_nodes = set()
+        buffered_replies = []
+
+        def dispatch(nodes: List[str]):
+            if nodes:
+                logger.info(f'Dispatching nodes {nodes} from the global model of round {self._round_current}')
+                self._job.dispatch_training(nodes, self._round_current, {}, {})
+
+        self._job.nodes = self._node_selection_strategy.sample_nodes(self._round_current)
+        dispatch(self._node_selection_strategy.dispatch_nodes(self._round_current, list(self._job.nodes)))
+
+        done = 0
+        while done < updates:
+            if not self._job.in_flight:
+                msg = ErrorNumbers.FB407.value + ', no node left for asynchronous training'
+                logger.critical(msg)
+                raise FedbiomedExperimentError(msg)
+
+            in_flight_before = set(self._job.in_flight)
+            replies = self._job.receive_training_replies()
+            replied = {reply['node_id'] for _, reply in replies}
+            failed_nodes |= in_flight_before - set(self._job.in_flight) - replied
+
+            for version, reply in replies:
+                if done == updates:
+                    logger.info(f"Discarding reply of node {reply['node_id']}, all updates were run")
+                    continue
+
+                _, _, sample_size, _ = self._node_selection_strategy.refine(Responses(reply), version)
+                staleness = self._round_current - version
+                buffered_replies.append(reply)
+                self._monitor.add_spans([reply])
+                if self._aggregator.add_update(reply['params'], base_models[version], sample_size, staleness):
+                    self._global_model = self._aggregator.flush(self._global_model)
+                    self._job.training_replies[self._round_current] = Responses([])
+                    self._job.training_replies[self._round_current].append(buffered_replies)
+                    buffered_replies = []
+
+                    aggregated_params_path, _ = self._job.update_parameters(self._global_model)
+                    logger.info(f'Saved aggregated params for round {self._round_current} '
+                                f'in {aggregated_params_path}')
+                    self._aggregated_params[self._round_current] = {'params': self._global_model,
+                                                                    'params_path': aggregated_params_path}
+                    self._round_current += 1
+                    done += 1
+                    base_models[self._round_current] = self._global_model
+                    self._monitor.set_round(round_=self._round_current + 1)
+
+                    if self._save_breakpoints:
+                        self.breakpoint(background=True)
+
+                if done < updates:
+                    idle = [reply['node_id']] if reply['node_id'] not in failed_nodes else []
+                    dispatch(self._node_selection_strategy.dispatch_nodes(self._round_current, idle))
+
+            # only keep the global models that nodes in flight train from
+            versions = set(self._job.in_flight.values()) | {self._round_current}
+            base_models = {v: params for v, params in base_models.items() if v in versions}
+
+        self._job.cancel_in_flight()
+        self._breakpoint_writer.wait()
+
+        return done
+
     # Training plan checking functions
 
     @exp_exceptions
@@ -1784,7 +2065,7 @@ class Experiment:
     # Breakpoint functions
 
     @exp_exceptions
-    def breakpoint(self) -> None:
+    def breakpoint(self, background: bool = False) -> None:
         """
         Saves breakpoint with the state of the training at a current round. The following Experiment attributes will
         be saved:
@@ -1803,10 +2084,18 @@ class Experiment:
           - job (attributes returned by the Job, aka job state)
           - secagg
 
+        Args:
+            background: if True, only take a snapshot of the state and write the breakpoint on a background
+                thread. Errors are then raised by the next breakpoint, or at the end of
+                [`run`][fedbiomed.researcher.experiment.Experiment.run]. Defaults to False.
+
         Raises:
             FedbiomedExperimentError: experiment not fully defined, experiment did not run any round yet, or error when
                 saving breakpoint
         """
+        # wait for the previous breakpoint, so that breakpoints are written in order
+        self._breakpoint_writer.wait()
+
         # at this point, we run the constructor so all object variables are defined
 
         # check pre-requisistes for saving a breakpoint
@@ -1837,27 +2126,31 @@ class Experiment:
         breakpoint_path, breakpoint_file_name = \
             choose_bkpt_file(self._experimentation_folder, self._round_current - 1)
 
-        state = {
-            'breakpoint_version': str(__breakpoints_version__),
-            'training_data': self._fds.data(),
-            'training_args': self._training_args.dict(),
-            'model_args': self._model_args,
-            'training_plan_path': self._job.training_plan_file,  # only in Job we always model saved to a file
-            # with current version
-            'training_plan_class': self._job.training_plan_name,  # not always available properly
-            # formatted in Experiment with current version
-            'round_current': self._round_current,
-            'round_limit': self._round_limit,
-            'experimentation_folder': self._experimentation_folder,
-            'aggregator': self._aggregator.save_state(breakpoint_path, global_model=self._global_model),  # aggregator state
-            'node_selection_strategy': self._node_selection_strategy.save_state(),
-            # strategy state
-            'tags': self._tags,
-            'aggregated_params': self._save_aggregated_params(
-                self._aggregated_params, breakpoint_path),
-            'job': self._job.save_state(breakpoint_path),  # job state
-            'secagg': self._secagg.save_state()
-        }
+        # arrays saved by the aggregator are only referenced here, and written with the breakpoint
+        with deferred_blobs() as blobs:
+            state = {
+                'breakpoint_version': str(__breakpoints_version__),
+                'training_data': self._fds.data(),
+                'training_args': self._training_args.dict(),
+                'model_args': self._model_args,
+                'training_plan_path': self._job.training_plan_file,  # only in Job we always model saved to a file
+                # with current version
+                'training_plan_class': self._job.training_plan_name,  # not always available properly
+                # formatted in Experiment with current version
+                'round_current': self._round_current,
+                'round_limit': self._round_limit,
+                'experimentation_folder': self._experimentation_folder,
+                'aggregator': self._aggregator.save_state(breakpoint_path, global_model=self._global_model),  # aggregator state
+                'node_selection_strategy': self._node_selection_strategy.save_state(),
+                # strategy state
+                'tags': self._tags,
+                'aggregated_params': self._save_aggregated_params(
+                    self._aggregated_params, breakpoint_path),
+                'aggregated_params_in_memory': self._aggregated_params.rounds_in_memory,
+                'job': self._job.save_state(breakpoint_path),  # job state
+                'secagg': self._secagg.save_state(),
+                'round_deadline': self._round_deadline.get_state() if self._round_deadline else None
+            }
 
         # rewrite paths in breakpoint : use the links in breakpoint directory
         state['training_plan_path'] = create_unique_link(
@@ -1869,21 +2162,55 @@ class Experiment:
             os.path.join('..', os.path.basename(state["training_plan_path"]))
         )
 
-        # save state into a json file.
+        # snapshot the state as JSON, so that it can be written while the experiment goes on
+        try:
+            state = json.dumps(state)
+        except (ValueError, TypeError, RecursionError) as e:
+            # see json.dumps() documentation for documented errors for this call
+            msg = ErrorNumbers.FB413.value + f' - save failed with message {str(e)}'
+            logger.critical(msg)
+            raise FedbiomedExperimentError(msg)
 
         breakpoint_file_path = os.path.join(breakpoint_path, breakpoint_file_name)
+        args = (breakpoint_file_path, state, blobs, self._experimentation_folder, dict(self._breakpoint_retention))
+        if background:
+            self._breakpoint_writer.submit(self._write_breakpoint, *args)
+        else:
+            self._write_breakpoint(*args)
+
+    @staticmethod
+    def _write_breakpoint(breakpoint_file_path: str,
+                          state: str,
+                          blobs: list,
+                          experimentation_folder: str,
+                          retention: Dict[str, Optional[int]]) -> None:
+        """Writes a breakpoint snapshot taken by [`breakpoint`][fedbiomed.researcher.experiment.Experiment.breakpoint]
+
+        Args:
+            breakpoint_file_path: path of the breakpoint JSON file
+            state: breakpoint state, serialized as JSON
+            blobs: pending blobs referenced by the state
+            experimentation_folder: experimentation folder name, for pruning old breakpoints
+            retention: breakpoint retention policy, as keyword arguments of
+                [`prune_breakpoints`][fedbiomed.researcher.filetools.prune_breakpoints]
+
+        Raises:
+            FedbiomedExperimentError: error when writing breakpoint
+        """
         try:
+            write_blobs(blobs)
+            # write the state file last, so that a breakpoint is not found before it is complete
             with open(breakpoint_file_path, 'w') as bkpt:
-                json.dump(state, bkpt)
-            logger.info(f"breakpoint for round {self._round_current - 1} saved at " +
-                        os.path.dirname(breakpoint_file_path))
-        except (OSError, ValueError, TypeError, RecursionError) as e:
+                bkpt.write(state)
+            logger.info("breakpoint saved at " + os.path.dirname(breakpoint_file_path))
+        except OSError as e:
             # - OSError: heuristic for catching open() and write() errors
-            # - see json.dump() documentation for documented errors for this call
             msg = ErrorNumbers.FB413.value + f' - save failed with message {str(e)}'
             logger.critical(msg)
             raise FedbiomedExperimentError(msg)
 
+        prune_breakpoints(experimentation_folder, **retention)
+
     @classmethod
     @exp_exceptions
     def load_breakpoint(cls: Type[TExperiment],
@@ -1983,7 +2310,9 @@ class Experiment:
             raise FedbiomedExperimentError(msg)
         else:
             loaded_exp._aggregated_params = loaded_exp._load_aggregated_params(
-                saved_state.get('aggregated_params')
+                saved_state.get('aggregated_params'),
+                # breakpoints saved before the setting was available use the default
+                saved_state.get('aggregated_params_in_memory', DEFAULT_ROUNDS_IN_MEMORY)
             )
 
         # retrieve and change federator
@@ -1995,6 +2324,9 @@ class Experiment:
         # changing `Job` attributes
         loaded_exp._job.load_state(saved_state.get('job'))
 
+        if saved_state.get('round_deadline'):
+            loaded_exp.set_round_deadline(**saved_state['round_deadline'])
+
         logger.info(f"Experimentation reload from {breakpoint_folder_path} successful!")
         return loaded_exp
 
@@ -2029,7 +2361,8 @@ class Experiment:
 
         aggregated_params = {}
         for key, value in aggregated_params_init.items():
-            if not isinstance(value, dict):
+            # entries of older rounds are read-only mappings that load their parameters on access
+            if not isinstance(value, Mapping):
                 msg = ErrorNumbers.FB413.value + ' - save failed. ' + \
                     f'Bad type for aggregated params item {str(key)}, ' + \
                     f'should be `dict` not {type(value)}'
@@ -2044,13 +2377,15 @@ class Experiment:
 
     @staticmethod
     @exp_exceptions
-    def _load_aggregated_params(aggregated_params: Dict[str, dict]) -> Dict[int, Dict[str, Any]]:
+    def _load_aggregated_params(aggregated_params: Dict[str, dict],
+                                rounds_in_memory: Optional[int] = DEFAULT_ROUNDS_IN_MEMORY) -> Dict[int, Dict[str, Any]]:
         """Reconstruct experiment's aggregated params.
 
         Aggregated parameters structure from a breakpoint. It is identical to a classical `_aggregated_params`.
 
         Args:
             aggregated_params: JSON formatted aggregated_params extract from a breakpoint
+            rounds_in_memory: number of latest rounds whose parameters are kept in memory, `None` for all
 
         Returns:
             Reconstructed aggregated params from breakpoint
@@ -2075,10 +2410,8 @@ class Experiment:
             logger.critical(msg)
             raise FedbiomedExperimentError(msg)
 
-        for aggreg in aggregated_params.values():
-            aggreg['params'] = Serializer.load(aggreg['params_path'])
-
-        return aggregated_params
+        # only parameters of the latest rounds are loaded, older ones are loaded on access
+        return AggregatedParamsHistory.from_files(aggregated_params, rounds_in_memory=rounds_in_memory)
 
     # TODO: factorize code with Job and node
     @staticmethod
@@ -6,15 +6,30 @@ Functions for managing Job/Experiment files.
 """
 
 
+import hashlib
 import os
 import re
 import shutil
-from typing import Tuple, List
+import tempfile
+from contextlib import contextmanager
+from contextvars import ContextVar
+from typing import Any, Iterable, Iterator, List, Optional, Set, Tuple
 
 from fedbiomed.common.logger import logger
+from fedbiomed.common.serializer import Serializer
 from fedbiomed.researcher.environ import environ
 
 
+BLOBS_FOLDER = "blobs"
+"""Name of the folder of the experiment where breakpoint blobs are stored"""
+
+_ZSTD_MAGIC = b'\x28\xb5\x2f\xfd'
+_BREAKPOINT_FOLDER_RE = re.compile(r'breakpoint_(\d+)')
+
+# blobs saved in a `deferred_blobs` context, as `(breakpoint folder, link path, object)`
+_pending_blobs: ContextVar[Optional[List[Tuple[str, str, Any]]]] = ContextVar('_pending_blobs', default=None)
+
+
 def create_exp_folder(experimentation_folder: str = None) -> str:
     """ Creates a folder for the current experiment (ie the current run of the model). Experiment files to keep
     are stored here: model file, all versions of node parameters, all versions of aggregated parameters, breakpoints.
@@ -120,15 +135,31 @@ def create_unique_link(breakpoint_folder_path: str,
         FileExistsError: cannot create symlink
         FileNotFoundError : non-existent directory
     """
+    link_src_path = _unique_link_path(breakpoint_folder_path, link_src_prefix, link_src_postfix)
+    _create_link(link_target_path, link_src_path)
+
+    return link_src_path
+
+
+def _unique_link_path(breakpoint_folder_path: str,
+                      link_src_prefix: str,
+                      link_src_postfix: str,
+                      reserved: Iterable[str] = ()) -> str:
+    """ Finds a non-existing name in `breakpoint_folder_path`, that is not in `reserved` paths either. """
     stub = 0
+    reserved = set(reserved)
     link_src_path = os.path.join(breakpoint_folder_path,
                                  link_src_prefix + link_src_postfix)
 
     # Need to ensure unique name for link (e.g. when replaying from non-last breakpoint)
-    while os.path.exists(link_src_path) or os.path.islink(link_src_path):
+    while os.path.exists(link_src_path) or os.path.islink(link_src_path) or link_src_path in reserved:
         stub += 1
         link_src_path = os.path.join(breakpoint_folder_path,
                                      link_src_prefix + '_' + str("{:02}".format(stub)) + link_src_postfix)
+    return link_src_path
+
+
+def _create_link(link_target_path: str, link_src_path: str):
     try:
         os.symlink(link_target_path, link_src_path)
     except(FileExistsError, PermissionError, OSError, FileNotFoundError) as err:
@@ -136,8 +167,6 @@ def create_unique_link(breakpoint_folder_path: str,
                      f"from {link_src_path} due to error {err}")
         raise
 
-    return link_src_path
-
 
 def create_unique_file_link(breakpoint_folder_path: str, file_path: str) -> str:
     """
@@ -191,6 +220,218 @@ def create_unique_file_link(breakpoint_folder_path: str, file_path: str) -> str:
                               link_target)
 
 
+def save_blob(breakpoint_folder_path: str, link_src_prefix: str, obj: Any) -> str:
+    """ Saves an object in the content-addressed blob store of the experiment and links it from a breakpoint.
+
+    Objects are serialized and stored once, under the hash of their content, in the `blobs` folder
+    of the experiment folder (parent of the breakpoint folder). Saving an unchanged object again
+    (eg: the same array at each round) only creates a new link to the existing blob.
+
+    Blobs are compressed with zstandard if `environ['BREAKPOINT_COMPRESSION']` is `zstd`.
+
+    In a [`deferred_blobs`][fedbiomed.researcher.filetools.deferred_blobs] context, only the
+    link path is chosen, and the object is written later by
+    [`write_blobs`][fedbiomed.researcher.filetools.write_blobs].
+
+    Args:
+        breakpoint_folder_path: breakpoint folder, where the link to the blob is created
+        link_src_prefix: beginning of the name for the link (before unique id and `.mpk` extension)
+        obj: object to save, that can be serialized with
+            [`Serializer`][fedbiomed.common.serializer.Serializer]
+
+    Returns:
+        Path of the created link
+
+    Raises:
+        PermissionError: cannot write blob or create symlink
+        OSError: cannot write blob or create symlink
+    """
+    pending = _pending_blobs.get()
+    if pending is not None:
+        link_src_path = _unique_link_path(breakpoint_folder_path, link_src_prefix, ".mpk",
+                                          reserved=(p[1] for p in pending))
+        pending.append((breakpoint_folder_path, link_src_path, obj))
+        return link_src_path
+
+    link_src_path = _unique_link_path(breakpoint_folder_path, link_src_prefix, ".mpk")
+    _write_blob(breakpoint_folder_path, link_src_path, obj)
+    return link_src_path
+
+
+@contextmanager
+def deferred_blobs() -> Iterator[List[Tuple[str, str, Any]]]:
+    """ Context in which [`save_blob`][fedbiomed.researcher.filetools.save_blob] does not write blobs.
+
+    Saved objects are only referenced, so they must not be modified in place until they are
+    written with [`write_blobs`][fedbiomed.researcher.filetools.write_blobs].
+
+    Yields:
+        List of the pending blobs, to be passed to `write_blobs`
+    """
+    pending = []
+    token = _pending_blobs.set(pending)
+    try:
+        yield pending
+    finally:
+        _pending_blobs.reset(token)
+
+
+def write_blobs(pending: List[Tuple[str, str, Any]]):
+    """ Writes the blobs saved in a [`deferred_blobs`][fedbiomed.researcher.filetools.deferred_blobs] context.
+
+    Args:
+        pending: pending blobs yielded by `deferred_blobs`
+
+    Raises:
+        PermissionError: cannot write blob or create symlink
+        OSError: cannot write blob or create symlink
+    """
+    for breakpoint_folder_path, link_src_path, obj in pending:
+        _write_blob(breakpoint_folder_path, link_src_path, obj)
+
+
+def _write_blob(breakpoint_folder_path: str, link_src_path: str, obj: Any):
+    """ Stores an object in the blob store, if not already there, and links it from `link_src_path`. """
+    data = Serializer.dumps(obj)
+    digest = hashlib.sha256(data).hexdigest()
+
+    real_bkpt_folder_path = os.path.realpath(breakpoint_folder_path)
+    blobs_path = os.path.join(os.path.dirname(real_bkpt_folder_path), BLOBS_FOLDER, digest[:2])
+    blob_path = os.path.join(blobs_path, digest + ".mpk")
+
+    if not os.path.isfile(blob_path):
+        compression = environ['BREAKPOINT_COMPRESSION']
+        if compression == 'zstd':
+            data = _zstd_compress(data)
+        elif compression:
+            logger.warning(f"Unknown breakpoint compression `{compression}`, saving uncompressed blob")
+
+        try:
+            os.makedirs(blobs_path, exist_ok=True)
+            # write to a temporary file then rename, so that a blob is never partially written
+            fd, tmp_path = tempfile.mkstemp(dir=blobs_path, prefix='.' + digest)
+            with os.fdopen(fd, 'wb') as file:
+                file.write(data)
+            os.replace(tmp_path, blob_path)
+        except (PermissionError, OSError) as err:
+            logger.error(f"Can not save breakpoint blob {blob_path} due to error {err}")
+            raise
+
+    _create_link(os.path.relpath(blob_path, start=real_bkpt_folder_path), link_src_path)
+
+
+def load_blob(path: str) -> Any:
+    """ Loads an object saved with [`save_blob`][fedbiomed.researcher.filetools.save_blob].
+
+    Also loads files written with [`Serializer.dump`][fedbiomed.common.serializer.Serializer.dump]
+    by previous versions of breakpoints.
+
+    Args:
+        path: path of the blob, or of a link to the blob
+
+    Returns:
+        The deserialized object
+    """
+    with open(path, 'rb') as file:
+        data = file.read()
+    if data[:4] == _ZSTD_MAGIC:
+        data = _zstd_decompress(data)
+
+    return Serializer.loads(data)
+
+
+def _zstd_compress(data: bytes) -> bytes:
+    try:
+        import zstandard
+    except ImportError:
+        logger.warning("Breakpoint compression `zstd` requires the `zstandard` package, "
+                       "saving uncompressed blob")
+        return data
+
+    return zstandard.ZstdCompressor(level=3).compress(data)
+
+
+def _zstd_decompress(data: bytes) -> bytes:
+    try:
+        import zstandard
+    except ImportError as err:
+        message = "Cannot load compressed breakpoint blob: the `zstandard` package is not installed"
+        logger.error(message)
+        raise ImportError(message) from err
+
+    return zstandard.ZstdDecompressor().decompress(data)
+
+
+def prune_breakpoints(experimentation_folder: str,
+                      keep_last: Optional[int] = None,
+                      keep_every: Optional[int] = None) -> List[str]:
+    """ Removes the breakpoints of an experiment that are not kept by the retention policy, and unused blobs.
+
+    The breakpoints of the `keep_last` latest rounds are kept, as well as the breakpoint of every
+    `keep_every`-th round. Other breakpoint folders are removed, then blobs that are not linked
+    from any remaining breakpoint are removed. Files of the experiment folder (training plan,
+    node and aggregated parameters) are not removed.
+
+    Args:
+        experimentation_folder: experimentation folder name (not a path)
+        keep_last: number of latest breakpoints to keep. `None` keeps all breakpoints.
+        keep_every: also keep breakpoints of every `keep_every`-th round. `None` to only keep latest ones.
+
+    Returns:
+        Paths of the removed breakpoint folders
+    """
+    if keep_last is None:
+        return []
+
+    experiment_path = os.path.join(environ['EXPERIMENTS_DIR'], experimentation_folder)
+    breakpoints = {}
+    for name in os.listdir(experiment_path):
+        match = _BREAKPOINT_FOLDER_RE.fullmatch(name)
+        if match and os.path.isdir(os.path.join(experiment_path, name)):
+            breakpoints[int(match.group(1))] = os.path.join(experiment_path, name)
+
+    rounds = sorted(breakpoints)
+    kept = set(rounds[max(0, len(rounds) - keep_last):] if keep_last else [])
+    if keep_every:
+        # breakpoint `breakpoint_xxxx` is saved after round `xxxx + 1`
+        kept.update(r for r in rounds if (r + 1) % keep_every == 0)
+
+    removed = []
+    for round_ in rounds:
+        if round_ not in kept:
+            shutil.rmtree(breakpoints[round_], ignore_errors=True)
+            removed.append(breakpoints[round_])
+
+    if removed:
+        logger.debug(f"Removed breakpoints {', '.join(removed)}")
+        _remove_unused_blobs(experiment_path, (breakpoints[r] for r in kept))
+
+    return removed
+
+
+def _remove_unused_blobs(experiment_path: str, breakpoint_folder_paths: Iterable[str]):
+    """ Removes the blobs of an experiment that are not linked from the given breakpoint folders. """
+    blobs_path = os.path.realpath(os.path.join(experiment_path, BLOBS_FOLDER))
+    if not os.path.isdir(blobs_path):
+        return
+
+    used: Set[str] = set()
+    for folder in breakpoint_folder_paths:
+        with os.scandir(folder) as it:
+            for item in it:
+                if item.is_symlink():
+                    used.add(os.path.realpath(item.path))
+
+    for root, _, files in os.walk(blobs_path):
+        for name in files:
+            path = os.path.join(root, name)
+            if path not in used:
+                try:
+                    os.remove(path)
+                except OSError as err:
+                    logger.warning(f"Can not remove unused breakpoint blob {path} due to error {err}")
+
+
 def _get_latest_file(pathfile: str,
                      list_name_file: List[str],
                      only_folder: bool = False) -> str:
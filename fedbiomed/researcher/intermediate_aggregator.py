@@ -0,0 +1,333 @@
+# This file is originally part of Fed-BioMed
+# SPDX-License-Identifier: Apache-2.0
+
+"""
+Intermediate aggregator, aggregating a subset of the nodes for hierarchical (tree) aggregation.
+"""
+
+import os
+import queue
+import threading
+import time
+import uuid
+from typing import Any, Dict, List, Optional, Tuple
+
+from fedbiomed.common.constants import ComponentType, ErrorNumbers
+from fedbiomed.common.exceptions import FedbiomedAggregatorError, FedbiomedError
+from fedbiomed.common.logger import logger
+from fedbiomed.common.message import NodeMessages, ResearcherMessages
+from fedbiomed.common.messaging import Messaging
+from fedbiomed.common.repository import Repository
+from fedbiomed.common.serializer import Serializer
+from fedbiomed.researcher.aggregators.functional import accumulate_weighted_sum
+from fedbiomed.researcher.round_deadline import RoundDeadline
+
+
+POLL_PERIOD = 1.
+"""Seconds between two checks of the deadlines of the requests, while waiting for messages"""
+
+
+class IntermediateAggregator:
+    """Aggregates the models of a subset of the nodes, and forwards a single partial sum to the researcher.
+
+    For the researcher, an intermediate aggregator is a node holding dataset `dataset_id`. When it receives a
+    training request, it forwards the request to its nodes, and sums their models weighted by their number of
+    samples as they arrive, holding a single model in memory. It then uploads the partial sum to its own file
+    repository, and replies to the researcher with the total number of samples. The researcher downloads one
+    model per intermediate aggregator instead of one per node, and divides each partial sum by its number of
+    samples, so that `FedAverage` combines the partial sums into the average over all the nodes.
+
+    With a `deadline`, the reply to the researcher is sent when the deadline is reached, without the nodes
+    that did not reply yet: a node that never replies does not block the intermediate aggregator.
+
+    The nodes of an intermediate aggregator may be intermediate aggregators too, to build deeper trees.
+    Secure aggregation is not supported, and requests other than training requests are not relayed.
+    """
+
+    def __init__(self,
+                 aggregator_id: str,
+                 dataset_id: str,
+                 nodes: Dict[str, str],
+                 repository: Repository,
+                 tmp_dir: str,
+                 deadline: Optional[RoundDeadline] = None):
+        """Constructor of the class.
+
+        Args:
+            aggregator_id: id of the intermediate aggregator, used as a node id by the researcher
+            dataset_id: id of the dataset of the intermediate aggregator in the researcher's federated dataset
+            nodes: ids of the datasets used on each node, indexed by node id
+            repository: file repository where partial sums are uploaded, and from which node models are downloaded
+            tmp_dir: directory for temporary files
+            deadline: policy closing a request before all the nodes replied (timeout and/or quorum of the nodes).
+                Its `penalty_rounds` are not used. Defaults to None (wait for all the nodes).
+
+        Raises:
+            FedbiomedAggregatorError: no node
+        """
+        if not nodes:
+            msg = f"{ErrorNumbers.FB401.value}: intermediate aggregator {aggregator_id} has no node"
+            logger.critical(msg)
+            raise FedbiomedAggregatorError(msg)
+
+        self._id = aggregator_id
+        self._dataset_id = dataset_id
+        self._nodes = dict(nodes)
+        self._repository = repository
+        self._tmp_dir = tmp_dir
+        self._deadline = deadline if deadline is not None and deadline.active else None
+        # training requests waiting for the replies of nodes, indexed by job id
+        self._pending: Dict[str, Dict[str, Any]] = {}
+        # messages received by the messaging threads, handled in the main thread
+        self._queue = queue.Queue()
+        self._stop = threading.Event()
+
+    @property
+    def id(self) -> str:
+        """Id of the intermediate aggregator."""
+        return self._id
+
+    @property
+    def nodes(self) -> Dict[str, str]:
+        """Ids of the datasets used on each node, indexed by node id."""
+        return dict(self._nodes)
+
+    def on_request(self, msg: Dict[str, Any]) -> List[Tuple[Dict[str, Any], Optional[str]]]:
+        """Handles a request received from the researcher.
+
+        Args:
+            msg: request received from the researcher
+
+        Returns:
+            Messages to send, with the id of the destination node, or None for the researcher
+        """
+        if msg.get('command') != 'train':
+            logger.debug(f"Intermediate aggregator {self._id} ignores request {msg.get('command')}")
+            return []
+        request = NodeMessages.format_incoming_message(msg).get_dict()
+
+        if request['secagg_servkey_id'] is not None:
+            return [(self._reply(request, success=False, message="Secure aggregation is not supported by "
+                                                                 f"intermediate aggregator {self._id}"), None)]
+        if request['job_id'] in self._pending:
+            dropped = self._pending[request['job_id']]['round']
+            logger.warning(f"Intermediate aggregator {self._id} drops round {dropped} of job {request['job_id']} "
+                           "for a new request")
+
+        self._pending[request['job_id']] = {
+            'request': request,
+            'round': request['round'],
+            'waiting': set(self._nodes),
+            'start': time.perf_counter(),
+            'sum': None,
+            'sample_size': 0,
+            'contributors': [],
+            'failed': [],
+            'optimizer_args': None,
+            'rtime_training': 0.,
+        }
+        logger.info(f"Intermediate aggregator {self._id} forwards round {request['round']} to nodes "
+                    f"{list(self._nodes)}")
+
+        requests = []
+        for node_id, dataset_id in self._nodes.items():
+            node_request = {key: value for key, value in request.items() if key != 'protocol_version'}
+            node_request['dataset_id'] = dataset_id
+            requests.append((ResearcherMessages.format_outgoing_message(node_request).get_dict(), node_id))
+        return requests
+
+    def on_reply(self, msg: Dict[str, Any]) -> List[Tuple[Dict[str, Any], Optional[str]]]:
+        """Handles a reply received from a node.
+
+        Args:
+            msg: reply or error message received from a node
+
+        Returns:
+            Messages to send, with the id of the destination node, or None for the researcher. The reply to
+                the researcher is sent once all the nodes replied.
+        """
+        if msg.get('command') not in ('train', 'error'):
+            return []
+        reply = ResearcherMessages.format_incoming_message(msg).get_dict()
+
+        pending = self._pending.get(reply.get('job_id'))
+        if reply['command'] == 'error':
+            # error messages do not tell the job, look for a request waiting for the node
+            pending = next((p for p in self._pending.values() if reply['node_id'] in p['waiting']), None)
+        if pending is None or reply['node_id'] not in pending['waiting'] or \
+                reply['researcher_id'] != pending['request']['researcher_id']:
+            return []
+        if reply['command'] == 'train' and reply.get('round') is not None and reply['round'] != pending['round']:
+            return []
+
+        pending['waiting'].discard(reply['node_id'])
+        if reply['command'] == 'error' or not reply['success']:
+            logger.error(f"Intermediate aggregator {self._id}: node {reply['node_id']} failed: "
+                         f"{reply.get('msg') or reply.get('extra_msg')}")
+            pending['failed'].append(reply['node_id'])
+        elif pending['request']['training']:
+            try:
+                self._add_node_model(pending, reply)
+            except FedbiomedError as err:
+                logger.error(f"Intermediate aggregator {self._id}: cannot get the model of node "
+                             f"{reply['node_id']}: {err}")
+                pending['failed'].append(reply['node_id'])
+        else:
+            pending['contributors'].append(reply['node_id'])
+
+        if pending['waiting'] and not self._deadline_reached(pending):
+            return []
+        del self._pending[pending['request']['job_id']]
+        return [(self._complete(pending), None)]
+
+    def check_deadlines(self) -> List[Tuple[Dict[str, Any], Optional[str]]]:
+        """Closes the requests whose deadline is reached, without the nodes that did not reply yet.
+
+        Returns:
+            Replies to send to the researcher, with None as destination
+        """
+        outgoing = []
+        for job_id, pending in list(self._pending.items()):
+            if self._deadline_reached(pending):
+                del self._pending[job_id]
+                outgoing.append((self._complete(pending), None))
+        return outgoing
+
+    def _deadline_reached(self, pending: Dict[str, Any]) -> bool:
+        """Checks whether a request should be closed with the nodes that already replied."""
+        if self._deadline is None:
+            return False
+        return self._deadline.reached(len(self._nodes) - len(pending['waiting']), len(self._nodes), pending['start'])
+
+    def _add_node_model(self, pending: Dict[str, Any], reply: Dict[str, Any]):
+        """Downloads the model of a node, and adds it to the partial sum."""
+        sample_size = reply['sample_size']
+        if not isinstance(sample_size, int) or sample_size <= 0:
+            # the researcher divides the partial sum by the number of samples
+            raise FedbiomedAggregatorError(f"{ErrorNumbers.FB401.value}: reply of node {reply['node_id']} has "
+                                           f"{sample_size} samples, expected a positive number")
+        _, params_path = self._repository.download_file(reply['params_url'], f"node_params_{uuid.uuid4()}.mpk")
+        results = Serializer.load(params_path)
+        os.remove(params_path)
+
+        if results.get('partial_sum'):
+            # partial sum of a lower level intermediate aggregator, already weighted
+            pending['sum'] = accumulate_weighted_sum(pending['sum'], results['model_weights'], 1.)
+        else:
+            pending['sum'] = accumulate_weighted_sum(pending['sum'], results['model_weights'], sample_size)
+        pending['sample_size'] += sample_size
+        pending['contributors'].append(reply['node_id'])
+        if pending['optimizer_args'] is None:
+            pending['optimizer_args'] = results.get('optimizer_args')
+        pending['rtime_training'] = max(pending['rtime_training'], reply['timing'].get('rtime_training', 0.))
+
+    def _complete(self, pending: Dict[str, Any]) -> Dict[str, Any]:
+        """Builds the reply to the researcher once all the nodes of a request replied."""
+        request = pending['request']
+        late = sorted(pending['waiting'])
+        if late:
+            logger.warning(f"Intermediate aggregator {self._id}: deadline of round {pending['round']} reached, "
+                           f"going on without late nodes {late}")
+        message = f"nodes {pending['contributors']}" + \
+            (f", failed nodes {pending['failed']}" if pending['failed'] else "") + \
+            (f", late nodes {late}" if late else "")
+        if not pending['contributors']:
+            return self._reply(request, success=False,
+                               message=f"No node replied successfully: failed nodes {pending['failed']}, "
+                                       f"late nodes {late}")
+        if not request['training']:
+            return self._reply(request, success=True, message=message)
+
+        start = time.perf_counter()
+        results = {
+            'researcher_id': request['researcher_id'],
+            'job_id': request['job_id'],
+            'node_id': self._id,
+            'model_weights': pending['sum'],
+            'partial_sum': True,
+            'node_ids': pending['contributors'],
+            'optimizer_args': pending['optimizer_args'],
+        }
+        filename = os.path.join(self._tmp_dir, f"partial_sum_{uuid.uuid4()}.mpk")
+        try:
+            Serializer.dump(results, filename)
+            res = self._repository.upload_file(filename)
+        except Exception as exc:
+            return self._reply(request, success=False, message=f"Cannot upload partial sum: {exc}")
+        finally:
+            if os.path.isfile(filename):
+                os.remove(filename)
+
+        logger.info(f"Intermediate aggregator {self._id} forwards the partial sum of round {pending['round']}, "
+                    f"{message}")
+        return self._reply(request,
+                           success=True,
+                           message=message,
+                           params_url=res['file'],
+                           sample_size=pending['sample_size'],
+                           timing={'rtime_training': pending['rtime_training'],
+                                   'rtime_aggregation': time.perf_counter() - start})
+
+    def _reply(self,
+               request: Dict[str, Any],
+               success: bool,
+               message: str = '',
+               params_url: str = '',
+               sample_size: Optional[int] = None,
+               timing: Optional[Dict[str, float]] = None) -> Dict[str, Any]:
+        """Formats the reply to a training request of the researcher."""
+        if not success:
+            logger.error(f"Intermediate aggregator {self._id}: {message}")
+        return NodeMessages.format_outgoing_message({'node_id': self._id,
+                                                     'job_id': request['job_id'],
+                                                     'researcher_id': request['researcher_id'],
+                                                     'command': 'train',
+                                                     'success': success,
+                                                     'dataset_id': self._dataset_id if success else '',
+                                                     'params_url': params_url,
+                                                     'msg': message,
+                                                     'sample_size': sample_size,
+                                                     'timing': timing or {},
+                                                     'round': request['round']}).get_dict()
+
+    def start(self, mqtt_broker: str = 'localhost', mqtt_broker_port: int = 1883):
+        """Connects to the message broker, and relays training requests until stopped or interrupted.
+
+        Args:
+            mqtt_broker: IP address / URL of the message broker
+            mqtt_broker_port: port of the message broker
+        """
+        self._stop.clear()
+        # seen as a node by the researcher, and as a researcher by the nodes
+        to_researcher = Messaging(lambda msg, topic: self._queue.put(('request', msg)),
+                                  ComponentType.NODE, self._id, mqtt_broker, mqtt_broker_port)
+        to_nodes = Messaging(lambda msg, topic: self._queue.put(('reply', msg))
+                             if topic == 'general/researcher' else None,
+                             ComponentType.RESEARCHER, f"{self._id}_nodes", mqtt_broker, mqtt_broker_port)
+        to_nodes.start()
+        to_researcher.start()
+        logger.info(f"Intermediate aggregator {self._id} started with nodes {list(self._nodes)}")
+
+        try:
+            while not self._stop.is_set():
+                try:
+                    kind, msg = self._queue.get(timeout=POLL_PERIOD)
+                except queue.Empty:
+                    outgoing = []
+                else:
+                    outgoing = self.on_request(msg) if kind == 'request' else self.on_reply(msg)
+                for out_msg, node_id in outgoing + self.check_deadlines():
+                    if node_id is None:
+                        to_researcher.send_message(out_msg)
+                    else:
+                        to_nodes.send_message(out_msg, client=node_id)
+        except KeyboardInterrupt:
+            pass
+        finally:
+            to_researcher.stop()
+            to_nodes.stop()
+            logger.info(f"Intermediate aggregator {self._id} stopped")
+
+    def stop(self):
+        """Stops relaying requests, when called from another thread than the one running `start`."""
+        self._stop.set()
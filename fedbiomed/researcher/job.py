@@ -18,11 +18,11 @@ from typing import Any, Callable, Dict, List, Optional, Tuple, Type, Union
 
 import validators
 
-from fedbiomed.common.constants import TrainingPlanApprovalStatus
+from fedbiomed.common.constants import ErrorNumbers, TrainingPlanApprovalStatus
 from fedbiomed.common.exceptions import FedbiomedRepositoryError, FedbiomedDataQualityCheckError
 from fedbiomed.common.logger import logger
-from fedbiomed.common.repository import Repository
 from fedbiomed.common.serializer import Serializer
+from fedbiomed.common.simulation import create_repository
 from fedbiomed.common.training_args import TrainingArgs
 
 from fedbiomed.researcher.datasets import FederatedDataSet
@@ -30,6 +30,7 @@ from fedbiomed.researcher.environ import environ
 from fedbiomed.researcher.filetools import create_unique_link, create_unique_file_link
 from fedbiomed.researcher.requests import Requests
 from fedbiomed.researcher.responses import Responses
+from fedbiomed.researcher.round_deadline import RoundDeadline
 
 
 class Job:
@@ -76,6 +77,8 @@ class Job:
         self._model_args = model_args
         self._nodes = nodes
         self._training_replies = {}  # will contain all node replies for every round
+        self._late_nodes = {}  # nodes that did not reply before the deadline of each round
+        self._in_flight = {}  # round and time of the training requests in flight, for asynchronous training
         self._model_file = None  # path to local file containing model code
         self._model_params_file = ""  # path to local file containing current version of aggregated params
         self._training_plan_class = training_plan_class
@@ -149,7 +152,7 @@ class Job:
         # (it is `model` only in the case where `model` is not an instance)
         self._training_plan_name = self._training_plan.__class__.__name__
 
-        self.repo = Repository(environ['UPLOADS_URL'], self._keep_files_dir, environ['CACHE_DIR'])
+        self.repo = create_repository(environ['UPLOADS_URL'], self._keep_files_dir, environ['CACHE_DIR'])
 
         self._training_plan_file = os.path.join(self._keep_files_dir, 'my_model_' + str(uuid.uuid4()) + '.py')
         try:
@@ -227,6 +230,10 @@ class Job:
     def training_replies(self):
         return self._training_replies
 
+    @property
+    def late_nodes(self) -> Dict[int, List[str]]:
+        return self._late_nodes
+
     @property
     def training_args(self):
         return self._training_args.dict()
@@ -349,9 +356,15 @@ class Job:
                                    aggregator_args_thr_msg: Dict[str, Dict[str, Any]],
                                    aggregator_args_thr_files: Dict[str, Dict[str, Any]],
                                    secagg_arguments: Union[Dict, None] = None,
-                                   do_training: bool = True):
+                                   do_training: bool = True,
+                                   deadline: Optional[RoundDeadline] = None,
+                                   node_training_args: Optional[Dict[str, Dict[str, Any]]] = None):
         """ Sends training request to nodes and waits for the responses
 
+        If a `deadline` is given, stops waiting when it is reached: nodes that did not reply yet are
+        late, they are removed from the nodes of the job and recorded in `late_nodes`. Their replies,
+        when they come later, are discarded thanks to their round number.
+
         Args:
             round_: current number of round the algorithm is performing (a round is considered to be all the
                 training steps of a federated model between 2 aggregations).
@@ -363,15 +376,76 @@ class Job:
                 aggregator_args_thr_msg .
             secagg_arguments: Secure aggregation ServerKey context id
             do_training: if False, skip training in this round (do only validation). Defaults to True.
+            deadline: policy closing the round before all nodes replied. Defaults to None (wait for all nodes).
+            node_training_args: training arguments overridden for some nodes, indexed by node id. Defaults to
+                None (same training arguments for all nodes).
         """
 
+        time_start = self._send_training_requests(self._nodes, round_, aggregator_args_thr_msg,
+                                                  aggregator_args_thr_files, secagg_arguments, do_training,
+                                                  node_training_args)
+
+        # Recollect models trained
+        self._training_replies[round_] = Responses([])
+        self._late_nodes.pop(round_, None)
+        use_deadline = deadline is not None and deadline.active
+        num_requests = len(self._nodes)
+        round_start = time.perf_counter()
+        while self.waiting_for_nodes(self._training_replies[round_]):
+            if use_deadline and deadline.reached(len(self._training_replies[round_]), num_requests, round_start):
+                self._close_round_at_deadline(round_)
+                break
+            # collect nodes responses from researcher request 'train'
+            # (wait for all nodes with a ` while true` loop)
+            # models_done = self._reqs.get_responses(look_for_commands=['train'])
+            # with a deadline, check it after each polling period, even if nodes keep replying
+            models_done = self._reqs.get_responses(look_for_commands=['train', 'error'], only_successful=False,
+                                                   while_responses=not use_deadline)
+            for m in models_done.data():  # retrieve all models
+                # (there should have as many models done as nodes)
+                try:
+                    reply = self._process_training_reply(m, round_, self._nodes, time_start, do_training)
+                except FedbiomedRepositoryError:
+                    return
+                if reply is not None:
+                    self._training_replies[round_].append(reply)
+
+        # return the list of nodes which answered because nodes in error have been removed
+        return self._nodes
+
+    def _send_training_requests(self,
+                                nodes: List[str],
+                                round_: int,
+                                aggregator_args_thr_msg: Dict[str, Dict[str, Any]],
+                                aggregator_args_thr_files: Dict[str, Dict[str, Any]],
+                                secagg_arguments: Union[Dict, None] = None,
+                                do_training: bool = True,
+                                node_training_args: Optional[Dict[str, Dict[str, Any]]] = None
+                                ) -> Dict[str, float]:
+        """Sends the training request of a round to nodes.
+
+        Args:
+            nodes: ids of the nodes the request is sent to
+            round_: round of the request, ie version of the global model the nodes train from
+            aggregator_args_thr_msg: aggregator arguments sent through messages, indexed by node id
+            aggregator_args_thr_files: aggregator arguments sent through the file exchange system
+            secagg_arguments: Secure aggregation ServerKey context id
+            do_training: if False, skip training in this round (do only validation)
+            node_training_args: training arguments overridden for some nodes, indexed by node id
+
+        Returns:
+            Time when the request was sent to each node
+        """
         # Assign empty dict to secagg arguments if it is None
         if secagg_arguments is None:
             secagg_arguments = {}
+        if node_training_args is None:
+            node_training_args = {}
+        training_args = self._training_args.dict()
 
         headers = {'researcher_id': self._researcher_id,
                    'job_id': self._id,
-                   'training_args': self._training_args.dict(),
+                   'training_args': training_args,
                    'training': do_training,
                    'model_args': self._model_args,
                    'round': round_,
@@ -388,8 +462,10 @@ class Job:
         # pass heavy aggregator params through file exchange system
         self.upload_aggregator_args(aggregator_args_thr_msg, aggregator_args_thr_files)
 
-        for cli in self._nodes:
+        for cli in nodes:
             msg['dataset_id'] = self._data.data()[cli]['dataset_id']
+            msg['training_args'] = {**training_args, **node_training_args[cli]} \
+                if cli in node_training_args else training_args
 
             if aggregator_args_thr_msg:
                 # add aggregator parameters to message header
@@ -412,84 +488,190 @@ class Job:
             time_start[cli] = time.perf_counter()
             self._reqs.send_message(msg, cli)  # send request to node
 
-        # Recollect models trained
-        self._training_replies[round_] = Responses([])
-        while self.waiting_for_nodes(self._training_replies[round_]):
-            # collect nodes responses from researcher request 'train'
-            # (wait for all nodes with a ` while true` loop)
-            # models_done = self._reqs.get_responses(look_for_commands=['train'])
-            models_done = self._reqs.get_responses(look_for_commands=['train', 'error'], only_successful=False)
-            for m in models_done.data():  # retrieve all models
-                # (there should have as many models done as nodes)
+        return time_start
 
-                # manage error messages during training
-                if m['command'] == 'error':
-                    if m['extra_msg']:
-                        logger.info(f"Error message received during training: {str(m['errnum'].value)} "
-                                    f"- {str(m['extra_msg'])}")
-                    else:
-                        logger.info(f"Error message received during training: {str(m['errnum'].value)}")
+    def _process_training_reply(self,
+                                m: Dict[str, Any],
+                                round_: int,
+                                nodes: List[str],
+                                time_start: Dict[str, float],
+                                do_training: bool = True) -> Optional[Dict[str, Any]]:
+        """Processes a message received in reply to a training request.
 
-                    faulty_node = m['node_id']  # remove the faulty node from the list
+        Nodes that report an error or a training failure are removed from `nodes`.
 
-                    if faulty_node not in list(self._nodes):
-                        logger.warning(f"Error message from {faulty_node} ignored, since this node is not part ot "
-                                       f"the training any mode")
-                        continue
+        Args:
+            m: message received from a node, `train` reply or `error`
+            round_: round of the training request
+            nodes: ids of the nodes whose reply is expected
+            time_start: time when the request was sent to each node
+            do_training: whether the request was a training request, or only a validation request
 
-                    self._nodes.remove(faulty_node)
-                    continue
+        Returns:
+            Training reply, with the parameters downloaded from the node. None if the message is not
+                a successful reply to the request.
 
-                # only consider replies for our request
-                if m['researcher_id'] != environ['RESEARCHER_ID'] or \
-                        m['job_id'] != self._id or m['node_id'] not in list(self._nodes):
-                    continue
+        Raises:
+            FedbiomedRepositoryError: the parameters of the node cannot be downloaded
+        """
+        # manage error messages during training
+        if m['command'] == 'error':
+            if m['extra_msg']:
+                logger.info(f"Error message received during training: {str(m['errnum'].value)} "
+                            f"- {str(m['extra_msg'])}")
+            else:
+                logger.info(f"Error message received during training: {str(m['errnum'].value)}")
 
-                # manage training failure for this job
-                if not m['success']:
-                    logger.error(f"Training failed for node {m['node_id']}: {m['msg']}")
-                    self._nodes.remove(m['node_id'])  # remove the faulty node from the list
-                    continue
+            faulty_node = m['node_id']  # remove the faulty node from the list
 
-                rtime_total = time.perf_counter() - time_start[m['node_id']]
-
-                if do_training:
-                    logger.info(f"Downloading model params after training on {m['node_id']} - from {m['params_url']}")
-                    try:
-                        _, params_path = self.repo.download_file(m["params_url"], f"node_params_{uuid.uuid4()}.mpk")
-                    except FedbiomedRepositoryError as err:
-                        logger.error(f"Cannot download model parameter from node {m['node_id']}, probably because Node"
-                                     f" stops working (details: {err})")
-                        return
-                    results = Serializer.load(params_path)
-                    params = results["model_weights"]
-                    optimizer_args = results.get("optimizer_args")
-                    encryption_factor = results.get('encryption_factor', None)
-                else:
-                    params_path = None
-                    params = None
-                    optimizer_args = None
-                    encryption_factor = None
-
-                # TODO: could choose completely different name/structure for
-                timing = m['timing']
-                timing['rtime_total'] = rtime_total
-
-                r = Responses({'success': m['success'],
-                               'msg': m['msg'],
-                               'dataset_id': m['dataset_id'],
-                               'node_id': m['node_id'],
-                               'params_path': params_path,
-                               'params': params,
-                               'optimizer_args': optimizer_args,
-                               'sample_size': m["sample_size"],
-                               'encryption_factor': encryption_factor,
-                               'timing': timing})
-
-                self._training_replies[round_].append(r)
+            if faulty_node not in list(nodes):
+                logger.warning(f"Error message from {faulty_node} ignored, since this node is not part ot "
+                               f"the training any mode")
+                return None
 
-        # return the list of nodes which answered because nodes in error have been removed
-        return self._nodes
+            nodes.remove(faulty_node)
+            return None
+
+        # only consider replies for our request
+        if m['researcher_id'] != environ['RESEARCHER_ID'] or \
+                m['job_id'] != self._id or m['node_id'] not in list(nodes):
+            return None
+
+        # discard late replies to the request of a previous round
+        if m.get('round') is not None and m['round'] != round_:
+            logger.info(f"Discarding reply of node {m['node_id']} for round {m['round']}, "
+                        f"expected round {round_}")
+            return None
+
+        # manage training failure for this job
+        if not m['success']:
+            logger.error(f"Training failed for node {m['node_id']}: {m['msg']}")
+            nodes.remove(m['node_id'])  # remove the faulty node from the list
+            return None
+
+        rtime_total = time.perf_counter() - time_start[m['node_id']]
+
+        if do_training:
+            logger.info(f"Downloading model params after training on {m['node_id']} - from {m['params_url']}")
+            try:
+                _, params_path = self.repo.download_file(m["params_url"], f"node_params_{uuid.uuid4()}.mpk")
+            except FedbiomedRepositoryError as err:
+                logger.error(f"Cannot download model parameter from node {m['node_id']}, probably because Node"
+                             f" stops working (details: {err})")
+                raise
+            results = Serializer.load(params_path)
+            params = results["model_weights"]
+            if results.get('partial_sum', False):
+                if not m['sample_size'] or m['sample_size'] < 0:
+                    logger.error(f"{ErrorNumbers.FB408.value}: intermediate aggregator {m['node_id']} replied with "
+                                 f"a partial sum of {m['sample_size']} samples, which cannot be averaged. "
+                                 "Reply is discarded.")
+                    nodes.remove(m['node_id'])
+                    return None
+                # weighted sum of the models of the nodes behind an intermediate aggregator:
+                # their average is combined with the other models as a single model
+                params = {key: value / m['sample_size'] for key, value in params.items()}
+            optimizer_args = results.get("optimizer_args")
+            encryption_factor = results.get('encryption_factor', None)
+            profile = results.get('profile')
+        else:
+            params_path = None
+            params = None
+            optimizer_args = None
+            encryption_factor = None
+            profile = None
+
+        # TODO: could choose completely different name/structure for
+        timing = m['timing']
+        timing['rtime_total'] = rtime_total
+
+        return {'success': m['success'],
+                'msg': m['msg'],
+                'dataset_id': m['dataset_id'],
+                'node_id': m['node_id'],
+                'params_path': params_path,
+                'params': params,
+                'optimizer_args': optimizer_args,
+                'sample_size': m["sample_size"],
+                'encryption_factor': encryption_factor,
+                'timing': timing,
+                'spans': m.get('spans') or {},
+                'profile': profile}
+
+    def dispatch_training(self,
+                          nodes: List[str],
+                          round_: int,
+                          aggregator_args_thr_msg: Dict[str, Dict[str, Any]],
+                          aggregator_args_thr_files: Dict[str, Dict[str, Any]]) -> None:
+        """Sends a training request to nodes without waiting for their replies (asynchronous training).
+
+        Replies are received with
+        [`receive_training_replies`][fedbiomed.researcher.job.Job.receive_training_replies].
+
+        Args:
+            nodes: ids of the nodes the request is sent to. They should not have a request in flight.
+            round_: version of the global model the nodes train from
+            aggregator_args_thr_msg: aggregator arguments sent through messages, indexed by node id
+            aggregator_args_thr_files: aggregator arguments sent through the file exchange system
+        """
+        time_start = self._send_training_requests(nodes, round_, aggregator_args_thr_msg, aggregator_args_thr_files)
+        for node_id in nodes:
+            self._in_flight[node_id] = (round_, time_start[node_id])
+
+    def receive_training_replies(self) -> List[Tuple[int, Dict[str, Any]]]:
+        """Receives the replies to the training requests in flight (asynchronous training).
+
+        Waits for one polling period. Nodes that replied, failed, or whose parameters cannot be downloaded
+        no longer have a request in flight. Replies to other requests are discarded.
+
+        Returns:
+            Round of the request and training reply, for each node that successfully replied
+        """
+        replies = []
+        models_done = self._reqs.get_responses(look_for_commands=['train', 'error'], only_successful=False,
+                                               while_responses=False)
+        for m in models_done.data():
+            node_id = m['node_id']
+            if node_id not in self._in_flight:
+                continue
+            round_, time_start = self._in_flight[node_id]
+            nodes = [node_id]
+            try:
+                reply = self._process_training_reply(m, round_, nodes, {node_id: time_start})
+            except FedbiomedRepositoryError:
+                reply, nodes = None, []
+            if reply is not None or not nodes:
+                # the request got its reply, or failed
+                del self._in_flight[node_id]
+            if reply is not None:
+                replies.append((round_, reply))
+
+        return replies
+
+    @property
+    def in_flight(self) -> Dict[str, int]:
+        """Nodes with a training request in flight, and the round of their request (asynchronous training)."""
+        return {node_id: round_ for node_id, (round_, _) in self._in_flight.items()}
+
+    def cancel_in_flight(self) -> None:
+        """Forgets the training requests in flight: their replies will be discarded when they come."""
+        self._in_flight = {}
+
+    def _close_round_at_deadline(self, round_: int):
+        """Removes the nodes that did not reply to the training request of the round, and records them as late.
+
+        Args:
+            round_: current round
+        """
+        try:
+            nodes_done = set(self._training_replies[round_].dataframe()['node_id'])
+        except KeyError:
+            nodes_done = set()
+        late_nodes = [node for node in self._nodes if node not in nodes_done]
+
+        logger.warning(f"Round {round_} deadline reached, going on without late nodes {late_nodes}")
+        self._late_nodes[round_] = late_nodes
+        self._nodes = [node for node in self._nodes if node in nodes_done]
 
     def update_parameters(
         self,
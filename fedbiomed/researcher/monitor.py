@@ -9,8 +9,9 @@ sned it to tensordboard
 import os
 import shutil
 import collections
-from typing import Dict, Union, Any
+from typing import Dict, Iterable, Union, Any
 
+import pandas as pd
 from torch.utils.tensorboard import SummaryWriter
 
 from fedbiomed.common.logger import logger
@@ -220,6 +221,8 @@ class Monitor:
         self._event_writers = {}
         self._round_state = 0
         self._tensorboard = False
+        # spans of the training replies, indexed by node and round
+        self._spans: Dict[str, Dict[int, Dict[str, Dict[str, Any]]]] = {}
 
         if os.listdir(self._log_dir):
             logger.info('Removing tensorboard logs from previous experiment')
@@ -264,6 +267,56 @@ class Monitor:
             # Log metric result
             self._log_metric_result(message=msg, cum_iter=cumulative_iter)
 
+    def add_spans(self, replies: Iterable[Dict[str, Any]]):
+        """Stores the spans of training replies received for the current round, and writes them as scalars into
+        tensorboard if it is activated.
+
+        Spans record the time and resources spent in each phase of the round of a node, see
+        [`SpanRecorder`][fedbiomed.common.instrumentation.SpanRecorder].
+
+        Args:
+            replies: training replies of the nodes, as stored by the job
+        """
+        for reply in replies:
+            spans = reply.get('spans')
+            if not spans:
+                continue
+            node = reply['node_id']
+            self._spans.setdefault(node, {})[self._round] = spans
+
+            if self._tensorboard:
+                for name, measures in spans.items():
+                    self._summary_writer(header=f'SPANS/{name}',
+                                         node=node,
+                                         metric={key: value for key, value in measures.items() if value is not None},
+                                         cum_iter=self._round)
+
+    def spans(self) -> Dict[str, Dict[int, Dict[str, Dict[str, Any]]]]:
+        """Retrieves the spans received from the nodes.
+
+        Returns:
+            Measures of each span of the nodes, indexed by node id, round and span name
+        """
+        return {node: {round_: {name: dict(measures) for name, measures in spans.items()}
+                       for round_, spans in rounds.items()}
+                for node, rounds in self._spans.items()}
+
+    def spans_table(self) -> pd.DataFrame:
+        """Retrieves the spans received from the nodes as a table.
+
+        Comparing the `download` and `upload` spans to the `training` span tells whether a node is network-bound
+        or compute-bound.
+
+        Returns:
+            One row per node, round and span, with columns `node_id`, `round`, `span`, `wall_time`, `cpu_time`,
+                `peak_rss` and `bytes`
+        """
+        rows = [{'node_id': node, 'round': round_, 'span': name, **measures}
+                for node, rounds in self._spans.items()
+                for round_, spans in rounds.items()
+                for name, measures in spans.items()]
+        return pd.DataFrame(rows, columns=['node_id', 'round', 'span', 'wall_time', 'cpu_time', 'peak_rss', 'bytes'])
+
     def set_tensorboard(self, tensorboard: bool):
         """ Sets tensorboard flag, which is used to decide the behavior of the writing scalar values into
          tensorboard log files.
@@ -20,7 +20,7 @@ from fedbiomed.common.exceptions import FedbiomedTaskQueueError
 from fedbiomed.common.logger import logger
 from fedbiomed.common.message import ResearcherMessages
 from fedbiomed.common.messaging import Messaging
-from fedbiomed.common.repository import Repository
+from fedbiomed.common.simulation import create_messaging, create_repository
 from fedbiomed.common.singleton import SingletonMeta
 from fedbiomed.common.tasks_queue import TasksQueue
 
@@ -46,12 +46,12 @@ class Requests(metaclass=SingletonMeta):
         # eg: a notebook not quitted and launching a script
         self.queue = TasksQueue(environ['MESSAGES_QUEUE_DIR'] + '_' + str(uuid.uuid4()), environ['TMP_DIR'])
 
-        if mess is None or type(mess) is not Messaging:
-            self.messaging = Messaging(self.on_message,
-                                       ComponentType.RESEARCHER,
-                                       environ['RESEARCHER_ID'],
-                                       environ['MQTT_BROKER'],
-                                       environ['MQTT_BROKER_PORT'])
+        if mess is None or not isinstance(mess, Messaging):
+            self.messaging = create_messaging(self.on_message,
+                                              ComponentType.RESEARCHER,
+                                              environ['RESEARCHER_ID'],
+                                              environ['MQTT_BROKER'],
+                                              environ['MQTT_BROKER_PORT'])
             self.messaging.start(block=False)
         else:
             self.messaging = mess
@@ -420,9 +420,9 @@ class Requests(metaclass=SingletonMeta):
             return {}
 
         # create a repository instance and upload the training plan file
-        repository = Repository(environ['UPLOADS_URL'],
-                                environ['TMP_DIR'],
-                                environ['CACHE_DIR'])
+        repository = create_repository(environ['UPLOADS_URL'],
+                                       environ['TMP_DIR'],
+                                       environ['CACHE_DIR'])
 
         upload_status = repository.upload_file(training_plan_file)
 
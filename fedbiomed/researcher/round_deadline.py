@@ -0,0 +1,103 @@
+# This file is originally part of Fed-BioMed
+# SPDX-License-Identifier: Apache-2.0
+
+"""
+Deadline of a training round, after which the round goes on with the nodes that replied.
+"""
+
+import math
+import time
+from typing import Any, Dict, Optional
+
+from fedbiomed.common.constants import ErrorNumbers
+from fedbiomed.common.exceptions import FedbiomedExperimentError
+from fedbiomed.common.logger import logger
+
+
+class RoundDeadline:
+    """Policy closing a training round before all the sampled nodes replied.
+
+    A round is closed when all the nodes replied, or as soon as one of the deadline conditions is met:
+
+    - `timeout`: number of seconds elapsed since the training requests were sent,
+    - `quorum`: fraction of the sampled nodes that replied.
+
+    Nodes that did not reply when the round is closed are late: they are left out of the aggregation of
+    the round, and left out of node sampling for the next `penalty_rounds` rounds.
+    """
+
+    def __init__(self,
+                 timeout: Optional[float] = None,
+                 quorum: Optional[float] = None,
+                 penalty_rounds: int = 1):
+        """Constructor of the class.
+
+        Args:
+            timeout: maximum duration of a round in seconds, `None` for no timeout.
+            quorum: fraction of the sampled nodes, in ]0, 1], after whose replies the round is closed.
+                `None` to wait for all nodes.
+            penalty_rounds: number of rounds for which late nodes are not sampled.
+
+        Raises:
+            FedbiomedExperimentError: bad argument type or value
+        """
+        for name, value in (('timeout', timeout), ('quorum', quorum)):
+            if value is not None and (not isinstance(value, (int, float)) or isinstance(value, bool) or value <= 0):
+                self._raise(f'`{name}` should be a positive number or None, not {value}')
+        if quorum is not None and quorum > 1:
+            self._raise(f'`quorum` should be a fraction of the nodes in ]0, 1], not {quorum}')
+        if not isinstance(penalty_rounds, int) or isinstance(penalty_rounds, bool) or penalty_rounds < 0:
+            self._raise(f'`penalty_rounds` should be a non-negative int, not {penalty_rounds}')
+
+        self._timeout = timeout
+        self._quorum = quorum
+        self._penalty_rounds = penalty_rounds
+
+    @staticmethod
+    def _raise(msg: str):
+        msg = ErrorNumbers.FB410.value + f', round deadline: {msg}'
+        logger.critical(msg)
+        raise FedbiomedExperimentError(msg)
+
+    @property
+    def timeout(self) -> Optional[float]:
+        """Maximum duration of a round in seconds."""
+        return self._timeout
+
+    @property
+    def quorum(self) -> Optional[float]:
+        """Fraction of the sampled nodes after whose replies the round is closed."""
+        return self._quorum
+
+    @property
+    def penalty_rounds(self) -> int:
+        """Number of rounds for which late nodes are not sampled."""
+        return self._penalty_rounds
+
+    @property
+    def active(self) -> bool:
+        """Whether a round may be closed before all the nodes replied."""
+        return self._timeout is not None or self._quorum is not None
+
+    def reached(self, num_replies: int, num_nodes: int, start_time: float) -> bool:
+        """Checks whether the round should be closed with the nodes that already replied.
+
+        Args:
+            num_replies: number of nodes that replied
+            num_nodes: number of nodes the training requests were sent to
+            start_time: value of `time.perf_counter()` when the training requests were sent
+
+        Returns:
+            True if the deadline is reached
+        """
+        if self._quorum is not None and num_replies >= math.ceil(self._quorum * num_nodes):
+            return True
+        return self._timeout is not None and time.perf_counter() - start_time >= self._timeout
+
+    def get_state(self) -> Dict[str, Any]:
+        """Returns the arguments of the policy, to be saved in a breakpoint."""
+        return {'timeout': self._timeout, 'quorum': self._quorum, 'penalty_rounds': self._penalty_rounds}
+
+    def __repr__(self) -> str:
+        return f"{self.__class__.__name__}(timeout={self._timeout}, quorum={self._quorum}, " \
+               f"penalty_rounds={self._penalty_rounds})"
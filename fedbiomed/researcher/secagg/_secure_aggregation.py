@@ -4,7 +4,7 @@
 import functools
 import math
 import random
-from typing import List, Union, Dict, Any, Optional
+from typing import List, Union, Dict, Any, Optional, Tuple
 
 from ._secagg_context import SecaggServkeyContext, SecaggBiprimeContext
 from fedbiomed.common.constants import ErrorNumbers
@@ -27,10 +27,16 @@ class SecureAggregation:
         clipping_range: Clipping range that will be used for quantization of model
             parameters on the node side.
 
+        context_expiry: Number of rounds after which a pooled secagg context that was not
+            used is dropped from the pool.
+
         _biprime: Biprime-key context setup instance.
         _parties: Nodes and researcher that participates federated training
         _job_id: ID of the current Job launched by the experiment.
         _servkey: Server-key context setup instance.
+        _pool: Biprime and server-key contexts already created for the job, indexed by set of
+            parties, so that rounds with a known set of parties do not negotiate new contexts.
+        _rounds: Number of rounds configured, used as a clock for context expiry.
         _secagg_crypter: Secure aggregation encrypter and decrypter to decrypt encrypted model
             parameters.
         _secagg_random: Random float generated tobe sent to node to validate secure aggregation
@@ -42,6 +48,7 @@ class SecureAggregation:
             active: bool = True,
             timeout: int = 10,
             clipping_range: Union[None, int] = None,
+            context_expiry: Optional[int] = 10,
     ) -> None:
         """Class constructor
 
@@ -58,6 +65,9 @@ class SecureAggregation:
                 parameters on the node side. The default will be
                 [`VEParameters.CLIPPING_RANGE`][fedbiomed.common.constants.VEParameters].
                 The default value will be automatically set on the node side.
+            context_expiry: Number of rounds after which a secagg context created for a set of parties,
+                and not used since then, is dropped from the pool of reusable contexts. `None` to keep
+                all contexts. Dropped contexts are not deleted from the parties.
 
         Raises:
             FedbiomedSecureAggregationError: bad argument type
@@ -82,8 +92,16 @@ class SecureAggregation:
                 f"but got not {type(clipping_range)}"
             )
 
+        if context_expiry is not None and \
+                (not isinstance(context_expiry, int) or isinstance(context_expiry, bool) or context_expiry < 1):
+            raise FedbiomedSecureAggregationError(
+                f"{ErrorNumbers.FB417.value}: Context expiry should be None or a positive integer, "
+                f"but got {context_expiry}"
+            )
+
         self.timeout: int = timeout
         self.clipping_range: Optional[int] = clipping_range
+        self.context_expiry: Optional[int] = context_expiry
 
         self._active: bool = active
         self._parties: Optional[List[str]] = None
@@ -92,6 +110,8 @@ class SecureAggregation:
         self._biprime: Optional[SecaggBiprimeContext] = None
         self._secagg_random: Optional[float] = None
         self._secagg_crypter: SecaggCrypter = SecaggCrypter()
+        self._pool: Dict[Tuple[str, ...], Dict[str, Any]] = {}
+        self._rounds: int = 0
 
     @property
     def parties(self) -> Union[List[str], None]:
@@ -214,32 +234,92 @@ class SecureAggregation:
 
         return True
 
-    def _set_secagg_contexts(self, parties: List[str], job_id: Union[str, None] = None) -> None:
-        """Creates secure aggregation context classes.
+    def precompute(self,
+                   parties: List[List[str]],
+                   job_id: str) -> int:
+        """Sets up secure aggregation contexts for sets of parties likely to participate in next rounds.
 
-        This function should be called after `job_id` and `parties` are set
+        Intended to be run while the experiment is idle (eg: before running rounds with
+        a sampling strategy), so that the setup of the rounds using one of these sets of parties
+        does not negotiate new contexts.
 
         Args:
-            parties: Parties that participates secure aggregation
+            parties: List of sets of parties. Each set is a list of parties, the researcher first.
             job_id: The id of the job of experiment
+
+        Returns:
+            Number of sets of parties whose contexts are set up
+
+        Raises:
+            FedbiomedSecureAggregationError: Invalid argument type
         """
+        if not isinstance(parties, list) or not all(isinstance(p, list) for p in parties):
+            raise FedbiomedSecureAggregationError(
+                f"{ErrorNumbers.FB417.value}: Expected argument `parties` list of lists but got {parties}"
+            )
 
-        self._parties = parties
+        if not isinstance(job_id, str):
+            raise FedbiomedSecureAggregationError(
+                f"{ErrorNumbers.FB417.value}: Expected argument `job_id` string but got {type(job_id)}"
+            )
+
+        self._set_job_id(job_id)
+
+        ready = 0
+        for round_parties in parties:
+            contexts = self._pooled_contexts(round_parties)
+            if not contexts['biprime'].status:
+                contexts['biprime'].setup(timeout=self.timeout)
+            if not contexts['servkey'].status:
+                contexts['servkey'].setup(timeout=self.timeout)
+            ready += contexts['biprime'].status and contexts['servkey'].status
+
+        return ready
+
+    def _set_job_id(self, job_id: str) -> None:
+        """Sets the job of the experiment, dropping the contexts of a previous job.
 
-        # Updates job id if it is provided
-        if job_id is not None:
+        Args:
+            job_id: The id of the job of experiment
+        """
+        if self._job_id != job_id:
             self._job_id = job_id
+            self._pool = {}
+
+    @staticmethod
+    def _pool_key(parties: List[str]) -> Tuple[str, ...]:
+        """Key of the pooled contexts of a set of parties."""
+        return tuple(sorted(parties))
+
+    def _pooled_contexts(self, parties: List[str]) -> Dict[str, Any]:
+        """Gets the pooled contexts of a set of parties, creating them if needed.
+
+        Args:
+            parties: Parties that participates secure aggregation
+
+        Returns:
+            Pool entry, with `biprime`, `servkey` and `last_used` keys
+        """
+        key = self._pool_key(parties)
+        if key not in self._pool:
+            # TODO: support other options than using `default_biprime0`
+            self._pool[key] = {
+                'biprime': SecaggBiprimeContext(parties=parties, secagg_id='default_biprime0'),
+                'servkey': SecaggServkeyContext(parties=parties, job_id=self._job_id),
+                'last_used': self._rounds,
+            }
+
+        return self._pool[key]
 
-        # TODO: support other options than using `default_biprime0`
-        self._biprime = SecaggBiprimeContext(
-            parties=self._parties,
-            secagg_id='default_biprime0'
-        )
+    def _expire_contexts(self) -> None:
+        """Drops the pooled contexts that were not used for `context_expiry` rounds."""
+        if self.context_expiry is None:
+            return
 
-        self._servkey = SecaggServkeyContext(
-            parties=self._parties,
-            job_id=self._job_id
-        )
+        for key, contexts in list(self._pool.items()):
+            if self._rounds - contexts['last_used'] >= self.context_expiry:
+                logger.debug(f"Dropping unused secure aggregation context for parties {list(key)}")
+                del self._pool[key]
 
     def _configure_round(
             self,
@@ -248,9 +328,9 @@ class SecureAggregation:
     ) -> None:
         """Configures secure aggregation for each round.
 
-        This method checks the round state and creates secagg context element if
-        not existing or re-instantiates if the state of the round has changes in cases of
-        adding new nodes to the FL training
+        This method selects the secagg context elements of the round parties from the pool,
+        or creates them if this set of parties is not known, eg in cases of adding new nodes
+        to the FL training or sampling nodes.
 
         Args:
             parties: Nodes that participates federated training
@@ -259,14 +339,26 @@ class SecureAggregation:
 
         # For each round it generates new secagg random float
         self._secagg_random = round(random.uniform(0, 1), 3)
+        self._rounds += 1
+
+        self._set_job_id(job_id)
+
+        if self._parties is not None and self._pool_key(self._parties) != self._pool_key(parties):
+            if self._pool_key(parties) in self._pool:
+                logger.debug(f"Parties of the experiment has changed. Re-using secure aggregation context "
+                             f"of these parties for the experiment {self._job_id}")
+            else:
+                logger.info(f"Parties of the experiment has changed. Re-creating secure "
+                            f"aggregation context creation for the experiment {self._job_id}")
 
-        if self._parties is None or self._job_id != job_id:
-            self._set_secagg_contexts(parties, job_id)
+        contexts = self._pooled_contexts(parties)
+        contexts['last_used'] = self._rounds
 
-        elif set(self._parties) != set(parties):
-            logger.info(f"Parties of the experiment has changed. Re-creating secure "
-                        f"aggregation context creation for the experiment {self._job_id}")
-            self._set_secagg_contexts(parties)
+        self._parties = parties
+        self._biprime = contexts['biprime']
+        self._servkey = contexts['servkey']
+
+        self._expire_contexts()
 
     def aggregate(
             self,
@@ -358,12 +450,21 @@ class SecureAggregation:
                 'active': self._active,
                 'timeout': self.timeout,
                 'clipping_range': self.clipping_range,
+                'context_expiry': self.context_expiry,
             },
             "attributes": {
                 "_biprime": self._biprime.save_state() if self._biprime is not None else None,
                 "_servkey": self._servkey.save_state() if self._servkey is not None else None,
                 "_job_id": self._job_id,
-                "_parties": self._parties
+                "_parties": self._parties,
+                "_rounds": self._rounds,
+                "_pool": [
+                    {
+                        'biprime': contexts['biprime'].save_state(),
+                        'servkey': contexts['servkey'].save_state(),
+                        'last_used': contexts['last_used'],
+                    } for contexts in self._pool.values()
+                ],
             }
         }
 
@@ -393,8 +494,27 @@ class SecureAggregation:
             state["attributes"]["_servkey"] = SecaggServkeyContext. \
                 load_state(state=state["attributes"]["_servkey"])
 
+        # Pooled contexts, if saved
+        pool = {}
+        for contexts in state["attributes"].pop("_pool", None) or []:
+            servkey = SecaggServkeyContext.load_state(state=contexts['servkey'])
+            pool[secagg._pool_key(servkey.parties)] = {
+                'biprime': SecaggBiprimeContext.load_state(state=contexts['biprime']),
+                'servkey': servkey,
+                'last_used': contexts['last_used'],
+            }
+
         # Set attributes
         for name, val in state["attributes"].items():
             setattr(secagg, name, val)
 
+        # current contexts are the pooled contexts of the current parties
+        if secagg._parties is not None:
+            key = secagg._pool_key(secagg._parties)
+            if key in pool:
+                secagg._biprime, secagg._servkey = pool[key]['biprime'], pool[key]['servkey']
+            elif secagg._biprime is not None and secagg._servkey is not None:
+                pool[key] = {'biprime': secagg._biprime, 'servkey': secagg._servkey, 'last_used': secagg._rounds}
+        secagg._pool = pool
+
         return secagg
@@ -0,0 +1,232 @@
+# This file is originally part of Fed-BioMed
+# SPDX-License-Identifier: Apache-2.0
+
+"""
+Simulation of many nodes on the researcher's machine, without message broker nor HTTP file repository.
+"""
+
+import multiprocessing
+import os
+import queue
+import shutil
+import tempfile
+import uuid
+from typing import Any, Dict, List, Optional, Union
+
+from fedbiomed.common.constants import ComponentType, ErrorNumbers
+from fedbiomed.common.exceptions import FedbiomedSimulationError
+from fedbiomed.common.logger import logger
+from fedbiomed.common.simulation import SimulatedMessaging, SimulationBroker, activate, create_messaging, \
+    deactivate, is_active, make_store_dir
+from fedbiomed.node.simulation import run_virtual_nodes
+from fedbiomed.researcher.environ import environ
+from fedbiomed.researcher.requests import Requests
+
+
+class Simulation:
+    """Runs virtual nodes in local worker processes, for the researcher of this process.
+
+    Virtual nodes are real [`Node`][fedbiomed.node.node.Node]s, each with its own configuration, database and
+    datasets, hosted by a pool of worker processes. Nodes and researcher exchange Python objects through
+    multiprocessing queues instead of MQTT messages, and files through a directory in memory instead of the HTTP
+    repository. While the simulation runs, the [`Experiment`][fedbiomed.researcher.experiment.Experiment] API is
+    used unchanged, and finds the datasets of the virtual nodes by their tags.
+
+    The simulation must be started before the first `Experiment` of the process, since the requests of the
+    researcher are connected once. Worker processes are started with `spawn` by default: scripts must then
+    create the simulation under `if __name__ == '__main__':`.
+
+    **Typical use:**
+
+    ```python
+    datasets = [{'name': f'site {i}', 'data_type': 'csv', 'path': f'/data/site_{i}.csv',
+                 'tags': ['#sim'], 'description': 'simulated site'} for i in range(100)]
+
+    with Simulation(datasets, processes=8):
+        exp = Experiment(tags=['#sim'], training_plan_class=MyTrainingPlan, ...)
+        exp.run()
+    ```
+    """
+
+    def __init__(self,
+                 nodes: List[Union[Dict[str, Any], List[Dict[str, Any]]]],
+                 processes: Optional[int] = None,
+                 cpu_threads: Optional[int] = None,
+                 node_environ: Optional[Dict[str, str]] = None,
+                 log_level: str = 'WARNING',
+                 start_method: str = 'spawn',
+                 response_timeout: float = 0.5,
+                 timeout: float = 300.):
+        """Constructor of the class.
+
+        Args:
+            nodes: datasets of each virtual node, as a dataset or a list of datasets. Datasets are given as
+                arguments of [`DatasetManager.add_database`][fedbiomed.node.dataset_manager.DatasetManager].
+            processes: number of worker processes hosting the nodes. Defaults to the number of CPUs, at most
+                one process per node.
+            cpu_threads: number of torch threads of each worker process. Defaults to the number of CPUs divided
+                by the number of processes.
+            node_environ: environment variables of the virtual nodes, e.g. `{'ENABLE_TRAINING_PLAN_APPROVAL':
+                'True'}`. Training plan approval is disabled by default.
+            log_level: logging level of the nodes
+            start_method: multiprocessing start method of the worker processes
+            response_timeout: time in seconds the researcher waits for node replies before checking them,
+                instead of the `TIMEOUT` of the environment sized for a message broker
+            timeout: maximum time in seconds for the worker processes to start their nodes
+
+        Raises:
+            FedbiomedSimulationError: bad argument type or value
+        """
+        if not isinstance(nodes, list) or not nodes:
+            self._raise("`nodes` should be a non-empty list of datasets")
+        self._datasets = [list(datasets) if isinstance(datasets, (list, tuple)) else [datasets]
+                          for datasets in nodes]
+        if not all(isinstance(dataset, dict) for datasets in self._datasets for dataset in datasets):
+            self._raise("each dataset should be a dict of `DatasetManager.add_database` arguments")
+
+        cpu_count = os.cpu_count() or 1
+        if processes is None:
+            processes = cpu_count
+        if not isinstance(processes, int) or isinstance(processes, bool) or processes < 1:
+            self._raise(f"`processes` should be a positive int, not {processes}")
+        self._processes = min(processes, len(self._datasets))
+        if cpu_threads is None:
+            cpu_threads = max(1, cpu_count // self._processes)
+        if not isinstance(cpu_threads, int) or isinstance(cpu_threads, bool) or cpu_threads < 1:
+            self._raise(f"`cpu_threads` should be a positive int, not {cpu_threads}")
+        if start_method not in multiprocessing.get_all_start_methods():
+            self._raise(f"unknown start method {start_method}")
+        if not isinstance(response_timeout, (int, float)) or isinstance(response_timeout, bool) or \
+                response_timeout <= 0:
+            self._raise(f"`response_timeout` should be a positive number, not {response_timeout}")
+
+        self._node_args = {'gpu': False, 'gpu_num': None, 'gpu_only': False,
+                           'cpu_threads': cpu_threads, 'cpu_interop_threads': None, 'cpu_bfloat16': False}
+        self._node_environ = {'ENABLE_TRAINING_PLAN_APPROVAL': 'False', **(node_environ or {})}
+        self._log_level = log_level
+        self._start_method = start_method
+        self._response_timeout = response_timeout
+        self._timeout = timeout
+
+        run_id = uuid.uuid4().hex[:8]
+        self._node_ids = [f'node_sim_{run_id}_{i}' for i in range(len(self._datasets))]
+        self._workers: List[Any] = []
+        self._broker = None
+        self._store_dir = None
+        self._work_dir = None
+        self._environ_timeout = None
+
+    @staticmethod
+    def _raise(msg: str):
+        msg = f"{ErrorNumbers.FB628.value}: {msg}"
+        logger.critical(msg)
+        raise FedbiomedSimulationError(msg)
+
+    @property
+    def node_ids(self) -> List[str]:
+        """Ids of the virtual nodes."""
+        return list(self._node_ids)
+
+    def is_running(self) -> bool:
+        """Whether the simulation is running.
+
+        Returns:
+            True if the worker processes are started
+        """
+        return bool(self._workers)
+
+    def start(self):
+        """Starts the worker processes and their virtual nodes, and connects the researcher to the simulation.
+
+        Raises:
+            FedbiomedSimulationError: another simulation is running, the researcher is already connected to the
+                message broker, or the nodes cannot be started
+        """
+        if is_active():
+            self._raise("another simulation is already running in this process")
+
+        context = multiprocessing.get_context(self._start_method)
+        self._broker = SimulationBroker(context)
+        self._broker.add_component(ComponentType.RESEARCHER, environ['RESEARCHER_ID'])
+        inboxes = [f'workers_{i}' for i in range(self._processes)]
+        assignment = {inbox: {} for inbox in inboxes}
+        for i, (node_id, datasets) in enumerate(zip(self._node_ids, self._datasets)):
+            inbox = inboxes[i % self._processes]
+            self._broker.add_component(ComponentType.NODE, node_id, inbox=inbox)
+            assignment[inbox][node_id] = datasets
+
+        self._store_dir = make_store_dir()
+        self._work_dir = tempfile.mkdtemp(prefix='fedbiomed_simulation_nodes_')
+        activate(self._broker, self._store_dir)
+        self._environ_timeout = environ['TIMEOUT']
+        environ['TIMEOUT'] = self._response_timeout
+        try:
+            self._connect_requests()
+            ready = context.Queue()
+            for inbox, nodes in assignment.items():
+                worker = context.Process(target=run_virtual_nodes,
+                                         name=f'simulation-{inbox}',
+                                         args=(self._broker, inbox, nodes, self._store_dir, self._work_dir,
+                                               self._node_args, self._node_environ, self._log_level, ready),
+                                         daemon=True)
+                worker.start()
+                self._workers.append(worker)
+
+            errors = []
+            for _ in self._workers:
+                try:
+                    _, error = ready.get(timeout=self._timeout)
+                except queue.Empty:
+                    error = f"worker processes did not start their nodes within {self._timeout}s"
+                if error is not None:
+                    errors.append(error)
+            if errors:
+                self._raise(f"cannot start the simulation: {errors}")
+        except Exception:
+            self.stop()
+            raise
+
+        logger.info(f"Simulation started: {len(self._node_ids)} virtual nodes in {self._processes} processes")
+
+    def _connect_requests(self):
+        """Connects the requests of the researcher to the broker of the simulation."""
+        requests = Requests()
+        if not isinstance(requests.messaging, SimulatedMessaging):
+            self._raise("the researcher is already connected to the message broker, the simulation must be "
+                        "started before the first experiment of the process")
+        if not requests.messaging.is_connected():
+            # messaging of a previous simulation
+            requests.messaging = create_messaging(requests.on_message, ComponentType.RESEARCHER,
+                                                  environ['RESEARCHER_ID'])
+            requests.messaging.start(block=False)
+
+    def stop(self):
+        """Stops the worker processes, and removes the files of the simulation."""
+        for i, worker in enumerate(self._workers):
+            if worker.is_alive():
+                self._broker.close(f'workers_{i}')
+        for worker in self._workers:
+            worker.join(timeout=self._timeout)
+            if worker.is_alive():
+                worker.terminate()
+        self._workers = []
+
+        if is_active():
+            requests = Requests()
+            if isinstance(requests.messaging, SimulatedMessaging):
+                requests.messaging.stop()
+            deactivate()
+        if self._environ_timeout is not None:
+            environ['TIMEOUT'] = self._environ_timeout
+            self._environ_timeout = None
+        for directory in (self._store_dir, self._work_dir):
+            if directory is not None:
+                shutil.rmtree(directory, ignore_errors=True)
+        self._store_dir = self._work_dir = None
+
+    def __enter__(self) -> 'Simulation':
+        self.start()
+        return self
+
+    def __exit__(self, *args):
+        self.stop()
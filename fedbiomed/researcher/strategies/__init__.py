@@ -4,8 +4,12 @@
 
 from .strategy import Strategy
 from .default_strategy import DefaultStrategy
+from .async_strategy import AsyncStrategy
+from .throughput_strategy import ThroughputStrategy
 
 __all__ = [
+    "AsyncStrategy",
     "DefaultStrategy",
     "Strategy",
+    "ThroughputStrategy",
 ]
@@ -0,0 +1,94 @@
+# This file is originally part of Fed-BioMed
+# SPDX-License-Identifier: Apache-2.0
+
+"""
+Node selection strategy for asynchronous training
+"""
+
+from typing import Dict, List, Tuple, Union
+
+from fedbiomed.common.constants import ErrorNumbers
+from fedbiomed.common.exceptions import FedbiomedStrategyError
+from fedbiomed.common.logger import logger
+from fedbiomed.researcher.datasets import FederatedDataSet
+from fedbiomed.researcher.responses import Responses
+from fedbiomed.researcher.strategies.default_strategy import DefaultStrategy
+
+
+class AsyncStrategy(DefaultStrategy):
+    """
+    Strategy for asynchronous training with
+    [`Experiment.run_async`][fedbiomed.researcher.experiment.Experiment.run_async]
+
+    Strategy is:
+    - dispatch all the nodes when training starts, then re-dispatch each node as soon as it replies
+    - refine the replies as they arrive, without waiting for the other nodes
+    - leave out the nodes that fail
+    """
+
+    def __init__(self, data: FederatedDataSet):
+        """ Constructor of the asynchronous strategy
+
+        Args:
+            data: Object that includes all active nodes and the meta-data of the dataset that is going to be
+                used for federated training.
+        """
+        super().__init__(data)
+
+    def dispatch_nodes(self, round_i: int, idle_nodes: List[str]) -> List[str]:
+        """Selects the idle nodes that are sent a training request now.
+
+        Args:
+            round_i: current version of the global model
+            idle_nodes: nodes that do not have a training request in flight
+
+        Returns:
+            ids of the nodes to dispatch
+        """
+        available = set(self._fds.node_ids())
+        return [node_id for node_id in idle_nodes if node_id in available]
+
+    def refine(
+            self,
+            training_replies: Responses,
+            round_i: int
+    ) -> Tuple[Dict[str, Dict[str, Union['torch.Tensor', 'numpy.ndarray']]],
+               Dict[str, float],
+               int,
+               Dict[str, List[int]]]:
+        """Extracts parameters and sample sizes of the replies received so far, without expecting other nodes.
+
+        Args:
+            training_replies: replies received from nodes
+            round_i: version of the global model the nodes trained from
+
+        Returns:
+            model_params: model parameters indexed by node id
+            weights: proportion of samples of each node among the replies
+            total_rows: sum of number of samples used by the nodes
+            encryption_factors: encryption factors of the nodes
+
+        Raises:
+            FedbiomedStrategyError: a reply failed, or misses its `sample_size`
+        """
+        model_params = {}
+        sample_sizes = {}
+        encryption_factors = {}
+        for tr in training_replies:
+            if tr['success'] is not True:
+                msg = f"{ErrorNumbers.FB409.value} (node = {tr['node_id']} )"
+                logger.critical(msg)
+                raise FedbiomedStrategyError(msg)
+            if tr["sample_size"] is None:
+                raise FedbiomedStrategyError(ErrorNumbers.FB402.value + f" : Node {tr['node_id']} did not return " +
+                                             "any `sample_size` value (number of samples seen during one Round)," +
+                                             " can not compute weigths for the aggregation. Aborting")
+            model_params[tr['node_id']] = tr['params']
+            sample_sizes[tr['node_id']] = tr['sample_size']
+            encryption_factors[tr['node_id']] = tr.get('encryption_factor', None)
+            self._success_node_history.setdefault(round_i, []).append(tr['node_id'])
+
+        total_rows = sum(sample_sizes.values())
+        weights = {node_id: sample_size / total_rows if total_rows != 0 else 1 / len(sample_sizes)
+                   for node_id, sample_size in sample_sizes.items()}
+        return model_params, weights, total_rows, encryption_factors
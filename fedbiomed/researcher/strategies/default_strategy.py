@@ -25,8 +25,8 @@ class DefaultStrategy(Strategy):
     and checking whether nodes have responded or not
 
     Strategy is:
-    - select all node for each round
-    - raise an error if one node does not answer
+    - select all node for each round, except nodes penalized for being late in a previous round
+    - raise an error if one node does not answer, unless it is reported late for the round
     - raise an error is one node returns an error
     """
 
@@ -42,7 +42,7 @@ class DefaultStrategy(Strategy):
 
     def sample_nodes(self, round_i: int) -> List[uuid.UUID]:
         """ Samples and selects nodes on which to train local model. In this strategy we will consider all existing
-        nodes
+        nodes, except those that were late in a previous round (unless all nodes are).
 
         Args:
             round_i: number of round.
@@ -51,9 +51,14 @@ class DefaultStrategy(Strategy):
             node_ids: list of all node ids considered for training during
                 this round `round_i`.
         """
-        self._sampling_node_history[round_i] = self._fds.node_ids()
+        node_ids = self._fds.node_ids()
+        penalized = self.penalized_nodes(round_i)
+        if any(node_id not in penalized for node_id in node_ids):
+            node_ids = [node_id for node_id in node_ids if node_id not in penalized]
 
-        return self._fds.node_ids()
+        self._sampling_node_history[round_i] = node_ids
+
+        return node_ids
 
     def refine(
             self,
@@ -97,13 +102,15 @@ class DefaultStrategy(Strategy):
                 - if a Node has not sent `sample_size` value in the TrainingReply, making it
                 impossible to compute aggregation weights.
         """
-        # check that all nodes answered
+        # check that all nodes answered, except nodes that were late for the round deadline
         cl_answered = [val['node_id'] for val in training_replies.data()]
+        late_nodes = self._late_node_history.get(round_i, [])
         answers_count = 0
 
         if self._sampling_node_history.get(round_i) is None:
             raise FedbiomedStrategyError(ErrorNumbers.FB408.value + f": Missing Nodes Responses for round: {round_i}")
-        for cl in self._sampling_node_history[round_i]:
+        expected_nodes = [cl for cl in self._sampling_node_history[round_i] if cl not in late_nodes]
+        for cl in expected_nodes:
             if cl in cl_answered:
                 answers_count += 1
             else:
@@ -114,7 +121,7 @@ class DefaultStrategy(Strategy):
                              ")"
                              )
 
-        if len(self._sampling_node_history[round_i]) != answers_count:
+        if len(expected_nodes) != answers_count or answers_count == 0:
             if answers_count == 0:
                 # none of the nodes answered
                 msg = ErrorNumbers.FB407.value
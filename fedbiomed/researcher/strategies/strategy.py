@@ -6,7 +6,7 @@ Top class for strategy implementation
 """
 
 
-from typing import Dict, Any
+from typing import Any, Dict, List, Set
 
 from fedbiomed.common.constants  import ErrorNumbers
 from fedbiomed.common.exceptions import FedbiomedStrategyError
@@ -32,6 +32,9 @@ class Strategy:
         self._fds = data
         self._sampling_node_history = {}
         self._success_node_history = {}
+        self._late_node_history = {}
+        # round until which (excluded) each late node is not sampled
+        self._penalized_until = {}
         self._parameters = None
 
     def sample_nodes(self, round_i: int):
@@ -68,6 +71,50 @@ class Strategy:
         logger.critical(msg)
         raise FedbiomedStrategyError(msg)
 
+    def node_training_args(self, round_i: int, training_args: Dict[str, Any]) -> Dict[str, Dict[str, Any]]:
+        """Training arguments overridden for some of the nodes sampled in a round.
+
+        Called after [`sample_nodes`][fedbiomed.researcher.strategies.Strategy.sample_nodes]. By default,
+        all nodes use the training arguments of the experiment.
+
+        Args:
+            round_i: Current round of experiment
+            training_args: Training arguments of the experiment
+
+        Returns:
+            Training arguments overridden for each node, indexed by node id
+        """
+        return {}
+
+    def report_late_nodes(self, round_i: int, node_ids: List[str], penalty_rounds: int = 1):
+        """Records the nodes that did not reply before the deadline of a round.
+
+        Late nodes are not expected to reply in this round, and should not be sampled in the next
+        `penalty_rounds` rounds.
+
+        Args:
+            round_i: Current round of experiment
+            node_ids: Ids of the late nodes
+            penalty_rounds: Number of rounds for which late nodes should not be sampled
+        """
+        self._late_node_history[round_i] = list(node_ids)
+        for node_id in node_ids:
+            self._penalized_until[node_id] = round_i + 1 + penalty_rounds
+        if node_ids:
+            logger.info(f"Nodes late in round {round_i} are not sampled in the next {penalty_rounds} round(s): "
+                        f"{list(node_ids)}")
+
+    def penalized_nodes(self, round_i: int) -> Set[str]:
+        """Nodes that should not be sampled in a round because they were late in a previous round.
+
+        Args:
+            round_i: Current round of experiment
+
+        Returns:
+            Ids of the penalized nodes
+        """
+        return {node_id for node_id, until in self._penalized_until.items() if round_i < until}
+
     def save_state(self) -> Dict[str, Any]:
         """
         Method for saving strategy state for saving breakpoints
@@ -80,7 +127,8 @@ class Strategy:
             "class": type(self).__name__,
             "module": self.__module__,
             "parameters": self._parameters,
-            "fds": self._fds.data()
+            "fds": self._fds.data(),
+            "penalized_until": self._penalized_until
         }
         return state
 
@@ -94,3 +142,4 @@ class Strategy:
         # fds may be modified and diverge from Experiment
         self._fds = FederatedDataSet(state.get('fds'))
         self._parameters = state['parameters']
+        self._penalized_until = dict(state.get('penalized_until', {}))
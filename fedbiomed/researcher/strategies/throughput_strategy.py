@@ -0,0 +1,274 @@
+# This file is originally part of Fed-BioMed
+# SPDX-License-Identifier: Apache-2.0
+
+"""
+Node selection strategy using the measured throughput of the nodes
+"""
+
+import math
+from typing import Any, Dict, List, Optional, Tuple, Union
+
+from fedbiomed.common.constants import ErrorNumbers
+from fedbiomed.common.exceptions import FedbiomedStrategyError
+from fedbiomed.common.logger import logger
+from fedbiomed.researcher.datasets import FederatedDataSet
+from fedbiomed.researcher.responses import Responses
+from fedbiomed.researcher.strategies.default_strategy import DefaultStrategy
+
+
+class ThroughputStrategy(DefaultStrategy):
+    """
+    Strategy sampling nodes according to their measured throughput
+
+    The strategy keeps an exponentially weighted moving average of the time each node spends:
+
+    - computing, per model update, from the `rtime_training` timing of the training replies,
+    - on everything else (transfers, messaging, set up), from `rtime_total - rtime_training`.
+
+    Strategy is:
+    - sample the nodes whose estimated round duration fits in `target_round_time`, plus the nodes
+        without an estimate yet, and the left out nodes once every `probe_interval` rounds to refresh
+        their estimate. At least `min_nodes` nodes are sampled, the fastest ones.
+    - if `balance_updates` is True, scale the `num_updates` of each sampled node so that all nodes
+        finish near the same time: `target_round_time`, or the estimated duration of the slowest
+        sampled node. Scaling is bounded by a factor `max_update_scaling`, and needs `num_updates`
+        in the training arguments. It should not be used with aggregators relying on the same number
+        of updates on all nodes, such as `Scaffold`.
+    - refine replies as the `DefaultStrategy`
+    """
+
+    def __init__(self,
+                 data: FederatedDataSet,
+                 target_round_time: Optional[float] = None,
+                 balance_updates: bool = False,
+                 smoothing: float = 0.3,
+                 min_nodes: int = 1,
+                 max_update_scaling: float = 2.,
+                 probe_interval: int = 5):
+        """Constructor of the throughput strategy
+
+        Args:
+            data: Object that includes all active nodes and the meta-data of the dataset that is going to be
+                used for federated training.
+            target_round_time: target duration of a round in seconds. None to sample all the nodes.
+            balance_updates: whether to scale the number of updates of each node so that nodes finish at the
+                same time.
+            smoothing: weight of the last measure in the moving average of the timings, in ]0, 1].
+            min_nodes: minimum number of nodes sampled in a round.
+            max_update_scaling: maximum factor by which the number of updates of a node is scaled up or down.
+            probe_interval: number of rounds after which a node left out is sampled again.
+
+        Raises:
+            FedbiomedStrategyError: bad argument type or value
+        """
+        super().__init__(data)
+        if target_round_time is not None and (not isinstance(target_round_time, (int, float)) or
+                                              isinstance(target_round_time, bool) or target_round_time <= 0):
+            self._raise(f"`target_round_time` should be a positive number or None, not {target_round_time}")
+        if not isinstance(balance_updates, bool):
+            self._raise(f"`balance_updates` should be a bool, not {balance_updates}")
+        if not isinstance(smoothing, (int, float)) or isinstance(smoothing, bool) or not 0 < smoothing <= 1:
+            self._raise(f"`smoothing` should be a number in ]0, 1], not {smoothing}")
+        for name, value in (('min_nodes', min_nodes), ('probe_interval', probe_interval)):
+            if not isinstance(value, int) or isinstance(value, bool) or value < 1:
+                self._raise(f"`{name}` should be a positive int, not {value}")
+        if not isinstance(max_update_scaling, (int, float)) or isinstance(max_update_scaling, bool) or \
+                max_update_scaling < 1:
+            self._raise(f"`max_update_scaling` should be a number >= 1, not {max_update_scaling}")
+
+        self._parameters = {
+            'target_round_time': target_round_time,
+            'balance_updates': balance_updates,
+            'smoothing': smoothing,
+            'min_nodes': min_nodes,
+            'max_update_scaling': max_update_scaling,
+            'probe_interval': probe_interval,
+        }
+        # moving averages of the timings of each node: `compute` in seconds per update, `overhead` in seconds
+        self._estimates: Dict[str, Dict[str, float]] = {}
+        # number of updates requested from each node in the last round, and in the training arguments
+        self._requested_updates: Dict[str, int] = {}
+        self._base_updates: Optional[int] = None
+        # last round each node was sampled
+        self._last_sampled: Dict[str, int] = {}
+
+    @staticmethod
+    def _raise(msg: str):
+        msg = ErrorNumbers.FB402.value + f', throughput strategy: {msg}'
+        logger.critical(msg)
+        raise FedbiomedStrategyError(msg)
+
+    @property
+    def estimates(self) -> Dict[str, Dict[str, float]]:
+        """Estimated timings of each node: `compute` seconds per update, and `overhead` seconds per round."""
+        return {node_id: dict(estimate) for node_id, estimate in self._estimates.items()}
+
+    def estimated_round_time(self, node_id: str, num_updates: Optional[int] = None) -> Optional[float]:
+        """Estimated duration of a round for a node.
+
+        Args:
+            node_id: id of the node
+            num_updates: number of updates of the node. Defaults to the number of updates of the
+                training arguments.
+
+        Returns:
+            Estimated duration in seconds, None if the node has no estimate yet.
+        """
+        estimate = self._estimates.get(node_id)
+        if estimate is None:
+            return None
+        if num_updates is None:
+            num_updates = self._base_updates or 1
+        return estimate['overhead'] + estimate['compute'] * num_updates
+
+    def _min_updates(self) -> int:
+        base = self._base_updates or 1
+        if self._parameters['balance_updates'] and self._base_updates is not None:
+            return max(1, math.ceil(base / self._parameters['max_update_scaling']))
+        return base
+
+    def sample_nodes(self, round_i: int) -> List[str]:
+        """Samples the nodes whose estimated round duration fits in the target round duration.
+
+        Args:
+            round_i: number of round.
+
+        Returns:
+            node_ids: ids of the nodes sampled for round `round_i`.
+        """
+        node_ids = super().sample_nodes(round_i)
+        target = self._parameters['target_round_time']
+        if target is not None:
+            min_updates = self._min_updates()
+            durations = {node_id: self.estimated_round_time(node_id, min_updates) for node_id in node_ids}
+            sampled = [node_id for node_id in node_ids
+                       if durations[node_id] is None or durations[node_id] <= target or
+                       round_i - self._last_sampled.get(node_id, round_i) >= self._parameters['probe_interval']]
+
+            # complete with the fastest nodes left out
+            missing = self._parameters['min_nodes'] - len(sampled)
+            if missing > 0:
+                left_out = sorted((node_id for node_id in node_ids if node_id not in sampled),
+                                  key=lambda node_id: durations[node_id])
+                sampled += left_out[:missing]
+            if len(sampled) < len(node_ids):
+                logger.info(f"Nodes left out of round {round_i} for exceeding the target round time of "
+                            f"{target}s: {[node_id for node_id in node_ids if node_id not in sampled]}")
+            # keep the order of the federated dataset
+            node_ids = [node_id for node_id in node_ids if node_id in sampled]
+            self._sampling_node_history[round_i] = node_ids
+
+        for node_id in node_ids:
+            self._last_sampled[node_id] = round_i
+        return node_ids
+
+    def node_training_args(self, round_i: int, training_args: Dict[str, Any]) -> Dict[str, Dict[str, Any]]:
+        """Scales the number of updates of the sampled nodes, if `balance_updates` is True.
+
+        Args:
+            round_i: number of round.
+            training_args: training arguments of the experiment
+
+        Returns:
+            Training arguments overridden for each node, indexed by node id
+        """
+        self._base_updates = training_args.get('num_updates')
+        self._requested_updates = {}
+        node_ids = self._sampling_node_history.get(round_i, [])
+        if self._base_updates is None:
+            if self._parameters['balance_updates']:
+                logger.warning("Number of updates of the nodes is not balanced, since `num_updates` is not "
+                               "defined in the training arguments")
+            return {}
+
+        self._requested_updates = {node_id: self._base_updates for node_id in node_ids}
+        if not self._parameters['balance_updates']:
+            return {}
+
+        durations = [self.estimated_round_time(node_id) for node_id in node_ids]
+        target = self._parameters['target_round_time']
+        if target is None:
+            target = max((duration for duration in durations if duration is not None), default=None)
+        if target is None:
+            return {}
+
+        scaling = self._parameters['max_update_scaling']
+        low, high = self._min_updates(), max(1, math.floor(self._base_updates * scaling))
+        overrides = {}
+        for node_id in node_ids:
+            estimate = self._estimates.get(node_id)
+            if estimate is None or estimate['compute'] <= 0:
+                continue
+            num_updates = int((target - estimate['overhead']) / estimate['compute'])
+            num_updates = min(max(num_updates, low), high)
+            self._requested_updates[node_id] = num_updates
+            if num_updates != self._base_updates:
+                overrides[node_id] = {'num_updates': num_updates}
+        if overrides:
+            logger.info(f"Number of updates of the nodes in round {round_i}: {self._requested_updates}")
+        return overrides
+
+    def refine(
+            self,
+            training_replies: Responses,
+            round_i: int
+    ) -> Tuple[Dict[str, Dict[str, Union['torch.Tensor', 'numpy.ndarray']]],
+               Dict[str, float],
+               int,
+               Dict[str, List[int]]]:
+        """Updates the timing estimates of the nodes, and refines replies as the `DefaultStrategy`.
+
+        Args:
+            training_replies: replies received from nodes
+            round_i: Current round of experiment
+
+        Returns:
+            model_params: model parameters indexed by node id
+            weights: proportion of samples of each node
+            total_rows: sum of number of samples used by the nodes
+            encryption_factors: encryption factors of the nodes
+        """
+        for tr in training_replies:
+            if tr.get('success') is True:
+                self._update_estimate(tr['node_id'], tr.get('timing') or {})
+        return super().refine(training_replies, round_i)
+
+    def _update_estimate(self, node_id: str, timing: Dict[str, float]):
+        """Updates the moving averages of the timings of a node with the timing of a reply."""
+        training = timing.get('rtime_training')
+        total = timing.get('rtime_total')
+        if training is None or total is None:
+            return
+        measure = {
+            'compute': training / self._requested_updates.get(node_id, self._base_updates or 1),
+            'overhead': max(0., total - training),
+        }
+        estimate = self._estimates.get(node_id)
+        if estimate is None:
+            self._estimates[node_id] = measure
+        else:
+            alpha = self._parameters['smoothing']
+            self._estimates[node_id] = {key: alpha * measure[key] + (1 - alpha) * estimate[key] for key in measure}
+
+    def save_state(self) -> Dict[str, Any]:
+        """Saves the strategy state, including the timing estimates of the nodes.
+
+        Returns:
+            The state of the strategy
+        """
+        state = super().save_state()
+        state['estimates'] = self.estimates
+        state['base_updates'] = self._base_updates
+        state['last_sampled'] = dict(self._last_sampled)
+        return state
+
+    def load_state(self, state: Dict[str, Any] = None, **kwargs):
+        """Loads the strategy state from a breakpoint state.
+
+        Args:
+            state: The state that will be loaded
+        """
+        super().load_state(state)
+        self._estimates = {node_id: dict(estimate) for node_id, estimate in state.get('estimates', {}).items()}
+        self._base_updates = state.get('base_updates')
+        self._last_sampled = dict(state.get('last_sampled', {}))
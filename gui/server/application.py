@@ -8,6 +8,7 @@ from flask_jwt_extended import JWTManager
 from utils import error
 from config import config
 from db import NodeDatabase, UserDatabase
+from indexer import data_index
 # Import api route blueprint before importing routes and register as blueprint
 from routes import api, auth
 
@@ -44,6 +45,10 @@ jwt = JWTManager(app)
 app.register_blueprint(api)
 app.register_blueprint(auth)
 
+# Index the data path in the background, so that repository listing and
+# disk usage requests do not walk the file system
+data_index.start()
+
 
 # Routes for react build directory
 @app.route('/', defaults={'path': ''}, methods=['GET'])
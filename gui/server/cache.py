@@ -1,31 +1,36 @@
 from functools import wraps
+from typing import Callable
 
 from cachelib import FileSystemCache
 from flask import request
 
 
-class RepositoryCache(object):
-    file_sizes = {}
-
-    @classmethod
-    def clear(cls, path):
-        if path in cls.file_sizes:
-            del cls.file_sizes[path]
-
-    @classmethod
-    def clear_all(cls):
-        cls.file_sizes = {}
-
-
 CACHE_TIMEOUT = 300
 cache = FileSystemCache("./__pycache__")
 
 
-def cached(key: str, prefix: str = "", timeout: int = CACHE_TIMEOUT):
+def cached(key: str, prefix: str = "", timeout: int = CACHE_TIMEOUT, version: Callable = None):
+    """ Caches the response of a route for the value of a request JSON key
+
+    Args:
+        key: Key of the request JSON that identifies the cached response
+        prefix: Prefix of the cache keys for the route
+        timeout: Seconds before a cached response expires
+        version: Optional function that gets the value of the request key and returns a
+            version of the data behind the response (eg: latest modification time of the
+            files). Cached responses of a previous version are not used anymore.
+    """
     def _decorator(func):
         @wraps(func)
         def __decorator(*args, **kwargs):
             cache_id = prefix + "-" + request.json[key]
+            if version is not None:
+                try:
+                    cache_id += "-" + str(version(request.json[key]))
+                except Exception:
+                    # Unknown version, do not use the cache
+                    return func(*args, **kwargs)
+
             response = cache.get(cache_id)
             if response is None:
                 response = func(*args, **kwargs)
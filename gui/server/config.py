@@ -1,7 +1,7 @@
 import os
 import sys
 import configparser
-from utils import get_node_id
+from utils import get_node_id, get_node_db_backend
 
 cfg = configparser.ConfigParser()
 
@@ -58,6 +58,11 @@ class Config(dict):
         self.configuration['DATA_PATH_RW'] = data_path
         self.configuration['DATA_PATH_SAVE'] = data_path
 
+        # Seconds between two synchronizations of the data path index with the file system
+        self.configuration['DATA_INDEX_INTERVAL'] = int(os.getenv('DATA_INDEX_INTERVAL',
+                                                                  cfg.get('server', 'DATA_INDEX_INTERVAL',
+                                                                          fallback=60)))
+
         self.configuration['DEFAULT_ADMIN_CREDENTIAL'] = {'email': cfg.get('init_admin', 'email'),
                                                           'password': cfg.get('init_admin', 'password')}
         
@@ -89,7 +94,9 @@ class Config(dict):
         self.configuration['NODE_DB_PATH'] = \
             os.path.join(self.configuration["NODE_FEDBIOMED_ROOT"],
                          'var',
-                         'db_' + self.configuration['ID'] + '.json')
+                         'db_' + self.configuration['ID'] +
+                         ('.sqlite' if get_node_db_backend(self.configuration['NODE_CONFIG_FILE_PATH']) == 'sqlite'
+                          else '.json'))
 
         # Set GUI_PATH based on given node id
         self.configuration['GUI_DB_PATH'] = \
@@ -3,7 +3,8 @@ from typing import Dict
 import uuid
 
 from fedbiomed.common.constants import UserRoleType
-from tinydb import TinyDB, Query
+from fedbiomed.common.db import open_database
+from tinydb import Query
 from tinydb.table import Table
 
 from config import config
@@ -20,10 +21,10 @@ class BaseDatabase:
 
     def __init__(self, db_path: str):
         """ Database class for TinyDB. It is general wrapper for
-            TinyDB. It can be extended in the future, if Fed-BioMed
-            support a=other persistent databases.
+            TinyDB or the SQLite backend, chosen from the extension of `db_path`
+            (see `fedbiomed.common.db.open_database`).
         """
-        self._db = TinyDB(db_path)
+        self._db = open_database(db_path)
         self._query = Query()
 
     def query(self):
@@ -0,0 +1,272 @@
+import os
+import threading
+from typing import Dict, List, Optional, Tuple
+
+from config import config
+from fedbiomed.common.logger import logger
+
+
+class IndexEntry(object):
+    """ Single file or directory of the data path index.
+
+        Directory entries keep their children and the total size of
+        their subtree, so that listing and disk usage requests are
+        answered without walking the file system.
+    """
+
+    __slots__ = ('name', 'is_dir', 'size', 'ctime', 'mtime', 'stamp', 'children', 'complete')
+
+    def __init__(self, name: str, is_dir: bool, size: int = 0, ctime: float = 0., mtime: float = 0.):
+        self.name = name
+        self.is_dir = is_dir
+        self.size = size
+        self.ctime = ctime
+        self.mtime = mtime
+        # Latest modification time in the subtree, used as a version for caches
+        self.stamp = mtime
+        # `None` until the directory is listed
+        self.children: Optional[Dict[str, 'IndexEntry']] = None
+        # True once the size of every file of the subtree is known
+        self.complete = not is_dir
+
+
+class DirectoryIndex(object):
+    """ Index of the node data path that keeps a path -> stat tree in memory.
+
+        The index is synchronized by polling: every pass stats each indexed
+        directory and only lists again the directories whose modification
+        time changed (eg: files added, removed or renamed). Directories that
+        are requested before the first pass is over are listed on demand.
+    """
+
+    def __init__(self, root: str, interval: int = 60):
+        """ Constructor of the class
+
+        Args:
+            root: Absolute path of the directory to index
+            interval: Seconds between two synchronization passes of the background indexer
+        """
+        self._root_path = root
+        self._interval = interval
+        self._root = IndexEntry('', True)
+        self._lock = threading.RLock()
+        self._stop = threading.Event()
+        self._thread = None
+
+    def start(self):
+        """ Starts the background indexer thread, if not already running """
+        if self._thread is not None and self._thread.is_alive():
+            return
+
+        self._stop.clear()
+        self._thread = threading.Thread(target=self._run, name='data-path-indexer', daemon=True)
+        self._thread.start()
+
+    def stop(self):
+        """ Stops the background indexer thread """
+        self._stop.set()
+        if self._thread is not None:
+            self._thread.join()
+            self._thread = None
+
+    def _run(self):
+        while not self._stop.is_set():
+            try:
+                self.sync()
+            except Exception as e:
+                logger.error(f'Indexing data path {self._root_path} failed: {e}')
+            self._stop.wait(self._interval)
+
+    def sync(self, parts: List[str] = None, force: bool = False):
+        """ Synchronizes the index of a directory and of its subtree with the file system
+
+        Args:
+            parts: Folders of the directory in hierarchical order, relative to the root path.
+                Synchronizes the whole index if not set.
+            force: If True, lists every directory of the subtree again, even if its
+                modification time did not change (eg: to get the new size of files
+                modified in place).
+
+        Raises:
+            FileNotFoundError: the requested directory does not exist
+        """
+        parts = parts or []
+        entry = self._entry(parts)
+        self._sync(entry, os.path.join(self._root_path, *parts), force)
+
+        # Parents totals are not updated by a partial synchronization
+        if parts:
+            self._update_parents(parts)
+
+    def list(self, parts: List[str], offset: int = 0, limit: int = None,
+             include_hidden: bool = False) -> Tuple[int, List[Tuple[str, IndexEntry]]]:
+        """ Lists entries of an indexed directory sorted by name
+
+        Args:
+            parts: Folders of the directory in hierarchical order, relative to the root path
+            offset: Index of the first entry to return
+            limit: Maximum number of entries to return, all entries if None
+            include_hidden: Whether entries starting with `.` are listed
+
+        Returns:
+            Total number of entries in the directory, and the requested page of
+                `(absolute path, entry)` tuples
+
+        Raises:
+            FileNotFoundError: the requested directory does not exist
+            NotADirectoryError: the requested path is not a directory
+        """
+        entry = self._entry(parts)
+        if not entry.is_dir:
+            raise NotADirectoryError(os.path.join(self._root_path, *parts))
+
+        with self._lock:
+            names = sorted(n for n in entry.children if include_hidden or not n.startswith('.'))
+            children = entry.children
+
+        end = None if limit is None else offset + limit
+        dpath = os.path.join(self._root_path, *parts)
+
+        return len(names), [(os.path.join(dpath, n), children[n]) for n in names[offset:end]]
+
+    def disk_usage(self, parts: List[str]) -> Optional[int]:
+        """ Gets the disk usage of a file or directory
+
+        Args:
+            parts: Path of the file or directory in hierarchical order, relative to the root path
+
+        Returns:
+            Size in bytes, or None if the directory is not fully indexed yet
+        """
+        entry = self._entry(parts)
+        return entry.size if entry.complete else None
+
+    def stamp(self, parts: List[str]) -> float:
+        """ Gets the latest modification time known in the subtree of a path
+
+        Args:
+            parts: Path of the file or directory in hierarchical order, relative to the root path
+        """
+        return self._entry(parts).stamp
+
+    def parts(self, path: str) -> List[str]:
+        """ Splits an absolute path into folders relative to the root path
+
+        Args:
+            path: Absolute path of a file or directory in the root path
+
+        Raises:
+            ValueError: the path is not in the root path
+        """
+        rel = os.path.relpath(os.path.normpath(path), os.path.normpath(self._root_path))
+        if rel == os.curdir:
+            return []
+        if rel == os.pardir or rel.startswith(os.pardir + os.sep):
+            raise ValueError(f'{path} is not in the data path {self._root_path}')
+
+        return rel.split(os.sep)
+
+    def _entry(self, parts: List[str]) -> IndexEntry:
+        """ Finds the entry of a path, listing directories that are not indexed yet
+
+        Raises:
+            FileNotFoundError: the path does not exist
+        """
+        entry = self._root
+        path = self._root_path
+        if entry.children is None:
+            self._list_dir(entry, path)
+
+        for part in parts:
+            if not entry.is_dir or part not in entry.children:
+                raise FileNotFoundError(os.path.join(self._root_path, *parts))
+            entry = entry.children[part]
+            path = os.path.join(path, part)
+            if entry.is_dir and entry.children is None:
+                self._list_dir(entry, path)
+
+        return entry
+
+    def _list_dir(self, entry: IndexEntry, path: str):
+        """ Lists a directory and updates its children, keeping subtrees of unchanged directories """
+        stats = os.stat(path)
+        children = {}
+        old = entry.children or {}
+
+        with os.scandir(path) as it:
+            for item in it:
+                try:
+                    is_dir = item.is_dir(follow_symlinks=False)
+                    st = item.stat(follow_symlinks=False)
+                except OSError:
+                    # Removed while listing
+                    continue
+
+                previous = old.get(item.name)
+                if is_dir and previous is not None and previous.is_dir:
+                    children[item.name] = previous
+                else:
+                    children[item.name] = IndexEntry(item.name, is_dir, 0 if is_dir else st.st_size,
+                                                     st.st_ctime, st.st_mtime)
+
+        with self._lock:
+            entry.children = children
+            entry.mtime = stats.st_mtime
+            entry.ctime = stats.st_ctime
+            self._update_totals(entry)
+
+    def _sync(self, entry: IndexEntry, path: str, force: bool):
+        """ Synchronizes the subtree of a directory entry, depth first """
+        if not entry.is_dir:
+            st = os.stat(path)
+            entry.size, entry.ctime, entry.mtime, entry.stamp = st.st_size, st.st_ctime, st.st_mtime, st.st_mtime
+            return
+
+        try:
+            mtime = os.stat(path).st_mtime
+            if force or entry.children is None or mtime != entry.mtime:
+                self._list_dir(entry, path)
+        except OSError:
+            # Directory removed or not readable anymore, it will be dropped by its parent
+            entry.children = entry.children or {}
+            entry.complete = True
+            return
+
+        for name, child in list(entry.children.items()):
+            if self._stop.is_set():
+                return
+            if child.is_dir:
+                self._sync(child, os.path.join(path, name), force)
+            elif force:
+                try:
+                    self._sync(child, os.path.join(path, name), force)
+                except OSError:
+                    pass
+
+        with self._lock:
+            self._update_totals(entry, complete=True)
+
+    @staticmethod
+    def _update_totals(entry: IndexEntry, complete: bool = False):
+        """ Updates the size, stamp and completion status of a directory from its children """
+        children = entry.children.values()
+        entry.size = sum(c.size for c in children)
+        entry.stamp = max([entry.mtime, *(c.stamp for c in children)])
+        entry.complete = complete or all(c.complete for c in children)
+
+    def _update_parents(self, parts: List[str]):
+        """ Updates totals of the parents of a path, from the deepest one """
+        entries = [self._root]
+        for part in parts[:-1]:
+            # Parents removed during the synchronization are dropped by the next pass
+            entry = (entries[-1].children or {}).get(part)
+            if entry is None or not entry.is_dir:
+                break
+            entries.append(entry)
+
+        with self._lock:
+            for entry in reversed(entries):
+                self._update_totals(entry)
+
+
+data_index = DirectoryIndex(config['DATA_PATH_RW'], config['DATA_INDEX_INTERVAL'])
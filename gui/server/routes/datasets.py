@@ -1,8 +1,10 @@
+import itertools
 import os
 import re
 import uuid
 
 from fedbiomed.common.exceptions import FedbiomedError
+from cache import cache
 from config import config
 from db import node_database
 from flask import request, current_app
@@ -15,7 +17,7 @@ from schemas import AddDataSetRequest, \
     ListDatasetRequest, \
     GetCsvData, \
     ReadDataLoadingPlan
-from utils import success, error, validate_request_data, response
+from utils import success, error, validate_request_data, response, streamed_response
 from fedbiomed.common.data import MedicalFolderLoadingBlockTypes
 from fedbiomed.node.dataset_manager import DatasetManager
 from . import api
@@ -25,6 +27,34 @@ dataset_manager = DatasetManager()
 
 DATA_PATH_RW = config['DATA_PATH_RW']
 
+# Number of rows displayed in the preview of a dataset
+PREVIEW_ROWS = 5
+# CSV files bigger than this size (in bytes) get an estimated number of rows
+CSV_COUNT_MAX_BYTES = 256 * 1024 ** 2
+# Seconds before a cached number of rows of a CSV file expires
+CSV_COUNT_TIMEOUT = 3600
+
+
+def _count_csv_rows(data_path: str):
+    """ Counts rows of a CSV file once per version of the file, instead of
+        scanning the file for every requested page of rows.
+
+    Args:
+        data_path: Path of the CSV file
+
+    Returns:
+        The number of rows, and whether this number is exact
+    """
+    st = os.stat(data_path)
+    cache_id = f"csv-rows-{data_path}-{st.st_mtime_ns}-{st.st_size}"
+
+    count = cache.get(cache_id)
+    if count is None:
+        count = dataset_manager.count_csv_rows(data_path, max_bytes=CSV_COUNT_MAX_BYTES)
+        cache.set(cache_id, count, CSV_COUNT_TIMEOUT)
+
+    return tuple(count)
+
 
 @api.route('/datasets/list', methods=['POST'])
 @validate_request_data(schema=ListDatasetRequest)
@@ -231,8 +261,8 @@ def get_preview_dataset():
 
     if dataset:
         if os.path.isfile(data_path):
-            df = dataset_manager.read_csv(data_path)
-            data_preview = df.head().to_dict('split')
+            df = dataset_manager.read_csv_window(data_path, limit=PREVIEW_ROWS)
+            data_preview = df.to_dict('split')
             dataset['data_preview'] = data_preview
         elif os.path.isdir(data_path):
             path_root = os.path.normpath(config["DATA_PATH_RW"]).split(os.sep)
@@ -336,8 +366,26 @@ def add_default_dataset():
 @validate_request_data(schema=GetCsvData)
 def get_csv_data():
     """
-    Loads csv from given path
+    Loads a window of rows of a csv from given path. Rows are read by chunks and
+    streamed, the whole file is never loaded.
+
+    Request {application/json}:
+        path (list): Path of the file in hierarchical order
+        offset (int): Index of the first row to return
+        limit (int): Maximum number of rows to return
+        columns (list): Columns to return, all columns if null
 
+    Response {application/json}:
+        400:
+            success   : Boolean error status (False)
+            result  : null
+            message : Message about error
+        200:
+            success: Boolean value indicates that the request is success
+            result: Columns, rows (`data`) and their index, number of rows in the file (`samples`,
+                estimated for big files if `samples_exact` is false). If reading the file fails after the
+                first rows are sent, `data` holds the rows read so far and `error` the error message.
+            message: The message for response
     """
     req = request.json
 
@@ -347,17 +395,35 @@ def get_csv_data():
     if not os.path.isfile(data_path):
         return error(f"Path does not correspond to a valid data file: {os.path.join(*req['path'])}"), 400
 
+    offset = req['offset']
     try:
-        df = dataset_manager.read_csv(data_path)
-        rows = df.shape[0]
-        df.fillna("NULL", inplace=True)
-        data_preview = df.iloc[0:30, :].to_dict('split')
-        data_preview.update({"samples": rows, "displays": 30})
+        chunks = dataset_manager.iter_csv(data_path, offset=offset, limit=req['limit'], columns=req['columns'])
+        # Read first chunk before streaming the response to report errors
+        first = next(chunks, None)
+        if first is None:
+            first = dataset_manager.read_csv_window(data_path, limit=0, columns=req['columns'])
+        samples, exact = _count_csv_rows(data_path)
     except Exception as e:
         return error(f"Can not read given data file please make sure the format "
                      f"is one of csv, tsv or txt: {e}"), 400
 
-    return response(data_preview), 200
+    displays = 0
+
+    def rows():
+        nonlocal displays
+        for chunk in itertools.chain([first], chunks):
+            values = chunk.fillna("NULL").to_json(orient='values')[1:-1]
+            displays += len(chunk)
+            yield values
+
+    def trailer():
+        return {'index': list(range(offset, offset + displays)), 'displays': displays}
+
+    return streamed_response({'columns': first.columns.tolist(),
+                              'samples': samples,
+                              'samples_exact': exact,
+                              'offset': offset},
+                             'data', rows(), trailer), 200
 
 
 @api.route('/datasets/list-dlps', methods=['POST'])
@@ -4,6 +4,7 @@ import re
 from cache import cached
 from db import node_database
 from flask import request, g
+from indexer import data_index
 from middlewares import middleware, medical_folder_dataset, common
 from schemas import ValidateMedicalFolderReferenceCSV, \
     ValidateMedicalFolderRoot, \
@@ -136,9 +137,18 @@ def remove_data_loading_plan():
     return response(data=True), 200
 
 
+def _dataset_files_version(dataset_id: str) -> float:
+    """Gets the latest modification time of the files of a dataset, from the data path index"""
+    dataset = table.get(query.dataset_id == dataset_id)
+    rexp = re.match('^' + config['DATA_PATH_SAVE'], dataset['path'])
+    data_path = dataset['path'].replace(rexp.group(0), config['DATA_PATH_RW'])
+
+    return data_index.stamp(data_index.parts(data_path))
+
+
 @api.route('/datasets/medical-folder-dataset/preview', methods=['POST'])
 @validate_request_data(schema=PreviewDatasetRequest)
-@cached(key="dataset_id", prefix="medical_folder_dataset-preview", timeout=600)
+@cached(key="dataset_id", prefix="medical_folder_dataset-preview", timeout=3600, version=_dataset_files_version)
 def medical_folder_preview():
     """Gets preview of MedicalFolder dataset by providing a table of subject and available modalities"""
 
@@ -1,11 +1,11 @@
+import datetime
 import os
-import re
 
-from config import config
 from db import node_database
 from flask import request
-from schemas import ListDataFolder
-from utils import error, validate_request_data, response, file_stats
+from indexer import data_index
+from schemas import ListDataFolder, DiskUsageRequest
+from utils import error, validate_request_data, response, parse_size
 
 from . import api
 
@@ -19,6 +19,9 @@ def list_data_path():
     Request {application/json}:
 
         path (list): List that includes folders in hierarchical order.
+        refresh (bool): Synchronizes the index of the requested folder with the file system before listing
+        offset (int): Index of the first item to list (items are sorted by name)
+        limit (int): Maximum number of items to list
 
     Response {application/json}:
         400:
@@ -35,68 +38,83 @@ def list_data_path():
     req = request.json
     req_path = req['path']
 
-    # Full path by including the base DATA_PATH
-    dpath = os.path.join(config["DATA_PATH_RW"], *req_path)
-
-    # Check if the path is existed, or it is a directory
-    if os.path.exists(dpath) and os.path.isdir(dpath):
-        base = os.sep if len(req_path) == 0 else os.path.join(*req_path)
-        try:
-            files = os.listdir(dpath)
-        except Exception as e:
-            return error(str(e)), 400
-
-        res = {
-            'level': len(req_path),
-            'base': base,
-            'files': [],
-            'number': len(files),
-            'displays': len(files) if len(files) <= 1000 else 1000,
-            'path': req_path
-        }
-
-        files = files if len(files) <= 1000 else files[0:1000]
-
-        table = node_database.table_datasets()
-        all_datasets = table.all()
-
-        for file in files:
-            if not file.startswith('.'):
-                fullpath = os.path.join(dpath, file)
-                path_type = 'file' if os.path.isfile(fullpath) else 'dir'
-                extension = os.path.splitext(fullpath)[1]
-
-                # Get dataset registered with full path
-                # dataset = table.get(query.path == fullpath)
-                dataset = None
-
-                indexes = [i for i, d in enumerate(all_datasets) if d.get("path", None) == fullpath]
-                dataset = all_datasets[indexes[0]] if indexes else None
-
-                # Get file statistics
-                cdate, size = file_stats(fullpath, req['refresh'])
-
-                # Folder that includes any data file
-                includes = []
-                if not dataset and os.path.isdir(fullpath):
-                    includes = [d for d in all_datasets
-                                if re.search('^' + os.path.join(fullpath, ''),
-                                             d.get("path", '') or '')]
-
-                # This is the path that will be displayed on the GUI
-                # It is created as list to be able to use it with `os.path.join`
-                exact_path = [*req_path, file]
-
-                res['files'].append({"type": path_type,
-                                     "name": file,
-                                     "path": exact_path,
-                                     "extension": extension,
-                                     'registered': dataset,
-                                     'includes': includes,
-                                     'created': cdate,
-                                     'size': size})
-        return response(res), 200
-
-    else:
-
+    try:
+        if req['refresh']:
+            data_index.sync(req_path, force=True)
+        number, items = data_index.list(req_path, offset=req['offset'], limit=req['limit'])
+    except (FileNotFoundError, NotADirectoryError):
         return error(f'Requested path does not exist or it is not a directory. {req_path}')
+    except Exception as e:
+        return error(str(e)), 400
+
+    base = os.sep if len(req_path) == 0 else os.path.join(*req_path)
+    res = {
+        'level': len(req_path),
+        'base': base,
+        'files': [],
+        'number': number,
+        'displays': len(items),
+        'offset': req['offset'],
+        'path': req_path
+    }
+
+    # Datasets registered with the listed paths, or with paths inside listed folders
+    all_datasets = node_database.table_datasets().all()
+    registered = {d.get('path'): d for d in all_datasets}
+
+    for fullpath, entry in items:
+        dataset = registered.get(fullpath)
+
+        # Folder that includes any data file
+        includes = []
+        if not dataset and entry.is_dir:
+            prefix = os.path.join(fullpath, '')
+            includes = [d for d in all_datasets if (d.get('path', '') or '').startswith(prefix)]
+
+        # This is the path that will be displayed on the GUI
+        # It is created as list to be able to use it with `os.path.join`
+        exact_path = [*req_path, entry.name]
+
+        res['files'].append({"type": 'dir' if entry.is_dir else 'file',
+                             "name": entry.name,
+                             "path": exact_path,
+                             "extension": os.path.splitext(fullpath)[1],
+                             'registered': dataset,
+                             'includes': includes,
+                             'created': datetime.datetime.fromtimestamp(entry.ctime).strftime('%d/%m/%Y %H:%M'),
+                             'size': parse_size(entry.size) if entry.complete else 'Indexing...'})
+
+    return response(res), 200
+
+
+@api.route('/repository/disk-usage', methods=['POST'])
+@validate_request_data(schema=DiskUsageRequest)
+def disk_usage():
+    """ API endpoint to get the disk usage of a file or folder in the data path of the node.
+
+    Request {application/json}:
+
+        path (list): List that includes folders in hierarchical order.
+
+    Response {application/json}:
+        400:
+            success   : Boolean error status (False)
+            result  : null
+            message : Message about error
+        200:
+            success: Boolean value indicates that the request is success
+            result: Size in bytes (`size`) and human readable size (`display`). Both are `null`
+                if the folder is not fully indexed yet.
+            message: The message for response
+    """
+
+    req_path = request.json['path']
+
+    try:
+        size = data_index.disk_usage(req_path)
+    except FileNotFoundError:
+        return error(f'Requested path does not exist. {req_path}'), 400
+
+    return response({'path': req_path,
+                     'size': size,
+                     'display': parse_size(size) if size is not None else None}), 200
@@ -246,7 +246,22 @@ class ListDataFolder(Validator):
         'type': "object",
         "properties": {
             "path": {'type': 'array', 'default': []},
-            "refresh": {'type': 'boolean', 'default': False}
+            "refresh": {'type': 'boolean', 'default': False},
+            "offset": {'type': 'integer', 'minimum': 0, 'default': 0},
+            "limit": {'type': 'integer', 'minimum': 1, 'maximum': 10000, 'default': 1000}
+        },
+        "required": []
+    })
+
+
+class DiskUsageRequest(Validator):
+    """  JSON schema for request of /api/repository/disk-usage """
+
+    type = 'json'
+    schema = JsonSchema({
+        'type': "object",
+        "properties": {
+            "path": {'type': 'array', 'default': []}
         },
         "required": []
     })
@@ -326,7 +341,12 @@ class GetCsvData(Validator):
     type = 'json'
     schema = JsonSchema({
         "type": "object",
-        "properties": {"path": {"type": "array"}},
+        "properties": {
+            "path": {"type": "array"},
+            "offset": {"type": "integer", "minimum": 0, "default": 0},
+            "limit": {"type": "integer", "minimum": 1, "maximum": 10000, "default": 30},
+            "columns": {"type": ["array", "null"], "default": None}
+        },
         "required": ["path"]
     })
 
@@ -1,11 +1,12 @@
 import configparser
-import datetime
+import json
 import os
 from functools import wraps
 from hashlib import sha512
-from flask import jsonify, request
+from typing import Callable, Iterable
+
+from flask import jsonify, request, Response
 
-from cache import RepositoryCache
 from schemas import Validator
 
 
@@ -42,6 +43,22 @@ def get_node_id(config_file: str):
     return node_id
 
 
+def get_node_db_backend(config_file: str) -> str:
+    """ This method parses given config file and returns the storage
+        backend of the node database (`tinydb` when not specified)
+
+    Args:
+
+        config_file     (str): Path for config file of the node that
+                        GUI services will run for
+    """
+
+    cfg = configparser.ConfigParser()
+    cfg.read(config_file)
+
+    return os.getenv('DB_BACKEND', cfg.get('default', 'db_backend', fallback='tinydb'))
+
+
 def error(msg: str):
     """ Function that returns jsonfied error result
         it is used for API enpoints  
@@ -97,6 +114,51 @@ def response(data: dict, message: str = None):
     return jsonify(res)
 
 
+def streamed_response(data: dict, key: str, items: Iterable[str], trailer: Callable[[], dict] = None):
+    """ Response function that streams a JSON array, so that large results
+        are sent while they are produced instead of being built in memory.
+        The body has the same format as `response`.
+
+    Args:
+        data (dict): Data that is known before streaming the array
+        key (str): Key of the streamed array in the result
+        items (Iterable[str]): JSON encoded elements of the array. An item can
+                      also be several comma separated elements, empty items are ignored.
+        trailer (Callable): Function that returns data known after the array is
+                      streamed (eg: number of elements), added to the result.
+                      If producing the items fails, the array ends with the items
+                      produced so far and the error message is added to the result
+                      as `error`.
+    """
+
+    def generate():
+        result = json.dumps(data)[:-1]
+        yield '{"success": true, "message": null, "result": ' + result + \
+              (', ' if data else '') + json.dumps(key) + ': ['
+
+        first = True
+        failure = None
+        try:
+            for item in items:
+                if item:
+                    yield item if first else ',' + item
+                    first = False
+        except Exception as e:
+            # Status and beginning of the body are already sent: end the JSON document
+            # properly and report the error in the result
+            failure = str(e)
+
+        yield ']'
+        extra = trailer() if trailer is not None else {}
+        if failure is not None:
+            extra['error'] = failure
+        for k, v in extra.items():
+            yield ', ' + json.dumps(k) + ': ' + json.dumps(v)
+        yield '}}'
+
+    return Response(generate(), mimetype='application/json')
+
+
 def validate_json(function):
     """ Decorator for validating requested JSON whether is in
         correct JSON format
@@ -154,56 +216,6 @@ def validate_request_data(schema: Validator):
     return decorator
 
 
-def file_stats(path: str, refresh: bool = False):
-    """ Returns creation date and size information of
-        given path.
-
-        Args:
-            path (str): Absolute path to folder or file
-            refresh (bool): If it is true clear cached size value for given path
-    """
-    stats = os.stat(path)
-    creation_time = datetime.datetime.fromtimestamp(stats.st_ctime).strftime('%d/%m/%Y %H:%M')
-    if refresh:
-        disk_usage = get_disk_usage(path)
-        RepositoryCache.clear(path)
-        RepositoryCache.file_sizes[path] = disk_usage
-    else:
-        if path in RepositoryCache.file_sizes:
-            disk_usage = RepositoryCache.file_sizes[path]
-        else:
-            disk_usage = get_disk_usage(path)
-            RepositoryCache.file_sizes[path] = disk_usage
-
-    return creation_time, disk_usage
-
-
-def get_disk_usage(path: str):
-    """ Calculates disk usage of given path
-    Args:
-
-        path (str) : Absolute path of file or folder
-    """
-
-    size = 0
-
-    if os.path.isfile(path):
-        try:
-            size = os.path.getsize(path)
-        except:
-            pass
-    elif os.path.isdir(path):
-        try:
-            for index, (path, dirs, files) in enumerate(os.walk(path)):
-                for i, f in enumerate(files):
-                    fp = os.path.join(path, f)
-                    size += os.path.getsize(fp)
-        except:
-            pass
-
-    return parse_size(size)
-
-
 def parse_size(size):
     """ This function will convert bytes into a human readable form
 
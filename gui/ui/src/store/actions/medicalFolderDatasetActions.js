@@ -111,6 +111,10 @@ export const setReferenceCSV = (path) => {
                 let data = response.data.result
                 dispatch({ type: "RESET_MEDICAL_FOLDER_REF"})
                 dispatch({type: "SET_REFERENCE_CSV", payload: { path: path.path, data: data}})
+                if(data.error){
+                    // Only the rows read before the error are displayed
+                    dispatch({type: 'ERROR_MODAL', payload: "Error while reading reference CSV file: " + data.error})
+                }
             }else{
                 dispatch({type: 'ERROR_MODAL', payload: response.data.result.message})
             }
@@ -0,0 +1,115 @@
+import os
+import shutil
+import tempfile
+import unittest
+from unittest.mock import patch
+
+import numpy as np
+
+#############################################################
+# Import ResearcherTestCase before importing any FedBioMed Module
+from testsupport.base_case import ResearcherTestCase
+#############################################################
+
+from fedbiomed.common.exceptions import FedbiomedExperimentError
+from fedbiomed.common.serializer import Serializer
+from fedbiomed.researcher.aggregated_params import AggregatedParamsHistory, LazyAggregatedParams
+
+
+class TestAggregatedParamsHistory(ResearcherTestCase):
+    """Tests the bounded history of aggregated parameters"""
+
+    def setUp(self):
+        self.tempdir = tempfile.mkdtemp()
+        self.entries = {}
+        for round_ in range(5):
+            params = {'weight': np.full(3, round_, dtype=float)}
+            path = os.path.join(self.tempdir, f'aggregated_params_{round_}.mpk')
+            Serializer.dump(params, path)
+            self.entries[round_] = {'params': params, 'params_path': path}
+
+    def tearDown(self):
+        shutil.rmtree(self.tempdir)
+
+    def test_aggregated_params_01_evict_old_rounds(self):
+        """Tests that only the latest rounds are kept in memory"""
+        history = AggregatedParamsHistory(rounds_in_memory=2)
+        for round_, entry in self.entries.items():
+            history[round_] = entry
+
+        self.assertIsInstance(history, dict)
+        self.assertListEqual(sorted(history), [0, 1, 2, 3, 4])
+        for round_ in (0, 1, 2):
+            self.assertIsInstance(history[round_], LazyAggregatedParams)
+        for round_ in (3, 4):
+            self.assertIs(history[round_], self.entries[round_])
+
+        # older rounds are loaded on access, with the same mapping API
+        self.assertIn('params', history[1])
+        np.testing.assert_array_equal(history[1]['params']['weight'], np.full(3, 1.))
+        np.testing.assert_array_equal(history[1].get('params')['weight'], np.full(3, 1.))
+        self.assertEqual(history[1]['params_path'], self.entries[1]['params_path'])
+        np.testing.assert_array_equal(history[0].load()['params']['weight'], np.zeros(3))
+
+        # lazy entries behave as a complete read-only mapping, parameters are loaded on each access
+        entry = history[2]
+        self.assertEqual(sorted(entry), ['params', 'params_path'])
+        self.assertEqual(sorted(entry.keys()), ['params', 'params_path'])
+        self.assertEqual(len(entry), 2)
+        with patch.object(Serializer, 'load', wraps=Serializer.load) as load:
+            self.assertIn('params', entry)
+            self.assertEqual(load.call_count, 0)
+            np.testing.assert_array_equal(dict(entry)['params']['weight'], np.full(3, 2.))
+            np.testing.assert_array_equal(dict(entry.items())['params']['weight'], np.full(3, 2.))
+            self.assertEqual(len(list(entry.values())), 2)
+            self.assertEqual(load.call_count, 3)
+        with self.assertRaises(TypeError):
+            entry['params'] = {}
+
+        # entries without file are kept in memory
+        history = AggregatedParamsHistory({0: {'params': {}, 'params_path': None}, 1: self.entries[1]},
+                                          rounds_in_memory=0)
+        self.assertNotIsInstance(history[0], LazyAggregatedParams)
+        self.assertIsInstance(history[1], LazyAggregatedParams)
+
+    def test_aggregated_params_02_rounds_in_memory(self):
+        """Tests changing the number of rounds kept in memory"""
+        history = AggregatedParamsHistory(self.entries, rounds_in_memory=None)
+        self.assertTrue(all(not isinstance(e, LazyAggregatedParams) for e in history.values()))
+
+        self.assertEqual(history.set_rounds_in_memory(1), 1)
+        self.assertEqual([r for r, e in history.items() if not isinstance(e, LazyAggregatedParams)], [4])
+
+        # more rounds in memory than rounds run: all rounds are kept in memory
+        history = AggregatedParamsHistory(self.entries, rounds_in_memory=10)
+        self.assertTrue(all(not isinstance(e, LazyAggregatedParams) for e in history.values()))
+        history = AggregatedParamsHistory(rounds_in_memory=5)
+        for round_, entry in list(self.entries.items())[:3]:
+            history[round_] = entry
+            self.assertTrue(all(not isinstance(e, LazyAggregatedParams) for e in history.values()))
+
+        for value in (-1, 1.5, True, 'two'):
+            with self.assertRaises(FedbiomedExperimentError):
+                history.set_rounds_in_memory(value)
+
+    def test_aggregated_params_03_from_files(self):
+        """Tests that only the latest rounds are loaded when restoring from files"""
+        entries = {r: {'params_path': e['params_path']} for r, e in self.entries.items()}
+
+        with patch.object(Serializer, 'load', wraps=Serializer.load) as load:
+            history = AggregatedParamsHistory.from_files(entries, rounds_in_memory=2)
+            self.assertEqual(load.call_count, 2)
+
+        self.assertIsInstance(history[2], LazyAggregatedParams)
+        np.testing.assert_array_equal(history[4]['params']['weight'], np.full(3, 4.))
+        np.testing.assert_array_equal(history[2]['params']['weight'], np.full(3, 2.))
+
+        # more rounds in memory than rounds run: all rounds are loaded
+        with patch.object(Serializer, 'load', wraps=Serializer.load) as load:
+            history = AggregatedParamsHistory.from_files(entries, rounds_in_memory=8)
+            self.assertEqual(load.call_count, 5)
+        self.assertTrue(all(not isinstance(e, LazyAggregatedParams) for e in history.values()))
+
+
+if __name__ == '__main__':  # pragma: no cover
+    unittest.main()
@@ -0,0 +1,50 @@
+import importlib.util
+import os
+import sys
+import unittest
+
+#############################################################
+# Import ResearcherTestCase before importing any FedBioMed Module
+from testsupport.base_case import ResearcherTestCase
+#############################################################
+
+BENCHMARK_PATH = os.path.join(os.path.dirname(os.path.abspath(__file__)), '..', 'benchmarks', 'round.py')
+
+
+def _import_benchmark():
+    """Imports the round benchmark script, which is not part of a package"""
+    spec = importlib.util.spec_from_file_location('benchmark_round', BENCHMARK_PATH)
+    module = importlib.util.module_from_spec(spec)
+    # the source of the training plans is found through the module
+    sys.modules[spec.name] = module
+    spec.loader.exec_module(module)
+    return module
+
+
+class TestBenchmarkRound(ResearcherTestCase):
+    """Smoke test of the end-to-end round benchmark"""
+
+    def test_benchmark_round_01_run(self):
+        """Tests running a tiny round with the virtual nodes of a simulation"""
+        benchmark = _import_benchmark()
+        args = benchmark.parse_args(['--nodes', '2', '--processes', '1', '--rounds', '2', '--updates', '1',
+                                     '--samples', '20', '--features', '4', '--classes', '2', '--batch-size', '10',
+                                     '--response-timeout', '0.05'])
+
+        result = benchmark.run(args, 'torch', 100, secagg=False)
+        self.assertSetEqual(set(result), {'num_params', 'first_round_s', 'round_s', 'researcher_s', 'nodes_s',
+                                          'nodes_peak_rss', 'nodes_bytes'})
+        self.assertGreater(result['num_params'], 0)
+        self.assertTupleEqual(tuple(result['researcher_s']), benchmark.RESEARCHER_PHASES)
+        self.assertTupleEqual(tuple(result['nodes_s']), benchmark.NODE_PHASES)
+        # spans are read from the training replies of the nodes
+        self.assertGreater(result['nodes_s']['training'], 0.)
+        self.assertGreater(result['nodes_bytes']['download'], 0)
+        self.assertGreater(result['researcher_s']['training_round'], 0.)
+
+        # secure aggregation of large models is skipped
+        self.assertIn('skipped', benchmark.run(args, 'torch', args.secagg_max_params + 1, secagg=True))
+
+
+if __name__ == '__main__':  # pragma: no cover
+    unittest.main()
@@ -403,7 +403,7 @@ class TestDatasetManager(NodeTestCase):
 
         # patchers
         os_listdir_patch.return_value = True
-        datasetmanager_load_default_dataset_patch.return_value = fake_dataset_shape
+        datasetmanager_load_default_dataset_patch.return_value = self.fake_dataset
         insert_table_patch.return_value = None
 
         # action
@@ -417,7 +417,11 @@ class TestDatasetManager(NodeTestCase):
         # checks
         self.assertEqual(dataset_id, fake_dataset_id)
         datasetmanager_load_default_dataset_patch.assert_called_once_with(fake_dataset_name,
-                                                                       fake_dataset_path)
+                                                                       fake_dataset_path,
+                                                                       as_dataset=True)
+        saved_dataset = insert_table_patch.call_args[0][0]
+        self.assertEqual(saved_dataset['shape'], fake_dataset_shape)
+        self.assertEqual(saved_dataset['profile']['n_samples'], fake_dataset_shape[0])
 
 
     def test_dataset_manager_16_add_database_real_csv_examples_based(self):
@@ -1059,6 +1063,126 @@ class TestDatasetManager(NodeTestCase):
         with self.assertRaises(FedbiomedDatasetManagerError):
             _ = DatasetManager.obfuscate_private_information([*metadata_with_private_info, 'non-dict-like'])
 
+    def test_dataset_manager_40_profile_csv_dataset(self):
+        """Tests that CSV datasets are profiled once at registration time"""
+        path = os.path.join(self.tempdir, 'data.csv')
+        pd.DataFrame(self.dummy_data).to_csv(path, index=False)
+
+        dataset_id = self.dataset_manager.add_database(name='test',
+                                                       tags=['profile'],
+                                                       data_type='csv',
+                                                       description='description',
+                                                       path=path)
+        dataset = self.dataset_manager.get_by_id(dataset_id)
+        profile = dataset['profile']
+
+        self.assertEqual(profile['n_samples'], 10)
+        self.assertEqual(profile['source_mtime'], os.path.getmtime(path))
+        self.assertEqual(profile['statistics']['integers'],
+                         {'count': 10, 'missing': 0, 'mean': 4.5,
+                          'std': float(np.std(self.dummy_data['integers'], ddof=1)), 'min': 0.0, 'max': 9.0})
+        self.assertEqual(profile['statistics']['chars'], {'count': 10, 'missing': 0, 'unique': 10})
+
+        # only the number of samples and the column names are shared with the researcher by default
+        shared = DatasetManager.obfuscate_private_information([copy.deepcopy(dataset)])[0]
+        self.assertEqual(shared['profile'], {'n_samples': 10, 'columns': list(profile['statistics'].keys())})
+
+        # statistics are shared if the node opts in, but never min/max
+        shared = DatasetManager.obfuscate_private_information([copy.deepcopy(dataset)], share_profile=True)[0]
+        self.assertEqual(shared['profile']['statistics']['integers'],
+                         {'count': 10, 'missing': 0, 'mean': 4.5,
+                          'std': float(np.std(self.dummy_data['integers'], ddof=1))})
+        self.assertEqual(shared['profile']['statistics']['chars'], {'count': 10, 'missing': 0, 'unique': 10})
+        self.assertNotIn('source_mtime', shared['profile'])
+        self.assertNotIn('profiled_at', shared['profile'])
+
+    def test_dataset_manager_41_profile_images_dataset(self):
+        """Tests that labelled image datasets are profiled with the number of samples per class"""
+        dataset = datasets.ImageFolder(os.path.join(self.testdir, "images"), transform=transforms.ToTensor())
+        profile = self.dataset_manager.profile_dataset('images', dataset)
+
+        self.assertEqual(profile['n_samples'], len(dataset))
+        self.assertEqual(sum(profile['targets'].values()), len(dataset))
+        self.assertEqual(list(profile['targets'].keys()), dataset.classes)
+        self.assertIsNone(profile['source_mtime'])
+
+        # number of samples per class is only shared if the node opts in
+        metadata = [{'data_type': 'images', 'profile': profile}]
+        shared = DatasetManager.obfuscate_private_information(copy.deepcopy(metadata))[0]
+        self.assertEqual(shared['profile'], {'n_samples': len(dataset)})
+        shared = DatasetManager.obfuscate_private_information(copy.deepcopy(metadata), share_profile=True)[0]
+        self.assertEqual(shared['profile'], {'n_samples': len(dataset), 'targets': profile['targets']})
+
+    def test_dataset_manager_42_refresh_dataset_profiles(self):
+        """Tests that only datasets whose data changed are profiled again"""
+        path = os.path.join(self.tempdir, 'data.csv')
+        pd.DataFrame(self.dummy_data).to_csv(path, index=False)
+        dataset_id = self.dataset_manager.add_database(name='test',
+                                                       tags=['refresh'],
+                                                       data_type='csv',
+                                                       description='description',
+                                                       path=path)
+
+        # data did not change
+        self.assertEqual(self.dataset_manager.refresh_dataset_profiles([dataset_id]), [])
+        self.assertEqual(self.dataset_manager.refresh_dataset_profiles([dataset_id], force=True), [dataset_id])
+
+        # data changed
+        pd.DataFrame(self.dummy_data).iloc[:4].to_csv(path, index=False)
+        os.utime(path, (0, 0))
+        self.assertEqual(self.dataset_manager.refresh_dataset_profiles([dataset_id]), [dataset_id])
+        dataset = self.dataset_manager.get_by_id(dataset_id)
+        self.assertEqual(dataset['shape'], [4, 4])
+        self.assertEqual(dataset['profile']['n_samples'], 4)
+
+        # data cannot be read anymore: profile is kept
+        os.remove(path)
+        self.assertEqual(self.dataset_manager.refresh_dataset_profiles([dataset_id], force=True), [])
+        self.assertEqual(self.dataset_manager.get_by_id(dataset_id)['profile']['n_samples'], 4)
+
+    def test_dataset_manager_43_read_csv_window(self):
+        """Tests reading windows of rows of a CSV file, with and without header"""
+        header_csv = os.path.join(self.testdir, "csv", "tata-header.csv")
+        no_header_csv = os.path.join(self.testdir, "csv", "titi-normal.csv")
+
+        res = self.dataset_manager.read_csv_window(header_csv, offset=1, limit=1)
+        self.assertListEqual(list(res.columns), ['Titi', 'Tata', 'Toto'])
+        self.assertListEqual(res.values.tolist(), [[12, 13, 'B']])
+
+        res = self.dataset_manager.read_csv_window(header_csv, offset=1, columns=['Toto'])
+        self.assertListEqual(res['Toto'].tolist(), ['B', 'C'])
+
+        res = self.dataset_manager.read_csv_window(no_header_csv, offset=2, limit=10)
+        self.assertListEqual(res.values.tolist(), [[14.5, 16, 32.5, 'D'], [12.5, 16, 34.5, 'C'], [13.5, 16, 34.5, 'A']])
+
+        # offset beyond the end of the file
+        res = self.dataset_manager.read_csv_window(header_csv, offset=100)
+        self.assertEqual(res.shape, (0, 3))
+        self.assertListEqual(list(res.columns), ['Titi', 'Tata', 'Toto'])
+
+        # same rows when iterating by chunks
+        chunks = list(self.dataset_manager.iter_csv(no_header_csv, offset=1, limit=3, chunk_size=2))
+        self.assertListEqual([len(c) for c in chunks], [2, 1])
+        pd.testing.assert_frame_equal(
+            pd.concat(chunks),
+            self.dataset_manager.read_csv_window(no_header_csv, offset=1, limit=3))
+
+    def test_dataset_manager_44_count_csv_rows(self):
+        """Tests counting the rows of a CSV file without loading it"""
+        self.assertEqual(
+            self.dataset_manager.count_csv_rows(os.path.join(self.testdir, "csv", "tata-header.csv")), (3, True))
+        self.assertEqual(
+            self.dataset_manager.count_csv_rows(os.path.join(self.testdir, "csv", "titi-normal.csv")), (5, True))
+
+        path = os.path.join(self.tempdir, 'rows.csv')
+        with open(path, 'w') as f:
+            f.write('a,b\n' + '\n'.join(f'{i},{i}' for i in range(1000)))
+        self.assertEqual(self.dataset_manager.count_csv_rows(path), (1000, True))
+
+        rows, exact = self.dataset_manager.count_csv_rows(path, max_bytes=1000)
+        self.assertFalse(exact)
+        self.assertAlmostEqual(rows, 1000, delta=200)
+
     @patch('os.path.isdir')
     def test_dataset_manager_32_data_loading_plan_save(self, patch_isdir):
         """Tests that DatasetManager correctly saves a DataLoadingPlan"""
@@ -1075,7 +1199,7 @@ class TestDatasetManager(NodeTestCase):
         dlp[LoadingBlockTypesForTesting.OTHER_LOADING_BLOCK_FOR_TESTING] = dlb2
 
         dataset_manager = DatasetManager()
-        dataset_manager.load_default_database = MagicMock(return_value=(1, 1))
+        dataset_manager.load_default_database = MagicMock(return_value=self.fake_dataset)
         dataset_manager.add_database(
             name='dlp-test-db',
             data_type='default',
@@ -0,0 +1,231 @@
+import os
+import shutil
+import tempfile
+import threading
+import unittest
+
+from tinydb import Query, TinyDB
+from tinydb.table import Document
+
+from fedbiomed.common.db import SQLiteDatabase, SQLiteTable, open_database, migrate_tinydb_to_sqlite, \
+    db_path_extension
+from fedbiomed.common.exceptions import FedbiomedDatabaseError
+
+
+class TestDb(unittest.TestCase):
+    """Tests for the SQLite storage backend of the component databases"""
+
+    def setUp(self):
+        self.tempdir = tempfile.mkdtemp()
+        self.path = os.path.join(self.tempdir, 'db_node.sqlite')
+        self.db = SQLiteDatabase(self.path)
+        self.table = self.db.table('Datasets', cache_size=0)
+        self.query = Query()
+
+        self.docs = [
+            {'name': 'mnist', 'tags': ['#MNIST', '#dataset'], 'dataset_id': 'dataset_1', 'shape': [60000, 1, 28, 28]},
+            {'name': 'csv', 'tags': ['#csv', '#dataset'], 'dataset_id': 'dataset_2', 'shape': [100, 3]},
+            {'name': 'images', 'tags': ['#images'], 'dataset_id': 'dataset_3', 'shape': [10, 3, 32, 32]},
+        ]
+
+    def tearDown(self):
+        self.db.close()
+        shutil.rmtree(self.tempdir)
+
+    def test_db_01_open_database(self):
+        """Test backend selection from the database file extension"""
+        db = open_database(os.path.join(self.tempdir, 'db.sqlite'))
+        self.assertIsInstance(db, SQLiteDatabase)
+        self.assertIsInstance(db.table('Datasets'), SQLiteTable)
+        db.close()
+
+        db = open_database(os.path.join(self.tempdir, 'db.json'))
+        self.assertIsInstance(db, TinyDB)
+        db.close()
+
+        self.assertEqual(db_path_extension('tinydb'), '.json')
+        self.assertEqual(db_path_extension('sqlite'), '.sqlite')
+        with self.assertRaises(FedbiomedDatabaseError):
+            db_path_extension('unknown')
+
+    def test_db_02_insert_get_search(self):
+        """Test inserting and reading documents"""
+        doc_ids = self.table.insert_multiple(self.docs)
+        self.assertEqual(doc_ids, [1, 2, 3])
+        self.assertEqual(self.table.insert({'name': 'other'}), 4)
+        self.assertEqual(len(self.table), 4)
+
+        doc = self.table.get(self.query.dataset_id == 'dataset_2')
+        self.assertEqual(doc, self.docs[1])
+        self.assertEqual(doc.doc_id, 2)
+        self.assertEqual(self.table.get(doc_id=3), self.docs[2])
+        self.assertIsNone(self.table.get(self.query.dataset_id == 'dataset_unknown'))
+        self.assertIsNone(self.table.get(doc_id=100))
+
+        # indexed list field
+        self.assertEqual(self.table.search(self.query.tags.all(['#dataset'])), self.docs[:2])
+        self.assertEqual(self.table.search(self.query.tags.all(['#dataset', '#csv'])), [self.docs[1]])
+        self.assertEqual(self.table.search(self.query.tags.any(['#csv', '#images'])), self.docs[1:])
+        self.assertEqual(self.table.search(self.query.tags.all(['#unknown'])), [])
+
+        # combined indexed and non indexed conditions
+        self.assertEqual(
+            self.table.search(self.query.tags.all(['#dataset']) & (self.query.name == 'mnist')), [self.docs[0]])
+        self.assertEqual(
+            self.table.search(self.query.dataset_id.one_of(['dataset_1', 'dataset_3'])),
+            [self.docs[0], self.docs[2]])
+        self.assertEqual(
+            self.table.search((self.query.dataset_id == 'dataset_1') | (self.query.name == 'images')),
+            [self.docs[0], self.docs[2]])
+
+        # non indexed condition, including non cacheable queries
+        self.assertEqual(self.table.search(self.query.name.exists()), self.docs + [{'name': 'other'}])
+        self.assertEqual(self.table.search(self.query.tags.test(lambda t: '#images' in t)), [self.docs[2]])
+
+        self.assertTrue(self.table.contains(self.query.name == 'csv'))
+        self.assertFalse(self.table.contains(doc_id=100))
+        self.assertEqual(self.table.count(self.query.tags.all(['#dataset'])), 2)
+
+    def test_db_03_same_results_as_tinydb(self):
+        """Test that indexed queries return the same results as the TinyDB backend"""
+        tiny = TinyDB(os.path.join(self.tempdir, 'db.json')).table('Datasets', cache_size=0)
+        tiny.insert_multiple(self.docs)
+        self.table.insert_multiple(self.docs)
+
+        queries = [
+            self.query.tags.all(['#dataset']),
+            self.query.tags == ['#images'],
+            self.query.tags == '#images',
+            self.query.dataset_id == 'dataset_3',
+            self.query.dataset_id.one_of(['dataset_2', 'unknown']),
+            self.query.tags.all([]),
+            (self.query.name == 'csv') | self.query.tags.any(['#MNIST']),
+        ]
+        for q in queries:
+            self.assertEqual(self.table.search(q), tiny.search(q))
+
+    def test_db_04_update_upsert_remove(self):
+        """Test modifying and removing documents"""
+        self.table.insert_multiple(self.docs)
+
+        updated = self.table.update({'tags': ['#new']}, self.query.dataset_id == 'dataset_1')
+        self.assertEqual(updated, [1])
+        # index was updated
+        self.assertEqual(self.table.search(self.query.tags.all(['#dataset'])), [self.docs[1]])
+        self.assertEqual(self.table.get(self.query.tags.all(['#new']))['name'], 'mnist')
+
+        self.table.update(lambda doc: doc.update({'name': 'renamed'}), doc_ids=[2])
+        self.assertEqual(self.table.get(doc_id=2)['name'], 'renamed')
+
+        # upsert existing then new document
+        self.assertEqual(self.table.upsert({'name': 'up'}, self.query.dataset_id == 'dataset_3'), [3])
+        self.assertEqual(self.table.get(doc_id=3)['name'], 'up')
+        self.assertEqual(self.table.upsert({'dataset_id': 'dataset_4'}, self.query.dataset_id == 'dataset_4'), [4])
+        self.assertEqual(self.table.get(self.query.dataset_id == 'dataset_4').doc_id, 4)
+        with self.assertRaises(ValueError):
+            self.table.upsert({'name': 'no condition'})
+
+        self.assertEqual(self.table.remove(self.query.tags.all(['#new'])), [1])
+        self.assertEqual(self.table.remove(doc_ids=[2]), [2])
+        self.assertEqual([d.doc_id for d in self.table.all()], [3, 4])
+        self.assertEqual(self.table.search(self.query.tags.all(['#dataset'])), [])
+        with self.assertRaises(RuntimeError):
+            self.table.remove()
+
+        # ids are not reused for documents inserted with explicit ID
+        self.assertEqual(self.table.insert(Document({'name': 'explicit'}, doc_id=10)), 10)
+        self.assertEqual(self.table.insert({'name': 'next'}), 11)
+        with self.assertRaises(ValueError):
+            self.table.insert(Document({'name': 'duplicate'}, doc_id=10))
+
+        self.table.truncate()
+        self.assertEqual(self.table.all(), [])
+
+    def test_db_05_tables(self):
+        """Test that tables are isolated from each other"""
+        other = self.db.table('TrainingPlans')
+        self.table.insert(self.docs[0])
+        other.insert({'training_plan_id': 'tp_1', 'hash': 'abc'})
+
+        self.assertEqual(self.db.tables(), {'Datasets', 'TrainingPlans'})
+        self.assertEqual(self.table.all(), [self.docs[0]])
+        self.assertEqual(other.get(self.query.hash == 'abc')['training_plan_id'], 'tp_1')
+
+        self.db.drop_table('TrainingPlans')
+        self.assertEqual(self.db.tables(), {'Datasets'})
+        self.db.drop_tables()
+        self.assertEqual(self.db.tables(), set())
+
+    def test_db_06_concurrent_access(self):
+        """Test concurrent writes from threads and from another connection (eg: GUI process)"""
+        other_db = SQLiteDatabase(self.path)
+        other_table = other_db.table('Datasets')
+
+        def _insert(table, prefix):
+            for i in range(20):
+                table.insert({'dataset_id': f'{prefix}_{i}', 'tags': [prefix]})
+
+        threads = [threading.Thread(target=_insert, args=(self.table, 'a')),
+                   threading.Thread(target=_insert, args=(other_table, 'b'))]
+        for t in threads:
+            t.start()
+        for t in threads:
+            t.join()
+
+        self.assertEqual(len(self.table), 40)
+        self.assertEqual(len(other_table.search(self.query.tags.all(['a']))), 20)
+        self.assertEqual(len({d.doc_id for d in self.table.all()}), 40)
+        other_db.close()
+
+    def test_db_07_errors(self):
+        """Test errors raised by the SQLite backend"""
+        with self.assertRaises(FedbiomedDatabaseError):
+            SQLiteDatabase(os.path.join(self.tempdir, 'no', 'such', 'dir', 'db.sqlite'))
+
+        with self.assertRaises(ValueError):
+            self.table.insert('not a document')
+        with self.assertRaises(RuntimeError):
+            self.table.get()
+
+        # failed write is rolled back
+        def _fail(doc):
+            raise KeyError('failing update')
+        self.table.insert(self.docs[0])
+        with self.assertRaises(KeyError):
+            self.table.update(_fail)
+        self.assertEqual(self.table.all(), [self.docs[0]])
+
+    def test_db_08_migrate(self):
+        """Test migration from a TinyDB JSON database"""
+        json_path = os.path.join(self.tempdir, 'db_node.json')
+        tiny = TinyDB(json_path)
+        tiny.table('Datasets').insert_multiple(self.docs)
+        tiny.table('Datasets').remove(doc_ids=[1])
+        tiny.table('TrainingPlans').insert({'training_plan_id': 'tp_1'})
+        tiny.close()
+
+        sqlite_path = os.path.join(self.tempdir, 'migrated.sqlite')
+        migrated = migrate_tinydb_to_sqlite(json_path, sqlite_path)
+        self.assertEqual(migrated, {'Datasets': 2, 'TrainingPlans': 1})
+
+        db = SQLiteDatabase(sqlite_path)
+        datasets = db.table('Datasets').all()
+        self.assertEqual(datasets, self.docs[1:])
+        self.assertEqual([d.doc_id for d in datasets], [2, 3])
+        self.assertEqual(db.table('Datasets').search(self.query.tags.all(['#dataset'])), [self.docs[1]])
+        db.close()
+
+        # destination exists
+        with self.assertRaises(FedbiomedDatabaseError):
+            migrate_tinydb_to_sqlite(json_path, sqlite_path)
+
+        # bad source
+        with open(os.path.join(self.tempdir, 'bad.json'), 'w') as f:
+            f.write('{not json')
+        with self.assertRaises(FedbiomedDatabaseError):
+            migrate_tinydb_to_sqlite(os.path.join(self.tempdir, 'bad.json'),
+                                     os.path.join(self.tempdir, 'other.sqlite'))
+
+
+if __name__ == '__main__':  # pragma: no cover
+    unittest.main()
@@ -4,12 +4,12 @@ import torch
 
 from torch.nn import Module
 from torch.optim import Adam
-from torch.utils.data import DataLoader, Dataset
+from torch.utils.data import DataLoader, Dataset, TensorDataset
 
 from unittest.mock import patch, MagicMock
 from fedbiomed.common.models import TorchModel
 from fedbiomed.common.optimizers.generic_optimizers import NativeTorchOptimizer
-from fedbiomed.common.privacy import DPController
+from fedbiomed.common.privacy import DPController, PerSampleGradients
 from fedbiomed.common.exceptions import FedbiomedDPControllerError
 
 
@@ -173,6 +173,74 @@ class TestDPController(unittest.TestCase):
         p = self.dpc.after_training(params)
         self.assertEqual(p, "POSTPROCESS")
 
+    def test_dep_controller_09_per_sample_gradients(self):
+        """Tests vectorized per-sample gradients against gradients clipped sample by sample"""
+        torch.manual_seed(0)
+        model = torch.nn.Sequential(torch.nn.Linear(4, 3), torch.nn.ReLU(), torch.nn.Linear(3, 1))
+        data, target = torch.randn(6, 4), torch.randn(6, 1)
+        clip = 0.5
+
+        def training_step(data, target):
+            return torch.nn.functional.mse_loss(model(data), target)
+
+        expected = [torch.zeros_like(p) for p in model.parameters()]
+        for i in range(6):
+            model.zero_grad()
+            training_step(data[i:i + 1], target[i:i + 1]).backward()
+            grads = [p.grad.clone() for p in model.parameters()]
+            norm = torch.cat([g.flatten() for g in grads]).norm()
+            factor = min(1., clip / (norm.item() + 1e-6))
+            for e, g in zip(expected, grads):
+                e += factor * g / 8
+
+        model.zero_grad(set_to_none=True)
+        loss = PerSampleGradients(model, sigma=0., clip=clip, expected_batch_size=8).backward(
+            training_step, data, target)
+        self.assertTrue(torch.isclose(loss, training_step(data, target)))
+        for param, e in zip(model.parameters(), expected):
+            self.assertTrue(torch.allclose(param.grad, e, atol=1e-6))
+
+        # noise is added to the gradients, and empty batches only contribute noise
+        model.zero_grad(set_to_none=True)
+        PerSampleGradients(model, sigma=1., clip=clip, expected_batch_size=8).backward(
+            training_step, data[:0], target[:0])
+        self.assertTrue(all(param.grad is not None and param.grad.abs().sum() > 0 for param in model.parameters()))
+
+    def test_dep_controller_10_vectorized_engine(self):
+        """Tests training with the `vmap` engine"""
+        self.assertFalse(self.dpl.vectorized)
+        self.assertEqual(self.dpl._dp_args['engine'], 'opacus')
+        with self.assertRaises(FedbiomedDPControllerError):
+            DPController({"type": "local", "sigma": 0.1, "clip": 0.1, "engine": "jax"})
+
+        dp = DPController({"type": "local", "sigma": 0.1, "clip": 0.1, "engine": "vmap"})
+        dp._privacy_engine = MagicMock()
+        self.assertTrue(dp.vectorized)
+
+        model = torch.nn.Linear(4, 1)
+        model_wrapper = MagicMock(spec=TorchModel)
+        model_wrapper.model = model
+        optim_wrapper = NativeTorchOptimizer(model_wrapper, Adam(model.parameters()))
+        loader = DataLoader(TensorDataset(torch.randn(10, 4), torch.randn(10, 1)), batch_size=5)
+
+        def training_step(data, target):
+            return torch.nn.functional.mse_loss(model(data), target)
+
+        with self.assertRaises(FedbiomedDPControllerError):
+            dp.private_backward(training_step, torch.randn(5, 4), torch.randn(5, 1))
+
+        optimizer, dp_loader = dp.before_training(optim_wrapper, loader)
+        self.privacy_engine_make_private.assert_not_called()
+        self.assertIs(optimizer.optimizer, optim_wrapper.optimizer)
+        self.assertIs(model_wrapper.model, model)
+        self.assertEqual(dp_loader.sample_rate, 0.5)
+
+        for data, target in dp_loader:
+            dp.private_backward(training_step, data, target)
+        self.assertTrue(all(param.grad is not None for param in model.parameters()))
+        self.assertEqual(dp._privacy_engine.accountant.step.call_count, 2)
+        dp._privacy_engine.accountant.step.assert_called_with(noise_multiplier=0.1, sample_rate=0.5)
+
 
 if __name__ == '__main__':  # pragma: no cover
     unittest.main()
@@ -9,6 +9,8 @@ import unittest
 from typing import Dict
 from unittest.mock import MagicMock, PropertyMock, patch
 
+import torch
+
 #############################################################
 # Import ResearcherTestCase before importing any FedBioMed Module
 from testsupport.base_case import ResearcherTestCase
@@ -25,7 +27,9 @@ from fedbiomed.common.exceptions import FedbiomedSilentTerminationError
 from fedbiomed.common.constants import __breakpoints_version__
 
 import fedbiomed.researcher.experiment
+from fedbiomed.researcher.aggregated_params import AggregatedParamsHistory
 from fedbiomed.researcher.aggregators.fedavg import FedAverage
+from fedbiomed.researcher.aggregators.fedbuff import FedBuff
 from fedbiomed.researcher.aggregators.aggregator import Aggregator
 from fedbiomed.researcher.aggregators.scaffold import Scaffold
 from fedbiomed.researcher.datasets import FederatedDataSet
@@ -37,6 +41,7 @@ from fedbiomed.researcher.responses import Responses
 from fedbiomed.researcher.secagg import SecureAggregation
 from fedbiomed.researcher.strategies.strategy import Strategy
 from fedbiomed.researcher.strategies.default_strategy import DefaultStrategy
+from fedbiomed.researcher.strategies.async_strategy import AsyncStrategy
 
 
 class FakeAggregator(Aggregator):
@@ -133,6 +138,8 @@ class TestExperiment(ResearcherTestCase):
                                                         MagicMock(return_value=None))
         self.patcher_monitor_close_writer = patch('fedbiomed.researcher.monitor.Monitor.close_writer',
                                                   MagicMock(return_value=None))
+        self.patcher_monitor_add_spans = patch('fedbiomed.researcher.experiment.Monitor.add_spans',
+                                               MagicMock(return_value=None))
         self.patcher_cr_folder = patch('fedbiomed.researcher.experiment.create_exp_folder',
                                        return_value=self.experimentation_folder)
         self.patcher_job = patch('fedbiomed.researcher.job.Job.__init__', MagicMock(return_value=None))
@@ -153,6 +160,7 @@ class TestExperiment(ResearcherTestCase):
         self.mock_monitor_init = self.patcher_monitor_init.start()
         self.mock_monitor_on_message = self.patcher_monitor_on_message_handler.start()
         self.mock_monitor_close_writer = self.patcher_monitor_close_writer.start()
+        self.mock_monitor_add_spans = self.patcher_monitor_add_spans.start()
         self.mock_create_folder = self.patcher_cr_folder.start()
         self.mock_logger_info = self.patcher_logger_info.start()
         self.mock_logger_error = self.patcher_logger_error.start()
@@ -194,6 +202,7 @@ class TestExperiment(ResearcherTestCase):
         self.patcher_monitor_init.stop()
         self.patcher_monitor_on_message_handler.stop()
         self.patcher_monitor_close_writer.stop()
+        self.patcher_monitor_add_spans.stop()
 
         if environ['EXPERIMENTS_DIR'] in sys.path:
             sys.path.remove(environ['EXPERIMENTS_DIR'])
@@ -788,7 +797,7 @@ class TestExperiment(ResearcherTestCase):
         self.patcher_job.stop()  # We need to actually leverage the real Job class
         self.test_exp._training_plan_is_defined = True  # required for set_job below
         self.test_exp.set_training_plan_class(TestExperiment.FakeModelTorch)  # required for set_job below
-        with patch('fedbiomed.researcher.job.Repository', new=MagicMock()) as patched_repo, \
+        with patch('fedbiomed.researcher.job.create_repository', new=MagicMock()) as patched_repo, \
              patch('fedbiomed.researcher.job.Job.update_parameters', return_value=None) as patched_update_params, \
              patch('fedbiomed.researcher.job.Job.validate_minimal_arguments', return_value=None) as patched_validate:
             self.test_exp.set_job()  # create an actual Job inside the experiment
@@ -1125,7 +1134,10 @@ class TestExperiment(ResearcherTestCase):
         mock_experiment_breakpoint.reset_mock()
         # action
         self.test_exp._round_current = 1
-        result = self.test_exp.run_once(test_after=True)
+        with patch.object(self.test_exp._breakpoint_writer, 'wait') as mock_wait:
+            result = self.test_exp.run_once(test_after=True)
+        # breakpoint written in the background is waited for before returning
+        mock_wait.assert_called_once()
         # testing calls
         mock_strategy_refine.assert_called_once()
         mock_fedavg_aggregate.assert_called_once()
@@ -1307,7 +1319,7 @@ class TestExperiment(ResearcherTestCase):
             # should raise a FedbiomedStrategyError, describing the error
             self.test_exp.run_once()
 
-    @patch('fedbiomed.researcher.experiment.Experiment.run_once')
+    @patch('fedbiomed.researcher.experiment.Experiment._run_once')
     def test_experiment_27_run(self, mock_exp_run_once):
         """ Testing run method of Experiment class """
 
@@ -1521,7 +1533,8 @@ class TestExperiment(ResearcherTestCase):
             'entry1': {'params_path': '/dummy/path/to/aggparams/params_path.mpk'},
             'entry2': {'params_path': '/yet/another/path/other_params_path.mpk'}
         }
-        self.test_exp._aggregated_params = agg_params
+        # entry1 is only referenced by its file
+        self.test_exp._aggregated_params = AggregatedParamsHistory(agg_params, rounds_in_memory=1)
 
         # patch choose_bkpt_file create_unique_{file_}link  with minimal functions
         def side_bkpt_file(exp_folder, round):
@@ -1608,6 +1621,7 @@ class TestExperiment(ResearcherTestCase):
         self.assertEqual(final_state['node_selection_strategy'], strategy_state)
         self.assertEqual(final_state['tags'], self.tags)
         self.assertEqual(final_state['aggregated_params'], final_agg_params)
+        self.assertEqual(final_state['aggregated_params_in_memory'], 1)
         self.assertEqual(final_state['job'], job_state)
         self.assertEqual(final_state['secagg']["class"], 'SecureAggregation')
         self.assertEqual(final_state['secagg']["module"], 'fedbiomed.researcher.secagg._secure_aggregation')
@@ -1618,8 +1632,8 @@ class TestExperiment(ResearcherTestCase):
             with self.assertRaises(SystemExit):
                 self.test_exp.breakpoint()
 
-        with patch.object(fedbiomed.researcher.experiment.json, 'dump') as m:
-            m.side_effect = OSError
+        with patch.object(fedbiomed.researcher.experiment.json, 'dumps') as m:
+            m.side_effect = ValueError
             with self.assertRaises(SystemExit):
                 self.test_exp.breakpoint()
 
@@ -1631,6 +1645,21 @@ class TestExperiment(ResearcherTestCase):
             with self.assertRaises(SystemExit):
                 self.test_exp.breakpoint()
 
+        # Test writing breakpoint in the background: errors are raised by the next breakpoint
+        bkpt_file_path = os.path.join(self.experimentation_folder_path, bkpt_file)
+        os.remove(bkpt_file_path)
+        self.test_exp.breakpoint(background=True)
+        self.test_exp._breakpoint_writer.wait()
+        with open(bkpt_file_path, "r") as f:
+            self.assertEqual(json.load(f)['round_current'], round_current)
+
+        with patch.object(fedbiomed.researcher.experiment, 'open') as m:
+            m.side_effect = OSError
+            self.test_exp.breakpoint(background=True)
+            with self.assertRaises(SystemExit):
+                self.test_exp.breakpoint()
+        self.assertFalse(self.test_exp._breakpoint_writer.pending)
+
     @patch('fedbiomed.researcher.experiment.Experiment.training_plan')
     @patch('fedbiomed.researcher.experiment.find_breakpoint_path')
     # test load_breakpoint + _load_aggregated_params
@@ -1732,6 +1761,7 @@ class TestExperiment(ResearcherTestCase):
             },
             'tags': self.tags,
             'aggregated_params': aggregated_params,
+            'aggregated_params_in_memory': None,
             'job': job,
             'secagg': secagg_state,
         }
@@ -1843,6 +1873,7 @@ class TestExperiment(ResearcherTestCase):
         self.assertDictEqual(loaded_exp._training_args.dict(), final_training_args.dict())
         self.assertEqual(loaded_exp._job._saved_state, final_job)
         self.assertEqual(loaded_exp._aggregated_params, final_aggregated_params)
+        self.assertIsNone(loaded_exp._aggregated_params.rounds_in_memory)
         self.assertTrue(loaded_exp._save_breakpoints)
         self.assertFalse(loaded_exp._monitor)
         self.assertTrue(loaded_exp.secagg.active)
@@ -2009,6 +2040,89 @@ class TestExperiment(ResearcherTestCase):
         # clean after tests
         del test_class
 
+    def test_experiment_36_set_breakpoint_retention(self):
+        """ Test setter for the breakpoint retention policy """
+        self.assertEqual(self.test_exp._breakpoint_retention, {'keep_last': None, 'keep_every': None})
+
+        for args in ({'keep_last': 0}, {'keep_last': 1.5}, {'keep_every': True}, {'keep_every': -2}):
+            with self.assertRaises(SystemExit):
+                self.test_exp.set_breakpoint_retention(**args)
+
+        retention = self.test_exp.set_breakpoint_retention(keep_last=2, keep_every=5)
+        self.assertEqual(retention, {'keep_last': 2, 'keep_every': 5})
+
+    def test_experiment_37_run_async(self):
+        """ Test asynchronous training with buffered aggregation """
+
+        class FakeAsyncJob:
+            """Nodes reply after a number of polls, with their parameters shifted by one"""
+            def __init__(self, polls):
+                self.polls = polls
+                self.nodes = []
+                self.training_replies = {}
+                self.training_plan = MagicMock()
+                self.training_plan.get_model_params.return_value = {'w': torch.zeros(2)}
+                self._params = {'w': torch.zeros(2)}
+                self._in_flight = {}
+                self.dispatched = []
+
+            @property
+            def in_flight(self):
+                return {node: round_ for node, (round_, _, _) in self._in_flight.items()}
+
+            def update_parameters(self, params):
+                self._params = params
+                return 'path', 'url'
+
+            def dispatch_training(self, nodes, round_, *args):
+                self.dispatched.append((tuple(nodes), round_))
+                for node in nodes:
+                    self._in_flight[node] = (round_, self._params, self.polls[node])
+
+            def receive_training_replies(self):
+                replies = []
+                for node, (round_, params, polls) in list(self._in_flight.items()):
+                    if polls > 1:
+                        self._in_flight[node] = (round_, params, polls - 1)
+                        continue
+                    del self._in_flight[node]
+                    replies.append((round_, {'node_id': node, 'success': True, 'sample_size': 10,
+                                             'params': {'w': params['w'] + 1}}))
+                return replies
+
+            def cancel_in_flight(self):
+                self._in_flight = {}
+
+        fds = MagicMock(spec=FederatedDataSet)
+        fds.node_ids.return_value = ['node-1', 'node-2']
+        self.test_exp.set_save_breakpoints(False)
+
+        # bad experiment definitions
+        self.test_exp._job = FakeAsyncJob({'node-1': 1, 'node-2': 3})
+        with self.assertRaises(SystemExit):
+            self.test_exp.run_async(2)
+        self.test_exp.set_aggregator(FedBuff(buffer_size=2, staleness_exponent=0.))
+        self.test_exp.set_strategy(AsyncStrategy(fds))
+        for updates in (0, 1.5, True):
+            with self.assertRaises(SystemExit):
+                self.test_exp.run_async(updates)
+
+        # node-1 is three times faster than node-2: it is re-dispatched without waiting for node-2
+        updates = self.test_exp.run_async(3)
+        self.assertEqual(updates, 3)
+        self.assertEqual(self.test_exp.round_current(), 3)
+        self.assertListEqual(self.test_exp._job.dispatched,
+                             [(('node-1', 'node-2'), 0), (('node-1',), 0), (('node-1',), 1), (('node-2',), 1),
+                              (('node-1',), 2), (('node-1',), 2)])
+        # each buffered update shifts the parameters by one, whatever the version it was trained from
+        self.assertTrue(torch.equal(self.test_exp._global_model['w'], torch.full((2,), 3.)))
+        self.assertListEqual(sorted(self.test_exp._aggregated_params), [0, 1, 2])
+        self.assertEqual(self.test_exp._job.in_flight, {})
+
+        # updates are limited by the round limit
+        self.assertEqual(self.test_exp.run_async(5), 1)
+        self.assertEqual(self.test_exp.run_async(), 0)
+
 
 if __name__ == '__main__':  # pragma: no cover
     unittest.main()
@@ -11,6 +11,7 @@ import numpy as np
 
 
 from fedbiomed.researcher.aggregators.fedavg import FedAverage
+from fedbiomed.researcher.aggregators.functional import accumulate_weighted_sum
 
 
 
@@ -120,6 +121,18 @@ class TestFedaverage(ResearcherTestCase):
             self.aggregator.aggregate(model_params=model_params,
                                       weights=weights)
 
+    def test_fed_average_07_accumulate_weighted_sum(self):
+        """Testing the running weighted sum of models, used by intermediate aggregators"""
+        partial_sum = None
+        for node_id, params in self.models.items():
+            partial_sum = accumulate_weighted_sum(partial_sum, params, 10.)
+        for key, val in partial_sum.items():
+            self.assertTrue(torch.allclose(val, 40. * self.model.state_dict()[key]))
+
+        partial_sum = accumulate_weighted_sum(None, {'coef_': np.array([1, 2])}, 2)
+        partial_sum = accumulate_weighted_sum(partial_sum, {'coef_': np.array([3, 4])}, 3)
+        self.assertTrue(np.allclose(partial_sum['coef_'], np.array([11., 16.])))
+
 
 if __name__ == '__main__':  # pragma: no cover
     unittest.main()
@@ -715,6 +715,32 @@ class TestSklearnFedPerceptron(unittest.TestCase):
                 if fed_name_param != 'verbose':
                     self.assertEqual(fed_value, fed_perp._model.get_params(fed_name_param))
 
+    def test_sklearnperceptron_02_reset_round(self):
+        """Tests that a FedPerceptron kept by the node for a new round is reset with its default values"""
+        fed_perp = FedPerceptron()
+        self.assertFalse(fed_perp.reusable())
+        fed_perp.post_init({'n_classes': 2, 'n_features': 2, 'tol': .03}, FakeTrainingArgs())
+        self.assertTrue(fed_perp.reusable())
+
+        # fitting state of the previous round
+        model = fed_perp.model()
+        model.partial_fit(np.array([[1., 2.], [2., 1.]]), np.array([0, 1]))
+
+        class RoundTrainingArgs(FakeTrainingArgs):
+            def pure_training_arguments(self):
+                return {"num_updates": 5, "batch_maxnum": 4}
+
+        fed_perp.reset_round(RoundTrainingArgs(), {'aggregator_name': 'fedavg'})
+        self.assertIsNot(fed_perp.model(), model)
+        self.assertEqual(fed_perp._training_args, {"num_updates": 5, "batch_maxnum": 4})
+        self.assertEqual(fed_perp._batch_maxnum, 4)
+        self.assertFalse(hasattr(fed_perp.model(), 't_'))
+        self.assertEqual(fed_perp._aggregator_args, {'aggregator_name': 'fedavg'})
+        sk_perceptron = Perceptron(tol=.03)
+        for (fed_name_param, fed_value) in sk_perceptron.get_params().items():
+            if fed_name_param != 'verbose':
+                self.assertEqual(fed_value, fed_perp._model.get_params(fed_name_param))
+
 
 if __name__ == '__main__':  # pragma: no cover
     unittest.main()
@@ -0,0 +1,62 @@
+import unittest
+
+import numpy as np
+import torch
+
+#############################################################
+# Import ResearcherTestCase before importing any FedBioMed Module
+from testsupport.base_case import ResearcherTestCase
+#############################################################
+
+from fedbiomed.common.exceptions import FedbiomedAggregatorError
+from fedbiomed.researcher.aggregators.fedbuff import FedBuff
+
+
+class TestFedBuff(ResearcherTestCase):
+    """Tests the buffered asynchronous aggregator"""
+
+    def test_fedbuff_01_init(self):
+        """Tests FedBuff arguments"""
+        for kwargs in ({'buffer_size': 0}, {'buffer_size': 1.5}, {'server_lr': 0.}, {'staleness_exponent': -1.}):
+            with self.assertRaises(FedbiomedAggregatorError):
+                FedBuff(**kwargs)
+
+        aggregator = FedBuff(buffer_size=4, server_lr=0.5, staleness_exponent=1.)
+        self.assertEqual(aggregator.staleness_weight(0), 1.)
+        self.assertEqual(aggregator.staleness_weight(3), 0.25)
+        self.assertEqual(aggregator.create_aggregator_args({}, ['node-1']), ({}, {}))
+
+        state = aggregator.save_state(None, global_model={})
+        loaded = FedBuff()
+        loaded.load_state(state)
+        self.assertEqual((loaded.buffer_size, loaded.server_lr, loaded.staleness_exponent), (4, 0.5, 1.))
+
+    def test_fedbuff_02_buffered_updates(self):
+        """Tests that the global model is updated from buffered updates, weighted by staleness"""
+        aggregator = FedBuff(buffer_size=2, server_lr=1., staleness_exponent=1.)
+        base_0 = {'w': torch.zeros(3), 'n': torch.tensor(0)}
+        base_1 = {'w': torch.ones(3), 'n': torch.tensor(1)}
+
+        self.assertFalse(aggregator.add_update({'w': torch.full((3,), 2.), 'n': torch.tensor(2)}, base_1, 30))
+        self.assertEqual(aggregator.buffered, 1)
+        self.assertTrue(aggregator.add_update({'w': torch.full((3,), 4.), 'n': torch.tensor(4)}, base_0, 10,
+                                              staleness=1))
+
+        aggregated = aggregator.flush(base_1)
+        # 0.75 * 1 * 1 + 0.25 * 0.5 * 4
+        self.assertTrue(torch.allclose(aggregated['w'], torch.full((3,), 1 + 0.75 + 0.5)))
+        self.assertEqual(aggregated['n'].dtype, torch.int64)
+        self.assertEqual(aggregator.buffered, 0)
+        with self.assertRaises(FedbiomedAggregatorError):
+            aggregator.flush(base_1)
+
+        # synchronous aggregation of numpy parameters
+        aggregator = FedBuff(buffer_size=10, server_lr=1.)
+        aggregated = aggregator.aggregate({'node-1': {'coef': np.array([2., 2.])}, 'node-2': {'coef': np.array([4., 0.])}},
+                                          {'node-1': 0.5, 'node-2': 0.5},
+                                          global_model={'coef': np.array([1., 1.])})
+        np.testing.assert_allclose(aggregated['coef'], [3., 1.])
+
+
+if __name__ == '__main__':  # pragma: no cover
+    unittest.main()
@@ -3,6 +3,8 @@ from unittest.mock import patch
 import os
 import shutil
 
+import numpy as np
+
 #############################################################
 # Import ResearcherTestCase before importing any FedBioMed Module
 from testsupport.base_case import ResearcherTestCase
@@ -409,6 +411,84 @@ class TestFiletools(ResearcherTestCase):
                           filetools.find_breakpoint_path,
                           bkpt_folder)
 
+    def test_filetools_14_save_and_load_blob(self):
+        """Tests that identical objects are stored once in the blob store"""
+        exp_folder = filetools.create_exp_folder('Exp_blobs')
+        params = {'weight': np.arange(6.).reshape(2, 3)}
+
+        links = []
+        for round_ in range(2):
+            bkpt_path, _ = filetools.choose_bkpt_file(exp_folder, round_)
+            links.append(filetools.save_blob(bkpt_path, 'aggregator_correction_node_1', params))
+            # saving the same object again in the same breakpoint creates a new link
+            links.append(filetools.save_blob(bkpt_path, 'aggregator_correction_node_1', params))
+
+        self.assertEqual(os.path.basename(links[0]), 'aggregator_correction_node_1.mpk')
+        self.assertEqual(os.path.basename(links[1]), 'aggregator_correction_node_1_01.mpk')
+        for link in links:
+            self.assertTrue(os.path.islink(link))
+            self.assertFalse(os.path.isabs(os.readlink(link)))
+            np.testing.assert_array_equal(filetools.load_blob(link)['weight'], params['weight'])
+
+        blobs = [f for _, _, files in os.walk(os.path.join(self.testdir, exp_folder, filetools.BLOBS_FOLDER))
+                 for f in files]
+        self.assertEqual(len(blobs), 1)
+
+        # a modified object gets its own blob
+        bkpt_path, _ = filetools.choose_bkpt_file(exp_folder, 2)
+        link = filetools.save_blob(bkpt_path, 'aggregator_correction_node_1', {'weight': np.zeros(3)})
+        self.assertNotEqual(os.path.realpath(link), os.path.realpath(links[0]))
+        np.testing.assert_array_equal(filetools.load_blob(link)['weight'], np.zeros(3))
+
+    def test_filetools_15_prune_breakpoints(self):
+        """Tests the breakpoint retention policy and the removal of unused blobs"""
+        exp_folder = filetools.create_exp_folder('Exp_prune')
+        links = {}
+        for round_ in range(7):
+            bkpt_path, _ = filetools.choose_bkpt_file(exp_folder, round_)
+            filetools.save_blob(bkpt_path, 'shared', {'value': np.ones(2)})
+            links[round_] = filetools.save_blob(bkpt_path, 'own', {'value': np.full(2, round_)})
+
+        # all breakpoints are kept by default
+        self.assertEqual(filetools.prune_breakpoints(exp_folder), [])
+        # or when keeping more breakpoints than the experiment has
+        self.assertEqual(filetools.prune_breakpoints(exp_folder, keep_last=10), [])
+        self.assertEqual(len(os.listdir(os.path.join(self.testdir, exp_folder))), 8)
+
+        removed = filetools.prune_breakpoints(exp_folder, keep_last=2, keep_every=3)
+        kept = sorted(os.listdir(os.path.join(self.testdir, exp_folder)))
+        self.assertEqual(kept, ['blobs', 'breakpoint_0002', 'breakpoint_0005', 'breakpoint_0006'])
+        self.assertEqual(len(removed), 4)
+
+        for round_ in (2, 5, 6):
+            np.testing.assert_array_equal(filetools.load_blob(links[round_])['value'], np.full(2, round_))
+        blobs = [f for _, _, files in os.walk(os.path.join(self.testdir, exp_folder, filetools.BLOBS_FOLDER))
+                 for f in files]
+        # shared blob + one blob per kept breakpoint
+        self.assertEqual(len(blobs), 4)
+
+    def test_filetools_16_deferred_blobs(self):
+        """Tests that blobs saved in a deferred context are only written by `write_blobs`"""
+        exp_folder = filetools.create_exp_folder('Exp_deferred')
+        bkpt_path, _ = filetools.choose_bkpt_file(exp_folder, 0)
+
+        with filetools.deferred_blobs() as pending:
+            link_1 = filetools.save_blob(bkpt_path, 'global_state', {'value': np.ones(2)})
+            link_2 = filetools.save_blob(bkpt_path, 'global_state', {'value': np.zeros(2)})
+
+        self.assertEqual(len(pending), 2)
+        self.assertNotEqual(link_1, link_2)
+        self.assertEqual(os.listdir(bkpt_path), [])
+        self.assertFalse(os.path.exists(os.path.join(self.testdir, exp_folder, filetools.BLOBS_FOLDER)))
+
+        filetools.write_blobs(pending)
+        np.testing.assert_array_equal(filetools.load_blob(link_1)['value'], np.ones(2))
+        np.testing.assert_array_equal(filetools.load_blob(link_2)['value'], np.zeros(2))
+
+        # blobs are written immediately outside of the context
+        link = filetools.save_blob(bkpt_path, 'global_state', {'value': np.ones(2)})
+        self.assertTrue(os.path.islink(link))
+
 
 if __name__ == '__main__':  # pragma: no cover
     unittest.main()
@@ -810,6 +810,43 @@ class TestTorchBasedOptimizer(unittest.TestCase):
                 with declearn_optim_wrapper.optimizer_processing():
                     pass
 
+    def test_torchbasedoptimizer_04_step_without_copies(self):
+        """Tests that steps on views of the model tensors match the declearn computations on copies"""
+        data = torch.Tensor([[1, 2, 3, 4], [0, 1, 0, 1]])
+        targets = torch.Tensor([[1, 1], [0, 1]])
+        loss_func = torch.nn.MSELoss()
+
+        optimizers = (
+            lambda: FedOptimizer(lr=.1, decay=.05),
+            lambda: FedOptimizer(lr=.1, modules=[YogiMomentumModule()]),
+            lambda: FedOptimizer(lr=.1, decay=.05, regularizers=[FedProxRegularizer(alpha=.5)]),
+        )
+        for build_optim in optimizers:
+            model = TorchModel(copy.deepcopy(self._torch_model[0]))
+            reference = TorchModel(copy.deepcopy(self._torch_model[0]))
+            optim_wrapper = DeclearnOptimizer(model, build_optim())
+            ref_optim = build_optim()
+            ref_optim.init_round()
+
+            for _ in range(3):
+                for wrapped in (model, reference):
+                    wrapped.model.zero_grad()
+                    loss_func(wrapped.model(data), targets).backward()
+
+                optim_wrapper.step()
+                updates = ref_optim.step(TorchVector(reference.get_gradients()),
+                                         TorchVector(reference.get_weights()))
+                reference.apply_updates(updates.coefs)
+
+            for (name, val), (_, ref_val) in zip(model.get_weights().items(), reference.get_weights().items()):
+                self.assertTrue(torch.allclose(val, ref_val, atol=1e-6), name)
+
+        # views share memory with the model tensors
+        views = model.get_weights(copy=False)
+        self.assertEqual(views['weight'].data_ptr(), model.model.weight.data_ptr())
+        self.assertEqual(model.get_gradients(copy=False)['weight'].data_ptr(), model.model.weight.grad.data_ptr())
+        self.assertNotEqual(model.get_weights()['weight'].data_ptr(), model.model.weight.data_ptr())
+
 
 class TestSklearnBasedOptimizer(unittest.TestCase):
     def setUp(self):
@@ -0,0 +1,254 @@
+import os
+import shutil
+import sys
+import tempfile
+import time
+import unittest
+from unittest.mock import patch
+
+from testsupport.base_case import NodeTestCase
+
+# GUI server modules are imported as top level modules, from the GUI server directory
+GUI_SERVER_DIR = os.path.abspath(os.path.join(os.path.dirname(__file__), '..', 'gui', 'server'))
+
+
+def _create_gui_root(root: str) -> str:
+    """Creates the Fed-BioMed root directory read by the GUI configuration, returns its data path"""
+    data_path = os.path.join(root, 'data')
+    for folder in ('gui', 'etc', 'var', 'data'):
+        os.makedirs(os.path.join(root, folder))
+
+    with open(os.path.join(root, 'gui', 'config_gui.ini'), 'w') as file:
+        file.write(f'[server]\nDATA_PATH = {data_path}\n\n'
+                   '[init_admin]\nemail = admin@fedbiomed.gui\npassword = admin\n')
+    with open(os.path.join(root, 'etc', 'config_node.ini'), 'w') as file:
+        file.write('[default]\nid = node_gui_test\n')
+
+    return data_path
+
+
+GUI_ROOT = tempfile.mkdtemp()
+DATA_PATH = _create_gui_root(GUI_ROOT)
+
+with patch.dict(os.environ, {'FEDBIOMED_DIR': GUI_ROOT, 'DATA_INDEX_INTERVAL': '3600'}):
+    sys.path.insert(0, GUI_SERVER_DIR)
+    from flask import Flask
+    from flask_jwt_extended import JWTManager, create_access_token
+
+    import indexer
+    from indexer import DirectoryIndex
+    from routes import api
+
+
+def tearDownModule():
+    shutil.rmtree(GUI_ROOT, ignore_errors=True)
+
+
+def _write(path: str, size: int):
+    os.makedirs(os.path.dirname(path), exist_ok=True)
+    with open(path, 'wb') as file:
+        file.write(b'0' * size)
+
+
+def _touch_dir(path: str):
+    """Moves the modification time of a directory forward, as if its content changed"""
+    mtime = time.time() + 10
+    os.utime(path, (mtime, mtime))
+
+
+class TestDirectoryIndex(unittest.TestCase):
+    """Tests the in memory index of the node data path"""
+
+    def setUp(self):
+        self.root = tempfile.mkdtemp()
+        _write(os.path.join(self.root, 'a', 'f1'), 10)
+        _write(os.path.join(self.root, 'a', 'f2'), 20)
+        _write(os.path.join(self.root, 'b', 'c', 'f3'), 5)
+        _write(os.path.join(self.root, '.hidden'), 1)
+        _write(os.path.join(self.root, 'top.txt'), 3)
+        self.index = DirectoryIndex(self.root, interval=3600)
+
+    def tearDown(self):
+        self.index.stop()
+        shutil.rmtree(self.root)
+
+    def test_directory_index_01_build(self):
+        """Tests building the index and the disk usage totals"""
+        # directories requested before the first pass are listed on demand, their size is not known yet
+        number, items = self.index.list([])
+        self.assertEqual(number, 3)
+        self.assertEqual([entry.name for _, entry in items], ['a', 'b', 'top.txt'])
+        self.assertIsNone(self.index.disk_usage(['b']))
+        self.assertIsNone(self.index.disk_usage([]))
+
+        self.index.sync()
+        self.assertEqual(self.index.disk_usage([]), 39)
+        self.assertEqual(self.index.disk_usage(['a']), 30)
+        self.assertEqual(self.index.disk_usage(['b']), 5)
+        self.assertEqual(self.index.disk_usage(['b', 'c', 'f3']), 5)
+        self.assertEqual(items[0][0], os.path.join(self.root, 'a'))
+        self.assertTrue(items[0][1].is_dir)
+        self.assertFalse(items[2][1].is_dir)
+
+        # background indexer
+        index = DirectoryIndex(self.root, interval=3600)
+        index.start()
+        deadline = time.monotonic() + 5
+        while index.disk_usage([]) is None and time.monotonic() < deadline:
+            time.sleep(0.05)
+        index.stop()
+        self.assertEqual(index.disk_usage([]), 39)
+
+    def test_directory_index_02_invalidation(self):
+        """Tests updating the index after files change"""
+        self.index.sync()
+        stamp = self.index.stamp([])
+
+        # new file: directory modification time changes
+        _write(os.path.join(self.root, 'a', 'f4'), 7)
+        _touch_dir(os.path.join(self.root, 'a'))
+        self.index.sync()
+        self.assertEqual(self.index.disk_usage(['a']), 37)
+        self.assertEqual(self.index.disk_usage([]), 46)
+        self.assertGreater(self.index.stamp([]), stamp)
+
+        # file modified in place: only seen by a forced synchronization
+        _write(os.path.join(self.root, 'a', 'f1'), 100)
+        self.index.sync()
+        self.assertEqual(self.index.disk_usage(['a']), 37)
+        self.index.sync(['a'], force=True)
+        self.assertEqual(self.index.disk_usage(['a']), 127)
+        self.assertEqual(self.index.disk_usage([]), 136)
+
+        # removed directory
+        shutil.rmtree(os.path.join(self.root, 'b'))
+        _touch_dir(self.root)
+        self.index.sync()
+        self.assertEqual(self.index.list([])[0], 2)
+        self.assertEqual(self.index.disk_usage([]), 131)
+        with self.assertRaises(FileNotFoundError):
+            self.index.disk_usage(['b'])
+
+        # parents removed during a partial synchronization are skipped
+        self.index._update_parents(['b', 'c', 'f3'])
+        self.assertEqual(self.index.disk_usage([]), 131)
+
+    def test_directory_index_03_pagination(self):
+        """Tests listing a page of a directory"""
+        for i in range(25):
+            _write(os.path.join(self.root, 'many', f'file_{i:02d}'), 1)
+
+        number, items = self.index.list(['many'], offset=0, limit=10)
+        self.assertEqual(number, 25)
+        self.assertEqual([entry.name for _, entry in items], [f'file_{i:02d}' for i in range(10)])
+
+        number, items = self.index.list(['many'], offset=20, limit=10)
+        self.assertEqual(number, 25)
+        self.assertEqual([entry.name for _, entry in items], [f'file_{i:02d}' for i in range(20, 25)])
+
+        number, items = self.index.list(['many'], offset=30, limit=10)
+        self.assertEqual(number, 25)
+        self.assertEqual(items, [])
+
+        self.assertEqual(len(self.index.list(['many'])[1]), 25)
+        self.assertEqual(self.index.list([], include_hidden=True)[0], 5)
+
+        with self.assertRaises(NotADirectoryError):
+            self.index.list(['top.txt'])
+        with self.assertRaises(FileNotFoundError):
+            self.index.list(['unknown'])
+
+    def test_directory_index_04_parts(self):
+        """Tests splitting absolute paths into folders of the root path"""
+        self.assertEqual(self.index.parts(self.root), [])
+        self.assertEqual(self.index.parts(os.path.join(self.root, 'b', 'c')), ['b', 'c'])
+        with self.assertRaises(ValueError):
+            self.index.parts(os.path.dirname(self.root))
+
+
+class TestRepositoryRoutes(NodeTestCase):
+    """Tests the GUI endpoints listing the data path from the index"""
+
+    @classmethod
+    def setUpClass(cls) -> None:
+        super().setUpClass()
+
+        cls.app = Flask(__name__)
+        cls.app.config['SECRET_KEY'] = 'test'
+        cls.app.config['JWT_TOKEN_LOCATION'] = ['headers']
+        JWTManager(cls.app)
+        cls.app.register_blueprint(api)
+        cls.client = cls.app.test_client()
+
+        with cls.app.app_context():
+            cls.headers = {'Authorization': 'Bearer ' + create_access_token(identity='user')}
+
+    def setUp(self):
+        for i in range(5):
+            _write(os.path.join(DATA_PATH, 'folder', f'file_{i}.csv'), 100)
+        _write(os.path.join(DATA_PATH, 'folder', 'sub', 'file.csv'), 50)
+        indexer.data_index.sync(force=True)
+
+    def tearDown(self):
+        shutil.rmtree(os.path.join(DATA_PATH, 'folder'))
+        indexer.data_index.sync(force=True)
+
+    def _post(self, url: str, json: dict):
+        return self.client.post(url, json=json, headers=self.headers)
+
+    def test_repository_routes_01_list(self):
+        """Tests the paginated listing of a data path folder"""
+        res = self._post('/api/repository/list', {'path': ['folder'], 'offset': 0, 'limit': 4})
+        self.assertEqual(res.status_code, 200)
+        result = res.json['result']
+        self.assertEqual(result['number'], 6)
+        self.assertEqual(result['displays'], 4)
+        self.assertEqual([f['name'] for f in result['files']], ['file_0.csv', 'file_1.csv', 'file_2.csv',
+                                                                 'file_3.csv'])
+        self.assertEqual(result['files'][0]['path'], ['folder', 'file_0.csv'])
+        self.assertEqual(result['files'][0]['type'], 'file')
+
+        res = self._post('/api/repository/list', {'path': ['folder'], 'offset': 4, 'limit': 4})
+        result = res.json['result']
+        self.assertEqual(result['displays'], 2)
+        self.assertEqual(result['offset'], 4)
+        self.assertEqual([f['type'] for f in result['files']], ['file', 'dir'])
+
+        res = self._post('/api/repository/list', {'path': ['folder'], 'offset': 10})
+        self.assertEqual(res.json['result']['displays'], 0)
+        self.assertEqual(res.json['result']['files'], [])
+
+        # new file is listed after a refresh
+        _write(os.path.join(DATA_PATH, 'folder', 'file_5.csv'), 100)
+        res = self._post('/api/repository/list', {'path': ['folder'], 'refresh': True})
+        self.assertEqual(res.json['result']['number'], 7)
+
+        # bad page bounds
+        for page in ({'offset': -1}, {'limit': 0}, {'limit': 10001}):
+            res = self._post('/api/repository/list', {'path': ['folder'], **page})
+            self.assertEqual(res.status_code, 400)
+
+        res = self._post('/api/repository/list', {'path': ['unknown']})
+        self.assertFalse(res.json['success'])
+
+        res = self.client.post('/api/repository/list', json={'path': []})
+        self.assertEqual(res.status_code, 401)
+
+    def test_repository_routes_02_disk_usage(self):
+        """Tests the disk usage totals of the data path"""
+        res = self._post('/api/repository/disk-usage', {'path': ['folder']})
+        self.assertEqual(res.status_code, 200)
+        self.assertEqual(res.json['result']['size'], 550)
+        self.assertEqual(res.json['result']['path'], ['folder'])
+        self.assertIsNotNone(res.json['result']['display'])
+
+        res = self._post('/api/repository/disk-usage', {'path': ['folder', 'sub']})
+        self.assertEqual(res.json['result']['size'], 50)
+
+        res = self._post('/api/repository/disk-usage', {'path': ['folder', 'unknown']})
+        self.assertEqual(res.status_code, 400)
+        self.assertFalse(res.json['success'])
+
+
+if __name__ == '__main__':  # pragma: no cover
+    unittest.main()
@@ -0,0 +1,75 @@
+import json
+import os
+import subprocess
+import sys
+import textwrap
+import unittest
+
+
+TESTS_DIR = os.path.dirname(os.path.abspath(__file__))
+ROOT_DIR = os.path.dirname(TESTS_DIR)
+
+HEAVY_MODULES = ['torch', 'torchvision', 'opacus', 'sklearn', 'scipy', 'declearn', 'monai', 'flamby', 'gmpy2',
+                 'pandas', 'matplotlib']
+"""Frameworks that should only be imported to train or load data"""
+
+IMPORT_TIME_BUDGET = 3.
+"""Maximum import time in seconds of the modules, that importing torch and scikit-learn alone exceeds"""
+
+
+def _measure_import(module: str) -> dict:
+    """Imports a module in a new interpreter, with the fake environ of the tests.
+
+    Returns:
+        Import time in seconds `elapsed`, and the `heavy` modules that were imported
+    """
+    script = textwrap.dedent(f"""
+        import json, shutil, sys, time
+        import testsupport.fake_node_environ, testsupport.fake_researcher_environ
+        sys.modules['fedbiomed.node.environ'] = testsupport.fake_node_environ
+        sys.modules['fedbiomed.researcher.environ'] = testsupport.fake_researcher_environ
+
+        start = time.perf_counter()
+        import {module}
+        elapsed = time.perf_counter() - start
+
+        for env in (testsupport.fake_node_environ.environ, testsupport.fake_researcher_environ.environ):
+            shutil.rmtree(env['ROOT_DIR'], ignore_errors=True)
+        print(json.dumps({{'elapsed': elapsed, 'heavy': [m for m in {HEAVY_MODULES!r} if m in sys.modules]}}))
+    """)
+    env = dict(os.environ)
+    env['PYTHONPATH'] = os.pathsep.join([ROOT_DIR, TESTS_DIR, env.get('PYTHONPATH', '')])
+    result = subprocess.run([sys.executable, '-c', script], cwd=TESTS_DIR, env=env, capture_output=True,
+                            text=True, timeout=300)
+    if result.returncode != 0:
+        raise AssertionError(f"Cannot import {module}: {result.stderr}")
+    return json.loads(result.stdout.strip().splitlines()[-1])
+
+
+class TestImportTime(unittest.TestCase):
+    """Tests that the command line interfaces and light modules do not import the training frameworks"""
+
+    def _check_import(self, module: str):
+        measure = _measure_import(module)
+        self.assertListEqual(measure['heavy'], [], f"importing {module} imports {measure['heavy']}")
+        self.assertLess(measure['elapsed'], IMPORT_TIME_BUDGET,
+                        f"importing {module} takes {measure['elapsed']:.2f}s")
+
+    def test_import_time_01_node_cli(self):
+        """Tests importing the node command line interface, e.g. to list datasets"""
+        for module in ('fedbiomed.node.cli', 'fedbiomed.node.dataset_manager'):
+            self._check_import(module)
+
+    def test_import_time_02_researcher_cli(self):
+        """Tests importing the researcher command line interface"""
+        self._check_import('fedbiomed.researcher.cli')
+
+    def test_import_time_03_common(self):
+        """Tests importing the packages whose classes import the frameworks when they are used"""
+        for module in ('fedbiomed.common.data', 'fedbiomed.common.training_plans', 'fedbiomed.common.serializer',
+                       'fedbiomed.common.messaging', 'fedbiomed.common.metrics'):
+            self._check_import(module)
+
+
+if __name__ == '__main__':  # pragma: no cover
+    unittest.main()
@@ -0,0 +1,73 @@
+import time
+import unittest
+
+from fedbiomed.common.instrumentation import SpanRecorder, current_rss
+
+
+class TestSpanRecorder(unittest.TestCase):
+    """Tests the recording of spans"""
+
+    def test_span_recorder_01_spans(self):
+        """Tests recording and accumulating spans"""
+        recorder = SpanRecorder()
+        self.assertDictEqual(recorder.spans(), {})
+
+        with recorder.span('download'):
+            time.sleep(0.01)
+            recorder.add_bytes('download', 100)
+        with recorder.span('training'):
+            sum(i * i for i in range(10000))
+        with recorder.span('download'):
+            recorder.add_bytes('download', 50)
+
+        spans = recorder.spans()
+        self.assertListEqual(list(spans), ['download', 'training'])
+        self.assertGreaterEqual(spans['download']['wall_time'], 0.01)
+        self.assertEqual(spans['download']['bytes'], 150)
+        self.assertEqual(spans['training']['bytes'], 0)
+        self.assertGreater(spans['training']['cpu_time'], 0.)
+        self.assertIsInstance(spans['training']['peak_rss'], int)
+
+        # returned spans are copies
+        spans['download']['bytes'] = 0
+        self.assertEqual(recorder.spans()['download']['bytes'], 150)
+
+    def test_span_recorder_02_exception(self):
+        """Tests recording a span whose block raises an exception"""
+        recorder = SpanRecorder()
+        with self.assertRaises(ValueError):
+            with recorder.span('upload'):
+                raise ValueError('upload failed')
+        self.assertIn('upload', recorder.spans())
+
+    def test_span_recorder_03_peak_rss(self):
+        """Tests measuring the peak resident set size of each span"""
+        rss = current_rss()
+        self.assertIsInstance(rss, int)
+        self.assertGreater(rss, 1024 * 1024)
+
+        size = 64 * 1024 * 1024
+        recorder = SpanRecorder()
+        with recorder.span('allocation'):
+            data = b'\x01' * size
+            time.sleep(0.05)
+            del data
+        with recorder.span('idle'):
+            time.sleep(0.05)
+
+        # peak of a later span does not include the memory freed by previous spans
+        spans = recorder.spans()
+        self.assertGreater(spans['allocation']['peak_rss'], spans['idle']['peak_rss'] + size // 2)
+
+        # nested spans have their own peak
+        with recorder.span('outer'):
+            with recorder.span('inner'):
+                time.sleep(0.02)
+            data = b'\x01' * size
+            time.sleep(0.05)
+            del data
+        spans = recorder.spans()
+        self.assertGreater(spans['outer']['peak_rss'], spans['inner']['peak_rss'] + size // 2)
+
+if __name__ == '__main__':  # pragma: no cover
+    unittest.main()
@@ -0,0 +1,291 @@
+import multiprocessing
+import os
+import shutil
+import tempfile
+import threading
+import time
+import unittest
+from unittest.mock import MagicMock, patch
+
+import torch
+
+#############################################################
+# Import ResearcherTestCase before importing any FedBioMed Module
+from testsupport.base_case import ResearcherTestCase
+from testsupport.fake_broker import FakeBroker, FakeRepository
+#############################################################
+
+from fedbiomed.common.constants import ComponentType, ErrorNumbers
+from fedbiomed.common.exceptions import FedbiomedAggregatorError
+from fedbiomed.common.message import NodeMessages, ResearcherMessages
+from fedbiomed.common.serializer import Serializer
+from fedbiomed.researcher.aggregators import FedAverage
+from fedbiomed.researcher.intermediate_aggregator import IntermediateAggregator
+from fedbiomed.researcher.round_deadline import RoundDeadline
+
+
+def node_params(value: float):
+    return {'w': torch.full((3,), value), 'b': torch.tensor([value])}
+
+
+def train_reply(node_id, params_url='', success=True, sample_size=None, round_=0, job_id='job'):
+    return NodeMessages.format_outgoing_message({
+        'node_id': node_id, 'job_id': job_id, 'researcher_id': 'researcher', 'command': 'train',
+        'success': success, 'dataset_id': f'dataset-{node_id}', 'params_url': params_url, 'msg': '',
+        'sample_size': sample_size, 'timing': {'rtime_training': 1.}, 'round': round_}).get_dict()
+
+
+def train_request(node_id, round_=0, training=True, secagg_servkey_id=None):
+    return ResearcherMessages.format_outgoing_message({
+        'researcher_id': 'researcher', 'job_id': 'job', 'params_url': 'url', 'training_args': {},
+        'dataset_id': f'dataset-{node_id}', 'training': training, 'model_args': {},
+        'training_plan_url': 'url', 'training_plan_class': 'TrainingPlan', 'command': 'train',
+        'secagg_servkey_id': secagg_servkey_id, 'secagg_biprime_id': None, 'secagg_random': None,
+        'secagg_clipping_range': None, 'round': round_, 'aggregator_args': {}}).get_dict()
+
+
+def upload_params(repository, tmp_dir, params, partial_sum=False):
+    filename = os.path.join(tmp_dir, 'params.mpk')
+    Serializer.dump({'model_weights': params, 'partial_sum': partial_sum, 'optimizer_args': {}}, filename)
+    return repository.upload_file(filename)['file']
+
+
+def run_fake_node(broker, node_id, value, sample_size, repository_dir):
+    """Fake node process: replies to one training request with a constant model"""
+    tmp_dir = tempfile.mkdtemp(dir=repository_dir)
+    received = broker.receive(node_id)
+    if received is None:
+        return
+    _, request = received
+    if value is None:
+        reply = train_reply(node_id, success=False, round_=request['round'], job_id=request['job_id'])
+    else:
+        repository = FakeRepository(repository_dir, tmp_dir)
+        url = upload_params(repository, tmp_dir, node_params(value))
+        reply = train_reply(node_id, url, sample_size=sample_size, round_=request['round'],
+                            job_id=request['job_id'])
+    broker.publish('general/researcher', reply)
+
+
+def run_intermediate_aggregator(broker, aggregator, name):
+    """Intermediate aggregator process: relays messages until it replies to the researcher"""
+    while True:
+        received = broker.receive(name)
+        if received is None:
+            return
+        topic, msg = received
+        outgoing = aggregator.on_request(msg) if topic == f'general/{aggregator.id}' else aggregator.on_reply(msg)
+        for out_msg, node_id in outgoing:
+            broker.publish('general/researcher' if node_id is None else f'general/{node_id}', out_msg)
+            if node_id is None:
+                return
+
+
+class TestIntermediateAggregator(ResearcherTestCase):
+    """Tests the intermediate aggregators of hierarchical aggregation"""
+
+    def setUp(self):
+        self.repository_dir = tempfile.mkdtemp()
+        self.tmp_dir = tempfile.mkdtemp()
+        self.repository = FakeRepository(self.repository_dir, self.tmp_dir)
+
+    def tearDown(self):
+        shutil.rmtree(self.repository_dir)
+        shutil.rmtree(self.tmp_dir)
+
+    def test_intermediate_aggregator_01_requests(self):
+        """Tests relaying training requests to the nodes"""
+        with self.assertRaises(FedbiomedAggregatorError):
+            IntermediateAggregator('agg-1', 'dataset-agg-1', {}, self.repository, self.tmp_dir)
+
+        aggregator = IntermediateAggregator('agg-1', 'dataset-agg-1', {'node-1': 'dataset-1', 'node-2': 'dataset-2'},
+                                            self.repository, self.tmp_dir)
+        self.assertListEqual(aggregator.on_request({'command': 'ping'}), [])
+
+        requests = aggregator.on_request(train_request('agg-1'))
+        self.assertListEqual([node_id for _, node_id in requests], ['node-1', 'node-2'])
+        self.assertListEqual([request['dataset_id'] for request, _ in requests], ['dataset-1', 'dataset-2'])
+
+        # secure aggregation is refused
+        (reply, node_id), = aggregator.on_request(train_request('agg-1', secagg_servkey_id='servkey'))
+        self.assertIsNone(node_id)
+        self.assertFalse(reply['success'])
+
+    def test_intermediate_aggregator_02_partial_sums(self):
+        """Tests the partial sum of nested intermediate aggregators, with a failing node"""
+        aggregator = IntermediateAggregator('agg-1', 'dataset-agg-1',
+                                            {'node-1': 'dataset-1', 'agg-2': 'dataset-agg-2', 'node-3': 'dataset-3'},
+                                            self.repository, self.tmp_dir)
+        aggregator.on_request(train_request('agg-1', round_=1))
+
+        url = upload_params(self.repository, self.tmp_dir, node_params(1.))
+        # replies to another round or job are ignored
+        self.assertListEqual(aggregator.on_reply(train_reply('node-1', url, sample_size=10, round_=0)), [])
+        self.assertListEqual(aggregator.on_reply(train_reply('node-1', url, sample_size=10, round_=1,
+                                                             job_id='other')), [])
+        self.assertListEqual(aggregator.on_reply(train_reply('node-1', url, sample_size=10, round_=1)), [])
+
+        # partial sum of a nested intermediate aggregator is added without weighting
+        url = upload_params(self.repository, self.tmp_dir, node_params(60.), partial_sum=True)
+        self.assertListEqual(aggregator.on_reply(train_reply('agg-2', url, sample_size=30, round_=1)), [])
+
+        error = {'command': 'error', 'node_id': 'node-3', 'researcher_id': 'researcher',
+                 'errnum': ErrorNumbers.FB300, 'extra_msg': 'error', 'protocol_version': '2'}
+        (reply, node_id), = aggregator.on_reply(error)
+        self.assertIsNone(node_id)
+        self.assertTrue(reply['success'])
+        self.assertEqual(reply['node_id'], 'agg-1')
+        self.assertEqual(reply['sample_size'], 40)
+        self.assertEqual(reply['round'], 1)
+
+        results = Serializer.load(reply['params_url'])
+        self.assertTrue(results['partial_sum'])
+        self.assertListEqual(results['node_ids'], ['node-1', 'agg-2'])
+        self.assertTrue(torch.allclose(results['model_weights']['w'], torch.full((3,), 70.)))
+
+    @unittest.skipUnless('fork' in multiprocessing.get_all_start_methods(), 'needs the fork start method')
+    def test_intermediate_aggregator_03_processes(self):
+        """Tests a tree of intermediate aggregators and nodes running in separate processes"""
+        context = multiprocessing.get_context('fork')
+        nodes = {'node-1': (1., 10), 'node-2': (2., 30), 'node-3': (5., 20), 'node-4': (None, None)}
+        trees = {'agg-1': ['node-1', 'node-2'], 'agg-2': ['node-3', 'node-4']}
+        subscriptions = {node_id: [f'general/{node_id}'] for node_id in nodes}
+        subscriptions.update({agg_id: [f'general/{agg_id}', 'general/researcher'] for agg_id in trees})
+        subscriptions['researcher'] = ['general/researcher']
+        broker = FakeBroker(subscriptions, context)
+
+        processes = [context.Process(target=run_fake_node, args=(broker, node_id, value, size, self.repository_dir))
+                     for node_id, (value, size) in nodes.items()]
+        for agg_id, node_ids in trees.items():
+            aggregator = IntermediateAggregator(agg_id, f'dataset-{agg_id}',
+                                                {node_id: f'dataset-{node_id}' for node_id in node_ids},
+                                                FakeRepository(self.repository_dir, tempfile.mkdtemp(dir=self.tmp_dir)),
+                                                self.tmp_dir)
+            processes.append(context.Process(target=run_intermediate_aggregator, args=(broker, aggregator, agg_id)))
+        for process in processes:
+            process.start()
+
+        for agg_id in trees:
+            broker.publish(f'general/{agg_id}', train_request(agg_id))
+        replies = {}
+        while len(replies) < len(trees):
+            _, msg = broker.receive('researcher')
+            if msg['node_id'] in trees:
+                replies[msg['node_id']] = ResearcherMessages.format_incoming_message(msg).get_dict()
+        for process in processes:
+            process.join(timeout=10)
+            self.assertEqual(process.exitcode, 0)
+
+        self.assertDictEqual({agg_id: reply['sample_size'] for agg_id, reply in replies.items()},
+                             {'agg-1': 40, 'agg-2': 20})
+        self.assertIn('failed nodes', replies['agg-2']['msg'])
+
+        # researcher combines the partial sums, as the average of all the nodes that succeeded
+        model_params = {agg_id: {key: value / reply['sample_size']
+                                 for key, value in Serializer.load(reply['params_url'])['model_weights'].items()}
+                        for agg_id, reply in replies.items()}
+        weights = {agg_id: reply['sample_size'] / 60 for agg_id, reply in replies.items()}
+        aggregated = FedAverage().aggregate(model_params, weights)
+        expected = (1. * 10 + 2. * 30 + 5. * 20) / 60
+        self.assertTrue(torch.allclose(aggregated['w'], torch.full((3,), expected)))
+        self.assertTrue(torch.allclose(aggregated['b'], torch.tensor([expected])))
+
+    def test_intermediate_aggregator_04_deadline(self):
+        """Tests closing a request when its deadline is reached, and rejecting replies without samples"""
+        nodes = {'node-1': 'dataset-1', 'node-2': 'dataset-2', 'node-3': 'dataset-3'}
+        url = upload_params(self.repository, self.tmp_dir, node_params(1.))
+
+        # without deadline, the aggregator waits for all the nodes
+        aggregator = IntermediateAggregator('agg-1', 'dataset-agg-1', nodes, self.repository, self.tmp_dir)
+        aggregator.on_request(train_request('agg-1'))
+        self.assertListEqual(aggregator.on_reply(train_reply('node-1', url, sample_size=10)), [])
+        self.assertListEqual(aggregator.check_deadlines(), [])
+
+        # timeout: nodes that did not reply are left out
+        aggregator = IntermediateAggregator('agg-1', 'dataset-agg-1', nodes, self.repository, self.tmp_dir,
+                                            deadline=RoundDeadline(timeout=0.1))
+        aggregator.on_request(train_request('agg-1'))
+        # a reply without samples cannot be averaged by the researcher
+        self.assertListEqual(aggregator.on_reply(train_reply('node-1', url, sample_size=0)), [])
+        self.assertListEqual(aggregator.on_reply(train_reply('node-2', url, sample_size=10)), [])
+        self.assertListEqual(aggregator.check_deadlines(), [])
+        time.sleep(0.15)
+        (reply, node_id), = aggregator.check_deadlines()
+        self.assertIsNone(node_id)
+        self.assertTrue(reply['success'])
+        self.assertEqual(reply['sample_size'], 10)
+        self.assertIn("failed nodes ['node-1']", reply['msg'])
+        self.assertIn("late nodes ['node-3']", reply['msg'])
+        # late reply is ignored
+        self.assertListEqual(aggregator.on_reply(train_reply('node-3', url, sample_size=10)), [])
+        self.assertListEqual(aggregator.check_deadlines(), [])
+
+        # no node replied before the deadline
+        aggregator.on_request(train_request('agg-1'))
+        time.sleep(0.15)
+        (reply, _), = aggregator.check_deadlines()
+        self.assertFalse(reply['success'])
+
+        # quorum: closed by the reply of the second node
+        aggregator = IntermediateAggregator('agg-1', 'dataset-agg-1', nodes, self.repository, self.tmp_dir,
+                                            deadline=RoundDeadline(quorum=0.5))
+        aggregator.on_request(train_request('agg-1'))
+        self.assertListEqual(aggregator.on_reply(train_reply('node-1', url, sample_size=10)), [])
+        (reply, _), = aggregator.on_reply(train_reply('node-2', url, sample_size=30))
+        self.assertEqual(reply['sample_size'], 40)
+
+    @patch('fedbiomed.researcher.intermediate_aggregator.Messaging')
+    def test_intermediate_aggregator_05_start(self, messaging_patch):
+        """Tests relaying the messages received from the message broker"""
+        messaging = {}
+
+        def create_messaging(on_message, component_type, component_id, *args):
+            messaging[component_type] = MagicMock(on_message=on_message, component_id=component_id)
+            return messaging[component_type]
+        messaging_patch.side_effect = create_messaging
+
+        aggregator = IntermediateAggregator('agg-1', 'dataset-agg-1', {'node-1': 'dataset-1', 'node-2': 'dataset-2'},
+                                            self.repository, self.tmp_dir)
+        thread = threading.Thread(target=aggregator.start, args=('broker', 1234), daemon=True)
+        thread.start()
+
+        def wait_for(condition):
+            deadline = time.monotonic() + 10
+            while not condition() and time.monotonic() < deadline:
+                time.sleep(0.01)
+            self.assertTrue(condition())
+
+        # seen as a node by the researcher, and as a researcher by the nodes
+        wait_for(lambda: len(messaging) == 2)
+        to_researcher, to_nodes = messaging[ComponentType.NODE], messaging[ComponentType.RESEARCHER]
+        self.assertEqual(to_researcher.component_id, 'agg-1')
+        self.assertEqual(to_nodes.component_id, 'agg-1_nodes')
+        for instance in (to_researcher, to_nodes):
+            instance.start.assert_called_once()
+        messaging_patch.assert_any_call(to_researcher.on_message, ComponentType.NODE, 'agg-1', 'broker', 1234)
+
+        # training request is forwarded to the nodes
+        to_researcher.on_message(train_request('agg-1'), 'general/agg-1')
+        wait_for(lambda: to_nodes.send_message.call_count == 2)
+        self.assertListEqual(sorted(call.kwargs['client'] for call in to_nodes.send_message.call_args_list),
+                             ['node-1', 'node-2'])
+
+        # replies of the nodes are aggregated, messages of other topics are ignored
+        url = upload_params(self.repository, self.tmp_dir, node_params(1.))
+        to_nodes.on_message(train_reply('node-1', url, sample_size=10), 'general/monitoring')
+        to_nodes.on_message(train_reply('node-1', url, sample_size=10), 'general/researcher')
+        to_nodes.on_message(train_reply('node-2', url, sample_size=30), 'general/researcher')
+        wait_for(lambda: to_researcher.send_message.call_count == 1)
+        reply = to_researcher.send_message.call_args.args[0]
+        self.assertTrue(reply['success'])
+        self.assertEqual(reply['sample_size'], 40)
+
+        aggregator.stop()
+        thread.join(timeout=10)
+        self.assertFalse(thread.is_alive())
+        for instance in (to_researcher, to_nodes):
+            instance.stop.assert_called_once()
+
+
+if __name__ == '__main__':  # pragma: no cover
+    unittest.main()
@@ -26,6 +26,7 @@ from fedbiomed.researcher.environ import environ
 from fedbiomed.researcher.job import Job
 from fedbiomed.researcher.requests import Requests
 from fedbiomed.researcher.responses import Responses
+from fedbiomed.researcher.round_deadline import RoundDeadline
 
 
 
@@ -856,6 +857,113 @@ class TestJob(ResearcherTestCase):
                     self.assertEqual(t_a[node_id][var]['filename'], filename)
                     self.assertEqual(t_a[node_id][var]['url'], self.job.repo.uploads_url)
 
+    @patch('fedbiomed.common.serializer.Serializer.load')
+    @patch('fedbiomed.researcher.requests.Requests.send_message')
+    @patch('fedbiomed.researcher.requests.Requests.get_responses')
+    def test_job_21_start_training_round_with_deadline(self,
+                                                       mock_requests_get_responses,
+                                                       mock_requests_send_message,
+                                                       serialize_load_patch):
+        """Tests that a round is closed at its deadline, and that replies of previous rounds are discarded"""
+        self.job._nodes = ['node-1', 'node-2', 'node-3']
+        self.fds.data = MagicMock(return_value={node: {'dataset_id': node} for node in self.job._nodes})
+
+        def reply(node_id, round_):
+            return {'node_id': node_id, 'researcher_id': environ['RESEARCHER_ID'],
+                    'job_id': self.job._id, 'params_url': 'http://test.test',
+                    'timing': {}, 'success': True, 'msg': 'MSG', 'dataset_id': node_id,
+                    'command': 'train', 'sample_size': 100, 'round': round_}
+
+        # node-2 replies late to the request of the previous round
+        mock_requests_get_responses.return_value = FakeResponses([reply('node-1', 4), reply('node-2', 3)])
+        nodes = self.job.start_nodes_training_round(4, aggregator_args_thr_msg={}, aggregator_args_thr_files={},
+                                                    deadline=RoundDeadline(quorum=0.3))
+
+        self.assertListEqual(nodes, ['node-1'])
+        self.assertDictEqual(self.job.late_nodes, {4: ['node-2', 'node-3']})
+        self.assertListEqual([r['node_id'] for r in self.job.training_replies[4]], ['node-1'])
+        self.assertEqual(mock_requests_send_message.call_count, 3)
+        self.assertFalse(mock_requests_get_responses.call_args.kwargs['while_responses'])
+
+        # without replies, the round is closed when the timeout expires
+        self.job._nodes = ['node-1', 'node-2']
+        mock_requests_get_responses.return_value = FakeResponses([])
+        nodes = self.job.start_nodes_training_round(5, aggregator_args_thr_msg={}, aggregator_args_thr_files={},
+                                                    deadline=RoundDeadline(timeout=1e-6))
+        self.assertListEqual(nodes, [])
+        self.assertListEqual(self.job.late_nodes[5], ['node-1', 'node-2'])
+
+    @patch('fedbiomed.common.serializer.Serializer.load')
+    @patch('fedbiomed.researcher.requests.Requests.send_message')
+    @patch('fedbiomed.researcher.requests.Requests.get_responses')
+    def test_job_22_asynchronous_training_requests(self,
+                                                   mock_requests_get_responses,
+                                                   mock_requests_send_message,
+                                                   serialize_load_patch):
+        """Tests dispatching training requests and receiving their replies without a barrier"""
+        self.fds.data = MagicMock(return_value={node: {'dataset_id': node} for node in ('node-1', 'node-2')})
+
+        self.job.dispatch_training(['node-1', 'node-2'], 0, {}, {})
+        self.assertEqual(mock_requests_send_message.call_count, 2)
+        self.assertDictEqual(self.job.in_flight, {'node-1': 0, 'node-2': 0})
+
+        reply = {'node_id': 'node-1', 'researcher_id': environ['RESEARCHER_ID'],
+                 'job_id': self.job._id, 'params_url': 'http://test.test',
+                 'timing': {}, 'success': True, 'msg': 'MSG', 'dataset_id': 'node-1',
+                 'command': 'train', 'sample_size': 100, 'round': 0}
+        mock_requests_get_responses.return_value = FakeResponses([reply])
+        replies = self.job.receive_training_replies()
+        self.assertEqual([(round_, r['node_id']) for round_, r in replies], [(0, 'node-1')])
+        self.assertDictEqual(self.job.in_flight, {'node-2': 0})
+        self.assertFalse(mock_requests_get_responses.call_args.kwargs['while_responses'])
+
+        # node-1 is re-dispatched, while node-2 fails
+        self.job.dispatch_training(['node-1'], 1, {}, {})
+        error = {'node_id': 'node-2', 'researcher_id': environ['RESEARCHER_ID'], 'errnum': ErrorNumbers.FB100,
+                 'extra_msg': 'error', 'command': 'error'}
+        mock_requests_get_responses.return_value = FakeResponses([error, reply])
+        self.assertListEqual(self.job.receive_training_replies(), [])
+        self.assertDictEqual(self.job.in_flight, {'node-1': 1})
+
+        self.job.cancel_in_flight()
+        self.assertDictEqual(self.job.in_flight, {})
+
+    @patch('fedbiomed.researcher.requests.Requests.send_message')
+    def test_job_23_node_training_args(self, mock_requests_send_message):
+        """Tests overriding the training arguments of some nodes"""
+        self.fds.data = MagicMock(return_value={node: {'dataset_id': node} for node in ('node-1', 'node-2')})
+        sent = {}
+        mock_requests_send_message.side_effect = lambda msg, node: sent.update({node: dict(msg['training_args'])})
+
+        self.job._send_training_requests(['node-1', 'node-2'], 0, {}, {},
+                                         node_training_args={'node-2': {'num_updates': 7}})
+        self.assertDictEqual(sent['node-1'], self.job.training_args)
+        self.assertDictEqual(sent['node-2'], {**self.job.training_args, 'num_updates': 7})
+
+    @patch('fedbiomed.common.serializer.Serializer.load')
+    def test_job_24_partial_sum_reply(self, serialize_load_patch):
+        """Tests that the partial sum of an intermediate aggregator is turned into the average of its nodes"""
+        reply = {'node_id': 'agg-1', 'researcher_id': environ['RESEARCHER_ID'], 'job_id': self.job._id,
+                 'params_url': 'http://test.test', 'timing': {}, 'success': True, 'msg': '',
+                 'dataset_id': 'agg-1', 'command': 'train', 'sample_size': 40, 'round': 0}
+
+        serialize_load_patch.return_value = {'model_weights': {'w': torch.full((2,), 80.)}, 'partial_sum': True}
+        result = self.job._process_training_reply(reply, 0, ['agg-1'], {'agg-1': 0.})
+        self.assertTrue(torch.equal(result['params']['w'], torch.full((2,), 2.)))
+
+        serialize_load_patch.return_value = {'model_weights': {'w': torch.full((2,), 80.)}}
+        result = self.job._process_training_reply(reply, 0, ['agg-1'], {'agg-1': 0.})
+        self.assertTrue(torch.equal(result['params']['w'], torch.full((2,), 80.)))
+
+        # partial sum of no sample is rejected
+        serialize_load_patch.return_value = {'model_weights': {'w': torch.zeros(2)}, 'partial_sum': True}
+        for sample_size in (0, None):
+            nodes = ['agg-1']
+            result = self.job._process_training_reply({**reply, 'sample_size': sample_size}, 0, nodes,
+                                                      {'agg-1': 0.})
+            self.assertIsNone(result)
+            self.assertListEqual(nodes, [])
+
 
 if __name__ == '__main__':  # pragma: no cover
     unittest.main()
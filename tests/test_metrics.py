@@ -2,7 +2,10 @@ import unittest
 import numpy as np
 from unittest.mock import patch
 
-from fedbiomed.common.metrics import Metrics, MetricTypes, _MetricCategory # noqa
+from sklearn import metrics
+
+from fedbiomed.common.metrics import Metrics, MetricTypes, _MetricCategory, MetricAccumulator, \
+    ConfusionMatrixAccumulator, MomentsAccumulator, ConcatenatingAccumulator  # noqa
 from fedbiomed.common.exceptions import FedbiomedMetricError
 
 
@@ -373,13 +376,13 @@ class TestMetrics(unittest.TestCase):
         with self.assertRaises(FedbiomedMetricError):
             result = self.metrics.evaluate(y_true, y_pred, metric=MetricTypes.ACCURACY)
 
-    @patch('fedbiomed.common.metrics.metrics.accuracy_score')
-    @patch('fedbiomed.common.metrics.metrics.precision_score')
-    @patch('fedbiomed.common.metrics.metrics.recall_score')
-    @patch('fedbiomed.common.metrics.metrics.f1_score')
-    @patch('fedbiomed.common.metrics.metrics.mean_squared_error')
-    @patch('fedbiomed.common.metrics.metrics.mean_absolute_error')
-    @patch('fedbiomed.common.metrics.metrics.explained_variance_score')
+    @patch('sklearn.metrics.accuracy_score')
+    @patch('sklearn.metrics.precision_score')
+    @patch('sklearn.metrics.recall_score')
+    @patch('sklearn.metrics.f1_score')
+    @patch('sklearn.metrics.mean_squared_error')
+    @patch('sklearn.metrics.mean_absolute_error')
+    @patch('sklearn.metrics.explained_variance_score')
     def test_metrics_17_try_expect_blocks_of_eval_functions(self,
                                                             patch_exp_variance,
                                                             patch_mean_abs,
@@ -420,6 +423,111 @@ class TestMetrics(unittest.TestCase):
         with self.assertRaises(FedbiomedMetricError):
             self.metrics.mse(y_true, y_pred)
 
+    def _accumulate(self, metric, y_true, y_pred, batch_size, **kwargs):
+        accumulator = MetricAccumulator.create(metric, **kwargs)
+        for start in range(0, len(y_true), batch_size):
+            accumulator.update(y_true[start:start + batch_size], y_pred[start:start + batch_size])
+        return accumulator
+
+    def test_metrics_18_accumulators_classification(self):
+        """Testing that accumulated classification metrics equal metrics on the whole dataset"""
+        rng = np.random.default_rng(0)
+        for n_classes in (2, 4):
+            y_true = rng.integers(0, n_classes, 103)
+            probs = rng.random((103, n_classes))
+            y_pred = np.argmax(probs, axis=1)
+
+            for metric in (MetricTypes.ACCURACY, MetricTypes.PRECISION, MetricTypes.RECALL, MetricTypes.F1_SCORE):
+                expected = self.metrics.evaluate(y_true, y_pred, metric=metric)
+                # batches smaller than the number of classes, including a last batch of size 1
+                for batch_size in (3, 17, 103):
+                    accumulator = self._accumulate(metric, y_true, probs, batch_size)
+                    self.assertIsInstance(accumulator, ConfusionMatrixAccumulator)
+                    self.assertEqual(accumulator.num_samples, 103)
+                    self.assertAlmostEqual(accumulator.result(), expected, msg=f'{metric.name} {batch_size}')
+
+            for average in ('macro', 'micro'):
+                self.assertAlmostEqual(
+                    self._accumulate(MetricTypes.F1_SCORE, y_true, y_pred, 10, average=average).result(),
+                    self.metrics.evaluate(y_true, y_pred, metric=MetricTypes.F1_SCORE, average=average))
+
+        # binary probabilities, string and one-hot labels
+        y_true = np.array([0, 1, 1, 0, 1, 1, 0])
+        y_prob = np.array([0.2, 0.8, 0.4, 0.6, 0.9, 0.7, 0.1])
+        self.assertAlmostEqual(self._accumulate(MetricTypes.RECALL, y_true, y_prob, 2).result(),
+                               self.metrics.evaluate(y_true, y_prob, metric=MetricTypes.RECALL))
+        self.assertAlmostEqual(
+            self._accumulate(MetricTypes.PRECISION, y_true, y_prob, 2, pos_label=1).result(),
+            self.metrics.evaluate(y_true, y_prob, metric=MetricTypes.PRECISION, pos_label=1))
+
+        y_true = np.array(['b', 'a', 'c', 'c', 'a'])
+        y_pred = np.array(['b', 'a', 'a', 'c', 'b'])
+        accumulator = self._accumulate(MetricTypes.F1_SCORE, y_true, y_pred, 2)
+        self.assertAlmostEqual(accumulator.result(),
+                               self.metrics.evaluate(y_true, y_pred, metric=MetricTypes.F1_SCORE))
+        labels, matrix = accumulator.confusion_matrix
+        self.assertListEqual(labels, ['a', 'b', 'c'])
+        self.assertListEqual(matrix.tolist(), [[1, 1, 0], [0, 1, 0], [1, 0, 1]])
+
+        y_true = np.array([[1, 0], [0, 1], [0, 1]])
+        y_pred = np.array([[0.7, 0.3], [0.2, 0.8], [0.9, 0.1]])
+        self.assertAlmostEqual(self._accumulate(MetricTypes.ACCURACY, y_true, y_pred, 1).result(), 2 / 3)
+
+    def test_metrics_19_accumulators_regression(self):
+        """Testing that accumulated regression metrics equal metrics on the whole dataset"""
+        rng = np.random.default_rng(1)
+        for y_true in (rng.normal(1e4, 1, 101), rng.normal(0, 3, (101, 3))):
+            y_pred = y_true + rng.normal(0.5, 1, y_true.shape)
+
+            multioutput = 'raw_values' if y_true.ndim == 2 else 'uniform_average'
+            for metric, func in ((MetricTypes.MEAN_SQUARE_ERROR, metrics.mean_squared_error),
+                                 (MetricTypes.MEAN_ABSOLUTE_ERROR, metrics.mean_absolute_error),
+                                 (MetricTypes.EXPLAINED_VARIANCE, metrics.explained_variance_score)):
+                expected = func(y_true, y_pred, multioutput=multioutput)
+                for batch_size in (1, 10, 101):
+                    accumulator = self._accumulate(metric, y_true, y_pred, batch_size)
+                    self.assertIsInstance(accumulator, MomentsAccumulator)
+                    np.testing.assert_allclose(accumulator.result(), expected, rtol=1e-7)
+
+        y_pred = y_true + 1
+        self.assertAlmostEqual(
+            self._accumulate(MetricTypes.MEAN_SQUARE_ERROR, y_true, y_pred, 7, multioutput='uniform_average').result(),
+            1.)
+        # constant true values
+        self.assertEqual(
+            self._accumulate(MetricTypes.EXPLAINED_VARIANCE, np.ones(5), np.ones(5), 2).result(), 1.)
+
+    def test_metrics_20_accumulators_fallback_and_errors(self):
+        """Testing accumulators of unsupported arguments, and errors"""
+        y_true = np.array([0, 1, 1, 0, 1])
+        y_pred = np.array([0, 1, 0, 0, 1])
+        weights = {'sample_weight': [1, 2, 1, 1, 1]}
+        accumulator = MetricAccumulator.create(MetricTypes.ACCURACY, **weights)
+        self.assertIsInstance(accumulator, ConcatenatingAccumulator)
+        accumulator.update(y_true[:2], y_pred[:2])
+        accumulator.update(y_true[2:], y_pred[2:])
+        self.assertAlmostEqual(accumulator.result(),
+                               self.metrics.evaluate(y_true, y_pred, metric=MetricTypes.ACCURACY, **weights))
+
+        with self.assertRaises(FedbiomedMetricError):
+            MetricAccumulator.create('ACCURACY')
+
+        accumulator = MetricAccumulator.create(MetricTypes.ACCURACY)
+        with self.assertRaises(FedbiomedMetricError):
+            accumulator.result()
+        with self.assertRaises(FedbiomedMetricError):
+            accumulator.update('toto', [1, 2])
+        with self.assertRaises(FedbiomedMetricError):
+            accumulator.update([1, 2, 3], [1, 2])
+        with self.assertRaises(FedbiomedMetricError):
+            accumulator.update(['a', 'b'], [1, 2])
+
+        accumulator = MetricAccumulator.create(MetricTypes.MEAN_SQUARE_ERROR)
+        with self.assertRaises(FedbiomedMetricError):
+            accumulator.update(['a', 'b'], ['a', 'b'])
+        with self.assertRaises(FedbiomedMetricError):
+            accumulator.update(np.ones((2, 2)), np.ones((2, 3)))
+
 
 class TestMetricTypes(unittest.TestCase):
     """ Testing Enum Class MetricTypes """
@@ -218,6 +218,35 @@ class TestMonitor(ResearcherTestCase):
         self.monitor.close_writer()
         mock_close.assert_called_once()
 
+    @patch('fedbiomed.researcher.monitor.Monitor._summary_writer')
+    def test_monitor_08_spans(self, mock_summary_writer):
+        """ Testing storing the spans of training replies """
+        spans = {'download': {'wall_time': 2., 'cpu_time': .5, 'peak_rss': 1000, 'bytes': 300},
+                 'training': {'wall_time': 1., 'cpu_time': 1., 'peak_rss': None, 'bytes': 0}}
+
+        self.monitor.set_round(2)
+        self.monitor.add_spans([{'node_id': 'node-1', 'spans': spans},
+                                {'node_id': 'node-2', 'spans': {}},
+                                {'node_id': 'node-3'}])
+        self.assertDictEqual(self.monitor.spans(), {'node-1': {2: spans}})
+        mock_summary_writer.assert_not_called()
+
+        table = self.monitor.spans_table()
+        self.assertListEqual(list(table.columns),
+                             ['node_id', 'round', 'span', 'wall_time', 'cpu_time', 'peak_rss', 'bytes'])
+        self.assertListEqual(table['span'].tolist(), ['download', 'training'])
+        self.assertListEqual(table['round'].tolist(), [2, 2])
+
+        # spans are written into tensorboard, without unknown measures
+        self.monitor.set_tensorboard(True)
+        self.monitor.set_round(3)
+        self.monitor.add_spans([{'node_id': 'node-1', 'spans': spans}])
+        self.assertEqual(len(self.monitor.spans()['node-1']), 2)
+        mock_summary_writer.assert_any_call(header='SPANS/download', node='node-1',
+                                            metric=spans['download'], cum_iter=3)
+        mock_summary_writer.assert_any_call(header='SPANS/training', node='node-1',
+                                            metric={'wall_time': 1., 'cpu_time': 1., 'bytes': 0}, cum_iter=3)
+
 
 class TestMetricStore(unittest.TestCase):
 
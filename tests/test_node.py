@@ -470,7 +470,8 @@ class TestNode(NodeTestCase):
                                        unittest.mock.ANY,  # this is for HistoryMonitor
                                        None,
                                        None, round_number=0,
-                                       dlp_and_loading_block_metadata=None)
+                                       dlp_and_loading_block_metadata=None,
+                                       warm_cache=self.n1.warm_cache)
 
         # check if object `HistoryMonitor` has been called
         history_monitor_patch.assert_called_once()
@@ -583,7 +584,8 @@ class TestNode(NodeTestCase):
                                             unittest.mock.ANY,  # FIXME: should be an history monitor object
                                             None,
                                             None, round_number=1,
-                                            dlp_and_loading_block_metadata=None
+                                            dlp_and_loading_block_metadata=None,
+                                            warm_cache=self.n1.warm_cache
                                             )
 
     @patch('fedbiomed.node.round.Round.__init__')
@@ -638,7 +640,8 @@ class TestNode(NodeTestCase):
                                             dict_msg_1_dataset['researcher_id'],
                                             unittest.mock.ANY,  # FIXME: should be an history_monitor object
                                             None, None, round_number=1,
-                                            dlp_and_loading_block_metadata=None)
+                                            dlp_and_loading_block_metadata=None,
+                                            warm_cache=self.n1.warm_cache)
 
     @patch('fedbiomed.node.history_monitor.HistoryMonitor.__init__')
     @patch('fedbiomed.common.message.NodeMessages.format_incoming_message')
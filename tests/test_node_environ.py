@@ -1,5 +1,3 @@
-import sys
-
 import os
 import importlib
 import inspect
@@ -89,6 +87,64 @@ class TestNodeEnviron(unittest.TestCase):
         self.assertTrue(self.environ._values['ALLOW_DEFAULT_TRAINING_PLANS'], "os.getenv did not overwrite the value")
         self.assertTrue(self.environ._values['TRAINING_PLAN_APPROVAL'], "os.getenv did not overwrite the value")
 
+        # sqlite storage backend
+        self.environ.from_config.side_effect = None
+        self.environ.from_config.side_effect = [None, None, None, "SHA256", '', '']
+        with patch.dict(os.environ, {"DB_BACKEND": "sqlite"}):
+            self.environ._set_component_specific_variables()
+        self.assertEqual(self.environ._values["DB_BACKEND"], "sqlite")
+        self.assertEqual(self.environ._values["DB_PATH"], os.path.join("dummy/var/dir", "db_node-1.sqlite"))
+
+        self.environ.from_config.side_effect = None
+        self.environ.from_config.side_effect = [None, None, None, "SHA256", '', '']
+        with patch.dict(os.environ, {"DB_BACKEND": "unknown"}):
+            with self.assertRaises(FedbiomedEnvironError):
+                self.environ._set_component_specific_variables()
+
+        # CPU performance profile
+        self.environ.from_config.side_effect = None
+        self.environ.from_config.side_effect = [None, None, None, "SHA256", '', '']
+        self.environ._set_component_specific_variables()
+        self.assertIsNone(self.environ._values["CPU_THREADS"])
+        self.assertIsNone(self.environ._values["CPU_INTEROP_THREADS"])
+        self.assertFalse(self.environ._values["CPU_BFLOAT16"])
+        self.assertFalse(self.environ._values["ALLOW_PROFILING"])
+        self.assertFalse(self.environ._values["SHARE_DATASET_PROFILE"])
+        self.assertEqual(self.environ._values["WARM_CACHE_MEMORY"], 1024)
+        self.assertEqual(self.environ._values["WARM_CACHE_IDLE_TIME"], 600)
+
+        self.environ.from_config.side_effect = [None, None, None, "SHA256", '', '']
+        with patch.dict(os.environ, {"ALLOW_PROFILING": "True", "SHARE_DATASET_PROFILE": "True"}):
+            self.environ._set_component_specific_variables()
+        self.assertTrue(self.environ._values["ALLOW_PROFILING"])
+        self.assertTrue(self.environ._values["SHARE_DATASET_PROFILE"])
+
+        self.environ.from_config.side_effect = [None, None, None, "SHA256", '', '']
+        with patch.dict(os.environ, {"CPU_THREADS": "4", "CPU_INTEROP_THREADS": "0", "CPU_BFLOAT16": "True"}):
+            self.environ._set_component_specific_variables()
+        self.assertEqual(self.environ._values["CPU_THREADS"], 4)
+        self.assertIsNone(self.environ._values["CPU_INTEROP_THREADS"])
+        self.assertTrue(self.environ._values["CPU_BFLOAT16"])
+
+        for threads in ("-1", "two"):
+            self.environ.from_config.side_effect = [None, None, None, "SHA256", '', '']
+            with patch.dict(os.environ, {"CPU_THREADS": threads}):
+                with self.assertRaises(FedbiomedEnvironError):
+                    self.environ._set_component_specific_variables()
+
+        # warm cache of the training plans
+        self.environ.from_config.side_effect = [None, None, None, "SHA256", '', '']
+        with patch.dict(os.environ, {"WARM_CACHE_MEMORY": "0", "WARM_CACHE_IDLE_TIME": "30"}):
+            self.environ._set_component_specific_variables()
+        self.assertEqual(self.environ._values["WARM_CACHE_MEMORY"], 0)
+        self.assertEqual(self.environ._values["WARM_CACHE_IDLE_TIME"], 30)
+
+        for key, value in (("WARM_CACHE_MEMORY", "-1"), ("WARM_CACHE_IDLE_TIME", "1.5")):
+            self.environ.from_config.side_effect = [None, None, None, "SHA256", '', '']
+            with patch.dict(os.environ, {key: value}):
+                with self.assertRaises(FedbiomedEnvironError):
+                    self.environ._set_component_specific_variables()
+
     def test_04_node_environ_set_component_specific_config_parameters(self):
         from fedbiomed.node.environ import __config_version__
         os.environ["NODE_ID"] = "node-1"
@@ -103,6 +159,7 @@ class TestNodeEnviron(unittest.TestCase):
             'id': 'node-1',
             'component': "NODE",
             'uploads_url': "localhost",
+            'db_backend': "tinydb",
             'version': str(__config_version__)
         })
 
@@ -111,7 +168,17 @@ class TestNodeEnviron(unittest.TestCase):
             'allow_default_training_plans': "True",
             'training_plan_approval': "True",
             "secure_aggregation": "True",
-            'force_secure_aggregation': "False"
+            'force_secure_aggregation': "False",
+            'allow_profiling': "False",
+            'share_dataset_profile': "False"
+        })
+
+        self.assertEqual(self.environ._cfg["performance"], {
+            'cpu_threads': "",
+            'cpu_interop_threads': "",
+            'cpu_bfloat16': "False",
+            'warm_cache_memory': "1024",
+            'warm_cache_idle_time': "600"
         })
 
     @patch("fedbiomed.common.logger.logger.info")
@@ -125,7 +192,7 @@ class TestNodeEnviron(unittest.TestCase):
         self.environ._set_component_specific_variables()
 
         self.environ.info()
-        self.assertEqual(mock_logger_info.call_count, 3)
+        self.assertEqual(mock_logger_info.call_count, 6)
 
 
 if __name__ == "__main__":
@@ -1,4 +1,6 @@
 import functools
+import os
+import tempfile
 import unittest
 import logging
 
@@ -238,6 +240,73 @@ class TestNPDataLoader(unittest.TestCase):
         self.assertEqual(epoch, 1)
         self.assertEqual(len(dataloader), 0)
 
+    def test_npdataloader_05_views_modes(self):
+        """Test the `in_place` and `blocks` modes, that yield contiguous views instead of copies"""
+        with self.assertRaises(FedbiomedValueError):
+            NPDataLoader(dataset=self.X, target=self.X, mode='unknown')
+        with self.assertRaises(FedbiomedTypeError):
+            NPDataLoader(dataset=self.X, target=self.X, mode='blocks', block_size='wrong-type')
+        with self.assertRaises(FedbiomedValueError):
+            NPDataLoader(dataset=self.X, target=self.X, batch_size=3, mode='blocks', block_size=2)
+
+        # block size is rounded down to whole batches
+        loader = NPDataLoader(dataset=self.X, target=self.X, batch_size=2, mode='blocks', block_size=5)
+        self.assertEqual(loader.block_size(), 4)
+
+        n = 103
+        for mode in ('in_place', 'blocks'):
+            for shuffle in (False, True):
+                for batch_size, drop_last in ((1, False), (10, False), (10, True), (n, False)):
+                    dataset = np.arange(2 * n, dtype=float).reshape(n, 2)
+                    target = dataset[:, :1] * 3.
+                    loader = NPDataLoader(dataset=dataset, target=target, batch_size=batch_size, shuffle=shuffle,
+                                          drop_last=drop_last, random_seed=42, mode=mode,
+                                          block_size=max(20, batch_size))
+                    for _ in range(2):
+                        rows, num_batches = [], 0
+                        for data, target_ in loader:
+                            # batches are views, aligned with the target values
+                            self.assertFalse(data.flags.owndata)
+                            self.assertLessEqual(len(data), batch_size)
+                            np.testing.assert_array_equal(target_, data[:, :1] * 3.)
+                            rows.extend(data[:, 0].tolist())
+                            num_batches += 1
+
+                        self.assertEqual(num_batches, len(loader))
+                        expected = np.arange(0, 2 * n, 2).tolist()
+                        if drop_last:
+                            self.assertEqual(len(rows), n - n % batch_size)
+                            self.assertTrue(set(rows) <= set(expected))
+                        elif shuffle:
+                            self.assertNotEqual(rows, expected)
+                            self.assertListEqual(sorted(rows), expected)
+                        else:
+                            self.assertListEqual(rows, expected)
+
+        # target overlapping the dataset is shuffled once, distinct columns of the same array are both shuffled
+        for target_columns in (slice(0, 1), slice(2, 3)):
+            array = np.arange(3 * n, dtype=float).reshape(n, 3)
+            loader = NPDataLoader(dataset=array[:, :2], target=array[:, target_columns], batch_size=10, shuffle=True,
+                                  mode='in_place')
+            for data, target_ in loader:
+                np.testing.assert_array_equal(target_[:, 0] - data[:, 0], target_columns.start)
+            self.assertFalse(np.array_equal(array[:, 0], np.arange(0, 3 * n, 3)))
+
+        # blocks mode reads blocks from a memory-mapped array, and reuses its buffers
+        with tempfile.TemporaryDirectory() as tmpdir:
+            path = os.path.join(tmpdir, 'features.npy')
+            np.save(path, np.arange(2 * n, dtype=float).reshape(n, 2))
+            dataset = np.load(path, mmap_mode='r')
+            loader = NPDataLoader(dataset=dataset, target=dataset[:, :1], batch_size=10, shuffle=True,
+                                  mode='blocks', block_size=20)
+            rows = [row for data, _ in loader for row in data[:, 0].tolist()]
+            self.assertListEqual(sorted(rows), np.arange(0, 2 * n, 2).tolist())
+            buffers = loader.block_buffers()
+            self.assertEqual(len(buffers[0]), 20)
+            list(loader)
+            self.assertIs(loader.block_buffers(), buffers)
+            del dataset, loader
+
 
 
 if __name__ == '__main__':  # pragma: no cover
@@ -0,0 +1,90 @@
+import importlib.util
+import json
+import os
+import shutil
+import tempfile
+import unittest
+
+from fedbiomed.common.exceptions import FedbiomedValueError
+from fedbiomed.node.profiler import MAX_TOP_N, PRIVATE, TRAINING_PLAN, RoundProfiler
+
+
+def _private_function():
+    return sum(range(1000))
+
+
+class TestRoundProfiler(unittest.TestCase):
+    """Tests the profiler of node rounds"""
+
+    def setUp(self):
+        self.tmp_dir = tempfile.mkdtemp()
+        self.training_plan_path = os.path.join(self.tmp_dir, 'training_plan_1234.py')
+        with open(self.training_plan_path, 'w', encoding='utf-8') as file:
+            file.write("import json\n"
+                       "def training_step(private):\n"
+                       "    private()\n"
+                       "    return json.dumps({'loss': 1.})\n")
+        spec = importlib.util.spec_from_file_location('training_plan_1234', self.training_plan_path)
+        self.module = importlib.util.module_from_spec(spec)
+        spec.loader.exec_module(self.module)
+
+    def tearDown(self):
+        shutil.rmtree(self.tmp_dir)
+
+    def test_profiler_01_init(self):
+        """Tests the validation of the profiler options"""
+        for kwargs in ({'top_n': 0}, {'top_n': 2.}, {'top_n': True}, {'sort': 'name'}):
+            with self.assertRaises(FedbiomedValueError):
+                RoundProfiler(**kwargs)
+
+        profiler = RoundProfiler(top_n=MAX_TOP_N + 1)
+        self.assertEqual(profiler.summary(), {'sort': 'cumulative', 'total_calls': 0, 'total_time': 0.,
+                                              'frames': []})
+
+    def test_profiler_02_summary(self):
+        """Tests summarizing the profile of successive calls without disclosing private files"""
+        profiler = RoundProfiler(top_n=MAX_TOP_N, sort='calls', training_plan_path=self.training_plan_path)
+        for _ in range(2):
+            self.assertEqual(profiler.runcall(self.module.training_step, _private_function), '{"loss": 1.0}')
+
+        summary = profiler.summary()
+        self.assertEqual(summary['sort'], 'calls')
+        self.assertGreater(summary['total_calls'], 0)
+        self.assertGreaterEqual(summary['total_time'], 0.)
+        frames = summary['frames']
+        self.assertListEqual([frame['calls'] for frame in frames],
+                             sorted([frame['calls'] for frame in frames], reverse=True))
+
+        # functions of the training plan and of the standard library are reported, other files are not
+        step = [frame for frame in frames if frame['function'] == 'training_step']
+        self.assertEqual(len(step), 1)
+        self.assertEqual(step[0]['file'], TRAINING_PLAN)
+        self.assertEqual(step[0]['line'], 2)
+        self.assertEqual(step[0]['calls'], 2)
+        self.assertGreaterEqual(step[0]['cumtime'], step[0]['tottime'])
+
+        self.assertTrue(any(frame['file'] == os.path.join('json', '__init__.py') for frame in frames))
+        private = [frame for frame in frames if frame['file'] == PRIVATE]
+        self.assertEqual(len(private), 1)
+        self.assertEqual(private[0]['function'], PRIVATE)
+        self.assertEqual(private[0]['line'], 0)
+        for frame in frames:
+            self.assertFalse(os.path.isabs(frame['file']))
+            self.assertNotIn('_private_function', frame['function'])
+            self.assertNotIn('disable', frame['function'])
+
+        # summary can be sent to the researcher
+        json.dumps(summary)
+
+    def test_profiler_03_top_n(self):
+        """Tests keeping the top frames of the profile"""
+        profiler = RoundProfiler(top_n=2, training_plan_path=self.training_plan_path)
+        profiler.runcall(self.module.training_step, private=_private_function)
+
+        frames = profiler.summary()['frames']
+        self.assertEqual(len(frames), 2)
+        self.assertGreaterEqual(frames[0]['cumtime'], frames[1]['cumtime'])
+
+
+if __name__ == '__main__':  # pragma: no cover
+    unittest.main()
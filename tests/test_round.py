@@ -20,6 +20,7 @@ from testsupport.fake_uuid import FakeUuid
 
 from fedbiomed.node.environ import environ
 from fedbiomed.node.round import Round
+from fedbiomed.node.warm_cache import WarmCache
 from fedbiomed.common.exceptions import FedbiomedRoundError
 from fedbiomed.common.logger import logger
 from fedbiomed.common.data import DataManager, DataLoadingPlanMixin, DataLoadingPlan
@@ -306,6 +307,14 @@ class TestRound(NodeTestCase):
         self.assertEqual(TestRound.URL_MSG, msg_test.get('params_url', False))
         self.assertEqual('train', msg_test.get('command', False))
 
+        # time and resources of the phases of the round are recorded
+        spans = msg_test['spans']
+        for name in ('download', 'import', 'deserialization', 'data_loading', 'training', 'serialization',
+                     'upload'):
+            self.assertIn(name, spans)
+            self.assertGreaterEqual(spans[name]['wall_time'], 0.)
+        self.assertGreater(spans['upload']['bytes'], 0)
+
         # remove model file
         os.remove(module_file_path)
 
@@ -871,5 +880,189 @@ class TestRound(NodeTestCase):
         environ["SECURE_AGGREGATION"] = False
         environ["FORCE_SECURE_AGGREGATION"] = False
 
+    @patch('fedbiomed.node.round.Round._split_train_and_test_data')
+    @patch('fedbiomed.common.message.NodeMessages.format_incoming_message')
+    @patch('fedbiomed.common.repository.Repository.upload_file')
+    @patch('fedbiomed.common.serializer.Serializer.dump')
+    @patch('fedbiomed.node.training_plan_security_manager.TrainingPlanSecurityManager.check_training_plan_status')
+    @patch('fedbiomed.common.serializer.Serializer.load')
+    @patch('fedbiomed.common.repository.Repository.download_file')
+    @patch('uuid.uuid4')
+    def test_round_14_run_model_training_profiling(self,
+                                                   uuid_patch,
+                                                   repository_download_patch,
+                                                   serialize_load_patch,
+                                                   tp_security_manager_patch,
+                                                   serialize_dump_patch,
+                                                   repository_upload_patch,
+                                                   node_msg_patch,
+                                                   mock_split_train_and_test_data):
+        """tests profiling the round when requested by the researcher and allowed by the node"""
+        FakeModel.SLEEPING_TIME = 0
+
+        repository_download_patch.return_value = (200, 'my_python_model')
+        tp_security_manager_patch.return_value = (True, {'name': "model_name"})
+        repository_upload_patch.return_value = {'file': TestRound.URL_MSG}
+        node_msg_patch.side_effect = TestRound.node_msg_side_effect
+        mock_split_train_and_test_data.return_value = (True, True)
+
+        dummy_training_plan_test = "\n".join([
+            "from testsupport.fake_training_plan import FakeModel",
+            "class MyTrainingPlan(FakeModel):",
+            "    dataset = [1, 2, 3, 4]",
+            "    def set_data_loaders(self, *args, **kwargs):",
+            "       self.testing_data_loader = MyTrainingPlan",
+            "       self.training_data_loader = MyTrainingPlan",
+            "    def training_routine(self, **kwargs):",
+            "       return sorted(range(10))",
+        ])
+        # module name of the training plan is not already imported
+        uuid_patch.return_value = FakeUuid()
+        uuid_patch.return_value.hex = 'profiling'
+        module_file_path = os.path.join(environ['TMP_DIR'], 'training_plan_profiling.py')
+        with open(module_file_path, "w", encoding="utf-8") as file:
+            file.write(dummy_training_plan_test)
+
+        # profiling is not allowed by the node
+        self.r1.training_kwargs = {'profiling': {'top_n': 5}}
+        msg_test = self.r1.run_model_training()
+        self.assertTrue(msg_test.get('success', False))
+        self.assertNotIn('profile', serialize_dump_patch.call_args[0][0])
+
+        # profiling is allowed by the node
+        environ['ALLOW_PROFILING'] = True
+        try:
+            msg_test = self.r1.run_model_training()
+        finally:
+            environ['ALLOW_PROFILING'] = False
+        self.assertTrue(msg_test.get('success', False))
+        profile = serialize_dump_patch.call_args[0][0]['profile']
+        self.assertEqual(profile['sort'], 'cumulative')
+        self.assertLessEqual(len(profile['frames']), 5)
+        self.assertIn(('<training_plan>', 'training_routine'),
+                      [(frame['file'], frame['function']) for frame in profile['frames']])
+
+        os.remove(module_file_path)
+
+    @patch('fedbiomed.node.round.Round._split_train_and_test_data')
+    @patch('fedbiomed.common.message.NodeMessages.format_incoming_message')
+    @patch('fedbiomed.common.repository.Repository.upload_file')
+    @patch('fedbiomed.common.serializer.Serializer.dump')
+    @patch('fedbiomed.node.training_plan_security_manager.TrainingPlanSecurityManager.check_training_plan_status')
+    @patch('fedbiomed.common.serializer.Serializer.load')
+    @patch('fedbiomed.common.repository.Repository.download_file')
+    @patch('uuid.uuid4')
+    def test_round_15_run_model_training_warm_cache(self,
+                                                    uuid_patch,
+                                                    repository_download_patch,
+                                                    serialize_load_patch,
+                                                    tp_security_manager_patch,
+                                                    serialize_dump_patch,
+                                                    repository_upload_patch,
+                                                    node_msg_patch,
+                                                    mock_split_train_and_test_data):
+        """tests reusing the training plan kept by the node in the next rounds of the job"""
+        FakeModel.SLEEPING_TIME = 0
+
+        dummy_training_plan_test = "\n".join([
+            "from testsupport.fake_training_plan import FakeModel",
+            "class MyTrainingPlan(FakeModel):",
+            "    def post_init(self, model_args, training_args, aggregator_args=None):",
+            "        self.post_init_calls = getattr(self, 'post_init_calls', 0) + 1",
+            "        self.aggregator_args = aggregator_args",
+            "    def reusable(self):",
+            "        return True",
+            "    def reset_round(self, training_args, aggregator_args=None):",
+            "        self.reset_round_calls = getattr(self, 'reset_round_calls', 0) + 1",
+            "        self.round_training_args = training_args",
+            "        self.aggregator_args = aggregator_args",
+            "    def set_data_loaders(self, train_data_loader, test_data_loader):",
+            "        self.data_loaders = (train_data_loader, test_data_loader)",
+            "        self.training_data_loader = train_data_loader",
+            "        self.testing_data_loader = test_data_loader",
+        ])
+        # module name of the training plan is not already imported
+        uuid_patch.return_value = FakeUuid()
+        uuid_patch.return_value.hex = 'warm'
+        module_file_path = os.path.join(environ['TMP_DIR'], 'training_plan_warm.py')
+        with open(module_file_path, "w", encoding="utf-8") as file:
+            file.write(dummy_training_plan_test)
+
+        repository_download_patch.return_value = (200, module_file_path)
+        tp_security_manager_patch.return_value = (True, {'name': "model_name"})
+        repository_upload_patch.return_value = {'file': TestRound.URL_MSG}
+        node_msg_patch.side_effect = TestRound.node_msg_side_effect
+        mock_split_train_and_test_data.return_value = (FakeLoader, None)
+
+        warm_cache = WarmCache(max_memory=2**20)
+
+        def run_round(training_kwargs: dict, aggregator_args: dict) -> Round:
+            round_ = Round(training_plan_url='http://somewhere/where/my/model?is_stored=True',
+                           training_plan_class='MyTrainingPlan',
+                           params_url='https://url/to/model/params?ok=True',
+                           model_kwargs={'lr': 0.1},
+                           training_kwargs=training_kwargs,
+                           training=True,
+                           dataset={'path': 'my/dataset/path', 'dataset_id': 'id_1234'},
+                           job_id='1234',
+                           researcher_id='1234',
+                           history_monitor=MagicMock(),
+                           warm_cache=warm_cache)
+            with patch.object(round_, 'download_aggregator_args', return_value=(True, '')):
+                round_.aggregator_args = aggregator_args
+                msg = round_.run_model_training()
+            self.assertTrue(msg.get('success', False))
+            return round_
+
+        # first round sets up the training plan and keeps it
+        run_round({'num_updates': 2}, {'round': 1})
+        self.assertEqual(len(warm_cache), 1)
+        self.assertEqual(mock_split_train_and_test_data.call_count, 1)
+        key = next(iter(warm_cache._entries))
+        self.assertEqual(key[:2], ('1234', '1234'))
+        training_plan = warm_cache._entries[key].training_plan
+        self.assertEqual(training_plan.post_init_calls, 1)
+
+        # next round reuses the training plan and its data loaders, with its new training and aggregator arguments
+        round_2 = run_round({'num_updates': 5, 'log_interval': 20}, {'round': 2})
+        self.assertEqual(mock_split_train_and_test_data.call_count, 1)
+        self.assertIs(warm_cache._entries[key].training_plan, training_plan)
+        self.assertEqual(training_plan.post_init_calls, 1)
+        self.assertEqual(training_plan.reset_round_calls, 1)
+        self.assertEqual(training_plan.round_training_args['num_updates'], 5)
+        self.assertEqual(training_plan.round_training_args['log_interval'], 20)
+        self.assertEqual(training_plan.aggregator_args, {'round': 2})
+        self.assertEqual(training_plan.data_loaders, (FakeLoader, None))
+        self.assertEqual(serialize_load_patch.call_count, 2)
+        self.assertIn('data_loading', round_2._spans.spans())
+
+        # training arguments of the data loaders changed: the training plan is set up again
+        run_round({'num_updates': 5, 'batch_size': 64}, {'round': 3})
+        self.assertEqual(mock_split_train_and_test_data.call_count, 2)
+        self.assertEqual(len(warm_cache), 1)
+        self.assertIsNot(warm_cache._entries[key].training_plan, training_plan)
+        self.assertEqual(warm_cache._entries[key].training_plan.post_init_calls, 1)
+
+        # failed round does not keep the training plan
+        repository_upload_patch.side_effect = Exception('upload failed')
+        round_4 = Round(training_plan_url='http://somewhere/where/my/model?is_stored=True',
+                        training_plan_class='MyTrainingPlan',
+                        params_url='https://url/to/model/params?ok=True',
+                        model_kwargs={'lr': 0.1},
+                        training_kwargs={'epochs': 2},
+                        training=True,
+                        dataset={'path': 'my/dataset/path', 'dataset_id': 'id_1234'},
+                        job_id='1234',
+                        researcher_id='1234',
+                        history_monitor=MagicMock(),
+                        warm_cache=warm_cache)
+        with patch.object(round_4, 'download_aggregator_args', return_value=(True, '')):
+            msg = round_4.run_model_training()
+        self.assertFalse(msg.get('success', True))
+        self.assertEqual(len(warm_cache), 0)
+
+        warm_cache.clear()
+        os.remove(module_file_path)
+
 if __name__ == '__main__':  # pragma: no cover
     unittest.main()
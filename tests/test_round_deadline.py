@@ -0,0 +1,95 @@
+import time
+import unittest
+from unittest.mock import MagicMock
+
+#############################################################
+# Import ResearcherTestCase before importing any FedBioMed Module
+from testsupport.base_case import ResearcherTestCase
+#############################################################
+
+from fedbiomed.common.exceptions import FedbiomedExperimentError, FedbiomedStrategyError
+from fedbiomed.researcher.responses import Responses
+from fedbiomed.researcher.round_deadline import RoundDeadline
+from fedbiomed.researcher.strategies.default_strategy import DefaultStrategy
+
+
+class TestRoundDeadline(ResearcherTestCase):
+    """Tests the deadline of training rounds, and the handling of late nodes by the default strategy"""
+
+    def setUp(self):
+        self.fds = MagicMock()
+        self.fds.node_ids = MagicMock(return_value=['node-1', 'node-2', 'node-3'])
+        self.fds.data = MagicMock(return_value={})
+
+    @staticmethod
+    def replies(*node_ids):
+        return Responses([{'node_id': node_id, 'success': True, 'params': {'w': 1.},
+                           'sample_size': 10 * (i + 1), 'encryption_factor': None}
+                          for i, node_id in enumerate(node_ids)])
+
+    def test_round_deadline_01_reached(self):
+        """Tests when the deadline of a round is reached"""
+        self.assertFalse(RoundDeadline().active)
+        self.assertFalse(RoundDeadline().reached(0, 3, time.perf_counter() - 1e6))
+
+        deadline = RoundDeadline(quorum=0.5)
+        self.assertTrue(deadline.active)
+        self.assertFalse(deadline.reached(1, 3, time.perf_counter()))
+        self.assertTrue(deadline.reached(2, 3, time.perf_counter()))
+
+        deadline = RoundDeadline(timeout=10)
+        self.assertFalse(deadline.reached(0, 3, time.perf_counter()))
+        self.assertTrue(deadline.reached(0, 3, time.perf_counter() - 10))
+
+        self.assertDictEqual(RoundDeadline(timeout=10, penalty_rounds=2).get_state(),
+                             {'timeout': 10, 'quorum': None, 'penalty_rounds': 2})
+
+        for kwargs in ({'timeout': 0}, {'timeout': '10'}, {'quorum': 1.5}, {'quorum': -0.5},
+                       {'quorum': True}, {'penalty_rounds': -1}, {'penalty_rounds': 1.}):
+            with self.assertRaises(FedbiomedExperimentError):
+                RoundDeadline(**kwargs)
+
+    def test_round_deadline_02_refine_without_late_nodes(self):
+        """Tests that late nodes are left out of the aggregation, with weights renormalized"""
+        strategy = DefaultStrategy(self.fds)
+        strategy.sample_nodes(0)
+
+        # missing replies still raise if nodes are not reported late
+        with self.assertRaises(FedbiomedStrategyError):
+            strategy.refine(self.replies('node-1', 'node-2'), 0)
+
+        strategy.report_late_nodes(0, ['node-3'])
+        model_params, weights, total_rows, _ = strategy.refine(self.replies('node-1', 'node-2'), 0)
+        self.assertListEqual(sorted(model_params), ['node-1', 'node-2'])
+        self.assertEqual(total_rows, 30)
+        self.assertAlmostEqual(weights['node-1'], 1 / 3)
+        self.assertAlmostEqual(weights['node-2'], 2 / 3)
+
+        # a round where all nodes are late fails
+        strategy.sample_nodes(1)
+        strategy.report_late_nodes(1, ['node-1', 'node-2', 'node-3'])
+        with self.assertRaises(FedbiomedStrategyError):
+            strategy.refine(self.replies(), 1)
+
+    def test_round_deadline_03_sampling_penalty(self):
+        """Tests that late nodes are not sampled in the next rounds"""
+        strategy = DefaultStrategy(self.fds)
+        strategy.report_late_nodes(0, ['node-2'], penalty_rounds=2)
+
+        self.assertListEqual(strategy.sample_nodes(1), ['node-1', 'node-3'])
+        self.assertListEqual(strategy.sample_nodes(2), ['node-1', 'node-3'])
+        self.assertListEqual(strategy.sample_nodes(3), ['node-1', 'node-2', 'node-3'])
+
+        # penalties are saved with the strategy state
+        state = strategy.save_state()
+        loaded = DefaultStrategy(self.fds)
+        loaded.load_state(state)
+        self.assertSetEqual(loaded.penalized_nodes(2), {'node-2'})
+
+        # all nodes are sampled rather than none
+        strategy.report_late_nodes(3, ['node-1', 'node-2', 'node-3'])
+        self.assertListEqual(strategy.sample_nodes(4), ['node-1', 'node-2', 'node-3'])
+
+
+if __name__ == '__main__':  # pragma: no cover
+    unittest.main()
@@ -8,7 +8,6 @@ from fedbiomed.researcher.aggregators.fedavg import FedAverage
 from fedbiomed.researcher.aggregators.functional import federated_averaging
 from fedbiomed.researcher.datasets import FederatedDataSet
 from fedbiomed.researcher.responses import Responses
-from testsupport.fake_uuid import FakeUuid
 import torch
 from torch.nn import Linear
 from fedbiomed.researcher.aggregators.scaffold import Scaffold
@@ -244,28 +243,31 @@ class TestScaffold(ResearcherTestCase):
         for node_id in self.node_ids:
             self.assertDictEqual(agg_thr_file[node_id]['aggregator_correction'], agg.nodes_deltas[node_id])
 
-    @patch('uuid.uuid4')
-    def test_7_save_state(self, uuid_patch):
-        uuid_patch.return_value = FakeUuid()
+    @patch('fedbiomed.researcher.aggregators.aggregator.save_blob')
+    @patch('fedbiomed.researcher.aggregators.scaffold.save_blob')
+    def test_7_save_state(self, scaffold_save_patch, aggregator_save_patch):
+        def _save_blob(path, prefix, obj):
+            return os.path.join(path, prefix + '.mpk')
+        scaffold_save_patch.side_effect = _save_blob
+        aggregator_save_patch.side_effect = _save_blob
+
         server_lr = .5
         fds = FederatedDataSet({node_id: {} for node_id in self.node_ids})
         bkpt_path = '/path/to/my/breakpoint'
         scaffold = Scaffold(server_lr, fds=fds)
         scaffold.init_correction_states(self.model.state_dict())
-        with patch("fedbiomed.common.serializer.Serializer.dump") as save_patch:
-            state = scaffold.save_state(breakpoint_path=bkpt_path, global_model=self.model.state_dict())
-        self.assertEqual(save_patch.call_count, self.n_nodes + 1,
-                        f"'Serializer.dump' should be called {self.n_nodes} times: once for each node + \
-                        one more time for global_state")
+        state = scaffold.save_state(breakpoint_path=bkpt_path, global_model=self.model.state_dict())
+        self.assertEqual(aggregator_save_patch.call_count, self.n_nodes,
+                         "'save_blob' should be called once for each node correction")
+        scaffold_save_patch.assert_called_once_with(bkpt_path, 'global_state', scaffold.global_state)
 
         for node_id in self.node_ids:
             self.assertEqual(state['parameters']['aggregator_correction'][node_id],
                              os.path.join(bkpt_path, 'aggregator_correction_' + str(node_id) + '.mpk'))
 
         self.assertEqual(state['parameters']['server_lr'], server_lr)
-        self.assertEqual(state['parameters']['global_state_filename'], os.path.join(bkpt_path,
-                                                                                    'global_state_'
-                                                                                    + str(FakeUuid.VALUE) + '.mpk'))
+        self.assertEqual(state['parameters']['global_state_filename'],
+                         os.path.join(bkpt_path, 'global_state.mpk'))
         self.assertEqual(state['class'], Scaffold.__name__)
         self.assertEqual(state['module'], Scaffold.__module__)
 
@@ -277,17 +279,18 @@ class TestScaffold(ResearcherTestCase):
         scaffold = Scaffold(server_lr, fds=fds)
 
         # create a state (not actually saving the associated contents)
-        with patch("fedbiomed.common.serializer.Serializer.dump"):
+        with patch("fedbiomed.researcher.aggregators.aggregator.save_blob"), \
+                patch("fedbiomed.researcher.aggregators.scaffold.save_blob"):
             state = scaffold.save_state(
                 breakpoint_path=bkpt_path, global_model=self.model.state_dict()
             )
 
         # action
-        with patch("fedbiomed.common.serializer.Serializer.load") as load_patch:
+        with patch("fedbiomed.researcher.aggregators.scaffold.load_blob") as load_patch:
             scaffold.load_state(state)
 
         self.assertEqual(load_patch.call_count, self.n_nodes + 1,
-                         f"'Serializer.load' should be called {self.n_nodes} times: once for each node + \
+                         f"'load_blob' should be called {self.n_nodes} times: once for each node + \
                          one more time for global_state")
 
     def test_9_load_state_2(self):
@@ -298,14 +301,15 @@ class TestScaffold(ResearcherTestCase):
         scaffold = Scaffold(server_lr, fds=fds)
 
         # create a state (not actually saving the associated contents)
-        with patch("fedbiomed.common.serializer.Serializer.dump"):
+        with patch("fedbiomed.researcher.aggregators.aggregator.save_blob"), \
+                patch("fedbiomed.researcher.aggregators.scaffold.save_blob"):
             state = scaffold.save_state(
                 breakpoint_path=bkpt_path, global_model=self.model.state_dict()
             )
 
         # action
         with patch(
-            "fedbiomed.common.serializer.Serializer.load",
+            "fedbiomed.researcher.aggregators.scaffold.load_blob",
             return_value=self.model.state_dict()
         ):
             scaffold.load_state(state)
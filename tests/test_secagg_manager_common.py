@@ -74,7 +74,7 @@ class TestBaseSecaggManager(unittest.TestCase):
     """Test for common secagg_manager module"""
 
     def setUp(self):
-        self.patcher_db = patch('fedbiomed.common.secagg_manager.TinyDB', FakeTinyDB)
+        self.patcher_db = patch('fedbiomed.common.secagg_manager.open_database', FakeTinyDB)
         self.patcher_query = patch('fedbiomed.common.secagg_manager.Query', FakeQuery)
 
         self.patcher_db.start()
@@ -104,7 +104,7 @@ class TestBaseSecaggManager(unittest.TestCase):
         # test
         # nothing to test at this point ...
 
-    @patch('fedbiomed.common.secagg_manager.TinyDB.__init__')
+    @patch('fedbiomed.common.secagg_manager.open_database')
     def test_secagg_manager_02_init_error(
             self,
             patch_tinydb_init):
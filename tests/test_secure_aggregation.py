@@ -110,13 +110,14 @@ class TestSecureAggregation(MockRequestMessaging, ResearcherTestCase):
             self.secagg.setup(parties=[environ["ID"], "node-1", "node-2", "new_party"],
                               job_id=1345)
 
-        # iterate twice with same incorrect arguments
+        # iterate twice with same incorrect arguments: contexts that could not be created are not pooled
         with self.assertRaises(FedbiomedSecaggError):
             self.secagg.setup(parties=["oops"],
                               job_id="exp-id-1")
-        with self.assertRaises(FedbiomedSecureAggregationError):
+        with self.assertRaises(FedbiomedSecaggError):
             self.secagg.setup(parties=["oops"],
                               job_id="exp-id-1")
+        self.assertEqual(self.secagg._pool, {})
 
         # Execute setup
         self.secagg.setup(parties=[environ["ID"], "node-1", "node-2", "new_party"],
@@ -210,8 +211,10 @@ class TestSecureAggregation(MockRequestMessaging, ResearcherTestCase):
 
         self.assertEqual(state["class"], "SecureAggregation")
         self.assertEqual(state["module"], "fedbiomed.researcher.secagg._secure_aggregation")
-        self.assertEqual(list(state["attributes"].keys()), ['_biprime', '_servkey', '_job_id', '_parties'])
-        self.assertEqual(list(state["arguments"].keys()), ['active', 'timeout', 'clipping_range'])
+        self.assertEqual(list(state["attributes"].keys()),
+                         ['_biprime', '_servkey', '_job_id', '_parties', '_rounds', '_pool'])
+        self.assertEqual(list(state["arguments"].keys()), ['active', 'timeout', 'clipping_range', 'context_expiry'])
+        self.assertEqual(len(state["attributes"]["_pool"]), 1)
 
         pass
 
@@ -238,7 +241,63 @@ class TestSecureAggregation(MockRequestMessaging, ResearcherTestCase):
         self.assertEqual(secagg.job_id, job_id)
         self.assertListEqual(secagg.parties, parties)
 
-        pass
+        # pooled contexts are restored, and current contexts are taken from the pool
+        self.secagg.setup(parties=parties[:3], job_id=job_id)
+        self.secagg.setup(parties=parties, job_id=job_id)
+        secagg = SecureAggregation.load_state(self.secagg.save_state())
+        self.assertEqual(len(secagg._pool), 2)
+        self.assertIs(secagg._pool[tuple(sorted(parties))]['servkey'], secagg.servkey)
+
+        # breakpoints without pool
+        state = self.secagg.save_state()
+        del state["attributes"]["_pool"]
+        secagg = SecureAggregation.load_state(state)
+        self.assertEqual(list(secagg._pool.values())[0]['servkey'], secagg.servkey)
+
+    def test_secure_aggregation_11_context_pool(self):
+        """Tests that contexts are reused for known sets of parties, and expire when unused"""
+        secagg = SecureAggregation(context_expiry=2)
+        parties_a = [environ["ID"], "node-1", "node-2"]
+        parties_b = [environ["ID"], "node-1", "node-3"]
+
+        secagg.setup(parties=parties_a, job_id="exp-id-1")
+        servkey_a = secagg.servkey
+        secagg.setup(parties=parties_b, job_id="exp-id-1")
+        self.assertIsNot(secagg.servkey, servkey_a)
+
+        # same set of parties, in another order
+        secagg.setup(parties=[environ["ID"], "node-2", "node-1"], job_id="exp-id-1")
+        self.assertIs(secagg.servkey, servkey_a)
+        self.assertEqual(len(secagg._pool), 2)
+
+        # parties_b is not used for 2 rounds
+        secagg.setup(parties=parties_a, job_id="exp-id-1")
+        self.assertEqual(list(secagg._pool), [tuple(sorted(parties_a))])
+
+        # contexts are not reused for another job
+        secagg.setup(parties=parties_a, job_id="exp-id-2")
+        self.assertIsNot(secagg.servkey, servkey_a)
+        self.assertEqual(secagg.servkey.job_id, "exp-id-2")
+
+        with self.assertRaises(FedbiomedSecureAggregationError):
+            SecureAggregation(context_expiry=0)
+
+    def test_secure_aggregation_12_precompute(self):
+        """Tests setting up contexts for likely sets of parties"""
+        parties = [[environ["ID"], "node-1", "node-2"], [environ["ID"], "node-1", "node-3"]]
+
+        with patch('fedbiomed.researcher.secagg.SecaggServkeyContext.status', True), \
+                patch('fedbiomed.researcher.secagg.SecaggBiprimeContext.status', True):
+            self.assertEqual(self.secagg.precompute(parties, job_id="exp-id-1"), 2)
+
+        servkey = self.secagg._pool[tuple(sorted(parties[1]))]['servkey']
+        self.secagg.setup(parties=parties[1], job_id="exp-id-1")
+        self.assertIs(self.secagg.servkey, servkey)
+
+        with self.assertRaises(FedbiomedSecureAggregationError):
+            self.secagg.precompute(parties[0], job_id="exp-id-1")
+        with self.assertRaises(FedbiomedSecureAggregationError):
+            self.secagg.precompute(parties, job_id=None)
 
 
 if __name__ == "__main__":
@@ -0,0 +1,151 @@
+import os
+import shutil
+import tempfile
+import threading
+import unittest
+
+#############################################################
+# Import ResearcherTestCase before importing any FedBioMed Module
+from testsupport.base_case import ResearcherTestCase
+#############################################################
+
+from fedbiomed.common import simulation
+from fedbiomed.common.constants import ComponentType, ErrorNumbers, __messaging_protocol_version__
+from fedbiomed.common.exceptions import FedbiomedRepositoryError, FedbiomedSimulationError
+from fedbiomed.common.messaging import Messaging
+from fedbiomed.common.repository import Repository
+from fedbiomed.common.simulation import SimulatedMessaging, SimulatedRepository, SimulationBroker
+from fedbiomed.researcher.simulation import Simulation
+
+
+class TestSimulation(ResearcherTestCase):
+    """Tests the in-process simulation backend"""
+
+    def setUp(self):
+        self.broker = SimulationBroker()
+        self.broker.add_component(ComponentType.RESEARCHER, 'researcher')
+        for node_id in ('node-1', 'node-2'):
+            self.broker.add_component(ComponentType.NODE, node_id, inbox='worker')
+        self.tmp_dir = tempfile.mkdtemp()
+
+    def tearDown(self):
+        simulation.deactivate()
+        shutil.rmtree(self.tmp_dir)
+
+    def test_simulation_01_broker(self):
+        """Tests routing messages to the inboxes subscribed to a topic"""
+        self.broker.publish('general/nodes', {'command': 'ping'})
+        self.assertEqual(self.broker.receive('worker', timeout=5),
+                         (['node-1', 'node-2'], 'general/nodes', {'command': 'ping'}))
+
+        self.broker.publish('general/node-2', {'command': 'train'})
+        self.assertEqual(self.broker.receive('worker', timeout=5), (['node-2'], 'general/node-2', {'command': 'train'}))
+
+        for topic in ('general/researcher', 'general/monitoring', 'general/logger'):
+            self.broker.publish(topic, {'command': 'pong'})
+            self.assertEqual(self.broker.receive('researcher', timeout=5)[1], topic)
+
+        self.broker.publish('general/unknown', {'command': 'pong'})
+        self.assertIsNone(self.broker.receive('researcher', timeout=0.1))
+        self.broker.close('worker')
+        self.assertIsNone(self.broker.receive('worker', timeout=5))
+
+    def test_simulation_02_messaging(self):
+        """Tests exchanging messages between a researcher and a node"""
+        received = []
+        done = threading.Event()
+
+        def on_message(msg, topic):
+            received.append((msg, topic))
+            if len(received) == 2:
+                done.set()
+
+        researcher = SimulatedMessaging(on_message, ComponentType.RESEARCHER, 'researcher', self.broker)
+        node = SimulatedMessaging(lambda msg, topic: None, ComponentType.NODE, 'node-1', self.broker,
+                                  dispatch=False)
+        # messages are not sent before the messaging is started
+        node.send_message({'command': 'pong'})
+        researcher.start()
+        node.start()
+        self.assertTrue(node.is_connected())
+
+        pong = {'command': 'pong', 'node_id': 'node-1', 'protocol_version': __messaging_protocol_version__}
+        node.send_message(pong)
+        node.send_error(ErrorNumbers.FB300, extra_msg='failed', researcher_id='researcher')
+        self.assertTrue(done.wait(timeout=5))
+        self.assertEqual(received[0], (pong, 'general/researcher'))
+        self.assertEqual(received[1][0]['command'], 'error')
+        self.assertEqual(received[1][0]['extra_msg'], 'failed')
+
+        # messages of the node are received by the caller, and delivered to the node
+        researcher.send_message({'command': 'ping'}, client='node-1')
+        component_ids, topic, msg = self.broker.receive('worker', timeout=5)
+        self.assertListEqual(component_ids, ['node-1'])
+        self.assertEqual(topic, 'general/node-1')
+
+        researcher.stop()
+        self.assertFalse(researcher.is_connected())
+
+    def test_simulation_03_repository(self):
+        """Tests exchanging files through the simulation repository"""
+        store_dir = simulation.make_store_dir()
+        try:
+            repository = SimulatedRepository(store_dir, self.tmp_dir, self.tmp_dir)
+            filename = os.path.join(self.tmp_dir, 'params.mpk')
+            with open(filename, 'wb') as file:
+                file.write(b'params')
+
+            url = repository.upload_file(filename)['file']
+            self.assertTrue(url.startswith(simulation.SIMULATION_UPLOADS_URL))
+            status, path = repository.download_file(url, 'downloaded.mpk')
+            self.assertEqual(status, 200)
+            self.assertEqual(path, os.path.join(self.tmp_dir, 'downloaded.mpk'))
+            with open(path, 'rb') as file:
+                self.assertEqual(file.read(), b'params')
+
+            for url in ('http://localhost:8844/media/params.mpk', simulation.SIMULATION_UPLOADS_URL + 'unknown'):
+                with self.assertRaises(FedbiomedRepositoryError):
+                    repository.download_file(url, 'downloaded.mpk')
+            with self.assertRaises(FedbiomedRepositoryError):
+                repository.upload_file(os.path.join(self.tmp_dir, 'unknown.mpk'))
+        finally:
+            shutil.rmtree(store_dir)
+
+    def test_simulation_04_factories(self):
+        """Tests creating simulated messagings and repositories when a simulation is active"""
+        self.assertFalse(simulation.is_active())
+        self.assertIs(type(simulation.create_repository('http://localhost:8844/upload/', self.tmp_dir,
+                                                        self.tmp_dir)), Repository)
+
+        simulation.activate(self.broker, self.tmp_dir, dispatch=False)
+        self.assertTrue(simulation.is_active())
+        messaging = simulation.create_messaging(None, ComponentType.NODE, 'node-1', 'localhost', 1883)
+        self.assertIsInstance(messaging, SimulatedMessaging)
+        self.assertIsInstance(messaging, Messaging)
+        self.assertIsInstance(simulation.create_repository('http://localhost:8844/upload/', self.tmp_dir,
+                                                           self.tmp_dir), SimulatedRepository)
+        simulation.deactivate()
+        self.assertFalse(simulation.is_active())
+
+    def test_simulation_05_arguments(self):
+        """Tests the validation of the simulation arguments"""
+        dataset = {'name': 'data', 'data_type': 'csv', 'path': 'data.csv', 'tags': ['#sim'], 'description': ''}
+        for args, kwargs in (([[]], {}), ([['data.csv']], {}), ([dataset], {'processes': 0}),
+                             ([dataset], {'cpu_threads': 1.5}), ([dataset], {'start_method': 'unknown'}),
+                             ([dataset], {'response_timeout': 0})):
+            with self.assertRaises(FedbiomedSimulationError):
+                Simulation(*args, **kwargs)
+
+        sim = Simulation([dataset, [dataset, dataset], dataset], processes=8)
+        self.assertEqual(len(sim.node_ids), 3)
+        self.assertEqual(len(set(sim.node_ids)), 3)
+        self.assertFalse(sim.is_running())
+
+        # only one simulation at a time in a process
+        simulation.activate(self.broker, self.tmp_dir)
+        with self.assertRaises(FedbiomedSimulationError):
+            sim.start()
+
+
+if __name__ == '__main__':  # pragma: no cover
+    unittest.main()
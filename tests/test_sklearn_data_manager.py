@@ -142,6 +142,36 @@ class TestSkLearnDataManager(unittest.TestCase):
 
         self.assertEqual(count_iter, 1)  # assert that only one iteration was made because of drop_last=True
 
+    def test_sklearn_data_manager_06_split_without_copies(self):
+        """Testing that subsets are views of the data in `in_place` and `blocks` loader modes"""
+        inputs = np.arange(40, dtype=float).reshape(10, 4)
+        target = inputs[:, 0] * 2.
+
+        # in_place: arrays are shuffled in place, then split
+        sklearn_data_manager = SkLearnDataManager(inputs=inputs, target=target, batch_size=2, mode='in_place')
+        loader_train, loader_test = sklearn_data_manager.split(test_ratio=0.25)
+        self.assertEqual(len(loader_train.dataset), 7)
+        self.assertEqual(len(loader_test.dataset), 3)
+        for loader in (loader_train, loader_test):
+            self.assertTrue(np.shares_memory(loader.dataset, inputs))
+            self.assertTrue(np.shares_memory(loader.target, target))
+            np.testing.assert_array_equal(loader.target[:, 0], loader.dataset[:, 0] * 2.)
+        self.assertEqual(len(loader_test), 1)
+        self.assertEqual(loader_test.mode(), 'in_place')
+
+        # blocks: arrays are split without shuffling, validation data is also read by blocks
+        inputs = np.arange(40, dtype=float).reshape(10, 4)
+        sklearn_data_manager = SkLearnDataManager(inputs=inputs, target=inputs[:, 0], batch_size=2,
+                                                  shuffle=True, mode='blocks', block_size=4)
+        loader_train, loader_test = sklearn_data_manager.split(test_ratio=0.25)
+        np.testing.assert_array_equal(loader_train.dataset, inputs[:7])
+        np.testing.assert_array_equal(loader_test.dataset, inputs[7:])
+        self.assertTrue(np.shares_memory(loader_test.dataset, inputs))
+        self.assertEqual(loader_test.mode(), 'blocks')
+        self.assertEqual(loader_test.block_size(), 4)
+        self.assertEqual(len(loader_test), 2)
+        self.assertFalse(loader_test.shuffle())
+
 
 
 
@@ -1,9 +1,11 @@
+import os
+import tempfile
 import unittest
 import pandas as pd
 import numpy as np
 import torch
 
-from fedbiomed.common.data import TabularDataset
+from fedbiomed.common.data import TabularDataset, ColumnarTabularDataset, TorchDataManager
 from fedbiomed.common.exceptions import FedbiomedDatasetError
 
 
@@ -77,5 +79,104 @@ class TestTabularDataset(unittest.TestCase):
         self.assertEqual(row[0][0].item(), 5.0, 'Get item does not return correct value in inputs')
 
 
+class TestColumnarTabularDataset(unittest.TestCase):
+
+    def setUp(self):
+        self.frame = pd.DataFrame({'age': np.arange(10, dtype=np.float64),
+                                   'count': np.arange(10, dtype=np.int8),
+                                   'group': pd.Categorical(['a', 'b'] * 5)})
+        self.target = pd.Series(np.arange(10, dtype=np.int64) * 2)
+
+    def test_columnar_tabular_dataset_01_initialization(self):
+        """Testing that columns keep their dtype and share memory with the source"""
+        with self.assertRaises(FedbiomedDatasetError):
+            ColumnarTabularDataset(inputs=[1, 2, 3], target=self.target)
+        with self.assertRaises(FedbiomedDatasetError):
+            ColumnarTabularDataset(inputs=self.frame, target=self.target[:5])
+        with self.assertRaises(FedbiomedDatasetError):
+            ColumnarTabularDataset(inputs=pd.DataFrame({'name': ['a', 'b']}), target=np.array([1, 2]))
+
+        dataset = ColumnarTabularDataset(inputs=self.frame, target=self.target)
+        self.assertEqual(len(dataset), 10)
+        columns = dict(dataset._inputs)
+        self.assertEqual(columns['count'].dtype, np.int8)
+        self.assertEqual(columns['group'].dtype, np.int8)  # categorical codes
+        self.assertTrue(np.shares_memory(columns['age'], self.frame['age'].to_numpy()))
+
+        array = np.arange(12, dtype=np.float32).reshape(4, 3)
+        dataset = ColumnarTabularDataset(inputs=array, target=np.arange(4))
+        self.assertIs(dataset._inputs[0][1], array)
+
+    def test_columnar_tabular_dataset_02_batches(self):
+        """Testing batches conversion"""
+        dataset = ColumnarTabularDataset(inputs=self.frame, target=self.target)
+
+        # same values as TabularDataset
+        expected = TabularDataset(inputs=self.frame.assign(group=self.frame['group'].cat.codes),
+                                  target=self.target)
+        for items in ([1, 5, 2], [3, 4, 5]):
+            inputs, target = dataset.__getitems__(items)
+            self.assertEqual(inputs.dtype, torch.float32)
+            self.assertTrue(torch.equal(inputs, expected.inputs[items]))
+            self.assertTrue(torch.equal(target, expected.target[items]))
+
+        inputs, target = dataset[3]
+        self.assertTrue(torch.equal(inputs, expected.inputs[3]))
+        self.assertEqual(target.item(), 6.)
+
+        # columns dtypes are kept
+        dataset = ColumnarTabularDataset(inputs=self.frame, target=self.target, dtype=None, target_dtype=None)
+        inputs, target = dataset.__getitems__([3, 4])
+        self.assertListEqual(list(inputs), ['age', 'count', 'group'])
+        self.assertEqual(inputs['count'].dtype, torch.int8)
+        self.assertEqual(target.dtype, torch.int64)
+        # batches are copies, even for consecutive indices
+        inputs['age'][0] = -1
+        self.assertEqual(self.frame['age'][3], 3.)
+
+        # torch data loaders use the batches, including for subsets
+        dataset = ColumnarTabularDataset(inputs=self.frame, target=self.target)
+        manager = TorchDataManager(dataset, batch_size=4, shuffle=True)
+        loader_train, loader_test = manager.split(test_ratio=0.2)
+        rows = []
+        for inputs, target in loader_train:
+            self.assertEqual(inputs.shape[1], 3)
+            self.assertTrue(torch.equal(target, inputs[:, 0] * 2))
+            rows.extend(inputs[:, 0].tolist())
+        self.assertEqual(len(rows), 8)
+        inputs, target = next(iter(loader_test))
+        self.assertEqual(inputs.shape, (2, 3))
+
+    def test_columnar_tabular_dataset_03_from_files(self):
+        """Testing memory-mapped and chunked files"""
+        with tempfile.TemporaryDirectory() as tmpdir:
+            paths = []
+            for i, chunk in enumerate(np.array_split(np.arange(30, dtype=np.int16).reshape(10, 3), [4, 7])):
+                paths.append(os.path.join(tmpdir, f'inputs_{i}.npy'))
+                np.save(paths[-1], chunk)
+            target_path = os.path.join(tmpdir, 'target.npy')
+            np.save(target_path, np.arange(10, dtype=np.float64))
+
+            dataset = ColumnarTabularDataset.from_files(paths, target_path, dtype=None)
+            self.assertEqual(len(dataset), 10)
+            inputs, target = dataset.__getitems__([9, 0, 5, 3])
+            self.assertEqual(inputs.dtype, torch.int16)
+            self.assertTrue(torch.equal(inputs[:, 0], torch.tensor([27, 0, 15, 9], dtype=torch.int16)))
+            self.assertTrue(torch.equal(target, torch.tensor([9., 0., 5., 3.], dtype=torch.float32)))
+
+            with self.assertRaises(FedbiomedDatasetError):
+                ColumnarTabularDataset.from_files(paths[0], target_path)  # lengths differ
+
+            dataset = ColumnarTabularDataset.from_files(paths[0], paths[0])
+            self.assertIsInstance(dataset._inputs[0][1], np.memmap)
+            inputs, _ = dataset.__getitems__([1, 2])
+            self.assertEqual(inputs.dtype, torch.float32)
+            self.assertTrue(torch.equal(inputs[:, 0], torch.tensor([3., 6.])))
+
+            with self.assertRaises(FedbiomedDatasetError):
+                ColumnarTabularDataset.from_files(os.path.join(tmpdir, 'missing.npy'), target_path)
+            del dataset, inputs, target
+
+
 if __name__ == '__main__':  # pragma: no cover
     unittest.main()
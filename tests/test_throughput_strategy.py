@@ -0,0 +1,124 @@
+import unittest
+from unittest.mock import MagicMock
+
+#############################################################
+# Import ResearcherTestCase before importing any FedBioMed Module
+from testsupport.base_case import ResearcherTestCase
+#############################################################
+
+from fedbiomed.common.exceptions import FedbiomedStrategyError
+from fedbiomed.researcher.responses import Responses
+from fedbiomed.researcher.strategies import ThroughputStrategy
+
+
+class TestThroughputStrategy(ResearcherTestCase):
+    """Tests the throughput-aware node selection strategy"""
+
+    def setUp(self):
+        self.fds = MagicMock()
+        self.fds.node_ids = MagicMock(return_value=['node-1', 'node-2', 'node-3'])
+        self.fds.data = MagicMock(return_value={'node-1': {}, 'node-2': {}, 'node-3': {}})
+
+    @staticmethod
+    def replies(timings):
+        return Responses([{'node_id': node_id, 'success': True, 'params': {'w': 1.}, 'sample_size': 10,
+                           'encryption_factor': None,
+                           'timing': {'rtime_training': training, 'rtime_total': total}}
+                          for node_id, (training, total) in timings.items()])
+
+    def run_round(self, strategy, round_i, timings, training_args=None):
+        """Samples nodes and refines the replies of a round, returns the sampled nodes and overridden arguments"""
+        node_ids = strategy.sample_nodes(round_i)
+        overrides = strategy.node_training_args(round_i, training_args or {'num_updates': 10})
+        strategy.refine(self.replies({node_id: timings[node_id] for node_id in node_ids}), round_i)
+        return node_ids, overrides
+
+    def test_throughput_strategy_01_arguments(self):
+        """Tests the validation of the arguments"""
+        for kwargs in ({'target_round_time': 0}, {'target_round_time': '10'}, {'balance_updates': 1},
+                       {'smoothing': 0}, {'smoothing': 1.5}, {'min_nodes': 0}, {'max_update_scaling': 0.5},
+                       {'probe_interval': 2.}):
+            with self.assertRaises(FedbiomedStrategyError):
+                ThroughputStrategy(self.fds, **kwargs)
+
+    def test_throughput_strategy_02_estimates(self):
+        """Tests the moving average of the timings of the nodes"""
+        strategy = ThroughputStrategy(self.fds, smoothing=0.5)
+        self.assertIsNone(strategy.estimated_round_time('node-1'))
+
+        timings = {'node-1': (10., 12.), 'node-2': (20., 30.), 'node-3': (5., 6.)}
+        node_ids, overrides = self.run_round(strategy, 0, timings)
+        self.assertListEqual(node_ids, ['node-1', 'node-2', 'node-3'])
+        self.assertDictEqual(overrides, {})
+        self.assertDictEqual(strategy.estimates['node-2'], {'compute': 2., 'overhead': 10.})
+        self.assertAlmostEqual(strategy.estimated_round_time('node-2'), 30.)
+        self.assertAlmostEqual(strategy.estimated_round_time('node-2', 5), 20.)
+
+        timings['node-2'] = (40., 50.)
+        self.run_round(strategy, 1, timings)
+        self.assertDictEqual(strategy.estimates['node-2'], {'compute': 3., 'overhead': 10.})
+
+    def test_throughput_strategy_03_sampling(self):
+        """Tests sampling the nodes that fit in the target round time"""
+        strategy = ThroughputStrategy(self.fds, target_round_time=15, probe_interval=3)
+        timings = {'node-1': (10., 12.), 'node-2': (20., 30.), 'node-3': (5., 6.)}
+
+        # all nodes are sampled until they have an estimate
+        node_ids, _ = self.run_round(strategy, 0, timings)
+        self.assertListEqual(node_ids, ['node-1', 'node-2', 'node-3'])
+
+        # slow node is left out, then probed again
+        node_ids, _ = self.run_round(strategy, 1, timings)
+        self.assertListEqual(node_ids, ['node-1', 'node-3'])
+        node_ids, _ = self.run_round(strategy, 2, timings)
+        self.assertListEqual(node_ids, ['node-1', 'node-3'])
+        node_ids, _ = self.run_round(strategy, 3, timings)
+        self.assertListEqual(node_ids, ['node-1', 'node-2', 'node-3'])
+
+        # the fastest nodes are sampled when no node fits
+        strategy = ThroughputStrategy(self.fds, target_round_time=1, min_nodes=2)
+        self.run_round(strategy, 0, timings)
+        node_ids, _ = self.run_round(strategy, 1, timings)
+        self.assertListEqual(node_ids, ['node-1', 'node-3'])
+
+    def test_throughput_strategy_04_balance_updates(self):
+        """Tests scaling the number of updates of the nodes so that they finish at the same time"""
+        strategy = ThroughputStrategy(self.fds, balance_updates=True, max_update_scaling=2.)
+        timings = {'node-1': (10., 12.), 'node-2': (20., 30.), 'node-3': (5., 6.)}
+        _, overrides = self.run_round(strategy, 0, timings)
+        self.assertDictEqual(overrides, {})
+
+        # nodes finish with the slowest one, within the scaling bounds
+        _, overrides = self.run_round(strategy, 1, timings)
+        self.assertDictEqual(overrides, {'node-1': {'num_updates': 20}, 'node-3': {'num_updates': 20}})
+
+        # estimates are normalized by the number of updates requested
+        self.assertAlmostEqual(strategy.estimates['node-1']['compute'], 0.3 * 10 / 20 + 0.7 * 1.)
+
+        # target round time bounds the duration of all the nodes
+        strategy = ThroughputStrategy(self.fds, target_round_time=20, balance_updates=True)
+        self.run_round(strategy, 0, timings)
+        node_ids, overrides = self.run_round(strategy, 1, timings)
+        self.assertListEqual(node_ids, ['node-1', 'node-2', 'node-3'])
+        self.assertDictEqual(overrides, {'node-1': {'num_updates': 18}, 'node-2': {'num_updates': 5},
+                                         'node-3': {'num_updates': 20}})
+
+        # no balancing without `num_updates`
+        self.assertDictEqual(strategy.node_training_args(2, {'epochs': 1, 'num_updates': None}), {})
+
+    def test_throughput_strategy_05_save_load_state(self):
+        """Tests that the estimates are saved with the strategy state"""
+        strategy = ThroughputStrategy(self.fds, target_round_time=15)
+        timings = {'node-1': (10., 12.), 'node-2': (20., 30.), 'node-3': (5., 6.)}
+        self.run_round(strategy, 0, timings)
+
+        state = strategy.save_state()
+        loaded = ThroughputStrategy(self.fds)
+        loaded.load_state(state)
+        self.assertDictEqual(loaded.estimates, strategy.estimates)
+        self.assertEqual(loaded._parameters['target_round_time'], 15)
+        self.assertListEqual(loaded.sample_nodes(1), ['node-1', 'node-3'])
+
+
+if __name__ == '__main__':  # pragma: no cover
+    unittest.main()
@@ -12,6 +12,7 @@ from fedbiomed.common.models import TorchModel
 
 from unittest.mock import MagicMock, patch
 
+import numpy as np
 import torch
 import torch.nn as nn
 from torch.autograd import Variable
@@ -43,6 +44,8 @@ class TrainingPlan(TorchTrainingPlan):
 
 
 class FakeDPController:
+    vectorized = False
+
     def validate_and_fix_model(self, model):
         return model
 
@@ -435,6 +438,16 @@ class TestTorchnn(unittest.TestCase):
                                                            num_batches=1)
         history_monitor.add_scalar.reset_mock()
 
+        # Empty validation dataset: nothing is evaluated nor reported -------------------------------------
+        empty_loader = DataLoader(torch.utils.data.TensorDataset(torch.zeros(0, 1), torch.zeros(0)), batch_size=2)
+        tp.set_data_loaders(test_data_loader=empty_loader, train_data_loader=data_loader)
+        tp.testing_routine(metric=MetricTypes.ACCURACY,
+                           metric_args={},
+                           history_monitor=history_monitor,
+                           before_train=True)
+        history_monitor.add_scalar.assert_not_called()
+        tp.set_data_loaders(test_data_loader=data_loader, train_data_loader=data_loader)
+
         # If prediction raises an exception
         patch_model_call.side_effect = Exception
         with self.assertRaises(FedbiomedTrainingPlanError):
@@ -631,6 +644,15 @@ class TestTorchnn(unittest.TestCase):
         tp.training_routine(None, None)
         self.assertEqual(tp._optimizer.optimizer.step.call_count, 6)
 
+        # Case where the training fails: the device is released
+        tp = setup_tp(tp, num_samples=10, batch_size=5, num_updates=6)
+        tp._optimizer.optimizer.step.side_effect = RuntimeError
+        with patch.object(tp, '_release_device') as release_device:
+            with self.assertRaises(RuntimeError):
+                tp.training_routine(None, None)
+            release_device.assert_called_once()
+        tp._optimizer.optimizer.step.side_effect = None
+
     def test_torch_nn_06_compute_corrected_loss(self):
         """test_torch_nn_06_compute_corrected_loss:
         checks:
@@ -787,6 +809,134 @@ class TestTorchnn(unittest.TestCase):
 
         # print("TEST", tp._TorchTrainingPlan__norm_l2())
 
+    def test_torch_nn_08_scaffold_corrections(self):
+        """Tests that Scaffold corrections are aligned once with the parameters and applied to gradients"""
+        model = nn.Linear(2, 1)
+        data, target = torch.Tensor([[1, 2], [1, 1], [2, 2]]), torch.Tensor([[1], [2], [2]])
+        tp = self.run_model_initialization(model, 0.)
+
+        correction_state = {'bias': torch.tensor([.5], dtype=torch.float64),
+                            'weight': torch.ones((1, 2), dtype=torch.float64),
+                            'unknown_layer': torch.ones(3)}
+        params, corrections = tp._align_parameters_state(correction_state)
+
+        # ordered as `named_parameters`, with the parameters device and dtype, unknown names ignored
+        self.assertListEqual([id(p) for p in params], [id(model.weight), id(model.bias)])
+        for param, correction in zip(params, corrections):
+            self.assertEqual(correction.dtype, param.dtype)
+            self.assertEqual(correction.device, param.device)
+            self.assertEqual(correction.shape, param.shape)
+
+        # gradients without corrections
+        with patch.object(tp._optimizer, 'step') as step:
+            tp._train_over_batch(data, target)
+            step.assert_called_once()
+        grads = [param.grad.clone() for param in params]
+
+        # gradients with corrections
+        tp._corrections = (params, corrections)
+        with patch.object(tp._optimizer, 'step'):
+            tp._train_over_batch(data, target)
+        for param, grad, correction in zip(params, grads, corrections):
+            self.assertTrue(torch.allclose(param.grad, grad - correction))
+
+    def test_torch_nn_09_performance_profile(self):
+        """Tests the CPU performance profile of the training and validation routines"""
+        threads = torch.get_num_threads()
+        self.addCleanup(torch.set_num_threads, threads)
+
+        model = nn.Linear(2, 1)
+        data, target = torch.Tensor([[1, 2], [1, 1], [2, 2]]), torch.Tensor([[1], [2], [2]])
+        tp = self.run_model_initialization(model, 0.)
+
+        # default profile
+        profile = tp.set_performance_profile(None)
+        self.assertDictEqual(profile, {'cpu_threads': threads,
+                                       'cpu_interop_threads': torch.get_num_interop_threads(),
+                                       'cpu_bfloat16': False})
+
+        # inter-op threads can not be changed once used: keep the current value
+        with (patch('torch.set_num_interop_threads', side_effect=RuntimeError) as set_interop,
+              patch.object(logging.getLogger('fedbiomed'), 'warning') as warning):
+            profile = tp.set_performance_profile({'cpu_threads': 1,
+                                                  'cpu_interop_threads': torch.get_num_interop_threads() + 1,
+                                                  'cpu_bfloat16': True})
+            set_interop.assert_called_once()
+            warning.assert_called_once()
+        self.assertEqual(torch.get_num_threads(), 1)
+        self.assertDictEqual(profile, {'cpu_threads': 1,
+                                       'cpu_interop_threads': torch.get_num_interop_threads(),
+                                       'cpu_bfloat16': True})
+
+        # forward passes run under bfloat16 autocast, parameters and gradients stay in fp32
+        with patch.object(tp, 'training_step', wraps=tp.training_step) as training_step:
+            def check_autocast(data, target):
+                self.assertTrue(torch.is_autocast_cpu_enabled())
+                return tp._model.model.forward(data).sum()
+            training_step.side_effect = check_autocast
+            tp._train_over_batch(data, target)
+        self.assertFalse(torch.is_autocast_cpu_enabled())
+        self.assertEqual(model.weight.grad.dtype, torch.float32)
+
+        # validation runs in inference mode, with bfloat16 predictions converted for the metrics
+        tp.testing_data_loader = DataLoader(torch.utils.data.TensorDataset(data, target), batch_size=3)
+
+        def testing_step(data, target):
+            self.assertTrue(torch.is_inference_mode_enabled())
+            self.assertTrue(torch.is_autocast_cpu_enabled())
+            self.assertEqual(tp._model.predict(data).dtype, np.float32)
+            return 1.
+        tp.testing_step = testing_step
+        tp.testing_routine(None, {}, None, False)
+        self.assertFalse(torch.is_inference_mode_enabled())
+
+        # bfloat16 autocast is disabled with differential privacy
+        tp._dp_controller = MagicMock(is_active=True)
+        profile = tp.set_performance_profile({'cpu_bfloat16': True})
+        self.assertFalse(profile['cpu_bfloat16'])
+
+    def test_torch_nn_10_reset_round(self):
+        """Tests preparing a training plan kept by the node for a new round"""
+        model = nn.Sequential(nn.Linear(2, 2), nn.BatchNorm1d(2))
+        tp = self.run_model_initialization(model, 0.)
+        self.assertTrue(tp.reusable())
+        weight = model[0].weight
+        initial_buffers = {name: buffer.clone() for name, buffer in model.named_buffers()}
+
+        # state of the previous round
+        model[1].running_mean.fill_(5.)
+        model[1].num_batches_tracked.fill_(3)
+        tp.correction_state = {'0.weight': torch.ones(2, 2)}
+        tp._corrections = ([], [])
+        tp.aggregator_name = 'scaffold'
+        optimizer = tp._optimizer
+
+        training_args = TrainingArgs({'fedprox_mu': 0., 'num_updates': 7, 'log_interval': 20,
+                                      'optimizer_args': {'lr': .5}}, only_required=False)
+        tp.reset_round(training_args, {'aggregator_name': 'fedavg'})
+
+        # model is kept, with its initial buffers, and the training arguments and optimizer are configured again
+        self.assertIs(tp.model(), model)
+        self.assertIs(model[0].weight, weight)
+        for name, buffer in model.named_buffers():
+            self.assertTrue(torch.equal(buffer, initial_buffers[name]))
+        self.assertIsNot(tp._optimizer, optimizer)
+        self.assertIsInstance(tp._optimizer.optimizer, Adam)
+        self.assertEqual(tp.aggregator_name, 'fedavg')
+        self.assertEqual(tp.correction_state, {})
+        self.assertIsNone(tp._corrections)
+        self.assertEqual(tp._num_updates, 7)
+        self.assertIsNone(tp._epochs)
+        self.assertEqual(tp._log_interval, 20)
+        self.assertEqual(tp._optimizer_args, {'lr': .5})
+
+        # model modified for differential privacy is not reused
+        tp._dp_controller = MagicMock(is_active=True)
+        self.assertFalse(tp.reusable())
+        with self.assertRaises(FedbiomedTrainingPlanError):
+            tp.reset_round(training_args, {})
+        self.assertFalse(TorchTrainingPlan().reusable())
+
 
 class TestSendToDevice(unittest.TestCase):
 
@@ -853,6 +1003,8 @@ class TestTorchNNTrainingRoutineDataloaderTypes(unittest.TestCase):
     class FakeDPController:
         """Mimics the behaviour of DPController
         """
+        vectorized = False
+
         def before_training(self, optimizer: NativeTorchOptimizer, loader: Dataset):
             return optimizer, loader
 
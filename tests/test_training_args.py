@@ -162,6 +162,21 @@ class TestTrainingArgs(unittest.TestCase):
         with self.assertRaises(FedbiomedUserInputError):
             t ^= {"test_metric_args": "not a dict"}
 
+    def test_training_args_05_profiling(self):
+        """
+        test profiling validator
+        """
+        t = TrainingArgs(only_required=False)
+        self.assertIsNone(t['profiling'])
+
+        for profiling in (True, False, {}, {"top_n": 5}, {"top_n": 50, "sort": "tottime"}):
+            t ^= {"profiling": profiling}
+            self.assertEqual(t['profiling'], profiling)
+
+        for profiling in ("cProfile", 10, {"top_n": 0}, {"top_n": True}, {"sort": "name"}, {"depth": 3}):
+            with self.assertRaises(FedbiomedUserInputError):
+                t ^= {"profiling": profiling}
+
 
 if __name__ == '__main__':  # pragma: no cover
     unittest.main()
@@ -0,0 +1,161 @@
+import os
+import shutil
+import sys
+import tempfile
+import time
+import types
+import unittest
+
+import numpy as np
+import torch
+
+from fedbiomed.common.exceptions import FedbiomedValueError
+from fedbiomed.node.warm_cache import WarmCache, WarmTrainingPlan, estimate_size, training_plan_hash
+
+
+class FakeLoader:
+    def __init__(self, size: int):
+        self.dataset = np.zeros(size, dtype=np.uint8)
+
+
+class TestWarmCache(unittest.TestCase):
+    """Tests the cache of the training plans kept by the node between rounds"""
+
+    def setUp(self):
+        self.modules = []
+
+    def tearDown(self):
+        for name in self.modules:
+            sys.modules.pop(name, None)
+
+    def _entry(self, size: int = 100, arguments: dict = None) -> WarmTrainingPlan:
+        name = f'training_plan_warm_cache_{len(self.modules)}'
+        sys.modules[name] = types.ModuleType(name)
+        self.modules.append(name)
+        return WarmTrainingPlan(training_plan=object(),
+                                module_name=name,
+                                training_plan_path=name + '.py',
+                                arguments=arguments or {'model_args': {'lr': 0.1}},
+                                data_loaders=(FakeLoader(size), None))
+
+    def test_warm_cache_01_init(self):
+        """Tests the validation of the memory budget and idle time"""
+        for kwargs in ({'max_memory': -1}, {'max_memory': '1'}, {'max_memory': 1, 'idle_time': -1.},
+                       {'max_memory': True}):
+            with self.assertRaises(FedbiomedValueError):
+                WarmCache(**kwargs)
+
+        cache = WarmCache(max_memory=0)
+        self.assertFalse(cache.enabled)
+        entry = self._entry()
+        self.assertFalse(cache.put(('researcher', 'job', 'hash'), entry))
+        self.assertEqual(len(cache), 0)
+        self.assertNotIn(entry.module_name, sys.modules)
+
+    def test_warm_cache_02_get_put(self):
+        """Tests taking training plans out of the cache and putting them back"""
+        cache = WarmCache(max_memory=1000)
+        key = ('researcher', 'job', 'hash')
+        entry = self._entry()
+        self.assertIsNone(cache.get(key, entry.arguments))
+
+        self.assertTrue(cache.put(key, entry))
+        self.assertIn(key, cache)
+        self.assertEqual(entry.size, 100)
+        self.assertEqual(cache.memory, 100)
+
+        # training plan is taken out of the cache while a round uses it
+        self.assertIs(cache.get(key, {'model_args': {'lr': 0.1}}), entry)
+        self.assertNotIn(key, cache)
+        self.assertIn(entry.module_name, sys.modules)
+
+        # training plan initialized with other arguments is evicted
+        cache.put(key, entry)
+        self.assertIsNone(cache.get(key, {'model_args': {'lr': 0.2}}))
+        self.assertEqual(len(cache), 0)
+        self.assertNotIn(entry.module_name, sys.modules)
+
+        # a job keeps a single training plan
+        first = self._entry()
+        cache.put(key, first)
+        cache.put(('researcher', 'job', 'other_hash'), self._entry())
+        cache.put(('researcher', 'other_job', 'hash'), self._entry())
+        self.assertEqual(len(cache), 2)
+        self.assertNotIn(key, cache)
+        self.assertNotIn(first.module_name, sys.modules)
+
+        cache.clear()
+        self.assertEqual(len(cache), 0)
+        self.assertEqual(cache.memory, 0)
+
+    def test_warm_cache_03_memory_budget(self):
+        """Tests evicting the least recently used training plans to keep the memory budget"""
+        cache = WarmCache(max_memory=250)
+        keys = [('researcher', f'job_{i}', 'hash') for i in range(3)]
+        for key in keys[:2]:
+            cache.put(key, self._entry())
+        # job 0 becomes the most recently used
+        cache.put(keys[0], cache.get(keys[0], {'model_args': {'lr': 0.1}}))
+
+        cache.put(keys[2], self._entry())
+        self.assertIn(keys[0], cache)
+        self.assertNotIn(keys[1], cache)
+        self.assertIn(keys[2], cache)
+        self.assertEqual(cache.memory, 200)
+
+        # training plan exceeding the budget is not kept
+        entry = self._entry(size=300)
+        self.assertFalse(cache.put(('researcher', 'job_3', 'hash'), entry))
+        self.assertEqual(len(cache), 2)
+        self.assertNotIn(entry.module_name, sys.modules)
+
+    def test_warm_cache_04_idle_time(self):
+        """Tests evicting the idle training plans"""
+        cache = WarmCache(max_memory=1000, idle_time=0.1)
+        cache.put(('researcher', 'job', 'hash'), self._entry())
+        self.assertEqual(len(cache), 1)
+
+        # evicted by the timer, without any new round
+        deadline = time.monotonic() + 5
+        while len(cache) and time.monotonic() < deadline:
+            time.sleep(0.05)
+        self.assertEqual(len(cache), 0)
+
+        # idle time 0 never evicts
+        cache = WarmCache(max_memory=1000)
+        cache.put(('researcher', 'job', 'hash'), self._entry())
+        cache.evict_idle()
+        self.assertEqual(len(cache), 1)
+        cache.clear()
+
+    def test_warm_cache_05_estimate_size(self):
+        """Tests estimating the memory of training plans and data loaders"""
+        class TrainingPlan:
+            def __init__(self):
+                self.model = torch.nn.Linear(10, 2)
+                self.arrays = [np.zeros(5, dtype=np.float64), 'abc']
+                self.method = self.__init__
+                self.module = np
+
+        training_plan = TrainingPlan()
+        # weights, bias and the array are counted once
+        self.assertEqual(estimate_size(training_plan, training_plan.arrays),
+                         (10 * 2 + 2) * 4 + 5 * 8 + len('abc'))
+        self.assertEqual(estimate_size(None, 1, 2.), 0)
+
+    def test_warm_cache_06_training_plan_hash(self):
+        """Tests hashing training plan files"""
+        tmp_dir = tempfile.mkdtemp()
+        try:
+            paths = [os.path.join(tmp_dir, f'training_plan_{i}.py') for i in range(3)]
+            for path, content in zip(paths, ('a = 1\n', 'a = 1\n', 'a = 2\n')):
+                with open(path, 'w', encoding='utf-8') as file:
+                    file.write(content)
+            self.assertEqual(training_plan_hash(paths[0]), training_plan_hash(paths[1]))
+            self.assertNotEqual(training_plan_hash(paths[0]), training_plan_hash(paths[2]))
+        finally:
+            shutil.rmtree(tmp_dir)
+
+
+if __name__ == '__main__':  # pragma: no cover
+    unittest.main()
@@ -7,7 +7,7 @@ class MockRequestMessaging(unittest.TestCase):
     @classmethod
     def setUpClass(cls) -> None:
         super().setUpClass()
-        cls.messaging_patch = patch("fedbiomed.researcher.requests.Messaging")
+        cls.messaging_patch = patch("fedbiomed.researcher.requests.create_messaging")
         cls.messaging_patch.start()
 
     @classmethod
@@ -0,0 +1,62 @@
+"""Stand-in for the message broker and the file repository, to run components in several local processes."""
+
+import multiprocessing
+import os
+import queue
+import shutil
+import uuid
+from typing import Any, Dict, List, Optional, Tuple
+
+from fedbiomed.common import json
+from fedbiomed.common.repository import Repository
+
+
+class FakeBroker:
+    """Routes messages between processes, through one multiprocessing queue per subscriber.
+
+    Subscriptions are declared before the processes are started.
+    """
+
+    def __init__(self, subscriptions: Dict[str, List[str]], context: Any = None):
+        """
+        Args:
+            subscriptions: topics of each subscriber, indexed by subscriber name
+            context: multiprocessing context used to create the queues
+        """
+        context = context or multiprocessing
+        self._queues = {name: context.Queue() for name in subscriptions}
+        self._subscribers = {}
+        for name, topics in subscriptions.items():
+            for topic in topics:
+                self._subscribers.setdefault(topic, []).append(name)
+
+    def publish(self, topic: str, msg: Dict[str, Any]):
+        """Publishes a message to the subscribers of a topic."""
+        payload = json.serialize_msg(msg)
+        for name in self._subscribers.get(topic, []):
+            self._queues[name].put((topic, payload))
+
+    def receive(self, name: str, timeout: float = 10.) -> Optional[Tuple[str, Dict[str, Any]]]:
+        """Receives the next message of a subscriber, with its topic. None after `timeout` seconds."""
+        try:
+            topic, payload = self._queues[name].get(timeout=timeout)
+        except queue.Empty:
+            return None
+        return topic, json.deserialize_msg(payload)
+
+
+class FakeRepository(Repository):
+    """File repository in a local directory, shared by processes."""
+
+    def __init__(self, repository_dir: str, tmp_dir: str):
+        super().__init__(uploads_url=repository_dir, tmp_dir=tmp_dir, cache_dir=tmp_dir)
+
+    def upload_file(self, filename: str) -> Dict[str, Any]:
+        url = os.path.join(self.uploads_url, f"{uuid.uuid4()}_{os.path.basename(filename)}")
+        shutil.copy(filename, url)
+        return {'file': url}
+
+    def download_file(self, url: str, filename: str) -> Tuple[int, str]:
+        filepath = os.path.join(self.tmp_dir, filename)
+        shutil.copy(url, filepath)
+        return 200, filepath
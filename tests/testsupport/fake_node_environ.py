@@ -44,6 +44,13 @@ class NodeEnviron:
         self._values['TRAINING_PLANS_DIR'] = f"/tmp/{node}/registered_training_plans"
         self._values['SECURE_AGGREGATION'] = False
         self._values['FORCE_SECURE_AGGREGATION'] = False
+        self._values['ALLOW_PROFILING'] = False
+        self._values['SHARE_DATASET_PROFILE'] = False
+        self._values['CPU_THREADS'] = None
+        self._values['CPU_INTEROP_THREADS'] = None
+        self._values['CPU_BFLOAT16'] = False
+        self._values['WARM_CACHE_MEMORY'] = 1024
+        self._values['WARM_CACHE_IDLE_TIME'] = 600
 
 
         # TODO: create random directory paths like  for test_taskqueue.py
@@ -65,6 +72,7 @@ class NodeEnviron:
         self._values['MESSAGES_QUEUE_DIR'] = f"/tmp/{node}/var/queue_messages_XXX"
         self._values['NODE_ID'] = f"mock_node_{node}_XXX"
         self._values['ID'] = f"mock_node_{node}_XXX"
+        self._values['DB_BACKEND'] = "tinydb"
         self._values['DB_PATH'] = f"/tmp/{node}/var/db_node_mock_node_XXX.json"
 
         self._values['ALLOW_DEFAULT_TRAINING_PLANS'] = True
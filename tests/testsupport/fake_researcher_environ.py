@@ -58,6 +58,7 @@ class ResearcherEnviron:
 
         # values specific to researcher
         self._values['MESSAGES_QUEUE_DIR'] = f"/tmp/{res}/var/queue_messages"
+        self._values['BREAKPOINT_COMPRESSION'] = ''
         self._values['RESEARCHER_ID'] = f"mock_researcher_{res}_XXX"
         self._values['ID'] = f"mock_researcher_{res}_XXX"
         self._values['DB_PATH'] = f"/tmp/{res}/var/db_researcher_mock_node_XXX.json"